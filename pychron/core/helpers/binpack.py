@@ -20,6 +20,18 @@
 import base64
 import struct
 
+from numpy import array, dtype as ndtype, frombuffer, empty
+
+STRUCT_TO_NUMPY = {'f': 'f4', 'd': 'f8',
+                   'b': 'i1', 'B': 'u1',
+                   'h': 'i2', 'H': 'u2',
+                   'i': 'i4', 'I': 'u4',
+                   'l': 'i4', 'L': 'u4',
+                   'q': 'i8', 'Q': 'u8'}
+ENDIANNESS = {'>': '>', '!': '>', '<': '<', '=': '=', '@': '='}
+
+_dtype_cache = {}
+
 
 def format_blob(blob):
     return base64.b64decode(blob)
@@ -47,11 +59,92 @@ def pack(fmt, data):
     return b''.join([struct.pack(fmt, *datum) for datum in data])
 
 
+def make_dtype(fmt):
+    """
+    convert a struct format string e.g. ">ff" into a structured numpy dtype with one field per item.
+    return None if the format cannot be represented exactly, e.g. native alignment padding
+
+    @param fmt:
+    @return:
+    """
+    try:
+        return _dtype_cache[fmt]
+    except KeyError:
+        pass
+
+    dt = None
+    order, codes = '=', fmt
+    if fmt and fmt[0] in ENDIANNESS:
+        order, codes = ENDIANNESS[fmt[0]], fmt[1:]
+
+    try:
+        fields = [('f{}'.format(i), '{}{}'.format(order, STRUCT_TO_NUMPY[c])) for i, c in enumerate(codes)]
+        if fields:
+            dt = ndtype(fields)
+            if dt.itemsize != struct.calcsize(fmt):
+                dt = None
+    except (KeyError, struct.error):
+        dt = None
+
+    _dtype_cache[fmt] = dt
+    return dt
+
+
+def unpack_arrays(blob, fmt='>ff', decode=False):
+    """
+    decode ``blob`` into one array per item in ``fmt``.
+
+    the returned arrays are read-only views into ``blob``. no per-point python objects are created.
+    a truncated trailing record is dropped, matching ``unpack``
+
+    @param blob:
+    @param fmt:
+    @param decode:
+    @return:
+    """
+    if decode:
+        blob = format_blob(blob)
+
+    dt = make_dtype(fmt)
+    if dt is None:
+        return [array(c, dtype=float) for c in unpack(blob, fmt=fmt, step=struct.calcsize(fmt))]
+
+    if not blob:
+        return [empty(0, dtype=dt[i]) for i in range(len(dt))]
+
+    n = len(blob) // dt.itemsize
+    data = frombuffer(blob, dtype=dt, count=n)
+    return [data[name] for name in dt.names]
+
+
+def pack_arrays(fmt, *columns):
+    """
+    inverse of ``unpack_arrays``. encode equal length sequences into a blob byte-compatible with ``pack``
+
+    @param fmt:
+    @param columns:
+    @return:
+    """
+    dt = make_dtype(fmt)
+    if dt is None:
+        return pack(fmt, zip(*columns))
+
+    n = min(len(c) for c in columns) if columns else 0
+    data = empty(n, dtype=dt)
+    for name, c in zip(dt.names, columns):
+        data[name] = c[:n]
+    return data.tobytes()
+
+
 def unpack(blob, fmt='>ff', step=8, decode=False):
     if decode:
         blob = format_blob(blob)
 
     if blob:
+        dt = make_dtype(fmt)
+        if dt is not None and dt.itemsize == step:
+            return [tuple(c.tolist()) for c in unpack_arrays(blob, fmt)]
+
         try:
             return list(zip(*[struct.unpack(fmt, blob[i:i + step]) for i in range(0, len(blob), step)]))
         except struct.error:
@@ -65,6 +158,6 @@ def unpack(blob, fmt='>ff', step=8, decode=False):
             return list(zip(*ret))
 
     else:
-        return [[] for _ in fmt.count('f')]
+        return [[] for _ in range(len(fmt.lstrip('<>!=@')))]
 
 # ============= EOF =============================================
@@ -0,0 +1,102 @@
+# ===============================================================================
+# Copyright 2026 ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+# ============= local library imports  ==========================
+from numpy import empty, asarray
+
+MIN_CAPACITY = 64
+
+
+class SignalBuffer(object):
+    """
+        growable (x, y) storage for live acquisition.
+
+        values are written into preallocated arrays whose capacity doubles when full
+        so appending a point is amortized O(1). ``xs`` and ``ys`` are plain ndarray views
+        of the filled region and can be handed directly to fitting and plotting code.
+
+        a view is never written to after it is returned. new points always land beyond
+        the end of any existing view and growing reallocates, leaving old views untouched.
+    """
+    __slots__ = ('_xs', '_ys', '_n', '_vxs', '_vys')
+
+    def __init__(self, xs=None, ys=None, capacity=MIN_CAPACITY):
+        n = 0
+        if xs is not None and ys is not None:
+            xs, ys = asarray(xs, dtype=float), asarray(ys, dtype=float)
+            n = min(xs.shape[0], ys.shape[0])
+
+        capacity = max(capacity, MIN_CAPACITY)
+        while capacity < n:
+            capacity *= 2
+
+        self._xs = empty(capacity)
+        self._ys = empty(capacity)
+        if n:
+            self._xs[:n] = xs[:n]
+            self._ys[:n] = ys[:n]
+
+        self._n = n
+        self._make_views()
+
+    def __len__(self):
+        return self._n
+
+    @property
+    def capacity(self):
+        return self._xs.shape[0]
+
+    @property
+    def xs(self):
+        return self._vxs
+
+    @property
+    def ys(self):
+        return self._vys
+
+    def owns(self, xs, ys):
+        """
+            return True if ``xs`` and ``ys`` are the current views of this buffer.
+            used to detect that a measurement's arrays were replaced externally
+        """
+        return xs is self._vxs and ys is self._vys
+
+    def append(self, x, y):
+        n = self._n
+        if n == self._xs.shape[0]:
+            self._grow(2 * n)
+
+        self._xs[n] = x
+        self._ys[n] = y
+        self._n = n + 1
+        self._make_views()
+
+    def _grow(self, capacity):
+        n = self._n
+        for attr in ('_xs', '_ys'):
+            old = getattr(self, attr)
+            new = empty(capacity)
+            new[:n] = old[:n]
+            setattr(self, attr, new)
+
+    def _make_views(self):
+        n = self._n
+        self._vxs = self._xs[:n]
+        self._vys = self._ys[:n]
+
+# ============= EOF =============================================
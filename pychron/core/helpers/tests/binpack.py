@@ -0,0 +1,73 @@
+import struct
+import unittest
+
+from pychron.core.helpers.binpack import pack, unpack, unpack_arrays, pack_arrays, encode_blob, format_blob
+from pychron.processing.isotope import Isotope
+
+
+def legacy_unpack(blob, fmt='>ff', step=8):
+    ret = []
+    for i in range(0, len(blob), step):
+        try:
+            args = struct.unpack(fmt, blob[i:i + step])
+        except struct.error:
+            break
+        ret.append(args)
+    return list(zip(*ret))
+
+
+class BinpackTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data = [(i * 1.5, 1000 - i * 0.25) for i in range(100)]
+        self.blob = pack('>ff', self.data)
+
+    def test_unpack_compatible(self):
+        self.assertEqual(unpack(self.blob), legacy_unpack(self.blob))
+
+    def test_unpack_little_endian(self):
+        blob = pack('<ff', self.data)
+        self.assertEqual(unpack(blob, fmt='<ff'), legacy_unpack(blob, fmt='<ff'))
+
+    def test_unpack_truncated(self):
+        blob = self.blob + b'\x01\x02\x03'
+        self.assertEqual(unpack(blob), legacy_unpack(blob))
+
+        xs, ys = unpack_arrays(blob)
+        self.assertEqual(xs.shape[0], 100)
+
+    def test_unpack_arrays(self):
+        xs, ys = unpack_arrays(self.blob)
+        self.assertListEqual(list(xs), [d[0] for d in self.data])
+        self.assertListEqual(list(ys), [d[1] for d in self.data])
+
+    def test_unpack_empty(self):
+        self.assertEqual(unpack(b''), [[], []])
+        xs, ys = unpack_arrays(b'')
+        self.assertEqual(xs.shape[0], 0)
+
+    def test_pack_arrays(self):
+        xs, ys = unpack_arrays(self.blob)
+        self.assertEqual(pack_arrays('>ff', xs, ys), self.blob)
+
+    def test_decode(self):
+        xs, ys = unpack_arrays(encode_blob(self.blob), decode=True)
+        self.assertEqual(xs.shape[0], 100)
+
+    def test_isotope_roundtrip(self):
+        iso = Isotope('Ar40', 'H1')
+        iso.unpack_data(self.blob)
+        self.assertEqual(iso.xs.dtype.kind, 'f')
+        self.assertEqual(iso.xs.dtype.itemsize, 8)
+        self.assertEqual(iso.pack(as_hex=False), self.blob)
+
+        iso.ys[0] = 1
+        self.assertEqual(iso.ys[0], 1)
+
+    def test_isotope_n_only(self):
+        iso = Isotope('Ar40', 'H1')
+        iso.unpack_data(format_blob(encode_blob(self.blob)), n_only=True)
+        self.assertEqual(iso.n, 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
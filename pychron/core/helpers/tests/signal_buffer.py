@@ -0,0 +1,105 @@
+import unittest
+
+from numpy import arange, array
+
+from pychron.core.helpers.signal_buffer import SignalBuffer
+from pychron.core.regression.incremental_regressor import IncrementalPolynomialRegressor
+from pychron.core.regression.ols_regressor import PolynomialRegressor
+from pychron.processing.isotope import Isotope
+from pychron.processing.isotope_group import IsotopeGroup
+
+
+class SignalBufferTestCase(unittest.TestCase):
+    def test_append(self):
+        b = SignalBuffer()
+        for i in range(200):
+            b.append(i, 2 * i)
+
+        self.assertEqual(len(b), 200)
+        self.assertListEqual(list(b.xs), list(range(200)))
+        self.assertListEqual(list(b.ys), list(range(0, 400, 2)))
+
+    def test_capacity_doubles(self):
+        b = SignalBuffer(capacity=4)
+        c = b.capacity
+        for i in range(c + 1):
+            b.append(i, i)
+        self.assertEqual(b.capacity, 2 * c)
+
+    def test_seed(self):
+        b = SignalBuffer(arange(3), arange(3) * 10)
+        b.append(3, 30)
+        self.assertListEqual(list(b.ys), [0, 10, 20, 30])
+
+    def test_old_views_unchanged(self):
+        b = SignalBuffer()
+        b.append(0, 1)
+        xs, ys = b.xs, b.ys
+        for i in range(1, 500):
+            b.append(i, i)
+        self.assertEqual(xs.shape[0], 1)
+        self.assertEqual(ys[0], 1)
+
+    def test_owns(self):
+        b = SignalBuffer()
+        b.append(0, 1)
+        self.assertTrue(b.owns(b.xs, b.ys))
+        self.assertFalse(b.owns(array([0.]), b.ys))
+
+
+class MeasurementAppendTestCase(unittest.TestCase):
+    def setUp(self):
+        self.group = IsotopeGroup()
+        self.group.isotopes['Ar40'] = Isotope('Ar40', 'H1')
+
+    def test_append_signal(self):
+        for i in range(100):
+            self.assertTrue(self.group.append_data('Ar40', 'H1', i, 10 + i, 'signal'))
+
+        iso = self.group.isotopes['Ar40']
+        self.assertEqual(iso.xs.shape[0], 100)
+        self.assertEqual(iso.ys[-1], 109)
+
+    def test_append_baseline_sniff(self):
+        for i in range(10):
+            self.group.append_data('Ar40', 'H1', i, 0.1, 'baseline')
+            self.group.append_data('Ar40', 'H1', i, 5, 'sniff')
+
+        iso = self.group.isotopes['Ar40']
+        self.assertEqual(iso.baseline.xs.shape[0], 10)
+        self.assertEqual(iso.sniff.ys.shape[0], 10)
+        self.assertEqual(iso.xs.shape[0], 0)
+
+    def test_replaced_arrays(self):
+        iso = self.group.isotopes['Ar40']
+        for i in range(10):
+            iso.append_data(i, i)
+
+        iso.xs, iso.ys = iso.xs[:5], iso.ys[:5]
+        iso.append_data(100, 100)
+        self.assertListEqual(list(iso.xs), [0, 1, 2, 3, 4, 100])
+
+    def test_fit(self):
+        iso = self.group.isotopes['Ar40']
+        iso.fit = 'linear'
+        for i in range(50):
+            iso.append_data(i, 2 * i + 5)
+
+        self.assertAlmostEqual(iso.value, 5)
+
+    def test_end_acquisition(self):
+        iso = self.group.isotopes['Ar40']
+        iso.fit = 'linear'
+        for i in range(50):
+            self.group.append_data('Ar40', 'H1', i, 2 * i + 5, 'signal')
+            self.group.append_data('Ar40', 'H1', i, 0.1, 'baseline')
+        self.assertIs(type(iso.regressor), IncrementalPolynomialRegressor)
+
+        self.group.end_acquisition()
+        self.assertIs(type(iso.regressor), PolynomialRegressor)
+        self.assertIsNone(iso.baseline._buffer)
+        self.assertAlmostEqual(iso.value, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,9 +15,9 @@
 # ===============================================================================
 
 # ============= standard library imports ========================
-from operator import itemgetter
+from collections import OrderedDict
 
-from numpy import asarray, column_stack, ones_like, array, average, ravel
+from numpy import asarray, column_stack, ones_like, array, zeros, arange, argsort, delete
 # ============= local library imports  ==========================
 from statsmodels.regression.linear_model import WLS, OLS
 # ============= enthought library imports =======================
@@ -48,41 +48,118 @@ class SpecialFluxRegressor(BaseRegressor):
 
 
 class NearestNeighborFluxRegressor(SpecialFluxRegressor):
+    """
+        predict J as the (weighted) mean of the ``n`` monitor positions closest to each point.
+
+        all points are predicted at once. the distances from every point to every monitor are calculated in one
+        call and sorted row wise, ties are broken by monitor order. the neighbor indices are cached by monitor set
+        and points so ``predict``, ``predict_error`` and the monte carlo estimators reuse them.
+
+        the prediction is linear in ``ys`` so ``get_prediction_matrix`` can be used for monte carlo errors
+    """
     n = Int(3)
 
-    def _predict(self, pts, return_error=False):
-        def pred(x, y):
-            """
-            get the n positions that are closest (eucledian distance) to x,y
-            """
-
-            v2 = array([[x,y]])
-            ds = ravel(calc_distances(self.clean_xs, v2))
-            idx = sorted(enumerate(ds), key=itemgetter(1))
-            idx, ds = zip(*idx[:self.n])
-
-            v = 0
-            if idx:
-                idx = array(idx)
-
-                vs = self.clean_ys[idx]
-
-                if self.use_weighted_fit:
-                    es = self.clean_yserr[idx]
-                    ws = es ** -2
-                    if return_error:
-                        v = ws.sum()
-                    else:
-                        v = average(vs, weights=ws)
-                else:
-                    if return_error:
-                        v = vs.std()
-                    else:
-                        v = vs.mean()
-            return v
-
-        ret = [pred(*pt) for pt in pts]
-        return ret
+    max_cache = 8
+
+    _neighbor_key = None
+    _neighbor_cache = None
+
+    def predict(self, pts):
+        return self.predict_with_error(pts)[0]
+
+    def predict_error(self, pts, error_calc=None):
+        return self.predict_with_error(pts)[1]
+
+    def predict_with_error(self, pts):
+        """
+            return the predicted values and errors for ``pts``. errors are the standard deviation of the neighbors
+            or the sum of their weights if ``use_weighted_fit``
+        """
+        pts = self._get_pts(pts)
+        idx = self._get_neighbors(pts)
+        if idx is None:
+            z = zeros(pts.shape[0])
+            return z, z.copy()
+
+        vs = self.clean_ys[idx]
+        if self.use_weighted_fit:
+            ws = self.clean_yserr[idx] ** -2
+            es = ws.sum(axis=1)
+            vs = (vs * ws).sum(axis=1) / es
+        else:
+            es = vs.std(axis=1)
+            vs = vs.mean(axis=1)
+        return vs, es
+
+    def get_prediction_matrix(self, exog, n=None):
+        """
+        return M such that endog.dot(M) == fast_predict2(endog, exog).
+
+        rows correspond to ``clean_ys`` if ``n`` is the number of clean points otherwise to ``ys``
+        """
+        pts = self._get_pts(exog)
+        npts = pts.shape[0]
+        idx = self._get_neighbors(pts)
+
+        cidx = delete(arange(len(self.ys)), self.get_excluded())
+        if n is None or n == cidx.shape[0]:
+            nrows = cidx.shape[0]
+        else:
+            nrows = len(self.ys)
+
+        m = zeros((nrows, npts))
+        if idx is None:
+            return m
+
+        if self.use_weighted_fit:
+            ws = self.clean_yserr[idx] ** -2
+            ws = ws / ws.sum(axis=1)[:, None]
+        else:
+            ws = 1 / idx.shape[1]
+
+        if nrows != cidx.shape[0]:
+            idx = cidx[idx]
+
+        m[idx, arange(npts)[:, None]] = ws
+        return m
+
+    def fast_predict2(self, endog, exog):
+        endog = asarray(endog)
+        return endog.dot(self.get_prediction_matrix(exog, endog.shape[0]))
+
+    def _get_pts(self, pts):
+        return asarray(pts, dtype=float).reshape(-1, 2)
+
+    def _get_neighbors(self, pts):
+        """
+            return an (npts, n) array of indices into the clean arrays. the nearest monitor is first
+        """
+        cxs = self.clean_xs
+        if not len(cxs):
+            return
+
+        cxs = asarray(cxs, dtype=float)
+        key = (cxs.tobytes(), self.n)
+        if key != self._neighbor_key:
+            self._neighbor_key = key
+            self._neighbor_cache = OrderedDict()
+
+        cache = self._neighbor_cache
+        pkey = pts.tobytes()
+        try:
+            idx = cache[pkey]
+            cache.move_to_end(pkey)
+            return idx
+        except KeyError:
+            pass
+
+        ds = calc_distances(pts, cxs)
+        idx = argsort(ds, axis=1, kind='stable')[:, :self.n]
+
+        cache[pkey] = idx
+        if len(cache) > self.max_cache:
+            cache.popitem(last=False)
+        return idx
 
 
 # class BracketingFluxRegressor(SpecialFluxRegressor):
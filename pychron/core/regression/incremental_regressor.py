@@ -0,0 +1,292 @@
+# ===============================================================================
+# Copyright 2026 ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+from traits.api import Bool
+# ============= standard library imports ========================
+from numpy import arange, dot, linalg, outer, sqrt, diag, ones, zeros, asarray, abs as nabs
+from statsmodels.api import WLS
+# ============= local library imports  ==========================
+from pychron.core.regression.ols_regressor import PolynomialRegressor
+
+
+class IncrementalResult(object):
+    """
+        minimal stand in for statsmodels ``RegressionResults``.
+
+        provides the attributes the regressors use. the fitted data and residual based values are only
+        calculated when requested. ``data_func`` returns (exog, endog, weights)
+    """
+
+    def __init__(self, params, normalized_cov_params, nobs, data_func):
+        self.params = params
+        self.normalized_cov_params = normalized_cov_params
+        self.nobs = nobs
+        self.df_resid = self.nobs - params.shape[0]
+
+        self._data_func = data_func
+        self._data = None
+        self._resid = None
+
+    @property
+    def _exog(self):
+        return self._get_data()[0]
+
+    @property
+    def _endog(self):
+        return self._get_data()[1]
+
+    @property
+    def _weights(self):
+        return self._get_data()[2]
+
+    def _get_data(self):
+        if self._data is None:
+            self._data = self._data_func()
+        return self._data
+
+    def predict(self, exog):
+        return dot(exog, self.params)
+
+    @property
+    def fittedvalues(self):
+        return self.predict(self._exog)
+
+    @property
+    def resid(self):
+        if self._resid is None:
+            self._resid = self._endog - self.fittedvalues
+        return self._resid
+
+    @property
+    def wresid(self):
+        return self.resid * sqrt(self._weights)
+
+    @property
+    def ssr(self):
+        return (self.wresid ** 2).sum()
+
+    @property
+    def scale(self):
+        return self.ssr / self.df_resid
+
+    @property
+    def bse(self):
+        return sqrt(diag(self.normalized_cov_params) * self.scale)
+
+    @property
+    def centered_tss(self):
+        w = self._weights
+        y = self._endog
+        ybar = (w * y).sum() / w.sum()
+        return (w * (y - ybar) ** 2).sum()
+
+    @property
+    def rsquared(self):
+        return 1 - self.ssr / self.centered_tss
+
+    @property
+    def rsquared_adj(self):
+        return 1 - (self.nobs - 1) / self.df_resid * (1 - self.rsquared)
+
+
+class IncrementalPolynomialRegressor(PolynomialRegressor):
+    """
+        polynomial regressor for data that grows one point at a time, e.g. live isotope signals.
+
+        keeps running sums of X'WX and X'Wy for every point not excluded by the user or truncation. when
+        ``calculate`` is called and ``xs``/``ys`` only gained points since the last call the sums are updated
+        with the new points, O(degree**2) per point, and the coefficients are solved from them. values that need
+        the residuals, e.g. the error of the intercept, are calculated from all the points when requested.
+
+        outlier filtering is not incremental. if it is enabled each ``calculate`` runs the filter iterations over
+        all the points, O(n), then removes the outliers by subtracting their rows from the sums so filtering gives
+        the same result as ``PolynomialRegressor``. the sums are rebuilt from scratch when the point set changes
+        in any other way (points replaced, user exclusions or truncation of existing points changed, degree changed).
+
+        intended for live acquisition only. ``Isotope`` switches back to ``PolynomialRegressor`` once acquisition
+        ends.
+
+        if ``weighted`` the points are weighted by ``yserr**-2`` as in ``WeightedPolynomialRegressor``.
+        weights of points already added are assumed not to change
+    """
+    weighted = Bool(False)
+
+    nupdates = 0
+    nrefits = 0
+
+    _xtx = None
+    _xty = None
+    _scale = 1
+    _npts = 0
+    _nbase = 0
+    _sum_degree = None
+    _base_excluded = None
+    _ends = None
+
+    def reset(self):
+        self._xtx = None
+
+    def calculate(self, filtering=False):
+        if not self._update_sums():
+            self.reset()
+            super(IncrementalPolynomialRegressor, self).calculate(filtering)
+            return
+
+        if not filtering:
+            if self.filter_outliers_dict.get('filter_outliers', False):
+                self.calculate_filtered_data()
+            else:
+                self.outlier_excluded = []
+                self.dirty = True
+
+        exc = self._fit_excluded()
+        if self._nbase - len(exc) <= self.degree:
+            super(IncrementalPolynomialRegressor, self).calculate(filtering)
+            return
+
+        self._ols = None
+        self._result = self._solve(exc)
+
+    def fast_predict(self, *args, **kw):
+        self._load_engine()
+        return super(IncrementalPolynomialRegressor, self).fast_predict(*args, **kw)
+
+    def calculate_prediction_envelope(self, fx, fy):
+        result = self._result
+        self._result = self._load_engine().fit()
+        try:
+            return super(IncrementalPolynomialRegressor, self).calculate_prediction_envelope(fx, fy)
+        finally:
+            self._result = result
+
+    @property
+    def summary(self):
+        if self._result:
+            return self._load_engine().fit().summary()
+
+    # private
+    def _get_pinv_wexog(self):
+        self._load_engine()
+        return super(IncrementalPolynomialRegressor, self)._get_pinv_wexog()
+
+    def _load_engine(self):
+        """
+            build the statsmodels model for the current fit. only needed for monte carlo errors and summaries
+        """
+        if self._ols is None:
+            fy = self.clean_ys
+            self._ols = self._engine_factory(fy, self._get_X(self.clean_xs))
+            if hasattr(self, 'pinv_wexog'):
+                del self.pinv_wexog
+        return self._ols
+
+    def _engine_factory(self, fy, X, check_integrity=True):
+        if self.weighted:
+            return WLS(fy, X, weights=self._get_weights(self.clean_yserr))
+        return super(IncrementalPolynomialRegressor, self)._engine_factory(fy, X, check_integrity)
+
+    def _get_weights(self, es):
+        if self.weighted:
+            return asarray(es) ** -2
+        return ones(len(es))
+
+    def _get_scaled_X(self, xs):
+        return self._get_X(xs / self._scale)
+
+    def _base_excluded_set(self):
+        return set(self.user_excluded + self.ouser_excluded + self.truncate_excluded)
+
+    def _fit_excluded(self):
+        base = self._base_excluded
+        n = self._npts
+        return sorted({i for i in self.outlier_excluded if i < n and i not in base})
+
+    def _is_extension(self, xs, ys, m):
+        """
+            cheap test that the first ``m`` points are the points already in the sums
+        """
+        if not m:
+            return True
+
+        return self._ends == (xs[0], ys[0], xs[m - 1], ys[m - 1])
+
+    def _update_sums(self):
+        xs, ys = self.xs, self.ys
+        n = xs.shape[0]
+        if n != ys.shape[0]:
+            return
+
+        if self.weighted and self.yserr.shape[0] != n:
+            return
+
+        base = self._base_excluded_set()
+        m = self._npts
+        if self._xtx is None or m > n or self._sum_degree != self.degree or \
+                not self._is_extension(xs, ys, m) or \
+                {i for i in base if i < m} != self._base_excluded:
+            m = 0
+
+        idx = [i for i in range(m, n) if i not in base]
+        if not m:
+            p = self.degree + 1
+            self._xtx = zeros((p, p))
+            self._xty = zeros(p)
+            self._nbase = 0
+            self._sum_degree = self.degree
+            self._scale = nabs(xs).max() if n else 1
+            if not self._scale:
+                self._scale = 1
+            if n:
+                self.nrefits += 1
+
+        if idx:
+            X = self._get_scaled_X(xs[idx])
+            w = self._get_weights(self.yserr[idx] if self.weighted else idx)
+            self._xtx += dot(X.T, X * w[:, None])
+            self._xty += dot(X.T, ys[idx] * w)
+            self._nbase += len(idx)
+            if m:
+                self.nupdates += 1
+
+        self._npts = n
+        self._base_excluded = {i for i in base if i < n}
+        if n:
+            self._ends = (xs[0], ys[0], xs[n - 1], ys[n - 1])
+        return True
+
+    def _solve(self, exc):
+        xtx, xty = self._xtx, self._xty
+        if exc:
+            X = self._get_scaled_X(self.xs[exc])
+            w = self._get_weights(self.yserr[exc] if self.weighted else exc)
+            xtx = xtx - dot(X.T, X * w[:, None])
+            xty = xty - dot(X.T, self.ys[exc] * w)
+
+        cov = linalg.pinv(xtx)
+        d = self._scale ** -arange(xtx.shape[0], dtype=float)
+
+        params = dot(cov, xty) * d
+        cov = cov * outer(d, d)
+
+        def data_func():
+            cxs = self.clean_xs
+            ws = self._get_weights(self.clean_yserr if self.weighted else cxs)
+            return self._get_X(cxs), self.clean_ys, ws
+
+        return IncrementalResult(params, cov, self._nbase - len(exc), data_func)
+
+# ============= EOF =============================================
@@ -17,7 +17,7 @@
 # ============= enthought library imports =======================
 # ============= standard library imports ========================
 
-from numpy import average, where, full
+from numpy import average, where, full, repeat, newaxis
 
 from pychron.core.helpers.formatting import floatfmt
 from pychron.pychron_constants import SEM, MSEM
@@ -34,6 +34,11 @@ class MeanRegressor(BaseRegressor):
     def fast_predict2(self, endog, exog):
         return full(exog.shape[0], endog.mean())
 
+    def get_prediction_matrix(self, exog, n=None):
+        if n is None:
+            n = self.clean_ys.shape[0]
+        return full((n, exog.shape[0]), 1 / n)
+
     def calculate(self, filtering=False, **kw):
         # cxs, cys = self.pre_clean_ys, self.pre_clean_ys
         if not filtering:
@@ -161,6 +166,11 @@ class WeightedMeanRegressor(MeanRegressor):
         mean = average(endog, weights=ws)
         return full(exog.shape[0], mean)
 
+    def get_prediction_matrix(self, exog, n=None):
+        ws = self._get_weights()
+        ws = ws / ws.sum()
+        return repeat(ws[:, newaxis], exog.shape[0], axis=1)
+
     @property
     def se(self):
         """
@@ -14,10 +14,13 @@
 # limitations under the License.
 # ===============================================================================
 # ============= enthought library imports =======================
-from numpy import linspace, Inf, zeros_like
+from numpy import linspace, zeros_like, asarray, atleast_2d, ones_like, where, zeros, full, inf, errstate, \
+    abs as nabs, array, vstack
 from scipy.optimize import fsolve
 from traits.api import Array, Property, Float
 # ============= standard library imports ========================
+import logging
+
 # ============= local library imports  ==========================
 from uncertainties import std_dev, ufloat
 
@@ -26,6 +29,8 @@ from pychron.core.stats import calculate_mswd2
 from pychron.core.stats.core import validate_mswd
 from pychron.pychron_constants import MSE, SE
 
+logger = logging.getLogger('NewYorkRegressor')
+
 
 def kron(i, j):
     """"
@@ -38,6 +43,233 @@ def kron(i, j):
     return int(i == j)
 
 
+class YorkFit(object):
+    """
+        result of ``york_fit``. one value per group
+
+        niterations: number of iterations used
+        delta: change in slope in the last iteration
+        converged: delta < tol
+    """
+
+    def __init__(self, slope, intercept, niterations, delta, converged):
+        self.slope = slope
+        self.intercept = intercept
+        self.niterations = niterations
+        self.delta = delta
+        self.converged = converged
+
+
+class YorkData(object):
+    """
+        stacked (K, N) arrays for K groups of up to N points. shorter groups are padded and ``mask`` is False
+        for the padding. the padding has zero weight
+    """
+
+    def __init__(self, xs, ys, sig_xs, sig_ys, rs=None, mask=None):
+        xs = atleast_2d(asarray(xs, dtype=float))
+        if mask is None:
+            mask = ones_like(xs, dtype=bool)
+        else:
+            mask = atleast_2d(asarray(mask, dtype=bool))
+
+        if rs is None:
+            rs = zeros_like(xs)
+
+        def clean(v, fill):
+            return where(mask, atleast_2d(asarray(v, dtype=float)), fill)
+
+        self.mask = mask
+        self.xs = clean(xs, 0)
+        self.ys = clean(ys, 0)
+        self.sig_xs = sx = clean(sig_xs, 1)
+        self.sig_ys = sy = clean(sig_ys, 1)
+        self.rs = clean(rs, 0)
+
+        self.var_x = sx ** 2
+        self.var_y = sy ** 2
+        self.sxy = self.rs * sx * sy
+
+    @property
+    def n(self):
+        return self.mask.sum(axis=1)
+
+    def weights(self, b):
+        """
+            York weights for slopes ``b``, one per group
+        """
+        b = asarray(b, dtype=float).reshape(-1, 1)
+        with errstate(divide='ignore', invalid='ignore'):
+            W = (self.var_y + b ** 2 * self.var_x - 2 * b * self.sxy) ** -1
+        return where(self.mask, W, 0)
+
+    def xy_bar(self, W):
+        sW = W.sum(axis=1)
+        with errstate(divide='ignore', invalid='ignore'):
+            x_bar = (W * self.xs).sum(axis=1) / sW
+            y_bar = (W * self.ys).sum(axis=1) / sW
+        return x_bar, y_bar
+
+    def uv(self, W):
+        x_bar, y_bar = self.xy_bar(W)
+        U = where(self.mask, self.xs - x_bar[:, None], 0)
+        V = where(self.mask, self.ys - y_bar[:, None], 0)
+        return U, V
+
+
+def york_fit(data, tol=1e-10, total=1000, b=None):
+    """
+        solve for the York (1969)/Mahon (1996) slopes and intercepts of all the groups in ``data``, a ``YorkData``,
+        at once.
+
+        starting at ``b`` (default 0) the slope is iterated until it changes by less than ``tol`` or ``total``
+        iterations are exceeded. a group stops updating once it has converged so the result for each group is the
+        same as fitting it alone
+
+        returns a ``YorkFit``
+    """
+    k = data.xs.shape[0]
+    var_x, var_y, sxy = data.var_x, data.var_y, data.sxy
+
+    b = zeros(k) if b is None else array(b, dtype=float).reshape(k)
+    pb = full(k, inf)
+    cnt = zeros(k, dtype=int)
+    while 1:
+        with errstate(invalid='ignore'):
+            active = ~(nabs(pb - b) < tol) & (cnt <= total)
+        if not active.any():
+            break
+
+        bb = b[:, None]
+        W = data.weights(b)
+        U, V = data.uv(W)
+
+        sumA = (W ** 2 * V * (U * var_y + bb * V * var_x - V * sxy)).sum(axis=1)
+        sumB = (W ** 2 * U * (U * var_y + bb * V * var_x - bb * U * sxy)).sum(axis=1)
+        with errstate(divide='ignore', invalid='ignore'):
+            nb = sumA / sumB
+
+        pb = where(active, b, pb)
+        b = where(active, nb, b)
+        cnt += active
+
+    x_bar, y_bar = data.xy_bar(data.weights(b))
+    with errstate(invalid='ignore'):
+        delta = nabs(pb - b)
+    return YorkFit(b, y_bar - b * x_bar, cnt, delta, delta < tol)
+
+
+def york_variances(data, b):
+    """
+        York (1969) slope and intercept variances for slopes ``b``
+    """
+    W = data.weights(b)
+    U, _ = data.uv(W)
+    with errstate(divide='ignore', invalid='ignore'):
+        var_b = 1 / (W * U ** 2).sum(axis=1)
+        var_a = var_b * (W * data.xs ** 2).sum(axis=1) / W.sum(axis=1)
+    return var_b, var_a
+
+
+def mahon_variances(data, b):
+    """
+        Mahon (1996) slope and intercept variances for slopes ``b``.
+
+        adapted from https://github.com/LLNL/MahonFitting/blob/master/mahon.py
+        Trappitsch et al. (2018). the sums over j of kron(i,j) terms are expanded so the
+        derivatives of all points are calculated together
+    """
+    b = asarray(b, dtype=float).reshape(-1, 1)
+    W = data.weights(b)
+    U, V = data.uv(W)
+    var_x, var_y, sxy = data.var_x, data.var_y, data.sxy
+
+    aa = 2 * b * (U * V * var_x - U ** 2 * sxy)
+    bb = U ** 2 * var_y - V ** 2 * var_x
+    cc = W ** 3 * (sxy - b * var_x)
+
+    da = b ** 2 * (U * V * var_x - U ** 2 * sxy)
+    db = b * (U ** 2 * var_y - V ** 2 * var_x)
+    dc = U * V * var_y - V ** 2 * sxy
+    dd = da + db - dc
+
+    # eq 19
+    dthdb = (W ** 2 * (aa + bb)).sum(axis=1) + 4 * (cc * dd).sum(axis=1)
+
+    xbar, _ = data.xy_bar(W)
+    wksum = W.sum(axis=1)
+
+    x = (b ** 2 * (V * var_x - 2 * U * sxy) + 2 * b * U * var_y - V * var_y)
+    xx = (b ** 2 * U * var_x + 2 * V * sxy - 2 * b * V * var_x - U * var_y)
+
+    with errstate(divide='ignore', invalid='ignore'):
+        # sum_j W_j**2 * (kron(i, j) - W_i / sum(W)) * x_j
+        ww = W / wksum[:, None]
+        w2 = W ** 2
+        dthdx = w2 * x - ww * (w2 * x).sum(axis=1)[:, None]
+        # correct equation! not equal to equation 21 in Mahon (1996)
+        dthdy = w2 * xx - ww * (w2 * xx).sum(axis=1)[:, None]
+
+        r = (xbar / dthdb)[:, None]
+        dadx = -b * ww - r * dthdx
+        dady = ww - r * dthdy
+
+        sigbsq = (dthdx ** 2 * var_x + dthdy ** 2 * var_y + 2 * sxy * dthdx * dthdy)
+        sigasq = (dadx ** 2 * var_x + dady ** 2 * var_y + 2 * sxy * dadx * dady)
+
+        sigbsq = where(data.mask, sigbsq, 0).sum(axis=1) / dthdb ** 2
+        sigasq = where(data.mask, sigasq, 0).sum(axis=1)
+    return sigbsq, sigasq
+
+
+def york_mswd(data, a, b):
+    """
+        MSWD of each group about the line ``a + b*x``. see ``calculate_mswd2``
+    """
+    b = asarray(b, dtype=float).reshape(-1, 1)
+    a = asarray(a, dtype=float).reshape(-1, 1)
+    W = data.weights(b)
+    with errstate(divide='ignore', invalid='ignore'):
+        return (W * (data.ys - a - b * data.xs) ** 2).sum(axis=1) / (data.n - 2)
+
+
+def solve_york_regressors(regressors, **kw):
+    """
+        solve the slopes and intercepts of many ``YorkRegressor``s together, e.g. one isochron per group.
+
+        each regressor's clean data is stacked into one ``YorkData``. the regressors keep the solution so
+        a subsequent ``calculate`` does not iterate again unless their data changes.
+
+        ``ReedYorkRegressor``s are calculated individually
+    """
+    regs, rows = [], []
+    for reg in regressors:
+        if isinstance(reg, ReedYorkRegressor):
+            reg.calculate()
+        else:
+            row = reg.get_york_arrays()
+            if row is not None:
+                regs.append(reg)
+                rows.append(row)
+
+    if not regs:
+        return
+
+    npts = max(len(r[0]) for r in rows)
+
+    def pad(v, fill=0):
+        return vstack([list(ri) + [fill] * (npts - len(ri)) for ri in v])
+
+    cols = list(zip(*rows))
+    mask = pad([[True] * len(x) for x in cols[0]], False)
+    data = YorkData(*[pad(c) for c in cols], mask=mask)
+    fit = york_fit(data, **kw)
+
+    for i, reg in enumerate(regs):
+        reg.set_york_solution(fit, i, rows[i])
+    return fit
+
+
 class YorkRegressor(OLSRegressor):
     """ York 1969, Mahon 1996"""
     xns = Array
@@ -65,6 +297,14 @@ class YorkRegressor(OLSRegressor):
     mswd = Property
     error_calc_type = SE
 
+    tolerance = 1e-10
+    max_iterations = 1000
+
+    # convergence diagnostics of the last solution
+    niterations = 0
+    converged = True
+    _york_key = None
+
     def calculate(self, *args, **kw):
         super(YorkRegressor, self).calculate(*args, **kw)
 
@@ -161,16 +401,9 @@ class YorkRegressor(OLSRegressor):
         return self._intercept_variance
 
     def get_slope_variance(self):
-        b = self._slope
-        W = self._calculate_W(b)
-        U, V = self._calculate_UV(W)
-
-        sigbsq = 1/sum(W*U**2)
-
-        sigasq = sigbsq*sum(W*self.clean_xs**2)/sum(W)
-
-        self._intercept_variance = sigasq
-        return sigbsq
+        sigbsq, sigasq = york_variances(self._get_york_data(), self._slope)
+        self._intercept_variance = float(sigasq[0])
+        return float(sigbsq[0])
 
     def get_slope_error(self):
         return self.get_slope_variance() ** 0.5
@@ -224,51 +457,47 @@ class YorkRegressor(OLSRegressor):
         return (var_y + b ** 2 * var_x - 2 * b * r * sig_x * sig_y) ** -1
 
     def _calculate(self):
-        b = 0
-        cnt = 0
-        b, a, cnt = self._calculate_slope_intercept(Inf, b, cnt)
-        if cnt >= 500:
-            print('regression did not converge')
-            #             self.warning('regression did not converge')
-        #         else:
-        #             self.info('regression converged after {} iterations'.format(cnt))
-
-        self._slope = b
-        self._intercept = a
-
-    def _calculate_slope_intercept(self, pb, b, cnt, total=1000, tol=1e-10):
-        """
-            recursively calculate slope
-            b=slope
-            a=intercept
-        """
-        a = 0
-        if abs(pb - b) < tol or cnt > total:
-            W = self._calculate_W(b)
-            XBar, YBar = self._calculate_xy_bar(W)
-            a = YBar - b * XBar
-            return b, a, cnt
-        else:
-            sig_x = self.clean_xserr
-            sig_y = self.clean_yserr
+        row = self.get_york_arrays()
+        if row is None:
+            return
 
-            r = self.calculate_correlation_coefficients()
+        if self._york_key is not None and self._york_key == self._make_york_key(row):
+            return
 
-            var_x = sig_x ** 2
-            var_y = sig_y ** 2
+        fit = york_fit(YorkData(*row), tol=self.tolerance, total=self.max_iterations)
+        self.set_york_solution(fit, 0, row)
 
-            W = self._calculate_W(b)
-            U, V = self._calculate_UV(W)
+    def get_york_arrays(self):
+        """
+            return the clean xs, ys, x errors, y errors and correlation coefficients
+        """
+        xs = self.clean_xs
+        if not len(xs) or not len(self.clean_xserr) or not len(self.clean_yserr):
+            return
 
-            sumA = sum(W ** 2 * V * (U * var_y + b * V * var_x - r * V * sig_x * sig_y))
-            sumB = sum(W ** 2 * U * (U * var_y + b * V * var_x - b * r * U * sig_x * sig_y))
-            try:
-                nb = sumA / sumB
-                b, a, cnt = self._calculate_slope_intercept(b, nb, cnt + 1)
-            except ZeroDivisionError:
-                pass
+        return (asarray(xs, dtype=float), asarray(self.clean_ys, dtype=float),
+                asarray(self.clean_xserr, dtype=float), asarray(self.clean_yserr, dtype=float),
+                asarray(self.calculate_correlation_coefficients(), dtype=float))
 
-        return b, a, cnt
+    def set_york_solution(self, fit, i, row):
+        """
+            use group ``i`` of the ``YorkFit`` ``fit`` as the solution for the data ``row``
+        """
+        self._slope = float(fit.slope[i])
+        self._intercept = float(fit.intercept[i])
+        self._intercept_variance = None
+        self.niterations = int(fit.niterations[i])
+        self.converged = bool(fit.converged[i])
+        self._york_key = self._make_york_key(row)
+        if not self.converged:
+            logger.warning('regression did not converge. iterations={}, delta={}'.format(self.niterations,
+                                                                                          fit.delta[i]))
+
+    def _make_york_key(self, row):
+        return tuple(v.tobytes() for v in row)
+
+    def _get_york_data(self):
+        return YorkData(*self.get_york_arrays())
 
     def predict(self, x):
         m, b = self._slope, self._intercept
@@ -286,71 +515,13 @@ class NewYorkRegressor(YorkRegressor):
         adapted from https://github.com/LLNL/MahonFitting/blob/master/mahon.py
         Trappitsch et al. (2018)
 
+        see ``mahon_variances``
+
         :return:
         """
-
-        b = self._slope
-        W = self._calculate_W(b)
-        U, V = self._calculate_UV(W)
-
-        sx = self.clean_xserr
-        sy = self.clean_yserr
-
-        var_x = sx ** 2
-        var_y = sy ** 2
-
-        r = self.calculate_correlation_coefficients()
-        sxy = r * sx * sy
-
-        aa = 2 * b * (U * V * var_x - U ** 2 * sxy)
-        bb = U ** 2 * var_y - V ** 2 * var_x
-        cc = W ** 3 * (sxy - b * var_x)
-
-        da = b ** 2 * (U * V * var_x - U ** 2 * sxy)
-        db = b * (U ** 2 * var_y - V ** 2 * var_x)
-        dc = U * V * var_y - V ** 2 * sxy
-        dd = da + db - dc
-
-        # eq 19
-        dthdb = sum(W ** 2 * (aa + bb)) + 4 * sum(cc * dd)
-
-        xbar, _ = self._calculate_xy_bar(W)
-
-        # now calculate sigasq and sigbsq
-        wksum = sum(W)
-        sigasq = 0.
-        sigbsq = 0.
-
-        x = (b ** 2 * (V * var_x - 2 * U * sxy) + 2 * b * U * var_y - V * var_y)
-        xx = (b ** 2 * U * var_x + 2 * V * sxy - 2 * b * V * var_x - U * var_y)
-        for i, wi in enumerate(W):
-            var_xi = var_x[i]
-            var_yi = var_y[i]
-            sxyi = sxy[i]
-
-            # calculate dell theta / dell xi and dell theta / dell yi
-            dthdxi = 0.
-            dthdyi = 0.
-            ww = wi / wksum
-            for j, wj in enumerate(W):
-                # add to dthdxi and dthdyi
-                a = wj ** 2. * (kron(i, j) - ww)
-                dthdxi += a * x[j]
-                # correct equation! not equal to equation 21 in Mahon (1996)
-                dthdyi += a * xx[j]
-
-            # now calculate dell a / dell xi and dell a / dell yi
-            dadxi = -b * ww - xbar * dthdxi / dthdb
-            dadyi = ww - xbar * dthdyi / dthdb
-
-            # now finally add to sigasq and sigbsq
-            sigbsq += dthdxi ** 2. * var_xi + dthdyi ** 2. * var_yi + 2 * sxyi * dthdxi * dthdyi
-            sigasq += dadxi ** 2. * var_xi + dadyi ** 2. * var_yi + 2 * sxyi * dadxi * dadyi
-
-        # now divide sigbsq
-        sigbsq /= dthdb ** 2.
-        self._intercept_variance = sigasq
-        return sigbsq
+        sigbsq, sigasq = mahon_variances(self._get_york_data(), self._slope)
+        self._intercept_variance = float(sigasq[0])
+        return float(sigbsq[0])
 
         # # this seems to be the issue. application of the kronecker delta not correct
         #
@@ -16,7 +16,7 @@
 # ============= enthought library imports =======================
 import logging
 
-from numpy import asarray, column_stack, sqrt, dot, linalg, zeros_like, hstack, ones_like, array
+from numpy import asarray, column_stack, sqrt, dot, linalg, zeros_like, hstack, ones_like, array, identity
 from statsmodels.api import OLS
 from traits.api import Int, Property
 
@@ -73,12 +73,24 @@ class OLSRegressor(BaseRegressor):
 
         currently useful for monte_carlo_estimation
         """
-        if not hasattr(self, 'pinv_wexog'):
-            self.pinv_wexog = linalg.pinv(self._ols.wexog)
-        beta = dot(self.pinv_wexog, endog)
+        beta = dot(self._get_pinv_wexog(), endog)
 
         return dot(exog, beta)
 
+    def get_prediction_matrix(self, exog, n=None):
+        """
+        return M such that endog.dot(M) == fast_predict2(endog, exog).
+
+        a stack of endogs, one per row, can then be predicted with a single matrix product.
+        used for monte_carlo_estimation
+        """
+        return dot(exog, self._get_pinv_wexog()).T
+
+    def _get_pinv_wexog(self):
+        if not hasattr(self, 'pinv_wexog'):
+            self.pinv_wexog = linalg.pinv(self._ols.wexog)
+        return self.pinv_wexog
+
     def calculate(self, filtering=False):
         cxs = self.clean_xs
         cys = self.clean_ys
@@ -374,6 +386,12 @@ class MultipleLinearRegressor(OLSRegressor):
         # use fast_predict instead
         return self.fast_predict(endog, pexog, **kw)
 
+    def get_prediction_matrix(self, exog, n=None):
+        # same linear map as fast_predict. endog is whitened before solving
+        ols = self._ols
+        pinv = linalg.pinv(ols.wexog)
+        return dot(dot(exog, pinv), ols.whiten(identity(pinv.shape[1]))).T
+
     def _get_X(self, xs=None):
         if xs is None:
             xs = self.clean_xs
@@ -19,13 +19,16 @@
 # ============= standard library imports ========================
 from unittest import TestCase
 
-from numpy import linspace, polyval
+from numpy import linspace, polyval, random
 
 # ============= local library imports  ==========================
+from pychron.core.regression.incremental_regressor import IncrementalPolynomialRegressor
 from pychron.core.regression.least_squares_regressor import ExponentialRegressor
 from pychron.core.regression.mean_regressor import MeanRegressor  # , WeightedMeanRegressor
-from pychron.core.regression.new_york_regressor import ReedYorkRegressor, NewYorkRegressor
-from pychron.core.regression.ols_regressor import OLSRegressor
+from pychron.core.regression.new_york_regressor import ReedYorkRegressor, NewYorkRegressor, YorkRegressor, \
+    YorkData, york_fit, mahon_variances, solve_york_regressors
+from pychron.core.regression.ols_regressor import OLSRegressor, PolynomialRegressor
+from pychron.core.regression.wls_regressor import WeightedPolynomialRegressor
 # from pychron.core.regression.york_regressor import YorkRegressor
 from pychron.core.regression.tests.standard_data import mean_data, filter_data, ols_data, pearson, pre_truncated_data, \
     expo_data, expo_data_linear
@@ -145,6 +148,79 @@ class FilterOLSRegressionTest(RegressionTestCase, TestCase):
         self.assertAlmostEqual(e, self.solution['pred_error'], 3)
 
 
+class IncrementalOLSRegressionTest(OLSRegressionTest):
+    reg_klass = IncrementalPolynomialRegressor
+
+
+class IncrementalFilterOLSRegressionTest(FilterOLSRegressionTest):
+    reg_klass = IncrementalPolynomialRegressor
+
+
+class IncrementalRegressionTest(TestCase):
+    def setUp(self):
+        rs = random.RandomState(12345)
+        n = 150
+        self.xs = xs = linspace(5, 300, n)
+        self.ys = ys = 10 - 0.01 * xs + 2e-5 * xs ** 2 + rs.normal(0, 0.01, n)
+        ys[40] += 1
+        ys[100] -= 0.5
+        self.yserr = rs.uniform(0.005, 0.02, n)
+
+    def _grow(self, reg, ref, weighted=False, **kw):
+        for n in range(10, len(self.xs), 7):
+            for r in (reg, ref):
+                r.trait_set(xs=self.xs[:n], ys=self.ys[:n], error_calc_type='SEM', **kw)
+                if weighted:
+                    r.yserr = self.yserr[:n]
+                r.calculate()
+
+            for a, b in zip(reg.coefficients, ref.coefficients):
+                self.assertAlmostEqual(a, b, 10)
+            self.assertAlmostEqual(reg.predict_error(0), ref.predict_error(0), 10)
+            self.assertEqual(sorted(reg.outlier_excluded), sorted(ref.outlier_excluded))
+
+    def _make(self, klass, fit):
+        reg = klass()
+        reg.set_degree(fit, refresh=False)
+        return reg
+
+    def test_linear(self):
+        reg = self._make(IncrementalPolynomialRegressor, 'linear')
+        self._grow(reg, self._make(PolynomialRegressor, 'linear'))
+        self.assertEqual(reg.nrefits, 1)
+
+    def test_parabolic(self):
+        reg = self._make(IncrementalPolynomialRegressor, 'parabolic')
+        ref = self._make(PolynomialRegressor, 'parabolic')
+        self._grow(reg, ref)
+        self.assertAlmostEqual(reg.rsquared, ref.rsquared, 10)
+
+    def test_filter_outliers(self):
+        fod = {'filter_outliers': True, 'iterations': 2, 'std_devs': 2}
+        reg = self._make(IncrementalPolynomialRegressor, 'parabolic')
+        self._grow(reg, self._make(PolynomialRegressor, 'parabolic'), filter_outliers_dict=fod)
+        self.assertEqual(reg.nrefits, 1)
+        self.assertIn(40, reg.outlier_excluded)
+
+    def test_weighted(self):
+        reg = self._make(IncrementalPolynomialRegressor, 'linear')
+        reg.weighted = True
+        self._grow(reg, self._make(WeightedPolynomialRegressor, 'linear'), weighted=True)
+
+    def test_user_excluded_refit(self):
+        reg = self._make(IncrementalPolynomialRegressor, 'linear')
+        reg.trait_set(xs=self.xs[:50], ys=self.ys[:50])
+        reg.calculate()
+        reg.user_excluded = [3]
+        reg.calculate()
+        self.assertEqual(reg.nrefits, 2)
+
+        ref = self._make(PolynomialRegressor, 'linear')
+        ref.trait_set(xs=self.xs[:50], ys=self.ys[:50], user_excluded=[3])
+        ref.calculate()
+        self.assertAlmostEqual(reg.predict(0), ref.predict(0), 10)
+
+
 class PearsonRegressionTest(RegressionTestCase):
     kind = ''
 
@@ -196,6 +272,97 @@ class NewYorkRegressionTest(PearsonRegressionTest, TestCase):
     #     self.assertEqual(self.reg.get_slope_variance_llnl(), self.reg.get_slope_variance_pychron())
 
 
+class YorkBatchTest(TestCase):
+    def setUp(self):
+        rs = random.RandomState(7)
+        self.groups = groups = []
+        for n in (5, 12, 8, 20):
+            x = rs.uniform(0.01, 0.2, n)
+            y = 0.0034 - 0.0034 / 0.15 * x + rs.normal(0, 2e-5, n)
+            groups.append((x, y, x * rs.uniform(0.002, 0.02, n), rs.uniform(1e-6, 2e-5, n),
+                           rs.uniform(0, 0.5, n)))
+
+    def _make(self, klass, g, corr=True):
+        x, y, ex, ey, r = g
+        reg = klass(xs=x, ys=y, xserr=ex, yserr=ey, error_calc_type='SE')
+        if corr:
+            reg.calculate_correlation_coefficients = lambda *args, **kw: r
+        return reg
+
+    def _legacy_mahon_variance(self, data, b):
+        # point by point sums as in the original implementation
+        W = data.weights(b)[0]
+        U, V = data.uv(data.weights(b))
+        U, V = U[0], V[0]
+        var_x, var_y, sxy = data.var_x[0], data.var_y[0], data.sxy[0]
+        aa = 2 * b * (U * V * var_x - U ** 2 * sxy)
+        bb = U ** 2 * var_y - V ** 2 * var_x
+        cc = W ** 3 * (sxy - b * var_x)
+        dd = b ** 2 * (U * V * var_x - U ** 2 * sxy) + b * (U ** 2 * var_y - V ** 2 * var_x) - \
+            (U * V * var_y - V ** 2 * sxy)
+        dthdb = sum(W ** 2 * (aa + bb)) + 4 * sum(cc * dd)
+        xbar = data.xy_bar(data.weights(b))[0][0]
+        wksum = sum(W)
+        x = (b ** 2 * (V * var_x - 2 * U * sxy) + 2 * b * U * var_y - V * var_y)
+        xx = (b ** 2 * U * var_x + 2 * V * sxy - 2 * b * V * var_x - U * var_y)
+        sigasq = sigbsq = 0
+        for i, wi in enumerate(W):
+            dthdxi = dthdyi = 0
+            ww = wi / wksum
+            for j, wj in enumerate(W):
+                a = wj ** 2 * (int(i == j) - ww)
+                dthdxi += a * x[j]
+                dthdyi += a * xx[j]
+            dadxi = -b * ww - xbar * dthdxi / dthdb
+            dadyi = ww - xbar * dthdyi / dthdb
+            sigbsq += dthdxi ** 2 * var_x[i] + dthdyi ** 2 * var_y[i] + 2 * sxy[i] * dthdxi * dthdyi
+            sigasq += dadxi ** 2 * var_x[i] + dadyi ** 2 * var_y[i] + 2 * sxy[i] * dadxi * dadyi
+        return sigbsq / dthdb ** 2, sigasq
+
+    def test_mahon_variance(self):
+        for g in self.groups:
+            data = YorkData(*g)
+            b = york_fit(data).slope
+            vb, va = mahon_variances(data, b)
+            eb, ea = self._legacy_mahon_variance(data, b[0])
+            self.assertAlmostEqual(vb[0] / eb, 1, 10)
+            self.assertAlmostEqual(va[0] / ea, 1, 10)
+
+    def test_batch_matches_single(self):
+        regs = [self._make(NewYorkRegressor, g) for g in self.groups]
+        fit = solve_york_regressors(regs)
+        self.assertTrue(fit.converged.all())
+
+        for reg, g in zip(regs, self.groups):
+            ref = self._make(NewYorkRegressor, g)
+            ref.calculate()
+            self.assertAlmostEqual(reg.slope / ref.slope, 1, 10)
+            self.assertAlmostEqual(reg.intercept / ref.intercept, 1, 10)
+            self.assertAlmostEqual(reg.get_slope_error() / ref.get_slope_error(), 1, 10)
+            self.assertAlmostEqual(reg.get_intercept_error() / ref.get_intercept_error(), 1, 10)
+            self.assertAlmostEqual(reg.mswd / ref.mswd, 1, 10)
+
+    def test_solution_cached(self):
+        reg = self._make(YorkRegressor, self.groups[1], corr=False)
+        reg.calculate()
+        n = reg.niterations
+        self.assertTrue(reg.converged)
+        self.assertGreater(n, 1)
+
+        reg.niterations = 0
+        reg.calculate()
+        self.assertEqual(reg.niterations, 0)
+
+        reg.user_excluded = [0]
+        reg.calculate()
+        self.assertGreater(reg.niterations, 0)
+
+    def test_not_converged(self):
+        fit = york_fit(YorkData(*self.groups[0]), total=1)
+        self.assertFalse(fit.converged[0])
+        self.assertEqual(fit.niterations[0], 2)
+
+
 class ExpoRegressionTest(TestCase):
     def setUp(self):
         xs, ys, sol = expo_data()
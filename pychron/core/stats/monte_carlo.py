@@ -16,38 +16,72 @@
 
 # ============= enthought library imports =======================
 # ============= standard library imports ========================
+from concurrent.futures import ProcessPoolExecutor
 
-from numpy import zeros, percentile, array, random, abs as nabs, column_stack
-from scipy.stats import norm
+from numpy import percentile, array, abs as nabs, column_stack, vstack
+from numpy.random import default_rng
 
 
 # ============= local library imports  ==========================
 
+def _regression_trials(args):
+    """
+    run ``ntrials`` perturbed regressions. module level so it can be used by a process pool.
+
+    every trial is predicted with one matrix product. ``m`` maps an endog vector to its predictions
+    see ``OLSRegressor.get_prediction_matrix``
+    """
+    ys, yserr, m, seed, ntrials = args
+    rng = default_rng(seed)
+    ga = rng.standard_normal((ntrials, ys.shape[0]))
+    yp = ys + yserr * ga
+    return yp.dot(m)
+
+
 class MonteCarloEstimator(object):
+    """
+    seed: int, ``numpy.random.SeedSequence`` or ``numpy.random.Generator``. each call is reseeded so results are
+    reproducible for a given int seed and chunk_size
+
+    chunk_size: number of trials evaluated at once. bounds the memory used for the random deviates. default all trials
+
+    processes: if > 1 chunks are evaluated in a process pool
+    """
 
-    def __init__(self, ntrials, regressor, seed=None):
+    def __init__(self, ntrials, regressor, seed=None, chunk_size=None, processes=None):
         self.regressor = regressor
         self.ntrials = ntrials
         self.seed = seed
+        self.chunk_size = chunk_size
+        self.processes = processes
 
     def _calculate(self, nominal_ys, ps):
         res = nominal_ys - ps
         pct = (15.87, 84.13)
 
-        a, b = array([percentile(ri, pct) for ri in res.T]).T
+        a, b = percentile(res, pct, axis=0)
         a, b = nabs(a), nabs(b)
         return (a + b) * 0.5
 
-    def _get_dist(self, n, npts):
-        if self.seed:
-            random.seed(self.seed)
-
-        ndist = norm()
+    def _chunks(self):
+        """
+        split the trials into chunks. each chunk gets its own seed drawn from a generator seeded with ``self.seed``
+        """
         ntrials = self.ntrials
-
-        ga = ndist.rvs((ntrials, n))
-        ps = zeros((ntrials, npts))
-        return ndist, ga, ps
+        chunk_size = self.chunk_size or ntrials
+        nchunks = max(1, -(-ntrials // chunk_size))
+
+        rng = default_rng(self.seed)
+        seeds = rng.integers(0, 2 ** 63, size=nchunks)
+        return [(seed, min(chunk_size, ntrials - i * chunk_size)) for i, seed in enumerate(seeds)]
+
+    def _map(self, func, args):
+        processes = self.processes
+        if processes and processes > 1 and len(args) > 1:
+            with ProcessPoolExecutor(max_workers=processes) as executor:
+                return list(executor.map(func, args))
+        else:
+            return [func(a) for a in args]
 
     def _estimate(self, pts, pexog, ys=None, yserr=None):
         reg = self.regressor
@@ -58,22 +92,22 @@ class MonteCarloEstimator(object):
         if yserr is None:
             yserr = reg.yserr
 
-        n, npts = len(ys), len(pts)
-
-        ntrials = self.ntrials
-        ndist, ga, ps = self._get_dist(n, npts)
-        pred = reg.fast_predict2
-        yp = ys + yserr * ga
-
-        if hasattr(pexog, '__call__'):
-            for i in range(ntrials):
-                ps[i] = pred(yp[i], pexog(i))
+        ys = array(ys)
+        if hasattr(reg, 'get_prediction_matrix'):
+            m = reg.get_prediction_matrix(pexog, ys.shape[0])
+            args = [(ys, yserr, m, seed, n) for seed, n in self._chunks()]
+            ps = vstack(self._map(_regression_trials, args))
         else:
-            for i in range(ntrials):
-                ps[i] = pred(yp[i], pexog)
+            ps = vstack([self._predict_trials(ys, yserr, pexog, seed, n) for seed, n in self._chunks()])
 
         return nominal_ys, self._calculate(nominal_ys, ps)
 
+    def _predict_trials(self, ys, yserr, pexog, seed, ntrials):
+        pred = self.regressor.fast_predict2
+        rng = default_rng(seed)
+        yp = ys + yserr * rng.standard_normal((ntrials, ys.shape[0]))
+        return array([pred(yi, pexog) for yi in yp])
+
 
 class RegressionEstimator(MonteCarloEstimator):
     def estimate(self, pts):
@@ -85,24 +119,32 @@ class RegressionEstimator(MonteCarloEstimator):
 
 class FluxEstimator(MonteCarloEstimator):
     def estimate_position_err(self, pts, error):
-        reg = self.regressor
-        ox, oy = pts.T
+        """
+        estimate the error in the predicted values due to the uncertainty in the position of each point.
 
-        n, npts = len(reg.ys), len(pts)
+        the exog for every trial is built in one call and predicted in one call
+        """
+        reg = self.regressor
+        nominal_ys = reg.predict(pts)
 
-        ntrials = self.ntrials
-        ndist, ga, ps = self._get_dist(n, npts)
+        pts = array(pts)
+        npts = pts.shape[0]
+        ox, oy = pts.T
 
-        pgax = ndist.rvs((ntrials, npts))
-        pgay = ndist.rvs((ntrials, npts))
+        ps = []
+        for seed, ntrials in self._chunks():
+            rng = default_rng(seed)
+            pgax = rng.standard_normal((ntrials, npts)) * error
+            pgay = rng.standard_normal((ntrials, npts)) * error
 
-        pgax *= error
-        pgay *= error
+            ppts = column_stack(((ox + pgax).ravel(), (oy + pgay).ravel()))
+            pexog = reg.get_exog(ppts)
 
-        def get_pexog(i):
-            return reg.get_exog(column_stack((ox + pgax[i], oy + pgay[i])))
+            # the endog is the same for every trial so all positions are predicted together
+            pred = reg.fast_predict2(reg.ys, pexog)
+            ps.append(pred.reshape(ntrials, npts))
 
-        return self._estimate(pts, get_pexog, yserr=0)
+        return nominal_ys, self._calculate(nominal_ys, vstack(ps))
 
     def estimate(self, pts):
 
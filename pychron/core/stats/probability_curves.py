@@ -17,40 +17,158 @@
 # ============= enthought library imports =======================
 
 # ============= standard library imports ========================
-from numpy import linspace, zeros, exp, pi, full
+from collections import OrderedDict
+from threading import Lock
 
+from numpy import linspace, zeros, exp, pi, asarray, ceil, floor, clip, repeat, arange, cumsum, bincount, \
+    searchsorted, abs as nabs
+from scipy.stats import gaussian_kde
 
 # ============= local library imports  ==========================
 
-def cumulative_probability(ages, errors, xmi, xma, n=100):
-    x = linspace(xmi, xma, n)
+# gaussians are truncated at CUTOFF sigma. exp(-CUTOFF**2/2) ~ 2e-22
+CUTOFF = 10
+# number of (age, x) pairs evaluated at once
+CHUNK_SIZE = 2 ** 20
+# adaptive resolution. sample the narrowest peak at least this many times per sigma
+SAMPLES_PER_SIGMA = 4
+MAX_N = 5000
+
+CACHE_SIZE = 32
+_cache = OrderedDict()
+_cache_lock = Lock()
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+def _cached(key, func):
+    with _cache_lock:
+        try:
+            x, y = _cache[key]
+            _cache.move_to_end(key)
+            return x.copy(), y.copy()
+        except KeyError:
+            pass
+
+    x, y = func()
+    with _cache_lock:
+        _cache[key] = (x.copy(), y.copy())
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+    return x, y
+
+
+def _make_key(kind, ages, errors, *args):
+    return kind, ages.tobytes(), errors.tobytes(), args
+
+
+def adaptive_resolution(ages, errors, xmi, xma, n=100, max_n=MAX_N):
+    """
+        return the number of points needed to resolve the narrowest peak within xmi, xma.
+        never less than n or more than max_n
+    """
+    w = xma - xmi
+    if not len(ages) or w <= 0:
+        return n
+
+    inside = (ages + CUTOFF * errors > xmi) & (ages - CUTOFF * errors < xma)
+    if not inside.any():
+        return n
+
+    need = int(ceil(SAMPLES_PER_SIGMA * w / errors[inside].min())) + 1
+    return int(min(max(n, need), max_n))
+
+
+def _sum_gaussians(x, ages, errors):
+    """
+        sum of normal pdfs evaluated at evenly spaced x.
+
+        only the points within CUTOFF sigma of each age are evaluated, in chunks of at most CHUNK_SIZE (age, x) pairs,
+        and accumulated with bincount
+    """
+    n = x.shape[0]
     probs = zeros(n)
+    if not len(ages):
+        return probs
+
+    dx = (x[-1] - x[0]) / (n - 1) if n > 1 else 0
+    if dx <= 0:
+        for s in range(0, len(ages), max(1, CHUNK_SIZE // n)):
+            a, e = ages[s:s + CHUNK_SIZE // n, None], errors[s:s + CHUNK_SIZE // n, None]
+            es2 = 2 * e * e
+            probs += ((es2 * pi) ** -0.5 * exp(-(x - a) ** 2 / es2)).sum(axis=0)
+        return probs
+
+    x0 = x[0]
+    lo = clip(ceil((ages - CUTOFF * errors - x0) / dx), 0, n).astype(int)
+    hi = clip(floor((ages + CUTOFF * errors - x0) / dx) + 1, 0, n).astype(int)
+    counts = hi - lo
+
+    keep = counts > 0
+    ages, errors, lo, counts = ages[keep], errors[keep], lo[keep], counts[keep]
+    if not len(ages):
+        return probs
+
+    ends = cumsum(counts)
+    start = 0
+    while start < len(ages):
+        base = ends[start] - counts[start]
+        # at least one age per chunk
+        stop = max(start + 1, searchsorted(ends, base + CHUNK_SIZE, side='right'))
+
+        c = counts[start:stop]
+        m = c.sum()
+        owner = repeat(arange(stop - start), c)
+        offsets = arange(m) - repeat(cumsum(c) - c, c)
+        idx = lo[start:stop][owner] + offsets
 
-    for ai, ei in zip(ages, errors):
-        if abs(ai) < 1e-10 or abs(ei) < 1e-10:
-            continue
+        a, e = ages[start:stop][owner], errors[start:stop][owner]
+        es2 = 2 * e * e
+        gs = (es2 * pi) ** -0.5 * exp(-(x[idx] - a) ** 2 / es2)
+        probs += bincount(idx, weights=gs, minlength=n)
+        start = stop
 
-        # calculate probability curve for ai+/-ei
-        # p=1/(2*pi*sigma2) *exp (-(x-u)**2)/(2*sigma2)
-        # see http://en.wikipedia.org/wiki/Normal_distribution
-        ds = (x-full(n, ai)) ** 2
-        es2 = full(n, 2 * ei * ei)
-        gs = (es2 * pi) ** -0.5 * exp(-ds / es2)
+    return probs
 
-        # cumulate probabilities
-        # numpy element_wise addition
-        probs += gs
 
-    return x, probs
+def cumulative_probability(ages, errors, xmi, xma, n=100, adaptive=False, max_n=MAX_N):
+    """
+        sum of the normal distributions of ages±errors evaluated at n points between xmi and xma.
+
+        ages/errors that are ~0 are ignored.
+        if adaptive, n is increased (up to max_n) so the narrowest peak in the window is resolved.
+
+        results are cached by ages, errors and bounds so redrawing an unchanged ideogram is free
+    """
+    ages = asarray(ages, dtype=float)
+    errors = asarray(errors, dtype=float)
+
+    def func():
+        valid = (nabs(ages) >= 1e-10) & (nabs(errors) >= 1e-10)
+        a, e = ages[valid], nabs(errors[valid])
+
+        nn = n
+        if adaptive:
+            nn = adaptive_resolution(a, e, xmi, xma, n, max_n)
+
+        x = linspace(xmi, xma, nn)
+        return x, _sum_gaussians(x, a, e)
+
+    return _cached(_make_key('cumulative', ages, errors, xmi, xma, n, adaptive, max_n), func)
 
 
 def kernel_density(ages, errors, xmi, xma, n=100):
-    from scipy.stats.kde import gaussian_kde
+    ages = asarray(ages, dtype=float)
+    errors = asarray(errors, dtype=float)
 
-    pdf = gaussian_kde(ages)
-    x = linspace(xmi, xma, n)
-    y = pdf(x)
+    def func():
+        pdf = gaussian_kde(ages)
+        x = linspace(xmi, xma, n)
+        return x, pdf(x)
 
-    return x, y
+    return _cached(_make_key('kernel', ages, errors, xmi, xma, n), func)
 
 # ============= EOF =============================================
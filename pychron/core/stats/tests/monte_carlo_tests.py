@@ -0,0 +1,181 @@
+import unittest
+
+from numpy import linspace, array, column_stack, ones_like, allclose, meshgrid, diag, average, argsort
+from numpy.linalg import inv
+from numpy.random import default_rng
+
+from pychron.core.regression.flux_regressor import PlaneFluxRegressor, NearestNeighborFluxRegressor
+from pychron.core.regression.mean_regressor import MeanRegressor, WeightedMeanRegressor
+from pychron.core.regression.ols_regressor import OLSRegressor
+from pychron.core.stats.monte_carlo import RegressionEstimator, FluxEstimator, _regression_trials
+
+
+class MonteCarloTestCase(unittest.TestCase):
+    def setUp(self):
+        rng = default_rng(1)
+        xs = linspace(0, 100, 20)
+        ys = 10 + 0.5 * xs + rng.normal(0, 1, 20)
+
+        reg = OLSRegressor(xs=xs, ys=ys, yserr=ones_like(ys))
+        reg.set_degree(1)
+        reg.calculate()
+        self.reg = reg
+        self.pts = linspace(-10, 110, 7)
+
+    def _legacy(self, reg, pts, ys, yserr, seed, ntrials):
+        pexog = reg.get_exog(pts)
+        m = reg.get_prediction_matrix(pexog, ys.shape[0])
+        a = _regression_trials((ys, yserr, m, seed, ntrials))
+
+        rng = default_rng(seed)
+        yp = ys + yserr * rng.standard_normal((ntrials, ys.shape[0]))
+        b = array([reg.fast_predict2(yi, pexog) for yi in yp])
+        return a, b
+
+    def test_batched_matches_loop(self):
+        reg = self.reg
+        a, b = self._legacy(reg, self.pts, reg.clean_ys, reg.clean_yserr, 5, 200)
+        self.assertTrue(allclose(a, b))
+
+    def test_mean_matches_loop(self):
+        for klass in (MeanRegressor, WeightedMeanRegressor):
+            reg = klass(xs=self.reg.xs, ys=self.reg.ys, yserr=linspace(1, 2, 20))
+            reg.calculate()
+            a, b = self._legacy(reg, array(self.pts), reg.clean_ys, reg.clean_yserr, 5, 50)
+            self.assertTrue(allclose(a, b))
+
+    def test_seed(self):
+        a = RegressionEstimator(500, self.reg, seed=10).estimate(self.pts)[1]
+        b = RegressionEstimator(500, self.reg, seed=10).estimate(self.pts)[1]
+        c = RegressionEstimator(500, self.reg, seed=11).estimate(self.pts)[1]
+        self.assertListEqual(list(a), list(b))
+        self.assertNotEqual(list(a), list(c))
+
+    def test_seed_repeated_calls(self):
+        est = RegressionEstimator(500, self.reg, seed=10, chunk_size=200)
+        a = est.estimate(self.pts)[1]
+        b = est.estimate(self.pts)[1]
+        self.assertListEqual(list(a), list(b))
+
+    def test_chunked_processes(self):
+        a = RegressionEstimator(1000, self.reg, seed=3, chunk_size=300).estimate(self.pts)[1]
+        b = RegressionEstimator(1000, self.reg, seed=3, chunk_size=300, processes=2).estimate(self.pts)[1]
+        self.assertListEqual(list(a), list(b))
+
+    def test_error(self):
+        # monte carlo error should be close to the analytical error for unit y errors
+        _, es = RegressionEstimator(20000, self.reg, seed=1).estimate(self.pts)
+        X = self.reg.get_exog(self.reg.xs)
+        pX = self.reg.get_exog(self.pts)
+        ees = diag(pX.dot(inv(X.T.dot(X))).dot(pX.T)) ** 0.5
+        self.assertTrue(allclose(es, ees, rtol=0.05))
+
+
+class FluxMonteCarloTestCase(unittest.TestCase):
+    def setUp(self):
+        x, y = meshgrid(linspace(-1, 1, 4), linspace(-1, 1, 4))
+        x, y = x.ravel(), y.ravel()
+        rng = default_rng(2)
+        z = 0.01 + 0.001 * x - 0.0005 * y + rng.normal(0, 1e-5, x.shape[0])
+        xy = column_stack((x, y))
+
+        reg = PlaneFluxRegressor(xs=xy, ys=z, yserr=ones_like(z) * 1e-5)
+        reg.calculate()
+        self.reg = reg
+        self.pts = column_stack((linspace(-0.9, 0.9, 5), linspace(0.9, -0.9, 5)))
+
+    def test_prediction_matrix(self):
+        reg = self.reg
+        for weighted in (False, True):
+            reg.use_weighted_fit = weighted
+            reg.calculate()
+            pexog = reg.get_exog(self.pts)
+            m = reg.get_prediction_matrix(pexog)
+            ys = reg.ys * 1.01
+            self.assertTrue(allclose(ys.dot(m), reg.fast_predict2(ys, pexog)))
+
+    def test_position_error(self):
+        fe = FluxEstimator(500, self.reg, seed=4)
+        _, es = fe.estimate_position_err(self.pts, 0.01)
+
+        # legacy per trial loop with the same deviates
+        reg = self.reg
+        seed = default_rng(4).integers(0, 2 ** 63, size=1)[0]
+        rng = default_rng(seed)
+        pgax = rng.standard_normal((500, 5)) * 0.01
+        pgay = rng.standard_normal((500, 5)) * 0.01
+        ox, oy = self.pts.T
+        ps = array([reg.fast_predict2(reg.ys, reg.get_exog(column_stack((ox + pgax[i], oy + pgay[i]))))
+                    for i in range(500)])
+        ees = fe._calculate(reg.predict(self.pts), ps)
+        self.assertTrue(allclose(es, ees))
+
+
+class NearestNeighborFluxTestCase(unittest.TestCase):
+    def setUp(self):
+        x, y = meshgrid(linspace(-1, 1, 4), linspace(-1, 1, 4))
+        x, y = x.ravel(), y.ravel()
+        rng = default_rng(3)
+        z = 0.01 + 0.001 * x - 0.0005 * y + rng.normal(0, 1e-5, x.shape[0])
+        ze = rng.uniform(1e-6, 1e-5, x.shape[0])
+        self.reg = NearestNeighborFluxRegressor(xs=column_stack((x, y)), ys=z, yserr=ze, n=3)
+
+        gx, gy = meshgrid(linspace(-1.2, 1.2, 15), linspace(-1.2, 1.2, 15))
+        self.pts = column_stack((gx.ravel(), gy.ravel()))
+
+    def _legacy(self, reg, pts, return_error=False):
+        # point by point implementation
+        ret = []
+        for x, y in pts:
+            ds = ((reg.clean_xs - (x, y)) ** 2).sum(axis=1) ** 0.5
+            idx = argsort(ds, kind='stable')[:reg.n]
+            vs = reg.clean_ys[idx]
+            if reg.use_weighted_fit:
+                ws = reg.clean_yserr[idx] ** -2
+                v = ws.sum() if return_error else average(vs, weights=ws)
+            else:
+                v = vs.std() if return_error else vs.mean()
+            ret.append(v)
+        return array(ret)
+
+    def test_matches_legacy(self):
+        reg = self.reg
+        for weighted in (False, True):
+            reg.use_weighted_fit = weighted
+            vs, es = reg.predict_with_error(self.pts)
+            self.assertTrue(allclose(vs, self._legacy(reg, self.pts)))
+            self.assertTrue(allclose(es, self._legacy(reg, self.pts, True)))
+
+    def test_excluded(self):
+        reg = self.reg
+        reg.user_excluded = [0, 5]
+        self.assertTrue(allclose(reg.predict(self.pts), self._legacy(reg, self.pts)))
+
+    def test_cache(self):
+        reg = self.reg
+        a = reg._get_neighbors(self.pts)
+        self.assertIs(reg._get_neighbors(self.pts.copy()), a)
+
+        reg.n = 2
+        self.assertEqual(reg._get_neighbors(self.pts).shape, (self.pts.shape[0], 2))
+
+    def test_prediction_matrix(self):
+        reg = self.reg
+        reg.user_excluded = [2]
+        for weighted in (False, True):
+            reg.use_weighted_fit = weighted
+            ys = reg.ys * 1.01
+            m = reg.get_prediction_matrix(self.pts, ys.shape[0])
+            self.assertEqual(m.shape, (16, self.pts.shape[0]))
+            self.assertTrue(allclose(reg.ys.dot(m), reg.predict(self.pts)))
+            self.assertTrue(allclose(ys.dot(m), reg.fast_predict2(ys, self.pts)))
+
+    def test_monte_carlo(self):
+        reg = self.reg
+        reg.n = 1
+        _, es = FluxEstimator(5000, reg, seed=1).estimate(reg.xs[:4])
+        self.assertTrue(allclose(es, reg.yserr[:4], rtol=0.05))
+
+
+if __name__ == '__main__':
+    unittest.main()
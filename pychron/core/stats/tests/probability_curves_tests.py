@@ -0,0 +1,76 @@
+import unittest
+
+from numpy import linspace, zeros, exp, pi, random
+
+from pychron.core.stats.probability_curves import cumulative_probability, kernel_density, clear_cache, \
+    adaptive_resolution
+
+
+def reference(ages, errors, xmi, xma, n):
+    x = linspace(xmi, xma, n)
+    probs = zeros(n)
+    for ai, ei in zip(ages, errors):
+        if abs(ai) < 1e-10 or abs(ei) < 1e-10:
+            continue
+        es2 = 2 * ei * ei
+        probs += (es2 * pi) ** -0.5 * exp(-(x - ai) ** 2 / es2)
+    return x, probs
+
+
+class CumulativeProbabilityTestCase(unittest.TestCase):
+    def setUp(self):
+        clear_cache()
+        rng = random.RandomState(0)
+        self.ages = rng.uniform(10, 100, 500)
+        self.errors = self.ages * rng.uniform(0.01, 0.05, 500)
+
+    def _assert_matches(self, xmi, xma, n=100):
+        x, y = cumulative_probability(self.ages, self.errors, xmi, xma, n=n)
+        rx, ry = reference(self.ages, self.errors, xmi, xma, n)
+        self.assertEqual(len(x), n)
+        for a, b in zip(y, ry):
+            self.assertAlmostEqual(a, b, delta=1e-9 * ry.max())
+
+    def test_full_window(self):
+        self._assert_matches(0, 120)
+
+    def test_zoomed(self):
+        self._assert_matches(40, 45)
+
+    def test_small_chunks(self):
+        from pychron.core.stats import probability_curves
+        chunk = probability_curves.CHUNK_SIZE
+        probability_curves.CHUNK_SIZE = 10
+        try:
+            self._assert_matches(0, 120)
+        finally:
+            probability_curves.CHUNK_SIZE = chunk
+
+    def test_ignore_zero(self):
+        x, y = cumulative_probability([10, 0, 20], [1, 1, 0], 0, 30)
+        rx, ry = reference([10], [1], 0, 30, 100)
+        self.assertAlmostEqual(y.max(), ry.max())
+
+    def test_cache(self):
+        x, y = cumulative_probability(self.ages, self.errors, 0, 120)
+        y[:] = 0
+        x2, y2 = cumulative_probability(self.ages, self.errors, 0, 120)
+        self.assertGreater(y2.max(), 0)
+
+    def test_adaptive(self):
+        n = adaptive_resolution(self.ages, self.errors, 0, 120, n=100)
+        self.assertGreater(n, 100)
+        x, y = cumulative_probability(self.ages, self.errors, 0, 120, n=100, adaptive=True)
+        self.assertEqual(len(x), n)
+
+        # window with no ages
+        self.assertEqual(adaptive_resolution(self.ages, self.errors, 1000, 1100, n=100), 100)
+
+    def test_kernel_density(self):
+        x, y = kernel_density(self.ages, self.errors, 0, 120)
+        self.assertEqual(len(y), 100)
+        self.assertGreater(y.max(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
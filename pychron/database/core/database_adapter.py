@@ -17,7 +17,7 @@
 # =============enthought library imports=======================
 import os
 from datetime import datetime, timedelta
-from threading import Lock
+from threading import Lock, local
 
 import six
 from sqlalchemy import create_engine, distinct, MetaData
@@ -118,7 +118,17 @@ class DatabaseAdapter(Loggable):
     ``_retrieve_items``
 
     """
-    session = None
+    session = Property
+    _session = None
+    _local = None
+
+    # give each thread its own session and session count instead of sharing one session between threads
+    use_scoped_session = Bool(False)
+
+    # connection pool. ignored for sqlite
+    pool_size = Int(5)
+    max_overflow = Int(10)
+    pool_timeout = Int(30)
 
     sess_stack = 0
     reraise = False
@@ -160,9 +170,17 @@ class DatabaseAdapter(Loggable):
     _trying_to_add = False
     _test_connection_enabled = True
 
+    _engine = None
+    _sessions = None
+    _nsessions_opened = 0
+    _nsessions_closed = 0
+
     def __init__(self, *args, **kw):
         super(DatabaseAdapter, self).__init__(*args, **kw)
         self._session_lock = Lock()
+        self._stats_lock = Lock()
+        self._local = local()
+        self._sessions = set()
 
     def create_all(self, metadata):
         """
@@ -184,7 +202,8 @@ class DatabaseAdapter(Loggable):
     #             sess = self.sess
     #         return SessionCTX(sess, parent=self, commit=commit, rollback=rollback)
 
-    _session_cnt = 0
+    _session_cnt = Property
+    _session_count = 0
 
     def session_ctx(self, use_parent_session=True):
         with self._session_lock:
@@ -196,14 +215,14 @@ class DatabaseAdapter(Loggable):
                 if force:
                     self.debug('force create new session {}'.format(id(self)))
                     if self.session:
-                        self.session.close()
+                        self._close_session(self.session)
 
-                    self.session = self.session_factory()
+                    self.session = self._open_session()
                     self._session_cnt = 1
                 else:
                     if not self.session:
                         # self.debug('create new session {}'.format(id(self)))
-                        self.session = self.session_factory()
+                        self.session = self._open_session()
                     self._session_cnt += 1
             else:
                 self.warning('no session factory')
@@ -217,9 +236,32 @@ class DatabaseAdapter(Loggable):
             self._session_cnt -= 1
             if not self._session_cnt:
                 self.debug('close session {}'.format(id(self)))
-                self.session.close()
+                self._close_session(self.session)
                 self.session = None
 
+    def get_pool_stats(self):
+        """
+        return a dict of session and connection pool counters
+        """
+        with self._stats_lock:
+            d = {'scoped': self.use_scoped_session,
+                 'sessions_opened': self._nsessions_opened,
+                 'sessions_open': self._nsessions_opened - self._nsessions_closed}
+
+        engine = self._engine
+        if engine is not None:
+            pool = engine.pool
+            d['pool'] = pool.__class__.__name__
+            d['status'] = pool.status()
+            for attr in ('size', 'checkedin', 'checkedout', 'overflow'):
+                func = getattr(pool, attr, None)
+                if func is not None:
+                    d[attr] = func()
+        return d
+
+    def report_pool_stats(self):
+        self.debug('pool stats {}'.format(self.get_pool_stats()))
+
     @property
     def enabled(self):
         return self.kind in ['mysql', 'sqlite', 'postgresql', 'mssql']
@@ -230,14 +272,30 @@ class DatabaseAdapter(Loggable):
 
         return globalv.username
 
-    @on_trait_change('username,host,password,name,kind,path')
+    @on_trait_change('username,host,password,name,kind,path,use_scoped_session,pool_size,max_overflow,pool_timeout')
     def reset_connection(self):
         """
         Trip the ``connection_parameters_changed`` flag. Next ``connect`` call with use the new values
         """
         self.connection_parameters_changed = True
         self.session_factory = None
-        self.session = None
+        self._session = None
+        self._session_count = 0
+
+        # close the sessions held by every thread before dropping them and release the old engine's connections
+        if self._sessions:
+            with self._stats_lock:
+                sessions = list(self._sessions)
+            for sess in sessions:
+                try:
+                    self._close_session(sess)
+                except SQLAlchemyError as e:
+                    self.debug('failed closing session. {}'.format(e))
+
+        self._local = local()
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
 
     # @caller
     def connect(self, test=True, force=False, warn=True, version_warn=True, attribute_warn=False):
@@ -278,7 +336,12 @@ class DatabaseAdapter(Loggable):
                 url = self.url
                 if url is not None:
                     self.info('{} connecting to database {}'.format(id(self), self.public_url))
-                    engine = create_engine(url, echo=self.echo, pool_recycle=pool_recycle)
+                    kw = {}
+                    if self.kind != 'sqlite':
+                        kw = dict(pool_size=self.pool_size, max_overflow=self.max_overflow,
+                                  pool_timeout=self.pool_timeout)
+                    engine = create_engine(url, echo=self.echo, pool_recycle=pool_recycle, **kw)
+                    self._engine = engine
 
                     self.session_factory = sessionmaker(bind=engine, autoflush=self.autoflush,
                                                         expire_on_commit=False,
@@ -389,6 +452,42 @@ host= {}\nurl= {}'.format(self.name, self.username, self.host, self.public_url)
             url = '{}:{}'.format(obscure_host(self.host), self.name)
         return url
 
+    def _get_session(self):
+        if self.use_scoped_session:
+            return getattr(self._local, 'session', None)
+        return self._session
+
+    def _set_session(self, v):
+        if self.use_scoped_session:
+            self._local.session = v
+        else:
+            self._session = v
+
+    def _get__session_cnt(self):
+        if self.use_scoped_session:
+            return getattr(self._local, 'count', 0)
+        return self._session_count
+
+    def _set__session_cnt(self, v):
+        if self.use_scoped_session:
+            self._local.count = v
+        else:
+            self._session_count = v
+
+    def _open_session(self):
+        sess = self.session_factory()
+        with self._stats_lock:
+            self._sessions.add(sess)
+            self._nsessions_opened += 1
+        return sess
+
+    def _close_session(self, sess):
+        sess.close()
+        with self._stats_lock:
+            if sess in self._sessions:
+                self._sessions.remove(sess)
+                self._nsessions_closed += 1
+
     @cached_property
     def _get_datasource_url(self):
         if self.kind == 'sqlite':
@@ -0,0 +1,139 @@
+# ===============================================================================
+# Copyright 2026 ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+# ============= local library imports  ==========================
+from pychron.core.helpers.datetime_tools import make_timef
+from pychron.core.utils import alphas
+from pychron.experiment.utilities.runid import make_runid
+
+# columns copied from the database. in this order in the rows passed to AnalysisRecord
+ANALYSIS_RECORD_COLUMNS = ('id', 'uuid', 'identifier', 'aliquot', 'increment', 'timestamp',
+                           'analysis_type', 'experiment_type', 'mass_spectrometer',
+                           'extract_device', 'extract_value', 'extract_units', 'cleanup',
+                           'pre_cleanup', 'post_cleanup', 'cryo_temperature', 'duration', 'weight',
+                           'comment', 'meas_script_name', 'extract_script_name',
+                           'irradiation', 'irradiation_level', 'irradiation_position_position', 'packet',
+                           'sample', 'material', 'project', 'change_tag', 'principal_investigator')
+
+# '' instead of None, e.g. for an analysis without a sample, as the AnalysisTbl properties
+TEXT_COLUMNS = ('packet', 'sample', 'material', 'project', 'principal_investigator')
+
+# values derived from the columns or from the analysis' repositories and measured positions
+ANALYSIS_RECORD_DERIVED = ('record_id', 'step', 'timestampf', 'repository_ids', 'position',
+                           'load_name', 'load_holder')
+
+READ_ONLY = frozenset(ANALYSIS_RECORD_COLUMNS + ANALYSIS_RECORD_DERIVED)
+
+
+class AnalysisRecord(object):
+    """
+        lightweight, read only copy of an analysis row. made in bulk by the ``DVCDatabase`` analysis queries
+        when called with ``record_views=True``.
+
+        provides the attributes of ``AnalysisTbl`` used by the browser tables and ``DVC.make_analyses``.
+        the record does not reference a session so it can be used from any thread after the query returns.
+
+        database values cannot be changed. the browser state, e.g. ``group_id``, ``review_status``,
+        ``delta_time``, and the tag via ``set_tag`` can
+    """
+    __slots__ = ANALYSIS_RECORD_COLUMNS + ANALYSIS_RECORD_DERIVED + ('group_id', 'graph_id', 'review_status',
+                                                                     'review_items', 'delta_time', 'frozen',
+                                                                     'is_plateau_step', '_temporary_tag')
+
+    def __init__(self, row, repository_ids=(), positions=()):
+        """
+            :param row: sequence of values ordered as ``ANALYSIS_RECORD_COLUMNS``
+            :param repository_ids: names of the repositories the analysis is associated with
+            :param positions: list of (position, load name, load holder) tuples
+        """
+        init = object.__setattr__
+        for attr, v in zip(ANALYSIS_RECORD_COLUMNS, row):
+            if v is None and attr in TEXT_COLUMNS:
+                v = ''
+            init(self, attr, v)
+
+        init(self, 'record_id', make_runid(self.identifier, self.aliquot, self.increment))
+        init(self, 'step', alphas(self.increment))
+        init(self, 'timestampf', make_timef(self.timestamp) if self.timestamp else 0)
+        init(self, 'repository_ids', tuple(repository_ids))
+
+        init(self, 'position', ','.join(['{}'.format(p) for p, _, _ in positions if p]))
+        load_name, load_holder = '', ''
+        if positions:
+            _, load_name, load_holder = positions[0]
+        init(self, 'load_name', load_name or '')
+        init(self, 'load_holder', load_holder or '')
+
+        init(self, 'group_id', 0)
+        init(self, 'graph_id', 0)
+        init(self, 'review_status', None)
+        init(self, 'review_items', None)
+        init(self, 'delta_time', 0)
+        init(self, 'frozen', False)
+        init(self, 'is_plateau_step', None)
+        init(self, '_temporary_tag', None)
+
+    def __setattr__(self, key, value):
+        if key in READ_ONLY:
+            raise AttributeError('AnalysisRecord.{} is read only'.format(key))
+        object.__setattr__(self, key, value)
+
+    def __repr__(self):
+        return '{}<{}>'.format(self.__class__.__name__, self.record_id)
+
+    def bind(self):
+        """
+            nothing to load. for compatibility with ``AnalysisTbl``
+        """
+        pass
+
+    def set_tag(self, t):
+        self._temporary_tag = t
+
+    @property
+    def tag(self):
+        return self._temporary_tag or self.change_tag
+
+    @property
+    def repository_identifier(self):
+        if len(self.repository_ids) == 1:
+            return self.repository_ids[0]
+
+    @property
+    def irradiation_info(self):
+        return '{}{} {}'.format(self.irradiation, self.irradiation_level, self.irradiation_position_position)
+
+    @property
+    def rundate(self):
+        return self.timestamp
+
+    @property
+    def analysis_timestamp(self):
+        return self.timestamp
+
+    @property
+    def display_uuid(self):
+        return (self.uuid or '')[:8]
+
+    def get_load_name(self):
+        return self.load_name
+
+    def get_load_holder(self):
+        return self.load_holder
+
+# ============= EOF =============================================
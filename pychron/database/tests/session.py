@@ -0,0 +1,100 @@
+import os
+import shutil
+import tempfile
+import unittest
+from threading import Thread, Barrier
+
+from pychron.database.core.database_adapter import DatabaseAdapter
+
+
+class ScopedSessionTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.db = DatabaseAdapter(kind='sqlite', path=os.path.join(self.root, 'test.db'))
+
+    def tearDown(self):
+        self.db.close_session()
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _thread_sessions(self, n=4):
+        db = self.db
+        barrier = Barrier(n)
+        sessions = [None] * n
+        errors = []
+
+        def func(i):
+            try:
+                with db.session_ctx() as sess:
+                    with db.session_ctx() as sess2:
+                        if sess2 is not sess:
+                            errors.append('nested session differs')
+                    sessions[i] = sess
+                    sess.execute('select 1')
+                    # hold the session until every thread has one
+                    barrier.wait(5)
+            except BaseException as e:
+                errors.append(e)
+
+        ts = [Thread(target=func, args=(i,)) for i in range(n)]
+        for t in ts:
+            t.start()
+        for t in ts:
+            t.join()
+
+        self.assertEqual(errors, [])
+        return sessions
+
+    def test_shared_session(self):
+        self.db.create_session()
+        main = self.db.session
+        sessions = []
+        t = Thread(target=lambda: sessions.append(self.db.session))
+        t.start()
+        t.join()
+        self.assertIs(sessions[0], main)
+
+    def test_scoped_session(self):
+        self.db.use_scoped_session = True
+        self.db.create_session()
+        main = self.db.session
+
+        sessions = self._thread_sessions()
+        self.assertEqual(len({id(s) for s in sessions}), len(sessions))
+        self.assertNotIn(main, sessions)
+        self.assertIs(self.db.session, main)
+
+    def test_pool_stats(self):
+        self.db.use_scoped_session = True
+        self._thread_sessions(3)
+        stats = self.db.get_pool_stats()
+        self.assertTrue(stats['scoped'])
+        self.assertEqual(stats['sessions_opened'], 3)
+        self.assertEqual(stats['sessions_open'], 0)
+        self.assertIn('pool', stats)
+
+    def test_reset_connection_closes_sessions(self):
+        db = self.db
+        db.use_scoped_session = True
+        barrier = Barrier(2)
+        done = Barrier(2)
+
+        def func():
+            db.create_session()
+            barrier.wait(5)
+            done.wait(5)
+
+        t = Thread(target=func)
+        t.start()
+        barrier.wait(5)
+        self.assertEqual(db.get_pool_stats()['sessions_open'], 1)
+
+        db.reset_connection()
+        done.wait(5)
+        t.join()
+
+        self.assertEqual(db.get_pool_stats()['sessions_open'], 0)
+        self.assertIsNone(db._engine)
+
+
+if __name__ == '__main__':
+    unittest.main()
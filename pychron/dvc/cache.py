@@ -13,58 +13,264 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 # ===============================================================================
-from datetime import datetime
+import os
+import pickle
+import sys
+import tempfile
+from collections import OrderedDict
+from threading import RLock
+
+from numpy import ndarray
+
+from pychron.core.helpers.logger_setup import new_logger
+
+logger = new_logger('DVCCache')
+
+# rough size of an analysis without its raw data. attributes, traits, uncertainties objects
+ANALYSIS_OVERHEAD = 64 * 1024
+MB = 1024 ** 2
+
+
+def estimate_size(obj):
+    """
+        estimate the memory used by a cached object in bytes.
+
+        for analyses this is the size of the raw isotope arrays plus a fixed overhead
+    """
+    # a DVCAnalysis keeps its isotopes in ``_isotopes``. reading ``isotopes`` would load its deferred modifiers
+    isotopes = getattr(obj, '_isotopes', None)
+    if isotopes is None:
+        isotopes = getattr(obj, 'isotopes', None)
+    if isinstance(isotopes, dict):
+        n = ANALYSIS_OVERHEAD
+        for iso in isotopes.values():
+            for m in (iso, getattr(iso, 'baseline', None), getattr(iso, 'sniff', None),
+                      getattr(iso, 'blank', None)):
+                if m is not None:
+                    for a in (getattr(m, 'xs', None), getattr(m, 'ys', None)):
+                        if isinstance(a, ndarray):
+                            n += a.nbytes
+        return n
+
+    return sys.getsizeof(obj)
 
 
 class DVCCache(object):
-    def __init__(self, max_size=1000):
-        self._cache = {}
+    """
+        LRU cache for analyses.
+
+        entries are evicted least recently used first once either ``max_size`` entries or ``max_bytes``
+        estimated bytes are exceeded. all operations are O(1).
+
+        if ``spill_dir`` is set evicted entries are pickled to disk and transparently reloaded by ``get``.
+        the spill tier is bounded by ``max_spill_bytes`` and is also evicted LRU. ``spill_dir`` may be shared by
+        several pychron instances so each cache spills into its own subdirectory, prefixed with the process id, and only
+        ever removes the files it wrote
+    """
+
+    def __init__(self, max_size=1000, max_bytes=None, spill_dir=None, max_spill_bytes=None):
+        self._cache = OrderedDict()
+        self._spilled = OrderedDict()
+        self._lock = RLock()
+
         self.max_size = max_size
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self.max_spill_bytes = max_spill_bytes
+        self._spill_subdir = None
+
+        self.nbytes = 0
+        self.spill_nbytes = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.spills = 0
+        self.spill_hits = 0
 
     def clear(self):
-        self._cache.clear()
+        with self._lock:
+            self._cache.clear()
+            self.nbytes = 0
+            self.clear_spilled()
+
+    def clear_spilled(self):
+        """
+            remove all spilled entries and this cache's spill subdirectory
+        """
+        with self._lock:
+            for key in list(self._spilled):
+                self._remove_spilled(key)
+
+            if self._spill_subdir:
+                try:
+                    os.rmdir(self._spill_subdir)
+                except OSError:
+                    pass
+                self._spill_subdir = None
 
     def remove(self, key):
-        try:
-            self._cache.pop(key)
-        except KeyError:
-            pass
+        with self._lock:
+            try:
+                _, size = self._cache.pop(key)
+                self.nbytes -= size
+            except KeyError:
+                pass
 
-    def clean(self):
-        t = 60 * 15  # 15 minutes
-        now = datetime.now()
-        remove = (k for k, v in self._cache.items()
-                  if (now - v['date_accessed']).total_seconds() > t)
+            self._remove_spilled(key)
 
-        for k in remove:
-            del self._cache[k]
+    def clean(self):
+        """
+            evict entries until the cache is within its limits
+        """
+        with self._lock:
+            cache = self._cache
+            while cache and self._is_full():
+                key, (value, size) = cache.popitem(last=False)
+                self.nbytes -= size
+                self.evictions += 1
+                self._spill(key, value)
 
     def report(self):
         return len(self._cache)
 
+    def stats(self):
+        """
+            return a dict of counters. suitable for display
+        """
+        with self._lock:
+            n = self.hits + self.misses
+            return {'entries': len(self._cache),
+                    'size_mb': self.nbytes / MB,
+                    'spilled': len(self._spilled),
+                    'spill_size_mb': self.spill_nbytes / MB,
+                    'hits': self.hits,
+                    'spill_hits': self.spill_hits,
+                    'misses': self.misses,
+                    'evictions': self.evictions,
+                    'spills': self.spills,
+                    'hit_rate': (self.hits + self.spill_hits) / n if n else 0}
+
+    def report_stats(self):
+        s = self.stats()
+        return 'Entries={entries} ({size_mb:0.1f} MB), Spilled={spilled} ({spill_size_mb:0.1f} MB)\n' \
+               'Hits={hits}, Disk Hits={spill_hits}, Misses={misses}, Hit Rate={hit_rate:0.1%}\n' \
+               'Evictions={evictions}, Spills={spills}'.format(**s)
+
     def get(self, item):
-        obj = self._cache.get(item)
-        if obj:
-            obj['date_accessed'] = datetime.now()
-            return obj['value']
+        with self._lock:
+            cache = self._cache
+            try:
+                value, _ = cache[item]
+            except KeyError:
+                value = self._load_spilled(item)
+                if value is None:
+                    self.misses += 1
+                else:
+                    self.spill_hits += 1
+                    self._put(item, value)
+                    self.clean()
+                return value
 
-    def update(self, key, value):
-        if key not in self._cache and len(self._cache) > self.max_size:
-            self.remove_oldest()
+            cache.move_to_end(item)
+            self.hits += 1
+            return value
 
-        self._cache[key] = {'date_accessed': datetime.now(),
-                            'value': value}
+    def update(self, key, value):
+        with self._lock:
+            self._remove_spilled(key)
+            self._put(key, value)
+            self.clean()
 
     def remove_oldest(self):
         """
-                Remove the entry that has the oldest accessed date
+                Remove the least recently used entry
         """
-        oldest_entry = None
-        for key in self._cache:
-            if oldest_entry is None:
-                oldest_entry = key
-            elif self._cache[key]['date_accessed'] < self._cache[oldest_entry]['date_accessed']:
-                oldest_entry = key
-
-        self._cache.pop(oldest_entry)
+        with self._lock:
+            if self._cache:
+                key, (value, size) = self._cache.popitem(last=False)
+                self.nbytes -= size
+                self.evictions += 1
+                self._spill(key, value)
+
+    # private
+    def _put(self, key, value):
+        cache = self._cache
+        if key in cache:
+            _, size = cache.pop(key)
+            self.nbytes -= size
+
+        size = estimate_size(value)
+        cache[key] = (value, size)
+        self.nbytes += size
+
+    def _is_full(self):
+        if self.max_size and len(self._cache) > self.max_size:
+            return True
+        if self.max_bytes and self.nbytes > self.max_bytes:
+            return True
+
+    def _spill_path(self, key):
+        return os.path.join(self._spill_subdir, '{}.pkl'.format(key))
+
+    def _spill(self, key, value):
+        if not self.spill_dir:
+            return
+
+        if not self._spill_subdir:
+            try:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                self._spill_subdir = tempfile.mkdtemp(prefix='{}-'.format(os.getpid()), dir=self.spill_dir)
+            except OSError as e:
+                logger.warning('failed creating spill directory in {}. error: {}'.format(self.spill_dir, e))
+                return
+
+        p = self._spill_path(key)
+        try:
+            with open(p, 'wb') as wfile:
+                pickle.dump(value, wfile, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError, OSError) as e:
+            logger.warning('failed spilling {}. error: {}'.format(key, e))
+            if os.path.isfile(p):
+                os.remove(p)
+            return
+
+        size = os.path.getsize(p)
+        self._spilled[key] = size
+        self.spill_nbytes += size
+        self.spills += 1
+
+        spilled = self._spilled
+        while spilled and self.max_spill_bytes and self.spill_nbytes > self.max_spill_bytes:
+            self._remove_spilled(next(iter(spilled)))
+
+    def _load_spilled(self, key):
+        if key not in self._spilled:
+            return
+
+        p = self._spill_path(key)
+        try:
+            with open(p, 'rb') as rfile:
+                value = pickle.load(rfile)
+        except (pickle.UnpicklingError, EOFError, AttributeError, ImportError, OSError) as e:
+            logger.warning('failed loading spilled {}. error: {}'.format(key, e))
+            value = None
+
+        self._remove_spilled(key)
+        return value
+
+    def _remove_spilled(self, key):
+        try:
+            size = self._spilled.pop(key)
+        except KeyError:
+            return
+
+        self.spill_nbytes -= size
+        try:
+            os.remove(self._spill_path(key))
+        except OSError:
+            pass
+
 # ============= EOF =============================================
@@ -0,0 +1,267 @@
+# ===============================================================================
+# Copyright 2026 ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import glob
+import os
+
+from numpy import array, load, save, concatenate, float32, zeros
+
+# ============= local library imports  ==========================
+from pychron import json
+from pychron.core.helpers.binpack import unpack_arrays, format_blob
+from pychron.core.helpers.logger_setup import new_logger
+from pychron.dvc import dvc_load
+
+logger = new_logger('DataSidecar')
+
+# Binary sidecar for the raw ``.data`` json file.
+#
+# The sidecar is a local cache, it is not committed to the repository. It sits next to ``<runid>.dat.json`` as
+# ``<runid>.dat.npy``, one uncompressed (2, n) float32 array holding every signal, baseline and sniff end to end,
+# plus ``<runid>.dat.idx``, a small json index with the same layout as the ``.data`` file and the offset of each
+# series. ``DVCAnalysis.load_raw_data`` reads the index and memory maps the array so only the requested series
+# are read from disk.
+#
+# The index records the size and modification time of the json file the sidecar was built from. If the json is
+# rewritten, e.g. by a pull or a tool that does not know about the sidecar, they no longer match and the sidecar
+# is ignored until it is rebuilt.
+#
+# The sidecar patterns are added to the repository's ``.git/info/exclude`` when a sidecar is written so they do not
+# show up as untracked files and are not removed by ``git clean``. the exclude file is local, nothing is committed.
+
+SIDECAR_EXTENSION = '.npy'
+INDEX_EXTENSION = '.idx'
+SIDECAR_VERSION = 3
+KINDS = ('signals', 'baselines', 'sniffs')
+EXCLUDE_PATTERNS = ('*.dat{}'.format(SIDECAR_EXTENSION), '*.dat{}'.format(INDEX_EXTENSION))
+
+# repository roots already excluded by this process
+_excluded = set()
+
+
+def sidecar_path(data_path):
+    """
+    return the sidecar path for a ``.data`` json path
+    """
+    head, _ = os.path.splitext(data_path)
+    return '{}{}'.format(head, SIDECAR_EXTENSION)
+
+
+def index_path(data_path):
+    """
+    return the sidecar index path for a ``.data`` json path
+    """
+    head, _ = os.path.splitext(data_path)
+    return '{}{}'.format(head, INDEX_EXTENSION)
+
+
+def remove_sidecar(data_path):
+    for p in (index_path(data_path), sidecar_path(data_path)):
+        if os.path.isfile(p):
+            os.remove(p)
+
+
+def find_repository_root(path):
+    """
+    return the directory above ``path`` that contains ``.git``. None if ``path`` is not in a repository
+    """
+    root = os.path.dirname(os.path.abspath(path))
+    while 1:
+        if os.path.isdir(os.path.join(root, '.git')):
+            return root
+
+        head = os.path.dirname(root)
+        if head == root:
+            return
+        root = head
+
+
+def exclude_sidecars(root):
+    """
+    add the sidecar patterns to the local exclude file of the repository at ``root``
+    """
+    if root is None or root in _excluded:
+        return
+
+    p = os.path.join(root, '.git', 'info', 'exclude')
+    lines = []
+    if os.path.isfile(p):
+        with open(p, 'r') as rfile:
+            lines = [line.strip() for line in rfile]
+
+    ps = [e for e in EXCLUDE_PATTERNS if e not in lines]
+    if ps:
+        os.makedirs(os.path.dirname(p), exist_ok=True)
+        with open(p, 'a') as afile:
+            if lines and lines[-1]:
+                afile.write('\n')
+            for e in ps:
+                afile.write('{}\n'.format(e))
+
+    _excluded.add(root)
+
+
+def json_stat(data_path):
+    st = os.stat(data_path)
+    return st.st_size, st.st_mtime_ns
+
+
+class DataSidecar(object):
+    """
+    read only view of a sidecar. arrays are read from disk only when requested
+    """
+
+    def __init__(self, data_path):
+        with open(index_path(data_path), 'r') as rfile:
+            self.index = json.load(rfile)
+
+        self._data = load(sidecar_path(data_path), mmap_mode='r', allow_pickle=False)
+        self._offsets = {e['key']: (e['offset'], e['n']) for kind in KINDS for e in self.index.get(kind, [])}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        self._data = None
+
+    def get(self, key):
+        o, n = self._offsets[key]
+        xs, ys = self._data[:, o:o + n]
+        return xs, ys
+
+    def is_current(self, data_path):
+        try:
+            size, mtime = json_stat(data_path)
+        except OSError:
+            return False
+
+        return self.index.get('json_size') == size and self.index.get('json_mtime') == mtime and \
+            self._data.shape == (2, self.index.get('total'))
+
+
+def load_sidecar(data_path):
+    """
+    open the sidecar for ``data_path``. return None if there is no sidecar or it is out of date
+    """
+    if not data_path:
+        return
+
+    if os.path.isfile(index_path(data_path)) and os.path.isfile(sidecar_path(data_path)):
+        try:
+            sc = DataSidecar(data_path)
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning('failed loading data sidecar. error: {}, {}'.format(e, data_path))
+            return
+
+        if sc.index.get('version') == SIDECAR_VERSION and sc.is_current(data_path):
+            return sc
+
+        sc.close()
+
+
+def dump_sidecar(data_path, signals, baselines, sniffs):
+    """
+    write the sidecar for ``data_path``. ``data_path`` must already be written.
+
+    signals, baselines and sniffs are lists of dicts with the same keys as the ``.data`` json plus
+    "xs" and "ys" in place of "blob"
+    """
+    exclude_sidecars(find_repository_root(data_path))
+
+    size, mtime = json_stat(data_path)
+    index = {'version': SIDECAR_VERSION,
+             'json_size': size,
+             'json_mtime': mtime}
+
+    arrays = []
+    offset = 0
+    for kind, items in zip(KINDS, (signals, baselines, sniffs)):
+        entries = []
+        for i, item in enumerate(items):
+            item = dict(item)
+            xs, ys = item.pop('xs'), item.pop('ys')
+            n = min(len(xs), len(ys))
+            arrays.append(array((xs[:n], ys[:n]), dtype=float32).reshape(2, n))
+
+            item.update(key='{}_{}'.format(kind, i), offset=offset, n=n)
+            entries.append(item)
+            offset += n
+        index[kind] = entries
+
+    index['total'] = offset
+    data = concatenate(arrays, axis=1) if arrays else zeros((2, 0), dtype=float32)
+
+    # write the array before the index. a sidecar whose index is missing or does not match is ignored
+    ip = index_path(data_path)
+    if os.path.isfile(ip):
+        os.remove(ip)
+
+    p = sidecar_path(data_path)
+    tmp = '{}.tmp'.format(p)
+    with open(tmp, 'wb') as wfile:
+        save(wfile, data, allow_pickle=False)
+    os.replace(tmp, p)
+
+    with open(ip, 'w') as wfile:
+        json.dump(index, wfile)
+    return p
+
+
+def dump_sidecar_from_json(data_path, jd=None):
+    """
+    build a sidecar from an existing ``.data`` json file
+    """
+    if jd is None:
+        jd = dvc_load(data_path)
+
+    if not jd:
+        return
+
+    fmt = jd.get('format', '>ff')
+
+    def convert(items):
+        ret = []
+        for item in items:
+            blob = item.get('blob')
+            xs, ys = unpack_arrays(format_blob(blob), fmt) if blob else ((), ())
+            item = {k: v for k, v in item.items() if k != 'blob'}
+            item.update(xs=xs, ys=ys)
+            ret.append(item)
+        return ret
+
+    return dump_sidecar(data_path, *(convert(jd.get(k, [])) for k in KINDS))
+
+
+def dump_repository_sidecars(root):
+    """
+    build sidecars for every ``.data`` json in the repository at ``root`` that does not have a current one
+    """
+    ps = []
+    for p in glob.iglob(os.path.join(root, '**', '.data', '*.json'), recursive=True):
+        sc = load_sidecar(p)
+        if sc is not None:
+            sc.close()
+            continue
+
+        ps.append(dump_sidecar_from_json(p))
+    return ps
+
+# ============= EOF =============================================
@@ -17,14 +17,16 @@
 import os
 import shutil
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from itertools import groupby
 from operator import itemgetter
+from threading import Lock
 
 # ============= enthought library imports =======================
 from apptools.preferences.preference_binding import bind_preference
 from git import Repo, GitCommandError, NoSuchPathError
-from traits.api import Instance, Str, Set, List, provides, Bool, Int
+from traits.api import Instance, Str, Set, List, provides, Bool, Int, on_trait_change
 from uncertainties import ufloat, std_dev, nominal_value
 
 from pychron import json
@@ -35,8 +37,9 @@ from pychron.core.progress import progress_loader, progress_iterator, open_progr
 from pychron.dvc import dvc_dump, dvc_load, analysis_path, repository_path, AnalysisNotAnvailableError, PATH_MODIFIERS, \
     USE_GIT_TAGGING
 from pychron.dvc.cache import DVCCache
+from pychron.dvc.data_sidecar import remove_sidecar
 from pychron.dvc.defaults import TRIGA, HOLDER_24_SPOKES, LASER221, LASER65
-from pychron.dvc.dvc_analysis import DVCAnalysis
+from pychron.dvc.dvc_analysis import DVCAnalysis, ISOTOPE_MODIFIERS
 from pychron.dvc.dvc_database import DVCDatabase
 from pychron.dvc.func import find_interpreted_age_path, GitSessionCTX, push_repositories, make_interpreted_age_dict
 from pychron.dvc.meta_repo import MetaRepo, get_frozen_flux, get_frozen_productions
@@ -58,6 +61,22 @@ HOST_WARNING_MESSAGE = 'GitLab or GitHub or LocalGit plugin is required'
 
 
 
+class MakeRecord(object):
+    """
+        plain copy of the record attributes used by DVC._make_record.
+
+        used when analyses are made on worker threads. records returned by the database lazy load their
+        relationships and the session must only be used from the thread that owns it
+    """
+    __slots__ = ('uuid', 'record_id', 'repository_identifier', 'repository_ids', 'group_id', 'tag',
+                 'load_name', 'load_holder', 'not_available')
+
+    def __init__(self, record):
+        for attr in self.__slots__[:-1]:
+            setattr(self, attr, getattr(record, attr, None))
+        self.not_available = False
+
+
 @provides(IDatastore)
 class DVC(Loggable):
     """
@@ -86,6 +105,12 @@ class DVC(Loggable):
     use_cocktail_irradiation = Str
     use_cache = Bool
     max_cache_size = Int
+    max_cache_memory = Int
+    use_cache_spill = Bool
+    max_cache_spill = Int
+    make_analyses_workers = Int
+    repository_sync_workers = Int
+    repository_fetch_ttl = Int
     irradiation_prefix = Str
 
     _cache = None
@@ -94,6 +119,10 @@ class DVC(Loggable):
     def __init__(self, bind=True, *args, **kw):
         super(DVC, self).__init__(*args, **kw)
 
+        self._fetch_times = {}
+        self._repo_locks = {}
+        self._repo_locks_lock = Lock()
+
         if bind:
             self._bind_preferences()
 
@@ -159,6 +188,10 @@ class DVC(Loggable):
                 shutil.move(sp, dp)
                 temps.append(dp)
 
+                if modifier == '.data':
+                    # the binary sidecar is a local cache of the old runid. it is rebuilt on demand
+                    remove_sidecar(sp)
+
         return temps
 
     def generate_currents(self):
@@ -452,19 +485,15 @@ class DVC(Loggable):
     def freeze_flux(self, ans):
         self.info('freeze flux')
 
+        meta_repo = self.meta_repo
+        meta_repo.refresh_index()
+
         def ai_gen():
             for irrad, ais in groupby_key(ans, 'irradiation'):
                 for level, ais in groupby_key(ais, 'level'):
-                    p = self.get_level_path(irrad, level)
-                    obj = dvc_load(p)
-                    if isinstance(obj, list):
-                        positions = obj
-                    else:
-                        positions = obj['positions']
-
                     for repo, ais in groupby_repo(ais):
-                        yield repo, irrad, level, {ai.irradiation_position: positions[ai.irradiation_position] for ai in
-                                                   ais}
+                        yield repo, irrad, level, {ai.irradiation_position: meta_repo.get_level_position(
+                            irrad, level, ai.irradiation_position) for ai in ais}
 
         added = []
 
@@ -613,7 +642,7 @@ class DVC(Loggable):
             self.info('Delete existing icfactors for {}'.format(ai))
             ai.delete_icfactors(dets)
             if self._cache:
-                self._cache.remove(ai.uiid)
+                self._cache.remove(ai.uuid)
 
             self._update_current_age(ai)
 
@@ -626,7 +655,7 @@ class DVC(Loggable):
                 ai.dump_icfactors(dets, fits, refs, reviewed=True)
 
         if self._cache:
-            self._cache.remove(ai.uiid)
+            self._cache.remove(ai.uuid)
         self._update_current_age(ai)
 
     def save_blanks(self, ai, keys, refs):
@@ -634,7 +663,7 @@ class DVC(Loggable):
             self.info('Saving blanks for {}'.format(ai))
             ai.dump_blanks(keys, refs, reviewed=True)
             if self._cache:
-                self._cache.remove(ai.uiid)
+                self._cache.remove(ai.uuid)
 
             self._update_current_blanks(ai, keys)
 
@@ -642,7 +671,7 @@ class DVC(Loggable):
         if keys:
             self.info('Saving equilibration for {}'.format(ai))
             if self._cache:
-                self._cache.remove(ai.uiid)
+                self._cache.remove(ai.uuid)
 
             self._update_current(ai, keys)
             return ai.dump_equilibration(keys, reviewed=True)
@@ -652,7 +681,7 @@ class DVC(Loggable):
             self.info('Saving fits for {}'.format(ai))
             ai.dump_fits(keys, reviewed=True)
             if self._cache:
-                self._cache.remove(ai.uiid)
+                self._cache.remove(ai.uuid)
 
             self._update_current(ai, keys)
 
@@ -842,14 +871,6 @@ class DVC(Loggable):
 
             records = nrecords
 
-        def func(xi, prog, i, n):
-            if prog:
-                prog.change_message('Syncing repository= {}'.format(xi))
-            try:
-                self.sync_repo(xi, use_progress=False)
-            except BaseException:
-                pass
-
         bad_records = [r for r in records if r.repository_identifier is None]
         if bad_records:
             self.warning_dialog('Missing Repository Associations. Contact an expert!'
@@ -866,11 +887,7 @@ class DVC(Loggable):
 
         exps = {r.repository_identifier for r in records}
 
-        if use_progress:
-            progress_iterator(exps, func, threshold=1)
-        else:
-            for ei in exps:
-                self.sync_repo(ei, use_progress=False)
+        self.sync_repos(exps, use_progress=use_progress)
         try:
             branches = {ei: get_repository_branch(repository_path(ei)) for ei in exps}
         except NoSuchPathError:
@@ -885,6 +902,8 @@ class DVC(Loggable):
         meta_repo = self.meta_repo
         use_cocktail_irradiation = self.use_cocktail_irradiation
         if not quick:
+            # discard indexed fluxes, productions and chronologies if the meta repo HEAD moved
+            meta_repo.refresh_index()
             for exp in exps:
                 ps = get_frozen_productions(exp)
                 frozen_productions.update(ps)
@@ -934,7 +953,10 @@ class DVC(Loggable):
                                                                                    record.record_id))
                 self.debug_exception()
 
-        if use_progress:
+        nworkers = self.make_analyses_workers
+        if nworkers > 1 and len(records) > 1:
+            ret = self._make_records_parallel(records, func, nworkers, use_progress)
+        elif use_progress:
             ret = progress_loader(records, func, threshold=1, step=25)
         else:
             ret = [func(r, None, 0, 0) for r in records]
@@ -951,6 +973,38 @@ class DVC(Loggable):
 
         return ret
 
+    def prefetch(self, analyses, modifiers, keys=None):
+        """
+            load the deferred ``modifiers`` of ``analyses`` in one batch. ``'.data'`` in ``modifiers`` loads the
+            raw data for ``keys``, all if None.
+
+            uses ``make_analyses_workers`` threads. each analysis is loaded by one thread
+        """
+        ans = [a for a in analyses if isinstance(a, DVCAnalysis)]
+        if not ans or not modifiers:
+            return
+
+        deferred = [m for m in modifiers if m != '.data']
+        raw = '.data' in modifiers
+
+        def func(a):
+            if deferred:
+                a.load_deferred(*deferred)
+            if raw:
+                a.load_raw_data(keys)
+
+        st = time.time()
+        nworkers = self.make_analyses_workers
+        if nworkers > 1 and len(ans) > 1:
+            with ThreadPoolExecutor(max_workers=nworkers) as executor:
+                for f in [executor.submit(func, a) for a in ans]:
+                    f.result()
+        else:
+            for a in ans:
+                func(a)
+
+        self.debug('prefetch {} n={}, time={:0.3f}'.format(','.join(modifiers), len(ans), time.time() - st))
+
     # repositories
     def find_changes(self, names, remote, branch):
         gs = self.application.get_services(IGitHost)
@@ -1038,6 +1092,72 @@ class DVC(Loggable):
     def git_session_ctx(self, repository_identifier, message):
         return GitSessionCTX(self, repository_identifier, message)
 
+    def sync_repos(self, names, use_progress=True):
+        """
+        pull or clone many repos
+
+        fetches run on a pool of ``repository_sync_workers`` threads. merging, which may ask the user to accept
+        changes, and cloning missing repositories happen on the calling thread once the fetches are done.
+
+        repositories fetched less than ``repository_fetch_ttl`` seconds ago are not fetched again unless the
+        merge after the last fetch failed or was declined.
+        a failure is logged and does not stop the remaining repositories from syncing.
+
+        returns a dict of name: (seconds, error). error is None if the repository synced
+        """
+        names = sorted(set(names))
+        st = time.time()
+
+        fetch, clone, report = [], [], {}
+        for name in names:
+            if not os.path.isdir(os.path.join(repository_path(name), '.git')):
+                clone.append(name)
+            elif self._is_recently_fetched(name):
+                self.debug('sync repository {}. fetched recently, skipping'.format(name))
+                report[name] = (0, None)
+            else:
+                fetch.append(name)
+
+        fetched = self._fetch_repositories(fetch, use_progress)
+
+        for name, (repo, et, error) in zip(fetch, fetched):
+            if repo is not None and error is None:
+                mst = time.time()
+                try:
+                    repo.pull(use_progress=False, use_auto_pull=self.use_auto_pull, fetch=False)
+                    _, behind = repo.ahead_behind(fetch=False)
+                except BaseException as e:
+                    error = e
+                    behind = True
+
+                if behind:
+                    # the merge failed or was declined. fetch and merge again on the next sync
+                    self._fetch_times.pop(name, None)
+                et += time.time() - mst
+            report[name] = (et, error)
+
+        for name in clone:
+            cst = time.time()
+            error = None
+            try:
+                self.sync_repo(name, use_progress=False)
+            except BaseException as e:
+                error = e
+            report[name] = (time.time() - cst, error)
+
+        for name in names:
+            et, error = report[name]
+            self.debug('sync repository {}. {:0.2f}s{}'.format(name, et, ' error={}'.format(error) if error else ''))
+
+        failed = [name for name in names if report[name][1] is not None]
+        self.debug('sync repositories n={}, fetched={}, failed={}, total={:0.2f}s'.format(len(names), len(fetch),
+                                                                                        len(failed),
+                                                                                        time.time() - st))
+        if failed:
+            self.warning('Failed syncing repositories: {}'.format(','.join(failed)))
+
+        return report
+
     def sync_repo(self, name, use_progress=True):
         """
         pull or clone an repo
@@ -1048,8 +1168,10 @@ class DVC(Loggable):
         self.debug('sync repository {}. exists={}'.format(name, exists))
 
         if exists:
-            repo = self._get_repository(name)
-            repo.pull(use_progress=use_progress, use_auto_pull=self.use_auto_pull)
+            with self._get_repo_lock(name):
+                repo = self._get_repository(name)
+                repo.pull(use_progress=use_progress, use_auto_pull=self.use_auto_pull)
+                self._fetch_times[name] = time.time()
             return True
         else:
             self.debug('getting repository from remote')
@@ -1155,11 +1277,14 @@ class DVC(Loggable):
         self.meta_repo.update_chronology(name, doses)
         self.meta_commit('updated chronology for {}'.format(name))
 
+    def meta_fetch(self, **kw):
+        return self.meta_repo.fetch(**kw)
+
     def meta_pull(self, **kw):
         return self.meta_repo.smart_pull(**kw)
 
-    def meta_push(self):
-        self.meta_repo.push()
+    def meta_push(self, **kw):
+        self.meta_repo.push(**kw)
 
     def meta_add_all(self):
         self.meta_repo.add_unstaged(paths.meta_root, add_all=True)
@@ -1495,6 +1620,16 @@ class DVC(Loggable):
         if self.use_cache:
             self._cache.clear()
 
+    def get_cache_stats(self):
+        if self._cache is not None:
+            return self._cache.stats()
+
+    def report_cache_stats(self):
+        if self._cache is not None:
+            return self._cache.report_stats()
+        else:
+            return 'Cache disabled'
+
     # private
     def _update_current_blanks(self, ai, keys=None, dban=None, force=False, update_age=True, commit=True):
         if self.update_currents_enabled:
@@ -1649,6 +1784,111 @@ class DVC(Loggable):
             prog.change_message('Loading repository {}. {}/{}'.format(expid, i, n))
         self.sync_repo(expid)
 
+    def _get_repo_lock(self, name):
+        with self._repo_locks_lock:
+            lock = self._repo_locks.get(name)
+            if lock is None:
+                lock = self._repo_locks[name] = Lock()
+            return lock
+
+    def _is_recently_fetched(self, name):
+        ttl = self.repository_fetch_ttl
+        if ttl > 0:
+            ft = self._fetch_times.get(name)
+            return ft is not None and time.time() - ft < ttl
+
+    def _fetch_repository(self, name):
+        """
+            fetch a repository. safe to call from a worker thread.
+
+            returns (repo, seconds, error). repo is None if the repository was fetched by another caller while
+            waiting for the lock
+        """
+        st = time.time()
+        repo = None
+        try:
+            with self._get_repo_lock(name):
+                if not self._is_recently_fetched(name):
+                    repo = self._get_repository(name, as_current=False)
+                    if repo.has_remote():
+                        repo.fetch(handled=False)
+                    self._fetch_times[name] = time.time()
+        except BaseException as e:
+            return None, time.time() - st, e
+
+        return repo, time.time() - st, None
+
+    def _fetch_repositories(self, names, use_progress):
+        """
+            fetch ``names`` on a pool of ``repository_sync_workers`` threads.
+            results are returned in the same order as ``names``
+        """
+        if not names:
+            return []
+
+        nworkers = min(self.repository_sync_workers, len(names))
+        if nworkers <= 1:
+            def func(name, prog, i, n):
+                if prog:
+                    prog.change_message('Fetching repository= {}'.format(name))
+                return self._fetch_repository(name)
+
+            if use_progress:
+                return progress_loader(names, func, threshold=1)
+            else:
+                return [func(name, None, 0, 0) for name in names]
+
+        self.debug('fetch repositories. workers={}, n={}'.format(nworkers, len(names)))
+        with ThreadPoolExecutor(max_workers=nworkers) as executor:
+            futures = [(name, executor.submit(self._fetch_repository, name)) for name in names]
+
+            def collect(nf, prog, i, n):
+                name, f = nf
+                if prog:
+                    prog.change_message('Fetching repository= {}. {}/{}'.format(name, i, n))
+                return f.result()
+
+            if use_progress:
+                return progress_loader(futures, collect, threshold=1)
+            else:
+                return [f.result() for _, f in futures]
+
+    def _make_records_parallel(self, records, func, nworkers, use_progress):
+        """
+            build analyses on a pool of ``nworkers`` threads.
+
+            records are copied to plain MakeRecord objects on the calling thread so database backed records are
+            never touched by a worker. results are returned in the same order as ``records``. progress and cancel
+            are handled on the calling thread as the results are collected
+        """
+        self.debug('make analyses. workers={}, n={}'.format(nworkers, len(records)))
+        records = [r if isinstance(r, DVCAnalysis) else MakeRecord(r) for r in records]
+
+        with ThreadPoolExecutor(max_workers=nworkers) as executor:
+            futures = [(r, executor.submit(func, r, None, 0, 0)) for r in records]
+
+            def collect(rf, prog, i, n):
+                r, f = rf
+                if prog:
+                    prog.change_message('Loading analysis {}. {}/{}'.format(r.record_id, i, n))
+                return f.result()
+
+            try:
+                if use_progress:
+                    ret = progress_loader(futures, collect, threshold=1, step=25)
+                else:
+                    ret = [f.result() for _, f in futures]
+            finally:
+                # cancelled or accepted early. don't wait for analyses that will not be used
+                for _, f in futures:
+                    f.cancel()
+
+        missing = [r.record_id for r in records if getattr(r, 'not_available', False)]
+        if missing:
+            self.warning_dialog('Analyses {} not available. You may need to pull changes'.format(','.join(missing)))
+
+        return ret
+
     def _make_record(self, record, prog, i, n, productions=None, chronos=None, branches=None, fluxes=None, sens=None,
                      frozen_fluxes=None, frozen_productions=None,
                      calculate_f_only=False, reload=False, quick=False):
@@ -1682,10 +1922,17 @@ class DVC(Loggable):
             uuid = record.uuid
 
             try:
-                a = DVCAnalysis(uuid, rid, expid)
+                # the age is not calculated for quick analyses. load the isotopes' values only if they are used
+                a = DVCAnalysis(uuid, rid, expid,
+                                deferred=DVCAnalysis.deferred_modifiers + ISOTOPE_MODIFIERS if quick else None)
             except AnalysisNotAnvailableError:
-                self.warning_dialog('Analysis {} not in repository {}. '
-                                    'You many need to pull changes'.format(rid, expid))
+                if isinstance(record, MakeRecord):
+                    # on a worker thread. _make_records_parallel reports these once all analyses are made
+                    record.not_available = True
+                    self.warning('Analysis {} not in repository {}'.format(rid, expid))
+                else:
+                    self.warning_dialog('Analysis {} not in repository {}. '
+                                        'You many need to pull changes'.format(rid, expid))
                 return
 
             a.group_id = record.group_id
@@ -1747,10 +1994,9 @@ class DVC(Loggable):
 
                     if not fd:
                         if fluxes:
-                            try:
-                                level_flux = fluxes[a.irradiation][a.irradiation_level]
-                                fd = meta_repo.get_flux_from_positions(a.irradiation_position, level_flux)
-                            except KeyError:
+                            if a.irradiation_level in fluxes.get(a.irradiation, ()):
+                                fd = meta_repo.get_flux(a.irradiation, a.irradiation_level, a.irradiation_position)
+                            else:
                                 fd = {'j': ufloat(0, 0)}
                         else:
                             fd = meta_repo.get_flux(a.irradiation,
@@ -1817,6 +2063,15 @@ class DVC(Loggable):
         bind_preference(self, 'use_cocktail_irradiation', '{}.use_cocktail_irradiation'.format(prefid))
         bind_preference(self, 'use_cache', '{}.use_cache'.format(prefid))
         bind_preference(self, 'max_cache_size', '{}.max_cache_size'.format(prefid))
+        bind_preference(self, 'max_cache_memory', '{}.max_cache_memory'.format(prefid))
+        bind_preference(self, 'use_cache_spill', '{}.use_cache_spill'.format(prefid))
+        bind_preference(self, 'max_cache_spill', '{}.max_cache_spill'.format(prefid))
+        bind_preference(self, 'make_analyses_workers', '{}.make_analyses_workers'.format(prefid))
+        bind_preference(self, 'repository_sync_workers', '{}.repository_sync_workers'.format(prefid))
+        bind_preference(self, 'repository_fetch_ttl', '{}.repository_fetch_ttl'.format(prefid))
+        bind_preference(self.db, 'use_scoped_session', '{}.use_scoped_db_sessions'.format(prefid))
+        bind_preference(self.db, 'pool_size', '{}.db_pool_size'.format(prefid))
+        bind_preference(self.db, 'max_overflow', '{}.db_max_overflow'.format(prefid))
         bind_preference(self, 'update_currents_enabled', '{}.update_currents_enabled'.format(prefid))
         bind_preference(self, 'use_auto_pull', '{}.use_auto_pull'.format(prefid))
 
@@ -1834,12 +2089,32 @@ class DVC(Loggable):
         else:
             self.use_cache = False
 
+    @on_trait_change('max_cache_memory, use_cache_spill, max_cache_spill')
+    def _cache_limits_changed(self):
+        if self._cache is not None:
+            self._cache.max_bytes = self.max_cache_memory * 1024 ** 2
+            self._cache.max_spill_bytes = self.max_cache_spill * 1024 ** 2
+            spill_dir = self._cache_spill_dir()
+            if spill_dir != self._cache.spill_dir:
+                self._cache.clear_spilled()
+                self._cache.spill_dir = spill_dir
+            self._cache.clean()
+
     def _use_cache_changed(self):
         if self.use_cache:
-            self._cache = DVCCache(max_size=self.max_cache_size)
+            self._cache = DVCCache(max_size=self.max_cache_size,
+                                   max_bytes=self.max_cache_memory * 1024 ** 2,
+                                   spill_dir=self._cache_spill_dir(),
+                                   max_spill_bytes=self.max_cache_spill * 1024 ** 2)
         else:
+            if self._cache is not None:
+                self._cache.clear()
             self._cache = None
 
+    def _cache_spill_dir(self):
+        if self.use_cache_spill and paths.default_cache:
+            return os.path.join(paths.default_cache, 'dvc')
+
     def _favorites_changed(self, items):
         try:
             ds = [DVCConnectionItem(attrs=f, load_names=False) for f in items]
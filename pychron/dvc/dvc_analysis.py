@@ -15,6 +15,7 @@
 # ===============================================================================
 
 # ============= enthought library imports =======================
+from traits.api import Property
 # ============= standard library imports ========================
 import datetime
 import os
@@ -31,6 +32,7 @@ from pychron.core.helpers.strtools import to_csv_str
 from pychron.dvc import USE_GIT_TAGGING, INTERCEPTS, BASELINES, BLANKS, ICFACTORS, PEAKCENTER, COSMOGENIC
 from pychron.dvc import dvc_dump, dvc_load, analysis_path, make_ref_list, get_spec_sha, get_masses, repository_path, \
     AnalysisNotAnvailableError
+from pychron.dvc.data_sidecar import load_sidecar, sidecar_path, dump_sidecar_from_json
 from pychron.experiment.utilities.environmentals import set_environmentals
 from pychron.experiment.utilities.runid import make_aliquot_step, make_step
 from pychron.processing.analyses.analysis import Analysis
@@ -38,6 +40,41 @@ from pychron.processing.isotope import Isotope
 from pychron.pychron_constants import INTERFERENCE_KEYS, NULL_STR, ARAR_MAPPING, EXTRACTION_ATTRS, META_ATTRS, \
     NO_BLANK_CORRECT
 
+MODIFIERS = (INTERCEPTS, BASELINES, BLANKS, ICFACTORS, PEAKCENTER, COSMOGENIC)
+
+# modifiers needed for the isotopes' values and the age. loaded when the isotopes are first accessed
+ISOTOPE_MODIFIERS = (INTERCEPTS, BASELINES, BLANKS, ICFACTORS, COSMOGENIC)
+
+
+def deferred_property(modifiers, default=None):
+    """
+        trait property that loads the deferred ``modifiers`` of a ``DVCAnalysis`` before it is read.
+
+        the value is kept in the instance ``__dict__`` as ``_<name>``. ``default`` is called to make the value
+        of an attribute that was never set
+    """
+
+    def fget(obj, name):
+        if not obj._deferred.isdisjoint(modifiers):
+            obj.load_deferred(*modifiers)
+
+        key = '_{}'.format(name)
+        d = obj.__dict__
+        try:
+            return d[key]
+        except KeyError:
+            v = default() if default else getattr(Analysis, name, None)
+            d[key] = v
+            return v
+
+    def fset(obj, name, v):
+        key = '_{}'.format(name)
+        old = obj.__dict__.get(key)
+        obj.__dict__[key] = v
+        obj.trait_property_changed(name, old, v)
+
+    return Property(fget, fset)
+
 
 class Blank:
     pass
@@ -66,7 +103,26 @@ class DVCAnalysis(Analysis):
     chronology_obj = None
     use_repository_suffix = False
 
+    # modifiers not loaded by __init__. each is loaded when the attributes it sets are first read
+    deferred_modifiers = (PEAKCENTER,)
+    _deferred = frozenset()
+    _raw_data_keys = None
+
+    isotopes = deferred_property(ISOTOPE_MODIFIERS, dict)
+
+    peak_center = deferred_property((PEAKCENTER,))
+    peak_center_data = deferred_property((PEAKCENTER,))
+    peak_center_reference_detector = deferred_property((PEAKCENTER,))
+    additional_peak_center_data = deferred_property((PEAKCENTER,))
+    peak_center_interpolation_kind = deferred_property((PEAKCENTER,))
+    peak_center_use_interpolation = deferred_property((PEAKCENTER,))
+    peak_center_reference_isotope = deferred_property((PEAKCENTER,))
+
     def __init__(self, uuid, record_id, repository_identifier, *args, **kw):
+        """
+            :param deferred: modifiers to load on first access instead of now. ``deferred_modifiers`` if None
+        """
+        deferred = kw.pop('deferred', None)
         super(DVCAnalysis, self).__init__(*args, **kw)
         self.record_id = record_id
         path = analysis_path((uuid, record_id), repository_identifier)
@@ -98,7 +154,14 @@ class DVCAnalysis(Analysis):
         else:
             self.warning('Invalid analysis. RunID="{}". No meta file {}'.format(record_id, path))
 
-        self.load_paths()
+        if deferred is None:
+            deferred = self.deferred_modifiers
+        self._deferred = frozenset(deferred)
+
+        modifiers = tuple(m for m in MODIFIERS if m not in self._deferred)
+        if USE_GIT_TAGGING:
+            modifiers += ('tags',)
+        self._load_modifiers(modifiers)
 
     @property
     def irradiation_position_position(self):
@@ -185,28 +248,26 @@ class DVCAnalysis(Analysis):
 
     def load_paths(self, modifiers=None):
         if modifiers is None:
-            modifiers = (INTERCEPTS, BASELINES, BLANKS, ICFACTORS, PEAKCENTER, COSMOGENIC)
+            modifiers = MODIFIERS
 
         if USE_GIT_TAGGING:
             modifiers += ('tags',)
 
-        for modifier in modifiers:
-            path = self._analysis_path(modifier=modifier)
-            if path:
-                if os.path.isfile(path):
-                    jd = dvc_load(path)
-                    if jd:
-                        func = getattr(self, '_load_{}'.format(modifier))
-                        try:
-                            func(jd)
-                        except BaseException as e:
-                            self.warning('Failed loading {}. path={}. error={}'.format(modifier, path, e))
-                            import traceback
-                            self.debug(traceback.format_exc())
-                    else:
-                        self.debug('path is empty. {}'.format(path))
-                else:
-                    self.debug('Non-existent path. {}'.format(path))
+        self._load_modifiers(modifiers)
+
+    def load_deferred(self, *modifiers):
+        """
+            load the deferred ``modifiers``. all the deferred modifiers if none are given.
+            modifiers that are not deferred are skipped
+        """
+        deferred = self._deferred
+        if modifiers:
+            modifiers = [m for m in modifiers if m in deferred]
+        else:
+            modifiers = [m for m in MODIFIERS if m in deferred]
+
+        if modifiers:
+            self._load_modifiers(modifiers)
 
     def load_spectrometer_parameters(self, spec_sha):
         if spec_sha:
@@ -226,9 +287,47 @@ class DVCAnalysis(Analysis):
         return jd
 
     def load_raw_data(self, keys=None, n_only=False, use_name_pairs=True):
+        """
+            load the signals for ``keys``, all if None. the raw data does not change once measured so
+            keys that are already loaded, e.g. by ``DVC.prefetch``, are not read again
+        """
+        if self._has_raw_data(keys, use_name_pairs):
+            return
+
         path = self._analysis_path(modifier='.data')
 
-        jd = dvc_load(path)
+        sidecar = load_sidecar(path)
+        if sidecar is not None:
+            with sidecar:
+                self._load_raw_data(sidecar.index, keys, n_only, use_name_pairs, sidecar)
+        else:
+            jd = dvc_load(path)
+            self._load_raw_data(jd, keys, n_only, use_name_pairs)
+
+            # build the sidecar so the next load does not parse the json. also rebuilds a stale sidecar,
+            # e.g. after a pull rewrote the json
+            try:
+                dump_sidecar_from_json(path, jd)
+            except OSError as e:
+                self.debug('failed building data sidecar. {}'.format(e))
+
+        if not n_only:
+            self._add_raw_data_keys(keys, use_name_pairs)
+
+    def _load_raw_data(self, jd, keys, n_only, use_name_pairs, sidecar=None):
+
+        def set_data(m, d):
+            if sidecar is not None:
+                key = d.get('key')
+                if key:
+                    if n_only:
+                        m.n = d.get('n', 0)
+                    else:
+                        m.set_data(*sidecar.get(key))
+            else:
+                blob = d.get('blob')
+                if blob:
+                    m.unpack_data(format_blob(blob), n_only)
 
         signals = jd.get('signals', [])
         baselines = jd.get('baselines', [])
@@ -252,16 +351,12 @@ class DVCAnalysis(Analysis):
             if not iso:
                 continue
 
-            blob = sd.get('blob')
-            if blob:
-                iso.unpack_data(format_blob(blob), n_only)
+            set_data(iso, sd)
 
             # det = sd['detector']
             bd = next((b for b in baselines if b.get('detector') == det), None)
             if bd:
-                blob = bd.get('blob')
-                if blob:
-                    iso.baseline.unpack_data(format_blob(blob), n_only)
+                set_data(iso.baseline, bd)
 
         # loop thru keys to make sure none were missed this can happen when only loading baseline
         if keys:
@@ -270,9 +365,7 @@ class DVCAnalysis(Analysis):
                 if bd:
                     for iso in self.itervalues():
                         if iso.detector == k:
-                            blob = bd.get('blob')
-                            if blob:
-                                iso.baseline.unpack_data(format_blob(blob), n_only)
+                            set_data(iso.baseline, bd)
 
         for sn in sniffs:
             isok = sn.get('isotope')
@@ -287,14 +380,9 @@ class DVCAnalysis(Analysis):
             if keys and key not in keys and isok not in keys:
                 continue
 
-            data = None
-            blob = sn.get('blob')
-            if blob:
-                data = format_blob(blob)
-
             for iso in self.itervalues():
                 if iso.detector == det:
-                    iso.sniff.unpack_data(data, n_only)
+                    set_data(iso.sniff, sn)
 
     def set_production(self, prod, r):
         self.production_obj = r
@@ -329,6 +417,7 @@ class DVCAnalysis(Analysis):
         self.calculate_decay_factors()
 
     def set_fits(self, fitobjs):
+        self.set_modified()
         isos = self.isotopes
         for fi in fitobjs:
             try:
@@ -387,6 +476,10 @@ class DVCAnalysis(Analysis):
         jd['sniffs'] = nsniffs
         dvc_dump(jd, path)
 
+        # keep the binary sidecar in sync with the rewritten json
+        if os.path.isfile(sidecar_path(path)):
+            dump_sidecar_from_json(path, jd)
+
         return path
 
     def dump_fits(self, keys, reviewed=False):
@@ -517,6 +610,44 @@ class DVCAnalysis(Analysis):
         return self._analysis_path(modifier=modifier)
 
     # private
+    def _has_raw_data(self, keys, use_name_pairs):
+        loaded = self._raw_data_keys
+        if loaded is None:
+            return False
+
+        if loaded is True:
+            return True
+
+        return bool(keys) and all((k, use_name_pairs) in loaded for k in keys)
+
+    def _add_raw_data_keys(self, keys, use_name_pairs):
+        if not keys:
+            self._raw_data_keys = True
+        elif self._raw_data_keys is not True:
+            self._raw_data_keys = (self._raw_data_keys or frozenset()).union((k, use_name_pairs) for k in keys)
+
+    def _load_modifiers(self, modifiers):
+        # removed before loading. the loaders read the deferred properties
+        self._deferred = self._deferred.difference(modifiers)
+
+        for modifier in modifiers:
+            path = self._analysis_path(modifier=modifier)
+            if path:
+                if os.path.isfile(path):
+                    jd = dvc_load(path)
+                    if jd:
+                        func = getattr(self, '_load_{}'.format(modifier))
+                        try:
+                            func(jd)
+                        except BaseException as e:
+                            self.warning('Failed loading {}. path={}. error={}'.format(modifier, path, e))
+                            import traceback
+                            self.debug(traceback.format_exc())
+                    else:
+                        self.debug('path is empty. {}'.format(path))
+                else:
+                    self.debug('Non-existent path. {}'.format(path))
+
     def _load_cosmogenic(self, jd):
         self.arar_constants.cosmo_from_dict(jd)
 
@@ -660,6 +791,7 @@ class DVCAnalysis(Analysis):
             path = self._analysis_path(modifier)
 
         dvc_dump(obj, path)
+        self.set_modified()
 
     def _analysis_path(self, repository_identifier=None, **kw):
         if repository_identifier is None:
@@ -32,6 +32,7 @@ from pychron.core.spell_correct import correct
 from pychron.core.utils import alpha_to_int
 from pychron.database.core.database_adapter import DatabaseAdapter, binfunc
 from pychron.database.core.query import compile_query, in_func
+from pychron.database.records.analysis_record import AnalysisRecord
 from pychron.dvc.dvc_orm import AnalysisTbl, ProjectTbl, MassSpectrometerTbl, \
     IrradiationTbl, LevelTbl, SampleTbl, \
     MaterialTbl, IrradiationPositionTbl, UserTbl, ExtractDeviceTbl, \
@@ -1008,7 +1009,7 @@ class DVCDatabase(DatabaseAdapter):
             return q.count()
 
     def get_analyses_advanced(self, advanced_filter, uuids=None, identifiers=None, return_labnumbers=False,
-                              include_invalid=False, limit=None, verbose=False):
+                              include_invalid=False, limit=None, verbose=False, record_views=False):
         with self.session_ctx() as sess:
             if return_labnumbers:
                 q = sess.query(IrradiationPositionTbl)
@@ -1046,6 +1047,9 @@ class DVCDatabase(DatabaseAdapter):
             if not include_invalid and not return_labnumbers:
                 q = q.filter(AnalysisChangeTbl.tag != 'invalid')
 
+            if record_views and not return_labnumbers:
+                return self._query_analysis_records(sess, q, limit=limit, verbose_query=verbose)
+
             if limit:
                 q = q.limit(limit)
 
@@ -1353,7 +1357,8 @@ class DVCDatabase(DatabaseAdapter):
                                loads=None,
                                order='asc',
                                limit=None,
-                               verbose_query=True):
+                               verbose_query=True,
+                               record_views=False):
 
         with self.session_ctx() as sess:
             q = sess.query(AnalysisTbl)
@@ -1386,6 +1391,10 @@ class DVCDatabase(DatabaseAdapter):
             if omit_key:
                 q = q.filter(AnalysisChangeTbl.tag != omit_key)
 
+            if record_views:
+                rs = self._query_analysis_records(sess, q, order, limit, verbose_query=verbose_query)
+                return rs, len(rs)
+
             if order:
                 q = q.order_by(getattr(AnalysisTbl.timestamp, order)())
 
@@ -1424,7 +1433,8 @@ class DVCDatabase(DatabaseAdapter):
                                    exclude=None,
                                    exclude_uuids=None,
                                    exclude_invalid=True,
-                                   verbose=True):
+                                   verbose=True,
+                                   record_views=False):
         if verbose:
             self.debug('------get analyses by date range parameters------')
             self.debug('low={}'.format(lpost))
@@ -1475,6 +1485,9 @@ class DVCDatabase(DatabaseAdapter):
                 q = q.filter(not_(AnalysisTbl.id.in_(exclude)))
             if exclude_uuids:
                 q = q.filter(not_(AnalysisTbl.uuid.in_(exclude_uuids)))
+            if record_views:
+                return self._query_analysis_records(sess, q, order, limit, verbose_query=verbose)
+
             q = q.order_by(getattr(AnalysisTbl.timestamp, order)())
             if limit:
                 q = q.limit(limit)
@@ -2334,6 +2347,80 @@ class DVCDatabase(DatabaseAdapter):
             desc = AnalysisTbl.timestamp.desc()
         return super(DVCDatabase, self)._get_date_range(q, asc, desc, hours=hours)
 
+    def _query_analysis_records(self, sess, q, order=None, limit=None, verbose_query=False):
+        """
+            return an ``AnalysisRecord`` for each analysis matched by ``q``.
+
+            ``q`` is a filtered ``AnalysisTbl`` query without order or limit. it is used as a subquery of ids so
+            the records are built from three queries, the analysis columns, the repository associations and
+            the measured positions, regardless of the number of analyses. loading the ORM objects instead lazy
+            loads the level, sample, project etc. analysis by analysis
+        """
+        q = q.with_entities(AnalysisTbl.id.label('aid'), AnalysisTbl.timestamp.label('ts')).distinct()
+
+        ts, aid = AnalysisTbl.timestamp, AnalysisTbl.id
+        if order:
+            q = q.order_by(getattr(ts, order)(), getattr(aid, order)())
+        elif limit:
+            q = q.order_by(aid)
+
+        if limit:
+            q = q.limit(limit)
+
+        sub = q.subquery()
+
+        cols = (AnalysisTbl.id, AnalysisTbl.uuid, IrradiationPositionTbl.identifier,
+                AnalysisTbl.aliquot, AnalysisTbl.increment, AnalysisTbl.timestamp,
+                AnalysisTbl.analysis_type, AnalysisTbl.experiment_type, AnalysisTbl.mass_spectrometer,
+                AnalysisTbl.extract_device, AnalysisTbl.extract_value, AnalysisTbl.extract_units,
+                AnalysisTbl.cleanup, AnalysisTbl.pre_cleanup, AnalysisTbl.post_cleanup,
+                AnalysisTbl.cryo_temperature, AnalysisTbl.duration, AnalysisTbl.weight,
+                AnalysisTbl.comment, AnalysisTbl.measurementName, AnalysisTbl.extractionName,
+                IrradiationTbl.name, LevelTbl.name, IrradiationPositionTbl.position, IrradiationPositionTbl.packet,
+                SampleTbl.name, MaterialTbl.name, ProjectTbl.name, AnalysisChangeTbl.tag,
+                PrincipalInvestigatorTbl.last_name, PrincipalInvestigatorTbl.first_initial)
+
+        aq = sess.query(*cols).select_from(sub)
+        aq = aq.join(AnalysisTbl, AnalysisTbl.id == sub.c.aid)
+        aq = aq.outerjoin(AnalysisChangeTbl, AnalysisChangeTbl.analysisID == AnalysisTbl.id)
+        aq = aq.outerjoin(IrradiationPositionTbl, IrradiationPositionTbl.id == AnalysisTbl.irradiation_positionID)
+        aq = aq.outerjoin(LevelTbl, LevelTbl.id == IrradiationPositionTbl.levelID)
+        aq = aq.outerjoin(IrradiationTbl, IrradiationTbl.id == LevelTbl.irradiationID)
+        aq = aq.outerjoin(SampleTbl, SampleTbl.id == IrradiationPositionTbl.sampleID)
+        aq = aq.outerjoin(MaterialTbl, MaterialTbl.id == SampleTbl.materialID)
+        aq = aq.outerjoin(ProjectTbl, ProjectTbl.id == SampleTbl.projectID)
+        aq = aq.outerjoin(PrincipalInvestigatorTbl,
+                          PrincipalInvestigatorTbl.id == ProjectTbl.principal_investigatorID)
+        if order:
+            aq = aq.order_by(getattr(sub.c.ts, order)(), getattr(sub.c.aid, order)())
+
+        rows = self._query_all(aq, verbose_query=verbose_query)
+        if not rows:
+            return []
+
+        rq = sess.query(RepositoryAssociationTbl.analysisID, RepositoryAssociationTbl.repository)
+        rq = rq.join(sub, sub.c.aid == RepositoryAssociationTbl.analysisID)
+        repos = {}
+        for i, r in self._query_all(rq):
+            repos.setdefault(i, []).append(r)
+
+        mq = sess.query(MeasuredPositionTbl.analysisID, MeasuredPositionTbl.position,
+                        MeasuredPositionTbl.loadName, LoadTbl.holderName)
+        mq = mq.join(sub, sub.c.aid == MeasuredPositionTbl.analysisID)
+        mq = mq.outerjoin(LoadTbl, LoadTbl.name == MeasuredPositionTbl.loadName)
+        mq = mq.order_by(MeasuredPositionTbl.id)
+        positions = {}
+        for i, p, ln, lh in self._query_all(mq):
+            positions.setdefault(i, []).append((p, ln, lh))
+
+        def make_record(row):
+            aid = row[0]
+            last_name, first_initial = row[-2:]
+            pi = '{}, {}'.format(last_name, first_initial) if first_initial else last_name
+            return AnalysisRecord(tuple(row[:-2]) + (pi,), repos.get(aid, ()), positions.get(aid, ()))
+
+        return [make_record(r) for r in rows]
+
     def _get_similar(self, name, attr, q):
         f = or_(attr == name, attr.like('{}%{}'.format(name[0], name[-1])))
         q = q.filter(f)
@@ -17,19 +17,23 @@
 import hashlib
 import os
 import shutil
+from contextlib import contextmanager
 from datetime import datetime
+from threading import Lock
 
 from apptools.preferences.preference_binding import bind_preference
 from git.exc import GitCommandError
 # ============= enthought library imports =======================
 from sqlalchemy.exc import OperationalError, DatabaseError
-from traits.api import Instance, Bool, Str
+from traits.api import Instance, Bool, Str, Int, Float
 from uncertainties import std_dev, nominal_value
 from yaml import YAMLError
 
 from pychron.core.helpers.binpack import encode_blob, pack
 from pychron.core.yaml import yload
 from pychron.dvc import dvc_dump, analysis_path, repository_path, NPATH_MODIFIERS
+from pychron.dvc.data_sidecar import dump_sidecar
+from pychron.dvc.publish_queue import DVCPublishQueue, PublishError, make_publish_job, commit_publish_job
 from pychron.experiment.automated_run.persistence import BasePersister
 from pychron.git_archive.repo_manager import GitRepoManager
 from pychron.paths import paths
@@ -57,6 +61,7 @@ class DVCPersister(BasePersister):
     dvc = Instance(DVC_PROTOCOL)
     use_isotope_classifier = Bool(False)
     use_uuid_path_name = Bool(True)
+    use_data_sidecar = Bool(True)
     # isotope_classifier = Instance(IsotopeClassifier, ())
     stage_files = Bool(True)
     default_principal_investigator = Str
@@ -65,13 +70,43 @@ class DVCPersister(BasePersister):
     save_log_enabled = Bool(False)
     arar_mapping = None
 
+    # commit and push on a worker thread. see DVCPublishQueue
+    use_publish_queue = Bool(False)
+    publish_push_every = Int(5)
+    publish_push_interval = Float(300)
+    publish_queue = Instance(DVCPublishQueue)
+
     def __init__(self, bind=True, *args, **kw):
         super(DVCPersister, self).__init__(*args, **kw)
         if bind:
             bind_preference(self, 'use_uuid_path_name', 'pychron.experiment.use_uuid_path_name')
+            bind_preference(self, 'use_data_sidecar', 'pychron.dvc.experiment.use_data_sidecar')
+            bind_preference(self, 'use_publish_queue', 'pychron.dvc.experiment.use_publish_queue')
+            bind_preference(self, 'publish_push_every', 'pychron.dvc.experiment.publish_push_every')
+            bind_preference(self, 'publish_push_interval', 'pychron.dvc.experiment.publish_push_interval')
 
+        self._repository_lock = Lock()
         self._load_arar_mapping()
 
+    @property
+    def publish_depth(self):
+        """
+            number of saved analyses not yet pushed
+        """
+        q = self.publish_queue
+        return q.depth if q else 0
+
+    def flush_publish_queue(self):
+        if self.publish_queue:
+            self.publish_queue.flush()
+
+    def stop_publish_queue(self):
+        """
+            push the queued analyses and stop the worker. called when pychron exits
+        """
+        if self.publish_queue:
+            self.publish_queue.stop()
+
     def per_spec_save(self, pr, repository_identifier=None, commit=False, commit_tag=None, push=True):
         self.per_spec = pr
 
@@ -108,14 +143,27 @@ class DVCPersister(BasePersister):
         root = repository_path(repository)
         repo.open_repo(root)
 
-        remote = 'origin'
-        if repo.has_remote(remote) and pull:
-            self.info('pulling changes from repo: {}'.format(repository))
-            try:
-                repo.pull(remote=remote, use_progress=False, use_auto_pull=self.dvc.use_auto_pull)
-            except GitCommandError:
-                self.warning('failed pulling changes')
-                self.debug_exception()
+        if self.use_publish_queue and self.stage_files:
+            self._start_publish_queue()
+
+        if pull:
+            self._pull_repository(repo, repository)
+
+    def pull_repository(self, repository):
+        """
+            pull ``repository`` without making it the active repository.
+            used to prepare the next run while the current run is measuring
+
+            return True if the repository was pulled
+        """
+        repository = format_repository_identifier(repository)
+        root = repository_path(repository)
+        if not os.path.isdir(root):
+            return False
+
+        repo = GitRepoManager()
+        repo.open_repo(root)
+        return self._pull_repository(repo, repository)
 
     def pre_extraction_save(self):
         pass
@@ -236,7 +284,9 @@ class DVCPersister(BasePersister):
         # will modify repository to NoRepo if repository_identifier does not exist
         self._check_repository_identifier()
 
-        self._save_analysis(timestamp)
+        # the meta repo scripts are staged by _save_analysis
+        with self._git_lock():
+            self._save_analysis(timestamp)
 
         # save monitor
         self._save_monitor()
@@ -249,62 +299,35 @@ class DVCPersister(BasePersister):
 
         if self.stage_files:
             if commit:
-                try:
-                    ar.smart_pull(accept_their=True)
-
-                    paths = [spec_path, ] + [self._make_path(modifier=m) for m in NPATH_MODIFIERS]
-
-                    for p in paths:
-                        if os.path.isfile(p):
-                            ar.add(p, commit=False)
-                        else:
-                            self.debug('not at valid file {}'.format(p))
-
-                    # commit files
-                    ar.commit('<{}>'.format(commit_tag))
-
-                    # commit default data reduction
-                    add = False
-                    p = self._make_path('intercepts')
-                    if os.path.isfile(p):
-                        ar.add(p, commit=False)
-                        add = True
-
-                    p = self._make_path('baselines')
-                    if os.path.isfile(p):
-                        ar.add(p, commit=False)
-                        add = True
-
-                    if add:
-                        ar.commit('<ISOEVO> default collection fits')
-
-                    for pp, tag, msg in (('blanks', 'BLANKS',
-                                          'preceding {}'.format(self.per_spec.previous_blank_runid)),
-                                         ('icfactors', 'ICFactor', 'default')):
-                        p = self._make_path(pp)
-                        if os.path.isfile(p):
-                            ar.add(p, commit=False)
-                            ar.commit('<{}> {}'.format(tag, msg))
-                    if push:
-                        # push changes
-                        dvc.push_repository(ar)
-
-                    # update meta
-                    dvc.meta_pull(accept_our=True)
-
-                    dvc.meta_commit('repo updated for analysis {}'.format(self.per_spec.run_spec.runid))
-
-                    if push:
-                        # push commit
-                        dvc.meta_push()
-                except GitCommandError as e:
-                    self.warning(e)
-                    if self.confirmation_dialog('NON FATAL\n\n'
-                                                'DVC/Git upload of analysis not successful.'
-                                                'Do you want to CANCEL the experiment?\n',
-                                                timeout_ret=False,
-                                                timeout=30):
-                        ret = False
+                job = self._make_publish_job(spec_path, commit_tag)
+                if push and self.publish_queue:
+                    # files are written. commit and push in the background
+                    self.publish_queue.put(job)
+                else:
+                    try:
+                        with self._git_lock():
+                            ar.smart_pull(accept_their=True)
+                            commit_publish_job(ar, job)
+                            if push:
+                                # push changes
+                                dvc.push_repository(ar)
+
+                            # update meta
+                            dvc.meta_pull(accept_our=True)
+
+                            dvc.meta_commit('repo updated for analysis {}'.format(self.per_spec.run_spec.runid))
+
+                            if push:
+                                # push commit
+                                dvc.meta_push()
+                    except (GitCommandError, PublishError) as e:
+                        self.warning(e)
+                        if self.confirmation_dialog('NON FATAL\n\n'
+                                                    'DVC/Git upload of analysis not successful.'
+                                                    'Do you want to CANCEL the experiment?\n',
+                                                    timeout_ret=False,
+                                                    timeout=30):
+                            ret = False
 
         with dvc.session_ctx():
             try:
@@ -324,12 +347,85 @@ class DVCPersister(BasePersister):
             npath = self._make_path('logs', '.log')
             shutil.copyfile(path, npath)
             ar = self.active_repository
-            ar.smart_pull(accept_their=True)
-            ar.add(npath, commit=False)
-            ar.commit('<COLLECTION> log')
-            self.dvc.push_repository(ar)
+            job = make_publish_job(os.path.basename(ar.path), self.per_spec.run_spec.runid, (npath,),
+                                   '<COLLECTION> log')
+            if self.publish_queue:
+                self.publish_queue.put(job)
+            else:
+                ar.smart_pull(accept_their=True)
+                try:
+                    commit_publish_job(ar, job)
+                except PublishError as e:
+                    self.warning(e)
+                    return
+                self.dvc.push_repository(ar)
 
     # private
+    def _make_publish_job(self, spec_path, commit_tag):
+        """
+            the files of the current analysis. committed in one commit. the default data reduction, previously
+            committed separately, is listed in the commit message
+        """
+        # the data sidecar is a local cache and is not committed
+        ps = [spec_path, ] + [self._make_path(modifier=m) for m in NPATH_MODIFIERS]
+
+        body = []
+        fits = [p for p in (self._make_path('intercepts'), self._make_path('baselines')) if os.path.isfile(p)]
+        if fits:
+            ps.extend(fits)
+            body.append('<ISOEVO> default collection fits')
+
+        for pp, tag, msg in (('blanks', 'BLANKS', 'preceding {}'.format(self.per_spec.previous_blank_runid)),
+                             ('icfactors', 'ICFactor', 'default')):
+            p = self._make_path(pp)
+            if os.path.isfile(p):
+                ps.append(p)
+                body.append('<{}> {}'.format(tag, msg))
+
+        for p in ps:
+            if not os.path.isfile(p):
+                self.debug('not at valid file {}'.format(p))
+
+        return make_publish_job(os.path.basename(self.active_repository.path), self.per_spec.run_spec.runid,
+                                [p for p in ps if os.path.isfile(p)], '<{}>'.format(commit_tag), body)
+
+    def _start_publish_queue(self):
+        q = self.publish_queue
+        if q is None:
+            q = DVCPublishQueue(dvc=self.dvc, path=os.path.join(paths.dvc_dir, 'publish_queue.json'))
+            self.publish_queue = q
+
+        q.trait_set(push_every=self.publish_push_every, push_interval=self.publish_push_interval)
+        q.start()
+
+    def _pull_repository(self, repo, repository):
+        remote = 'origin'
+        if repo.has_remote(remote):
+            self.info('pulling changes from repo: {}'.format(repository))
+            try:
+                with self._git_lock():
+                    repo.pull(remote=remote, use_progress=False, use_auto_pull=self.dvc.use_auto_pull)
+                return True
+            except GitCommandError:
+                self.warning('failed pulling changes')
+                self.debug_exception()
+
+        return False
+
+    @contextmanager
+    def _git_lock(self):
+        """
+            hold the publish queue's lock so the worker does not change a repository at the same time.
+            without a publish queue hold the persister's lock so a repository is not pulled for the next run
+            while an analysis is committed
+        """
+        if self.publish_queue:
+            with self.publish_queue.lock:
+                yield
+        else:
+            with self._repository_lock:
+                yield
+
     def _load_arar_mapping(self):
         """
         Isotope: IsotopeKey
@@ -501,6 +597,7 @@ class DVCPersister(BasePersister):
         signals = []
         baselines = []
         sniffs = []
+        raw = {'signals': [], 'baselines': [], 'sniffs': []}
         blanks = {}
         intercepts = {}
         cbaselines = {}
@@ -524,6 +621,9 @@ class DVCPersister(BasePersister):
                 d = {'isotope': iso.name, 'detector': iso.detector, 'blob': blob}
                 ss.append(d)
 
+            for kind, m in (('signals', iso), ('sniffs', iso.sniff)):
+                raw[kind].append({'isotope': iso.name, 'detector': iso.detector, 'xs': m.xs, 'ys': m.ys})
+
             detector = next((d for d in per_spec.active_detectors if d.name == iso.detector), None)
 
             isod = {'detector': iso.detector, 'name': iso.name,
@@ -539,6 +639,7 @@ class DVCPersister(BasePersister):
             if iso.detector not in dets:
                 bblob = encode_blob(iso.baseline.pack(endianness, as_hex=False))
                 baselines.append({'detector': iso.detector, 'blob': bblob})
+                raw['baselines'].append({'detector': iso.detector, 'xs': iso.baseline.xs, 'ys': iso.baseline.ys})
                 dets[iso.detector] = {'deflection': per_spec.defl_dict.get(iso.detector),
                                       'gain': per_spec.gains.get(iso.detector)}
 
@@ -647,6 +748,9 @@ class DVCPersister(BasePersister):
                 'signals': signals, 'baselines': baselines, 'sniffs': sniffs}
         dvc_dump(data, p)
 
+        if self.use_data_sidecar:
+            dump_sidecar(p, raw['signals'], raw['baselines'], raw['sniffs'])
+
     def _save_macrochron(self, obj):
         pass
 
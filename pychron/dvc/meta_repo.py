@@ -16,9 +16,11 @@
 import os
 import shutil
 from datetime import datetime
+from functools import wraps
 
+from git import GitError
 from traits.api import Bool
-from uncertainties import ufloat
+from uncertainties import ufloat, nominal_value, std_dev
 
 from pychron.core.helpers.datetime_tools import ISO_FORMAT_STR
 from pychron.core.helpers.filetools import glob_list_directory, add_extension, \
@@ -83,6 +85,39 @@ def get_frozen_productions(repo):
     return prods
 
 
+def make_flux(pos):
+    """
+        make a flux dict from a level position dict. defaults are used if pos is None
+    """
+    j, je, pe, lambda_k = 0, 0, 0, None
+    monitor_name, monitor_material, monitor_age = DEFAULT_MONITOR_NAME, 'sanidine', ufloat(28.201, 0)
+    if pos:
+        j, je, pe = pos.get('j', 0), pos.get('j_err', 0), pos.get('position_jerr', 0)
+        dc = pos.get('decay_constants')
+        if dc:
+            # this was a temporary fix and likely can be removed
+            if isinstance(dc, float):
+                v, e = dc, 0
+            else:
+                v, e = dc.get('lambda_k_total', 0), dc.get('lambda_k_total_error', 0)
+            lambda_k = ufloat(v, e)
+        mon = pos.get('monitor')
+        if mon:
+            monitor_name = mon.get('name', DEFAULT_MONITOR_NAME)
+            sa = mon.get('age', 28.201)
+            se = mon.get('error', 0)
+            monitor_age = ufloat(sa, se, tag='monitor_age')
+            monitor_material = mon.get('material', 'sanidine')
+
+    fd = {'j': ufloat(j, je, tag='J'),
+          'position_jerr': pe,
+          'lambda_k': lambda_k,
+          'monitor_name': monitor_name,
+          'monitor_material': monitor_material,
+          'monitor_age': monitor_age}
+    return fd
+
+
 def get_frozen_flux(repo, irradiation):
     path = repository_path(repo, '{}.json'.format(irradiation))
 
@@ -94,9 +129,86 @@ def get_frozen_flux(repo, irradiation):
     return fd
 
 
+def invalidates_index(func):
+    """
+        decorator for MetaRepo methods that write level, production or chronology files
+    """
+
+    @wraps(func)
+    def wrapper(obj, *args, **kw):
+        try:
+            return func(obj, *args, **kw)
+        finally:
+            obj.invalidate_index()
+
+    return wrapper
+
+
+def copy_flux(fd):
+    """
+        copy a flux dict with new J, lambda_k and monitor age ufloats so analyses sharing a position do not
+        share (and correlate) their uncertainties
+    """
+    fd = dict(fd)
+    for k in ('j', 'lambda_k', 'monitor_age'):
+        v = fd.get(k)
+        if v is not None:
+            fd[k] = ufloat(nominal_value(v), std_dev(v), tag=v.tag)
+    return fd
+
+
+class MetaIndex(object):
+    """
+        in memory index of the level, production and chronology files for one meta repo HEAD commit
+    """
+
+    def __init__(self, head=None):
+        self.head = head
+        # (irradiation, level): positions list
+        self.positions = {}
+        # (irradiation, level): {position: position dict}
+        self.levels = {}
+        # (irradiation, level): {position: flux dict}
+        self.fluxes = {}
+        # (irradiation, level, allow_null): (production name, Production)
+        self.productions = {}
+        # (irradiation, allow_null): Chronology
+        self.chronologies = {}
+
+
 class MetaRepo(GitRepoManager):
     clear_cache = Bool
 
+    _index = None
+
+    def refresh_index(self):
+        """
+            discard the index if HEAD has moved since it was built. return True if the index was discarded
+        """
+        head = self._get_index_head()
+        idx = self._index
+        if idx is None or idx.head != head:
+            self._index = MetaIndex(head)
+            return True
+
+    def invalidate_index(self):
+        self._index = None
+
+    def commit(self, msg):
+        ret = super(MetaRepo, self).commit(msg)
+        self.refresh_index()
+        return ret
+
+    def pull(self, *args, **kw):
+        ret = super(MetaRepo, self).pull(*args, **kw)
+        self.refresh_index()
+        return ret
+
+    def smart_pull(self, *args, **kw):
+        ret = super(MetaRepo, self).smart_pull(*args, **kw)
+        self.refresh_index()
+        return ret
+
     def get_correlation_ellipses(self):
         p = os.path.join(paths.meta_root, 'correlation_ellipses.json')
         return dvc_load(p)
@@ -134,6 +246,7 @@ class MetaRepo(GitRepoManager):
     def update_experiment_queue(self, rootname, name, path_or_blob):
         self._update_text(os.path.join('experiments', rootname.lower()), name, path_or_blob)
 
+    @invalidates_index
     def update_level_production(self, irrad, name, prname, note=None):
         prname = prname.replace(' ', '_')
 
@@ -145,6 +258,7 @@ class MetaRepo(GitRepoManager):
         else:
             self.warning_dialog('Invalid production name'.format(prname))
 
+    @invalidates_index
     def update_level_monitor(self, irradiation, level, monitor_name, monitor_material, monitor_age, lambda_k):
         path = self.get_level_path(irradiation, level)
         obj = dvc_load(path)
@@ -162,6 +276,7 @@ class MetaRepo(GitRepoManager):
 
         dvc_dump(obj, path)
 
+    @invalidates_index
     def add_production_to_irradiation(self, irrad, name, params, add=True, commit=False):
         self.debug('adding production {} to irradiation={}'.format(name, irrad))
         p = os.path.join(paths.meta_root, irrad, 'productions', add_extension(name, '.json'))
@@ -172,6 +287,7 @@ class MetaRepo(GitRepoManager):
         if add:
             self.add(p, commit=commit)
 
+    @invalidates_index
     def add_production(self, irrad, name, obj, commit=False, add=True):
         p = self.get_production(irrad, name, force=True)
 
@@ -193,6 +309,7 @@ class MetaRepo(GitRepoManager):
         if add:
             self.add(p.path, commit=commit)
 
+    @invalidates_index
     def update_production(self, prod, irradiation=None):
         ip = self.get_production(prod.name)
         self.debug('saving production {}'.format(prod.name))
@@ -207,6 +324,7 @@ class MetaRepo(GitRepoManager):
         self.add(ip.path, commit=False)
         self.commit('updated production {}'.format(prod.name))
 
+    @invalidates_index
     def update_productions(self, irrad, level, production, note=None, add=True):
         p = os.path.join(paths.meta_root, irrad, 'productions.json')
 
@@ -227,6 +345,7 @@ class MetaRepo(GitRepoManager):
             if add:
                 self.add(p, commit=False)
 
+    @invalidates_index
     def set_identifier(self, irradiation, level, pos, identifier):
         p = self.get_level_path(irradiation, level)
         jd = dvc_load(p)
@@ -243,6 +362,7 @@ class MetaRepo(GitRepoManager):
     def get_level_path(self, irrad, level):
         return os.path.join(paths.meta_root, irrad, '{}.json'.format(level))
 
+    @invalidates_index
     def add_level(self, irrad, level, add=True):
         p = self.get_level_path(irrad, level)
         lv = dict(z=0, positions=[])
@@ -250,6 +370,7 @@ class MetaRepo(GitRepoManager):
         if add:
             self.add(p, commit=False)
 
+    @invalidates_index
     def add_chronology(self, irrad, doses, add=True):
         p = os.path.join(paths.meta_root, irrad, 'chronology.txt')
 
@@ -262,6 +383,7 @@ class MetaRepo(GitRepoManager):
         if not os.path.isdir(p):
             os.mkdir(p)
 
+    @invalidates_index
     def add_position(self, irradiation, level, pos, add=True):
         p = self.get_level_path(irradiation, level)
         jd = dvc_load(p)
@@ -341,6 +463,7 @@ class MetaRepo(GitRepoManager):
         if add:
             self.add(p, commit=commit)
 
+    @invalidates_index
     def update_level_z(self, irradiation, level, z):
         p = self.get_level_path(irradiation, level)
         obj = dvc_load(p)
@@ -356,6 +479,7 @@ class MetaRepo(GitRepoManager):
         if add:
             self.add(p, commit=False)
 
+    @invalidates_index
     def remove_irradiation_position(self, irradiation, level, hole):
         p = self.get_level_path(irradiation, level)
         jd = dvc_load(p)
@@ -372,6 +496,7 @@ class MetaRepo(GitRepoManager):
             dvc_dump(obj, p)
             self.add(p, commit=False)
 
+    @invalidates_index
     def new_flux_positions(self, irradiation, level, positions, add=True):
         p = self.get_level_path(irradiation, level)
         obj = {'positions': positions, 'z': 0}
@@ -379,6 +504,7 @@ class MetaRepo(GitRepoManager):
         if add:
             self.add(p, commit=False)
 
+    @invalidates_index
     def update_fluxes(self, irradiation, level, j, e, add=True):
         p = self.get_level_path(irradiation, level)
         jd = dvc_load(p)
@@ -397,6 +523,7 @@ class MetaRepo(GitRepoManager):
             if add:
                 self.add(p, commit=False)
 
+    @invalidates_index
     def update_flux(self, irradiation, level, pos, identifier, j, e, mj, me, decay=None,
                     position_jerr=None,
                     analyses=None, options=None, add=True):
@@ -441,6 +568,7 @@ class MetaRepo(GitRepoManager):
         if add:
             self.add(p, commit=False)
 
+    @invalidates_index
     def update_chronology(self, name, doses):
         p = os.path.join(paths.meta_root, name, 'chronology.txt')
         dump_chronology(p, doses)
@@ -485,43 +613,36 @@ class MetaRepo(GitRepoManager):
         return dvc_load(p)
 
     def get_flux_positions(self, irradiation, level):
-        positions = self._get_level_positions(irradiation, level)
-        return positions
+        idx = self._get_index()
+        key = (irradiation, level)
+        try:
+            return idx.positions[key]
+        except KeyError:
+            positions = idx.positions[key] = self._get_level_positions(irradiation, level)
+            return positions
+
+    def get_level_position(self, irradiation, level, position):
+        """
+            return the position dict for ``position`` or None. O(1)
+        """
+        return self._get_level_index(irradiation, level).get(position)
 
     def get_flux(self, irradiation, level, position):
-        positions = self.get_flux_positions(irradiation, level)
-        return self.get_flux_from_positions(position, positions)
+        """
+            return the flux dict for ``position``. O(1)
+        """
+        fluxes = self._get_flux_index(irradiation, level)
+        try:
+            fd = fluxes[position]
+        except KeyError:
+            fd = make_flux(None)
+        return copy_flux(fd)
 
     def get_flux_from_positions(self, position, positions):
-        j, je, pe, lambda_k = 0, 0, 0, None
-        monitor_name, monitor_material, monitor_age = DEFAULT_MONITOR_NAME, 'sanidine', ufloat(28.201, 0)
+        pos = None
         if positions:
             pos = next((p for p in positions if p['position'] == position), None)
-            if pos:
-                j, je, pe = pos.get('j', 0), pos.get('j_err', 0), pos.get('position_jerr', 0)
-                dc = pos.get('decay_constants')
-                if dc:
-                    # this was a temporary fix and likely can be removed
-                    if isinstance(dc, float):
-                        v, e = dc, 0
-                    else:
-                        v, e = dc.get('lambda_k_total', 0), dc.get('lambda_k_total_error', 0)
-                    lambda_k = ufloat(v, e)
-                mon = pos.get('monitor')
-                if mon:
-                    monitor_name = mon.get('name', DEFAULT_MONITOR_NAME)
-                    sa = mon.get('age', 28.201)
-                    se = mon.get('error', 0)
-                    monitor_age = ufloat(sa, se, tag='monitor_age')
-                    monitor_material = mon.get('material', 'sanidine')
-
-        fd = {'j': ufloat(j, je, tag='J'),
-              'position_jerr': pe,
-              'lambda_k': lambda_k,
-              'monitor_name': monitor_name,
-              'monitor_material': monitor_material,
-              'monitor_age': monitor_age}
-        return fd
+        return make_flux(pos)
 
     def get_gains(self, name):
         g = self.get_gain_obj(name)
@@ -570,8 +691,19 @@ class MetaRepo(GitRepoManager):
         p = gain_path(name)
         return Gains(p)
 
-    # @cached('clear_cache')
-    def get_production(self, irrad, level, allow_null=False, **kw):
+    def get_production(self, irrad, level, allow_null=False, force=False, **kw):
+        key = (irrad, level, allow_null)
+        idx = self._get_index()
+        if not force:
+            try:
+                return idx.productions[key]
+            except KeyError:
+                pass
+
+        ret = idx.productions[key] = self._get_production(irrad, level, allow_null)
+        return ret
+
+    def _get_production(self, irrad, level, allow_null):
         path = os.path.join(paths.meta_root, irrad, 'productions.json')
         obj = dvc_load(path)
 
@@ -582,17 +714,23 @@ class MetaRepo(GitRepoManager):
         # print 'new production id={}, name={}, irrad={}, level={}'.format(id(ip), pname, irrad, level)
         return pname, ip
 
-    # @cached('clear_cache')
     def get_chronology(self, name, allow_null=False, **kw):
-        chron = None
+        key = (name, allow_null)
+        idx = self._get_index()
         try:
-            chron = irradiation_chronology(name, allow_null=allow_null)
-            if self.application:
-                chron.use_irradiation_endtime = self.application.get_boolean_preference(
-                    'pychron.arar.constants.use_irradiation_endtime', False)
-        except MetaObjectException:
-            if name != 'NoIrradiation' and not name.startswith('Package'):
-                self.warning('Could not locate the irradiation chronology "{}"'.format(name))
+            chron = idx.chronologies[key]
+        except KeyError:
+            chron = None
+            try:
+                chron = irradiation_chronology(name, allow_null=allow_null)
+            except MetaObjectException:
+                if name != 'NoIrradiation' and not name.startswith('Package'):
+                    self.warning('Could not locate the irradiation chronology "{}"'.format(name))
+            idx.chronologies[key] = chron
+
+        if chron is not None and self.application:
+            chron.use_irradiation_endtime = self.application.get_boolean_preference(
+                'pychron.arar.constants.use_irradiation_endtime', False)
         return chron
 
     @cached('clear_cache')
@@ -610,6 +748,38 @@ class MetaRepo(GitRepoManager):
         return os.path.join(paths.meta_root, 'sensitivity.json')
 
     # private
+    def _get_index_head(self):
+        try:
+            return self.get_head()
+        except (AttributeError, ValueError, GitError):
+            pass
+
+    def _get_index(self):
+        if self._index is None:
+            self._index = MetaIndex(self._get_index_head())
+        return self._index
+
+    def _get_level_index(self, irrad, level):
+        idx = self._get_index()
+        key = (irrad, level)
+        try:
+            return idx.levels[key]
+        except KeyError:
+            d = {}
+            for p in self.get_flux_positions(irrad, level):
+                d.setdefault(p['position'], p)
+            idx.levels[key] = d
+            return d
+
+    def _get_flux_index(self, irrad, level):
+        idx = self._get_index()
+        key = (irrad, level)
+        try:
+            return idx.fluxes[key]
+        except KeyError:
+            d = idx.fluxes[key] = {k: make_flux(p) for k, p in self._get_level_index(irrad, level).items()}
+            return d
+
     def _get_level_positions(self, irrad, level):
         p = self.get_level_path(irrad, level)
         obj = dvc_load(p)
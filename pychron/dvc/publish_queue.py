@@ -0,0 +1,296 @@
+# ===============================================================================
+# Copyright 2026 ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+from traits.api import Any, Str, Int, Float
+# ============= standard library imports ========================
+import json
+import os
+import time
+from threading import Thread, RLock, Condition
+
+# ============= local library imports  ==========================
+from pychron.loggable import Loggable
+
+
+class PublishError(Exception):
+    pass
+
+
+def make_publish_job(repository, runid, paths, message, body=None):
+    """
+        one analysis to publish.
+
+        :param repository: name of the repository
+        :param paths: files to commit
+        :param message: commit subject, e.g. "<COLLECTION>"
+        :param body: additional lines of the commit message
+    """
+    return {'repository': repository,
+            'runid': runid,
+            'paths': list(paths),
+            'message': message,
+            'body': list(body or [])}
+
+
+def commit_publish_job(repo, job):
+    """
+        add the job's files to ``repo`` and commit them in one commit.
+
+        returns False if there was nothing to commit, e.g. the job was committed before a crash
+    """
+    for p in job['paths']:
+        if os.path.isfile(p):
+            repo.add(p, commit=False, verbose=False)
+
+    if not repo.index.diff('HEAD'):
+        return False
+
+    msg = job['message']
+    if job['body']:
+        msg = '{}\n\n{}'.format(msg, '\n'.join(job['body']))
+
+    if not repo.commit(msg):
+        raise PublishError('commit failed. repository={}, runid={}'.format(job['repository'], job['runid']))
+    return True
+
+
+class DVCPublishQueue(Loggable):
+    """
+        commits and pushes the analyses saved by ``DVCPersister`` on a worker thread.
+
+        ``put`` journals the job to ``path`` before returning and the job is removed from the journal once it is
+        committed, so jobs are not lost if pychron exits or crashes. the journal is reloaded by ``start``.
+
+        each job is committed as one commit. the repositories and the meta repository are pulled and pushed once
+        ``push_every`` analyses are committed, ``push_interval`` seconds after the first unpushed commit, or when
+        ``flush`` is called. failed commits and pushes are retried with exponential backoff.
+
+        git operations that change a repository's index or working tree must hold ``lock``. fetches do not
+    """
+    dvc = Any
+    path = Str
+    push_every = Int(5)
+    push_interval = Float(300)
+    retry_delay = Float(5)
+    max_retry_delay = Float(600)
+
+    # number of analyses not yet pushed
+    depth = Int
+
+    _thread = None
+
+    def __init__(self, *args, **kw):
+        super(DVCPublishQueue, self).__init__(*args, **kw)
+        self.lock = RLock()
+        self._cond = Condition()
+
+        self._jobs = []
+        # repository: runids committed but not pushed
+        self._unpushed = {}
+        self._first_unpushed = None
+
+        self._flush = False
+        self._stop = False
+        self._nfailures = 0
+        self._retry_at = 0
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+
+        self._load()
+        self._stop = False
+        self._thread = t = Thread(target=self._run, name='DVCPublishQueue')
+        t.daemon = True
+        t.start()
+
+    def stop(self, timeout=60):
+        """
+            publish the pending jobs and stop the worker. jobs that fail are left in the journal
+        """
+        with self._cond:
+            self._stop = True
+            self._flush = True
+            self._cond.notify()
+
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def put(self, job):
+        with self._cond:
+            self._jobs.append(job)
+            self._dump()
+            self._cond.notify()
+
+    def flush(self):
+        """
+            push now instead of waiting for ``push_every`` or ``push_interval``
+        """
+        with self._cond:
+            self._flush = True
+            self._retry_at = 0
+            self._cond.notify()
+
+    @property
+    def is_empty(self):
+        with self._cond:
+            return not self._jobs and not self._unpushed
+
+    # private
+    def _run(self):
+        while 1:
+            with self._cond:
+                while not self._stop and not self._is_ready():
+                    self._cond.wait(self._get_timeout())
+                stop = self._stop
+
+            self._publish()
+            if stop:
+                break
+
+    def _is_ready(self):
+        if time.time() < self._retry_at:
+            return False
+        return bool(self._jobs) or self._is_push_due()
+
+    def _is_push_due(self):
+        if not self._unpushed:
+            return False
+
+        if self._flush:
+            return True
+
+        if sum(len(v) for v in self._unpushed.values()) >= self.push_every:
+            return True
+
+        return time.time() - self._first_unpushed >= self.push_interval
+
+    def _get_timeout(self):
+        now = time.time()
+        if now < self._retry_at:
+            return self._retry_at - now
+
+        if self._unpushed:
+            return max(0.0, self._first_unpushed + self.push_interval - now)
+
+    def _publish(self):
+        while 1:
+            with self._cond:
+                if not self._jobs:
+                    break
+                job = self._jobs[0]
+
+            try:
+                repo = self.dvc.get_repository(job['repository'])
+                with self.lock:
+                    commit_publish_job(repo, job)
+            except Exception as e:
+                self._failed('commit {}'.format(job['runid']), e)
+                return
+
+            with self._cond:
+                self._jobs.pop(0)
+                self._unpushed.setdefault(job['repository'], []).append(job['runid'])
+                if self._first_unpushed is None:
+                    self._first_unpushed = time.time()
+                self._dump()
+
+        with self._cond:
+            if not self._is_push_due():
+                self._nfailures = 0
+                return
+            unpushed = {k: list(v) for k, v in self._unpushed.items()}
+
+        try:
+            self._push(unpushed)
+        except Exception as e:
+            self._failed('push', e)
+            return
+
+        with self._cond:
+            self._unpushed = {}
+            self._first_unpushed = None
+            self._flush = False
+            self._nfailures = 0
+            self._dump()
+
+    def _push(self, unpushed):
+        dvc = self.dvc
+        runids = []
+        for name, rs in unpushed.items():
+            self.debug('publishing {}. {}'.format(name, ','.join(rs)))
+            repo = dvc.get_repository(name)
+            # fetch without the lock so a slow remote does not block DVCPersister saving the next run
+            repo.fetch(handled=False)
+            with self.lock:
+                repo.smart_pull(accept_their=True, fetch=False)
+            dvc.push_repository(repo, handled=False)
+            runids.extend(rs)
+
+        dvc.meta_fetch(handled=False)
+        with self.lock:
+            dvc.meta_pull(accept_our=True, fetch=False)
+            dvc.meta_commit('repo updated for analyses {}'.format(','.join(runids)))
+        dvc.meta_push(handled=False)
+
+    def _failed(self, tag, e):
+        self._nfailures += 1
+        delay = min(self.max_retry_delay, self.retry_delay * 2 ** (self._nfailures - 1))
+        self.warning('Publish failed. {}. retry #{} in {:0.0f}s. error={}'.format(tag, self._nfailures, delay, e))
+        with self._cond:
+            self._retry_at = time.time() + delay
+
+    def _load(self):
+        with self._cond:
+            if self.path and os.path.isfile(self.path):
+                try:
+                    with open(self.path, 'r') as rfile:
+                        obj = json.load(rfile)
+                except ValueError as e:
+                    self.warning('Invalid publish journal {}. {}'.format(self.path, e))
+                else:
+                    self._jobs = obj.get('jobs', []) + self._jobs
+                    for k, v in obj.get('unpushed', {}).items():
+                        self._unpushed.setdefault(k, []).extend(v)
+
+                    if self._jobs or self._unpushed:
+                        self.info('resuming publish. jobs={}, unpushed={}'.format(len(self._jobs),
+                                                                                   len(self._unpushed)))
+                        self._first_unpushed = time.time()
+                        self._flush = True
+            self._update_depth()
+
+    def _dump(self):
+        """
+            write the journal. must hold ``_cond``
+        """
+        self._update_depth()
+        if not self.path:
+            return
+
+        tmp = '{}.tmp'.format(self.path)
+        with open(tmp, 'w') as wfile:
+            json.dump({'jobs': self._jobs, 'unpushed': self._unpushed}, wfile)
+            wfile.flush()
+            os.fsync(wfile.fileno())
+        os.replace(tmp, self.path)
+
+    def _update_depth(self):
+        self.depth = len(self._jobs) + sum(len(v) for v in self._unpushed.values())
+
+# ============= EOF =============================================
@@ -240,6 +240,15 @@ class ClearCacheAction(Action):
         dvc.clear_cache()
 
 
+class CacheStatsAction(Action):
+    name = 'Cache Stats'
+
+    def perform(self, event):
+        app = event.task.window.application
+        dvc = app.get_service(DVC_PROTOCOL)
+        information(None, dvc.report_cache_stats())
+
+
 class WorkOfflineAction(Action):
     name = 'Work Offline'
 
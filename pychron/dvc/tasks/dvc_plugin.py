@@ -30,7 +30,7 @@ from pychron.dvc.dvc import DVC
 from pychron.dvc.dvc_persister import DVCPersister
 from pychron.dvc.tasks import list_local_repos
 from pychron.dvc.tasks.actions import WorkOfflineAction, UseOfflineDatabase, ShareChangesAction, ClearCacheAction, \
-    GenerateCurrentsAction
+    GenerateCurrentsAction, CacheStatsAction
 from pychron.dvc.tasks.dvc_preferences import DVCConnectionPreferencesPane, DVCExperimentPreferencesPane, \
     DVCRepositoryPreferencesPane, DVCPreferencesPane
 from pychron.dvc.tasks.repo_task import ExperimentRepoTask
@@ -62,6 +62,10 @@ class DVCPlugin(BaseTaskPlugin):
         # prog.change_message('Pushing changes to meta repository')
         # dvc.meta_repo.cmd('push', '-u','origin','master')
 
+        persister = self.application.get_service(DVCPersister)
+        if persister:
+            persister.stop_publish_queue()
+
         dvc = self.application.get_service(DVC)
         with dvc.session_ctx(use_parent_session=False):
             names = dvc.get_usernames()
@@ -151,6 +155,8 @@ class DVCPlugin(BaseTaskPlugin):
                    SchemaAddition(factory=ShareChangesAction,
                                   path='MenuBar/tools.menu'),
                    SchemaAddition(factory=ClearCacheAction,
+                                  path='MenuBar/tools.menu'),
+                   SchemaAddition(factory=CacheStatsAction,
                                   path='MenuBar/tools.menu')
                    ]
 
@@ -16,7 +16,7 @@
 
 # ============= enthought library imports =======================
 from envisage.ui.tasks.preferences_pane import PreferencesPane
-from traits.api import Str, Bool, Int
+from traits.api import Str, Bool, Int, Float
 from traitsui.api import View, Item, HGroup, VGroup
 
 from pychron.core.helpers.strtools import to_bool
@@ -86,6 +86,15 @@ class DVCPreferences(BasePreferencesHelper):
     use_cocktail_irradiation = Bool
     use_cache = Bool
     max_cache_size = Int
+    max_cache_memory = Int
+    use_cache_spill = Bool
+    max_cache_spill = Int
+    make_analyses_workers = Int
+    repository_sync_workers = Int
+    repository_fetch_ttl = Int
+    use_scoped_db_sessions = Bool
+    db_pool_size = Int(5)
+    db_max_overflow = Int(10)
     update_currents_enabled = Bool
     use_auto_pull = Bool(True)
 
@@ -106,8 +115,37 @@ class DVCPreferencesPane(PreferencesPane):
                                                                                       'the official version.')),
                         BorderVGroup(Item('update_currents_enabled', label='Enabled'),
                                      label='Current Values'),
+                        BorderVGroup(Item('make_analyses_workers', label='Workers',
+                                          tooltip='Number of threads used to build analyses. '
+                                                  '0 or 1=build analyses one at a time'),
+                                     Item('repository_sync_workers', label='Sync Workers',
+                                          tooltip='Number of repositories fetched at the same time before '
+                                                  'loading analyses. 0 or 1=fetch one at a time'),
+                                     Item('repository_fetch_ttl', label='Fetch TTL (s)',
+                                          tooltip='Do not fetch a repository again if it was fetched less than '
+                                                  'this many seconds ago. 0=always fetch'),
+                                     label='Analysis Loading'),
+                        BorderVGroup(Item('use_scoped_db_sessions', label='Session per Thread',
+                                          tooltip='Give each thread its own database session so background '
+                                                  'loaders can query the database in parallel'),
+                                     HGroup(Item('db_pool_size', label='Pool Size',
+                                                 tooltip='Number of database connections kept open'),
+                                            Item('db_max_overflow', label='Max Overflow',
+                                                 tooltip='Number of additional connections allowed when the '
+                                                         'pool is exhausted')),
+                                     label='Database'),
                         BorderVGroup(HGroup(Item('use_cache', label='Enabled'),
                                             Item('max_cache_size', label='Max Size')),
+                                     Item('max_cache_memory', label='Max Memory (MB)',
+                                          enabled_when='use_cache',
+                                          tooltip='Evict least recently used analyses once the cache uses more '
+                                                  'than this amount of memory. 0=no limit'),
+                                     HGroup(Item('use_cache_spill', label='Spill to Disk',
+                                                 tooltip='Write evicted analyses to disk and reload them from '
+                                                         'there instead of rebuilding them'),
+                                            Item('max_cache_spill', label='Max Disk (MB)',
+                                                 tooltip='0=no limit'),
+                                            enabled_when='use_cache'),
                                      label='Cache')))
         return v
 
@@ -115,6 +153,10 @@ class DVCPreferencesPane(PreferencesPane):
 class DVCExperimentPreferences(BasePreferencesHelper):
     preferences_path = 'pychron.dvc.experiment'
     use_dvc_persistence = Bool
+    use_data_sidecar = Bool(True)
+    use_publish_queue = Bool(False)
+    publish_push_every = Int(5)
+    publish_push_interval = Float(300)
 
 
 class DVCExperimentPreferencesPane(PreferencesPane):
@@ -123,6 +165,19 @@ class DVCExperimentPreferencesPane(PreferencesPane):
 
     def traits_view(self):
         v = View(BorderVGroup(Item('use_dvc_persistence', label='Use DVC Persistence'),
+                              Item('use_data_sidecar', label='Write Binary Data Sidecar',
+                                   tooltip='Cache signals, baselines and sniffs in a local binary .npy file '
+                                           'alongside the .data json for faster loading. The cache is not '
+                                           'committed'),
+                              BorderVGroup(Item('use_publish_queue', label='Publish in Background',
+                                                tooltip='Commit and push analyses on a background thread so a slow '
+                                                        'git host does not delay the next analysis'),
+                                           Item('publish_push_every', label='Push Every (runs)',
+                                                enabled_when='use_publish_queue'),
+                                           Item('publish_push_interval', label='Push Interval (s)',
+                                                tooltip='Push at least this often while there are unpushed analyses',
+                                                enabled_when='use_publish_queue'),
+                                           label='Publish'),
                               label='DVC'))
         return v
 
@@ -0,0 +1,137 @@
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from pychron.database.records.analysis_record import AnalysisRecord
+from pychron.dvc.dvc_database import DVCDatabase
+from pychron.dvc.dvc_orm import Base, AnalysisTbl, AnalysisChangeTbl, IrradiationTbl, LevelTbl, \
+    IrradiationPositionTbl, SampleTbl, MaterialTbl, ProjectTbl, PrincipalInvestigatorTbl, RepositoryTbl, \
+    RepositoryAssociationTbl, LoadTbl, MeasuredPositionTbl, MassSpectrometerTbl
+
+
+class AnalysisRecordsTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.root = tempfile.mkdtemp()
+        cls.db = db = DVCDatabase(kind='sqlite', path=os.path.join(cls.root, 'test.db'))
+        db.connect()
+        with db.session_ctx() as sess:
+            Base.metadata.create_all(sess.bind)
+
+            pi = PrincipalInvestigatorTbl(last_name='Ross', first_initial='J')
+            project = ProjectTbl(name='Foo', principal_investigator=pi)
+            sample = SampleTbl(name='bar', project=project, material=MaterialTbl(name='san'))
+            level = LevelTbl(name='A', irradiation=IrradiationTbl(name='NM-100'))
+            ip1 = IrradiationPositionTbl(identifier='1000', position=1, level=level, sample=sample)
+            ip2 = IrradiationPositionTbl(identifier='1001', position=2, level=level)
+            load = LoadTbl(name='L1', holderName='221-hole')
+            sess.add_all([MassSpectrometerTbl(name='jan'), RepositoryTbl(name='Repo1'), RepositoryTbl(name='Repo2'),
+                          load])
+
+            t = datetime(2020, 1, 1)
+            for i in range(6):
+                ip = ip1 if i % 2 else ip2
+                a = AnalysisTbl(uuid='uuid{}'.format(i), aliquot=i + 1, increment=-1 if i < 5 else 0,
+                                timestamp=t + timedelta(hours=i), analysis_type='unknown',
+                                mass_spectrometer='jan', extract_value=i, comment='c{}'.format(i),
+                                irradiation_position=ip)
+                a.change = AnalysisChangeTbl(tag='invalid' if i == 4 else 'ok')
+                sess.add(a)
+                sess.add(RepositoryAssociationTbl(repository='Repo1', analysis=a))
+                if i == 3:
+                    sess.add(RepositoryAssociationTbl(repository='Repo2', analysis=a))
+                if i < 2:
+                    sess.add(MeasuredPositionTbl(position=i + 3, load=load, analysis=a))
+                    sess.add(MeasuredPositionTbl(position=i + 10, load=load, analysis=a))
+            sess.commit()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.close_session()
+        shutil.rmtree(cls.root, ignore_errors=True)
+
+    def _compare(self, rs, ans):
+        self.assertEqual([r.uuid for r in rs], [a.uuid for a in ans])
+        for r, a in zip(rs, ans):
+            self.assertIsInstance(r, AnalysisRecord)
+            for attr in ('record_id', 'identifier', 'aliquot', 'increment', 'timestampf', 'tag', 'rundate',
+                         'sample', 'project', 'material', 'principal_investigator', 'irradiation',
+                         'irradiation_level', 'irradiation_position_position', 'irradiation_info', 'packet',
+                         'mass_spectrometer', 'extract_value', 'comment', 'position', 'repository_identifier'):
+                self.assertEqual(getattr(r, attr), getattr(a, attr), attr)
+
+            self.assertEqual(r.load_name, a.get_load_name())
+            self.assertEqual(r.load_holder, a.get_load_holder())
+
+    def test_labnumber_analyses(self):
+        db = self.db
+        with db.session_ctx():
+            ans, tc = db.get_labnumber_analyses(['1000', '1001'], verbose_query=False)
+            rs, rtc = db.get_labnumber_analyses(['1000', '1001'], verbose_query=False, record_views=True)
+            self.assertEqual(len(rs), 5)
+            self.assertEqual(rtc, tc)
+            self._compare(rs, ans)
+
+    def test_date_range_desc_limit(self):
+        db = self.db
+        kw = dict(order='desc', limit=3, exclude_invalid=False, verbose=False)
+        with db.session_ctx():
+            ans = db.get_analyses_by_date_range(None, None, **kw)
+            rs = db.get_analyses_by_date_range(None, None, record_views=True, **kw)
+            self.assertEqual([r.uuid for r in rs], ['uuid5', 'uuid4', 'uuid3'])
+            self._compare(rs, ans)
+
+    def test_record_values(self):
+        with self.db.session_ctx():
+            rs = self.db.get_analyses_by_date_range(None, None, verbose=False, record_views=True)
+
+        r = rs[0]
+        self.assertEqual(r.record_id, '1001-01')
+        self.assertEqual(r.sample, '')
+        self.assertEqual(r.position, '3,10')
+        self.assertEqual((r.load_name, r.load_holder), ('L1', '221-hole'))
+        self.assertEqual(rs[1].principal_investigator, 'Ross, J')
+        self.assertEqual(rs[-1].step, 'A')
+
+        multi = [ri for ri in rs if ri.uuid == 'uuid3'][0]
+        self.assertIsNone(multi.repository_identifier)
+        self.assertEqual(sorted(multi.repository_ids), ['Repo1', 'Repo2'])
+
+    def test_round_trips(self):
+        statements = []
+
+        def count(*args):
+            statements.append(args[2])
+
+        with self.db.session_ctx() as sess:
+            engine = sess.get_bind()
+            event.listen(engine, 'before_cursor_execute', count)
+            try:
+                rs = self.db.get_analyses_by_date_range(None, None, exclude_invalid=False, verbose=False,
+                                                        record_views=True)
+            finally:
+                event.remove(engine, 'before_cursor_execute', count)
+
+        self.assertEqual(len(rs), 6)
+        self.assertEqual(len(statements), 3)
+
+    def test_read_only(self):
+        with self.db.session_ctx():
+            r = self.db.get_analyses_by_date_range(None, None, verbose=False, record_views=True)[0]
+
+        with self.assertRaises(AttributeError):
+            r.uuid = 'foo'
+
+        r.group_id = 2
+        r.delta_time = 1.5
+        r.set_tag('omit')
+        self.assertEqual((r.group_id, r.delta_time, r.tag), (2, 1.5, 'omit'))
+        self.assertFalse(hasattr(r, '__dict__'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from numpy import linspace
+
+from pychron.dvc.cache import DVCCache, estimate_size, ANALYSIS_OVERHEAD
+from pychron.processing.isotope import Isotope
+
+
+class Item(object):
+    def __init__(self, name, n=0):
+        self.name = name
+        iso = Isotope('Ar40', 'H1')
+        iso.xs = linspace(0, 1, n)
+        iso.ys = linspace(0, 1, n)
+        self.isotopes = {'Ar40': iso}
+
+
+class DVCCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_estimate_size(self):
+        a = Item('a', 1000)
+        self.assertEqual(estimate_size(a), ANALYSIS_OVERHEAD + 2 * 1000 * 8)
+
+    def test_lru(self):
+        cache = DVCCache(max_size=2)
+        cache.update('a', 1)
+        cache.update('b', 2)
+        cache.get('a')
+        cache.update('c', 3)
+
+        self.assertEqual(cache.report(), 2)
+        self.assertEqual(cache.get('a'), 1)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('c'), 3)
+
+    def test_remove_oldest(self):
+        cache = DVCCache(max_size=10)
+        for k in 'abc':
+            cache.update(k, k)
+        cache.get('a')
+        cache.remove_oldest()
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.report(), 2)
+
+    def test_max_bytes(self):
+        size = estimate_size(Item('a', 1000))
+        cache = DVCCache(max_size=100, max_bytes=int(size * 2.5))
+        for k in 'abcd':
+            cache.update(k, Item(k, 1000))
+
+        self.assertEqual(cache.report(), 2)
+        self.assertLessEqual(cache.nbytes, cache.max_bytes)
+        self.assertEqual(cache.evictions, 2)
+        self.assertIsNone(cache.get('a'))
+        self.assertIsNotNone(cache.get('d'))
+
+    def test_remove(self):
+        cache = DVCCache()
+        cache.update('a', Item('a', 10))
+        cache.remove('a')
+        cache.remove('missing')
+        self.assertEqual(cache.nbytes, 0)
+        self.assertIsNone(cache.get('a'))
+
+    def test_stats(self):
+        cache = DVCCache()
+        cache.update('a', 1)
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+        s = cache.stats()
+        self.assertEqual(s['hits'], 2)
+        self.assertEqual(s['misses'], 1)
+        self.assertAlmostEqual(s['hit_rate'], 2 / 3.)
+        self.assertTrue(cache.report_stats())
+
+    def test_empty_cache_is_truthy(self):
+        self.assertTrue(DVCCache())
+
+    def test_spill(self):
+        cache = DVCCache(max_size=1, spill_dir=self.root)
+        cache.update('a', Item('a', 100))
+        cache.update('b', Item('b', 100))
+
+        self.assertEqual(cache.spills, 1)
+        subdir, = os.listdir(self.root)
+        self.assertTrue(subdir.startswith('{}-'.format(os.getpid())))
+        subdir = os.path.join(self.root, subdir)
+        self.assertTrue(os.path.isfile(os.path.join(subdir, 'a.pkl')))
+
+        a = cache.get('a')
+        self.assertEqual(a.name, 'a')
+        self.assertEqual(len(a.isotopes['Ar40'].xs), 100)
+        self.assertEqual(cache.spill_hits, 1)
+        self.assertFalse(os.path.isfile(os.path.join(subdir, 'a.pkl')))
+        self.assertTrue(os.path.isfile(os.path.join(subdir, 'b.pkl')))
+
+        cache.clear()
+        self.assertEqual(os.listdir(self.root), [])
+
+    def test_shared_spill_dir(self):
+        other = os.path.join(self.root, 'other')
+        os.mkdir(other)
+        p = os.path.join(other, 'a.pkl')
+        with open(p, 'wb') as wfile:
+            wfile.write(b'other')
+
+        a = DVCCache(max_size=1, spill_dir=self.root)
+        b = DVCCache(max_size=1, spill_dir=self.root)
+        for cache in (a, b):
+            cache.update('a', Item('a', 100))
+            cache.update('b', Item('b', 100))
+
+        self.assertEqual(len(os.listdir(self.root)), 3)
+        a.clear()
+        self.assertEqual(b.get('a').name, 'a')
+        b.clear()
+        self.assertEqual(os.listdir(self.root), ['other'])
+        self.assertTrue(os.path.isfile(p))
+
+    def test_max_spill_bytes(self):
+        cache = DVCCache(max_size=1, spill_dir=self.root, max_spill_bytes=1)
+        cache.update('a', Item('a', 100))
+        cache.update('b', Item('b', 100))
+        self.assertEqual(cache.spill_nbytes, 0)
+        subdir, = os.listdir(self.root)
+        self.assertEqual(os.listdir(os.path.join(self.root, subdir)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from numpy import linspace, memmap
+
+from pychron.core.helpers.binpack import encode_blob, format_blob
+from pychron.dvc import dvc_dump
+from pychron.dvc.data_sidecar import dump_sidecar_from_json, load_sidecar, sidecar_path, dump_repository_sidecars, \
+    remove_sidecar
+from pychron.processing.isotope import Isotope
+
+
+class DataSidecarTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        d = os.path.join(self.root, 'a', '.data')
+        os.makedirs(d)
+        self.path = os.path.join(d, 'a-01.dat.json')
+
+        self.isotopes = []
+        signals, sniffs = [], []
+        for name, det in (('Ar40', 'H1'), ('Ar39', 'AX'), ('Ar36', 'CDD')):
+            iso = Isotope(name, det)
+            iso.xs = linspace(0, 100, 50)
+            iso.ys = linspace(1000, 900, 50) / 3.
+            iso.sniff.xs = linspace(0, 5, 5)
+            iso.sniff.ys = linspace(5, 6, 5)
+            iso.baseline.xs = linspace(0, 10, 10)
+            iso.baseline.ys = linspace(0.1, 0.2, 10)
+            self.isotopes.append(iso)
+
+            signals.append({'isotope': name, 'detector': det, 'blob': encode_blob(iso.pack(as_hex=False))})
+            sniffs.append({'isotope': name, 'detector': det, 'blob': encode_blob(iso.sniff.pack(as_hex=False))})
+
+        baselines = [{'detector': i.detector, 'blob': encode_blob(i.baseline.pack(as_hex=False))}
+                     for i in self.isotopes]
+
+        self.jd = {'encoding': 'base64', 'format': '>ff',
+                   'signals': signals, 'baselines': baselines, 'sniffs': sniffs}
+        dvc_dump(self.jd, self.path)
+
+    def tearDown(self):
+        shutil.rmtree(self.root)
+
+    def test_no_sidecar(self):
+        self.assertIsNone(load_sidecar(self.path))
+
+    def test_roundtrip(self):
+        dump_sidecar_from_json(self.path)
+        with load_sidecar(self.path) as sc:
+            for kind in ('signals', 'baselines', 'sniffs'):
+                for entry, jentry in zip(sc.index[kind], self.jd[kind]):
+                    self.assertEqual(entry.get('detector'), jentry.get('detector'))
+
+                    a = Isotope('a', 'a')
+                    a.set_data(*sc.get(entry['key']))
+                    b = Isotope('b', 'b')
+                    b.unpack_data(format_blob(jentry['blob']))
+                    self.assertListEqual(list(a.xs), list(b.xs))
+                    self.assertListEqual(list(a.ys), list(b.ys))
+                    self.assertEqual(entry['n'], b.n)
+
+    def test_stale(self):
+        dump_sidecar_from_json(self.path)
+        self.jd['reviewed'] = True
+        dvc_dump(self.jd, self.path)
+        self.assertIsNone(load_sidecar(self.path))
+
+    def test_stale_same_size(self):
+        dump_sidecar_from_json(self.path)
+        with open(self.path, 'rb') as rfile:
+            txt = rfile.read()
+        st = os.stat(self.path)
+        with open(self.path, 'wb') as wfile:
+            wfile.write(txt.replace(b'Ar40', b'Ar41'))
+        os.utime(self.path, ns=(st.st_atime_ns, st.st_mtime_ns + 1000000000))
+
+        self.assertIsNone(load_sidecar(self.path))
+
+    def test_memory_mapped(self):
+        dump_sidecar_from_json(self.path)
+        with load_sidecar(self.path) as sc:
+            xs, ys = sc.get(sc.index['signals'][1]['key'])
+            self.assertIsInstance(xs, memmap)
+            self.assertEqual(len(xs), 50)
+
+    def test_remove(self):
+        dump_sidecar_from_json(self.path)
+        remove_sidecar(self.path)
+        self.assertFalse(os.path.isfile(sidecar_path(self.path)))
+        self.assertIsNone(load_sidecar(self.path))
+
+    def test_exclude(self):
+        os.mkdir(os.path.join(self.root, '.git'))
+        dump_sidecar_from_json(self.path)
+        dump_sidecar_from_json(self.path)
+
+        with open(os.path.join(self.root, '.git', 'info', 'exclude'), 'r') as rfile:
+            self.assertListEqual(rfile.read().splitlines(), ['*.dat.npy', '*.dat.idx'])
+
+    def test_repository(self):
+        ps = dump_repository_sidecars(self.root)
+        self.assertListEqual(ps, [sidecar_path(self.path)])
+        self.assertListEqual(dump_repository_sidecars(self.root), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pychron.core.helpers.binpack import encode_blob, pack
+from pychron.dvc import dvc_dump, analysis_path, INTERCEPTS, PEAKCENTER, BLANKS
+from pychron.paths import paths
+
+try:
+    from pychron.dvc.dvc_analysis import DVCAnalysis, ISOTOPE_MODIFIERS
+except ImportError:
+    # pychron.dvc.dvc_analysis imports the analysis views, which need chaco
+    DVCAnalysis = None
+
+REPO = 'Repo'
+RUNID = '12345-01A'
+UUID = '6b2f5c8e-3f6a-4d1b-9c3e-0a1b2c3d4e5f'
+
+
+def dump(obj, modifier=None, extension='.json'):
+    p = analysis_path((UUID, RUNID), REPO, modifier=modifier, extension=extension, mode='w')
+    dvc_dump(obj, p)
+
+
+@unittest.skipIf(DVCAnalysis is None, 'DVCAnalysis not importable')
+class LazyDVCAnalysisTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self._paths = paths.repository_dataset_dir, paths.meta_root
+        paths.repository_dataset_dir = paths.meta_root = self.root
+        os.mkdir(os.path.join(self.root, REPO))
+
+        dump({'uuid': UUID, 'timestamp': '2020-01-01T00:00:00',
+              'isotopes': {'Ar40': {'name': 'Ar40', 'detector': 'H1'},
+                           'Ar39': {'name': 'Ar39', 'detector': 'AX'}}})
+        dump({'extract_units': 'W'}, 'extraction')
+        dump({'Ar40': {'value': 100, 'error': 1, 'fit': 'linear'},
+              'Ar39': {'value': 10, 'error': 0.1, 'fit': 'parabolic'}}, INTERCEPTS)
+        dump({'Ar40': {'value': 1, 'error': 0.1, 'fit': 'average'}}, BLANKS)
+
+        points = encode_blob(pack('>ff', [(1, 10), (2, 20), (3, 10)]))
+        dump({'reference_detector': 'H1', 'reference_isotope': 'Ar40', 'fmt': '>ff', 'interpolation': 'cubic',
+              'H1': {'center_dac': 2.0, 'points': points}}, PEAKCENTER)
+
+        signals = [{'isotope': k, 'detector': d, 'blob': encode_blob(pack('>ff', [(i, v * i) for i in range(10)]))}
+                   for k, d, v in (('Ar40', 'H1', 10), ('Ar39', 'AX', 1))]
+        dump({'signals': signals, 'baselines': [], 'sniffs': []}, '.data')
+
+    def tearDown(self):
+        paths.repository_dataset_dir, paths.meta_root = self._paths
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _make(self, **kw):
+        return DVCAnalysis(UUID, RUNID, REPO, **kw)
+
+    def test_peak_center_deferred(self):
+        a = self._make()
+        self.assertIn(PEAKCENTER, a._deferred)
+        self.assertEqual(a.isotopes['Ar40'].value, 100)
+
+        self.assertEqual(a.peak_center, 2.0)
+        self.assertNotIn(PEAKCENTER, a._deferred)
+        self.assertEqual(a.peak_center_reference_detector, 'H1')
+        self.assertEqual(len(a.peak_center_data[0]), 3)
+
+    def test_isotopes_deferred(self):
+        a = self._make(deferred=DVCAnalysis.deferred_modifiers + ISOTOPE_MODIFIERS)
+        self.assertIn(INTERCEPTS, a._deferred)
+
+        iso = a.isotopes['Ar40']
+        self.assertNotIn(INTERCEPTS, a._deferred)
+        self.assertEqual(iso.value, 100)
+        self.assertEqual(iso.fit, 'linear')
+        self.assertEqual(iso.blank.value, 1)
+        self.assertIn(PEAKCENTER, a._deferred)
+
+    def test_same_as_eager(self):
+        a = self._make(deferred=())
+        b = self._make(deferred=DVCAnalysis.deferred_modifiers + ISOTOPE_MODIFIERS)
+        for k in ('Ar40', 'Ar39'):
+            self.assertEqual(a.isotopes[k].value, b.isotopes[k].value)
+            self.assertEqual(a.isotopes[k].blank.value, b.isotopes[k].blank.value)
+        self.assertEqual(a.peak_center, b.peak_center)
+
+    def test_load_deferred(self):
+        a = self._make()
+        a.load_deferred()
+        self.assertFalse(a._deferred)
+        self.assertEqual(a.__dict__['_peak_center'], 2.0)
+
+    def test_raw_data_loaded_once(self):
+        a = self._make()
+        a.load_raw_data(['Ar40'])
+        iso = a.isotopes['Ar40']
+        self.assertEqual(len(iso.xs), 10)
+        self.assertEqual(len(a.isotopes['Ar39'].xs), 0)
+
+        iso.ys[0] = -1
+        a.load_raw_data(['Ar40'])
+        self.assertEqual(iso.ys[0], -1)
+
+        a.load_raw_data(['Ar40', 'Ar39'])
+        self.assertEqual(len(a.isotopes['Ar39'].xs), 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from git import Repo
+from uncertainties import nominal_value, std_dev
+
+from pychron.dvc import dvc_dump
+from pychron.dvc.meta_repo import MetaRepo
+from pychron.paths import paths
+
+
+class MetaRepoIndexTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self._meta_root = paths.meta_root
+        paths.meta_root = self.root
+
+        repo = Repo.init(self.root)
+        with repo.config_writer() as cw:
+            cw.set_value('user', 'name', 'test')
+            cw.set_value('user', 'email', 'test@test.com')
+
+        os.mkdir(os.path.join(self.root, 'NM-100'))
+        positions = [{'position': i, 'j': 0.001 * i, 'j_err': 1e-6 * i, 'identifier': str(i)} for i in range(1, 11)]
+        dvc_dump({'z': 0, 'positions': positions}, os.path.join(self.root, 'NM-100', 'A.json'))
+
+        self.meta = meta = MetaRepo()
+        meta.open_repo(self.root)
+        meta.add(os.path.join(self.root, 'NM-100', 'A.json'), commit=False)
+        meta.commit('initial')
+
+    def tearDown(self):
+        paths.meta_root = self._meta_root
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_get_flux(self):
+        fd = self.meta.get_flux('NM-100', 'A', 3)
+        self.assertAlmostEqual(nominal_value(fd['j']), 0.003)
+        self.assertAlmostEqual(std_dev(fd['j']), 3e-6)
+
+    def test_get_flux_matches_positions(self):
+        positions = self.meta.get_flux_positions('NM-100', 'A')
+        for pos in (1, 5, 10, 11):
+            a = self.meta.get_flux('NM-100', 'A', pos)
+            b = self.meta.get_flux_from_positions(pos, positions)
+            self.assertEqual(nominal_value(a['j']), nominal_value(b['j']))
+            self.assertEqual(std_dev(a['j']), std_dev(b['j']))
+
+    def test_get_flux_independent(self):
+        a = self.meta.get_flux('NM-100', 'A', 3)
+        b = self.meta.get_flux('NM-100', 'A', 3)
+        self.assertIsNot(a['j'], b['j'])
+        self.assertAlmostEqual(std_dev(a['j'] - b['j']), 2 ** 0.5 * 3e-6)
+
+    def test_positions_indexed(self):
+        a = self.meta.get_flux_positions('NM-100', 'A')
+        b = self.meta.get_flux_positions('NM-100', 'A')
+        self.assertIs(a, b)
+        self.assertEqual(self.meta.get_level_position('NM-100', 'A', 4)['identifier'], '4')
+        self.assertIsNone(self.meta.get_level_position('NM-100', 'A', 40))
+
+    def test_update_flux_invalidates(self):
+        self.meta.get_flux('NM-100', 'A', 3)
+        self.meta.update_flux('NM-100', 'A', 3, '3', 0.5, 0.01, 0, 0, add=False)
+        fd = self.meta.get_flux('NM-100', 'A', 3)
+        self.assertEqual(nominal_value(fd['j']), 0.5)
+
+    def test_head_change_invalidates(self):
+        a = self.meta.get_flux_positions('NM-100', 'A')
+        self.assertFalse(self.meta.refresh_index())
+
+        # change the level outside of MetaRepo and commit
+        p = os.path.join(self.root, 'NM-100', 'A.json')
+        dvc_dump({'z': 0, 'positions': [{'position': 1, 'j': 2.0, 'j_err': 0}]}, p)
+        repo = Repo(self.root)
+        repo.index.add([p])
+        repo.index.commit('external')
+
+        self.assertIs(self.meta.get_flux_positions('NM-100', 'A'), a)
+        self.assertTrue(self.meta.refresh_index())
+        fd = self.meta.get_flux('NM-100', 'A', 1)
+        self.assertEqual(nominal_value(fd['j']), 2.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
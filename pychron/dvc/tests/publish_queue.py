@@ -0,0 +1,174 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from git import Repo
+
+from pychron.dvc.publish_queue import DVCPublishQueue, make_publish_job
+from pychron.git_archive.repo_manager import GitRepoManager
+
+
+class PublishDVC(object):
+    """
+        the parts of DVC used by DVCPublishQueue
+    """
+
+    def __init__(self, root, fail_pushes=0):
+        self.root = root
+        self.fail_pushes = fail_pushes
+        self.npushes = 0
+        self.meta_messages = []
+
+    def get_repository(self, name):
+        repo = GitRepoManager()
+        repo.open_repo(os.path.join(self.root, name))
+        return repo
+
+    def push_repository(self, repo, **kw):
+        if self.fail_pushes:
+            self.fail_pushes -= 1
+            raise IOError('host unavailable')
+        repo.push(**kw)
+        self.npushes += 1
+
+    def meta_fetch(self, **kw):
+        pass
+
+    def meta_pull(self, **kw):
+        pass
+
+    def meta_commit(self, msg):
+        self.meta_messages.append(msg)
+
+    def meta_push(self, **kw):
+        pass
+
+
+class PublishQueueTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        remote = os.path.join(self.root, 'remote.git')
+        Repo.init(remote, bare=True)
+
+        self.path = path = os.path.join(self.root, 'Repo')
+        repo = Repo.clone_from(remote, path)
+        repo.git.symbolic_ref('HEAD', 'refs/heads/master')
+        with repo.config_writer() as cw:
+            cw.set_value('user', 'name', 'test')
+            cw.set_value('user', 'email', 'test@test.com')
+
+        p = os.path.join(path, 'README')
+        with open(p, 'w') as wfile:
+            wfile.write('test')
+        repo.index.add([p])
+        repo.index.commit('initial')
+        repo.git.push('origin', 'master')
+
+        self.remote = Repo(remote)
+        self.dvc = PublishDVC(self.root)
+        self.journal = os.path.join(self.root, 'publish_queue.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _queue(self, **kw):
+        return DVCPublishQueue(dvc=self.dvc, path=self.journal, retry_delay=0.01, **kw)
+
+    def _job(self, runid):
+        ps = []
+        for tag in ('', '.intercepts'):
+            p = os.path.join(self.path, '{}{}.json'.format(runid, tag))
+            with open(p, 'w') as wfile:
+                wfile.write(runid)
+            ps.append(p)
+
+        return make_publish_job('Repo', runid, ps, '<COLLECTION>', ['<ISOEVO> default collection fits'])
+
+    def _wait(self, q, timeout=10):
+        st = time.time()
+        while not q.is_empty and time.time() - st < timeout:
+            time.sleep(0.01)
+        self.assertTrue(q.is_empty)
+
+    def _local_messages(self):
+        return [c.message for c in Repo(self.path).iter_commits('master')]
+
+    def _remote_messages(self):
+        return [c.message for c in self.remote.iter_commits('master')]
+
+    def test_one_commit_per_run(self):
+        q = self._queue(push_every=2)
+        q.start()
+        for i in range(4):
+            q.put(self._job('run-{}'.format(i)))
+        self._wait(q)
+        q.stop()
+
+        msgs = self._remote_messages()
+        self.assertEqual(len(msgs), 5)
+        self.assertTrue(msgs[0].startswith('<COLLECTION>'))
+        self.assertIn('<ISOEVO> default collection fits', msgs[0])
+        self.assertIn(self.dvc.npushes, (1, 2))
+        self.assertEqual(q.depth, 0)
+
+    def test_batched_push(self):
+        q = self._queue(push_every=10, push_interval=60)
+        q.start()
+        q.put(self._job('run-0'))
+        q.put(self._job('run-1'))
+
+        st = time.time()
+        while len(self._local_messages()) < 3 and time.time() - st < 10:
+            time.sleep(0.01)
+        self.assertEqual(self.dvc.npushes, 0)
+        self.assertEqual(q.depth, 2)
+
+        q.flush()
+        self._wait(q)
+        q.stop()
+        self.assertEqual(self.dvc.npushes, 1)
+        self.assertEqual(len(self._remote_messages()), 3)
+        self.assertEqual(self.dvc.meta_messages, ['repo updated for analyses run-0,run-1'])
+
+    def test_retry(self):
+        self.dvc.fail_pushes = 2
+        q = self._queue(push_every=1)
+        q.start()
+        q.put(self._job('run-0'))
+        self._wait(q)
+        q.stop()
+        self.assertEqual(self.dvc.npushes, 1)
+        self.assertEqual(len(self._remote_messages()), 2)
+
+    def test_resume_from_journal(self):
+        q = self._queue()
+        q.put(self._job('run-0'))
+        q.put(self._job('run-1'))
+        self.assertEqual(q.depth, 2)
+        self.assertTrue(os.path.isfile(self.journal))
+
+        # a new queue, e.g. after a restart, publishes the journaled jobs
+        q = self._queue()
+        q.start()
+        self._wait(q)
+        q.stop()
+        self.assertEqual(len(self._remote_messages()), 3)
+
+    def test_already_committed(self):
+        job = self._job('run-0')
+        q = self._queue(push_every=1)
+        q.start()
+        q.put(job)
+        self._wait(q)
+
+        # journaled again, e.g. committed before a crash but not removed from the journal
+        q.put(job)
+        self._wait(q)
+        q.stop()
+        self.assertEqual(len(self._remote_messages()), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -78,7 +78,8 @@ class AnalysisBrowserModel(BrowserModel):
 
             ans = self.dvc.get_analyses_advanced(m, uuids=uuids, identifiers=identifiers,
                                                  include_invalid=not m.omit_invalid,
-                                                 limit=m.limit)
+                                                 limit=m.limit,
+                                                 record_views=True)
             if m.apply_to_current_selection and not ans:
                 self.warning_dialog('No analyses match criteria')
                 return
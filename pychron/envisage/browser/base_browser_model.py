@@ -29,6 +29,7 @@ from pychron.column_sorter_mixin import ColumnSorterMixin
 from pychron.core.fuzzyfinder import fuzzyfinder
 from pychron.core.progress import progress_loader
 from pychron.core.ui.table_configurer import SampleTableConfigurer
+from pychron.database.records.analysis_record import AnalysisRecord
 from pychron.envisage.browser import progress_bind_records
 from pychron.envisage.browser.adapters import LabnumberAdapter
 from pychron.envisage.browser.record_views import ProjectRecordView, LabnumberRecordView, \
@@ -455,7 +456,8 @@ class BaseBrowserModel(PersistenceLoggable, ColumnSorterMixin):
                                                 include_invalid=include_invalid,
                                                 mass_spectrometers=mass_spectrometers,
                                                 repositories=repositories,
-                                                loads=loads)
+                                                loads=loads,
+                                                record_views=make_records)
             self.debug('retrieved analyses n={}'.format(tc))
         else:
             self.debug('retrieved analyses by date range')
@@ -465,7 +467,8 @@ class BaseBrowserModel(PersistenceLoggable, ColumnSorterMixin):
                                                 repositories=repositories,
                                                 limit=limit,
                                                 analysis_types=analysis_types,
-                                                loads=loads)
+                                                loads=loads,
+                                                record_views=make_records)
 
         if make_records:
             return self._make_records(ans)
@@ -484,6 +487,10 @@ class BaseBrowserModel(PersistenceLoggable, ColumnSorterMixin):
     def _make_records(self, ans):
         n = len(ans)
         self.debug('make records {}'.format(n))
+        if ans and isinstance(ans[0], AnalysisRecord):
+            # bulk loaded. nothing to bind
+            return ans
+
         import time
         st = time.time()
 
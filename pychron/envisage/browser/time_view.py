@@ -242,7 +242,8 @@ class TimeViewModel(HasTraits):
                                             mass_spectrometers=mass_spectrometer,
                                             analysis_types=analysis_type,
                                             extract_devices=extract_device,
-                                            limit=self.limit, order='desc')
+                                            limit=self.limit, order='desc',
+                                            record_views=True)
         self.oanalyses = self._make_records(ans)
         self.analyses = self.oanalyses[:]
 
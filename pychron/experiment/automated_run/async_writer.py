@@ -0,0 +1,144 @@
+# ===============================================================================
+# Copyright 2026 ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import time
+from queue import Queue, Full, Empty
+from threading import Thread, Event, Lock
+
+
+# ============= local library imports  ==========================
+
+
+class AsyncDataWriter(object):
+    """
+        calls ``writer(*args)`` on a background thread.
+
+        ``put`` only appends to a bounded queue so a slow disk or database does not delay the measurement loop.
+        the writer thread wakes every ``flush_interval`` seconds, or as soon as the queue is half full, and writes
+        everything queued. if the queue is full ``put`` blocks until there is room, data is never dropped.
+
+        ``stop`` always writes any remaining items before returning.
+    """
+
+    def __init__(self, writer, maxsize=1000, flush_interval=1.0, on_error=None, name='AsyncDataWriter'):
+        self._writer = writer
+        self._queue = Queue(maxsize=maxsize)
+        self._maxsize = maxsize
+        self._flush_interval = flush_interval
+        self._on_error = on_error
+        self._name = name
+
+        self._wake = Event()
+        self._stop = Event()
+        self._write_lock = Lock()
+        self._thread = None
+
+        self.nwritten = 0
+        self.nblocked = 0
+        self.max_depth = 0
+        self.total_latency = 0
+        self.max_latency = 0
+
+    @property
+    def depth(self):
+        return self._queue.qsize()
+
+    @property
+    def is_alive(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        self._stop.clear()
+        self._thread = t = Thread(target=self._run, name=self._name)
+        t.daemon = True
+        t.start()
+
+    def put(self, *args):
+        item = (time.time(), args)
+        q = self._queue
+        try:
+            q.put_nowait(item)
+        except Full:
+            self.nblocked += 1
+            self._wake.set()
+            q.put(item)
+
+        depth = q.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+        if depth >= self._maxsize // 2:
+            self._wake.set()
+
+    def flush(self):
+        """
+            write everything queued on the calling thread
+        """
+        with self._write_lock:
+            q = self._queue
+            while 1:
+                try:
+                    st, args = q.get_nowait()
+                except Empty:
+                    break
+
+                try:
+                    self._writer(*args)
+                except BaseException as e:
+                    if self._on_error:
+                        self._on_error(e)
+
+                latency = time.time() - st
+                self.total_latency += latency
+                if latency > self.max_latency:
+                    self.max_latency = latency
+                self.nwritten += 1
+
+    def stop(self, timeout=None):
+        """
+            stop the writer thread and write any remaining items
+        """
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+        self.flush()
+
+    def stats(self):
+        n = self.nwritten
+        return {'written': n,
+                'depth': self.depth,
+                'max_depth': self.max_depth,
+                'blocked': self.nblocked,
+                'mean_latency': self.total_latency / n if n else 0,
+                'max_latency': self.max_latency}
+
+    def report_stats(self):
+        return 'written={written}, max depth={max_depth}, blocked={blocked}, ' \
+               'latency mean={mean_latency:0.3f}s max={max_latency:0.3f}s'.format(**self.stats())
+
+    # private
+    def _run(self):
+        while not self._stop.is_set():
+            self._wake.wait(self._flush_interval)
+            self._wake.clear()
+            self.flush()
+
+# ============= EOF =============================================
@@ -20,9 +20,10 @@ from threading import Event
 
 # ============= enthought library imports =======================
 from apptools.preferences.preference_binding import bind_preference
-from traits.api import Any, List, CInt, Int, Bool, Enum, Str, Instance
+from traits.api import Any, List, CInt, Int, Bool, Enum, Str, Instance, Float
 
 from pychron.envisage.consoleable import Consoleable
+from pychron.experiment.automated_run.async_writer import AsyncDataWriter
 from pychron.pychron_constants import AR_AR, SIGNAL, BASELINE, WHIFF, SNIFF
 
 
@@ -62,7 +63,7 @@ class DataCollector(Consoleable):
     _data = None
     _temp_conds = None
     _result = None
-    _queue = None
+    _writer = None
 
     err_message = Str
     no_intensity_threshold = 100
@@ -70,9 +71,16 @@ class DataCollector(Consoleable):
     trigger = None
     plot_panel_update_period = Int(1)
 
+    use_async_data_writer = Bool(True)
+    data_writer_flush_interval = Float(1.0)
+    data_writer_queue_size = Int(1000)
+
     def __init__(self, *args, **kw):
         super(DataCollector, self).__init__(*args, **kw)
         bind_preference(self, 'plot_panel_update_period', 'pychron.experiment.plot_panel_update_period')
+        bind_preference(self, 'use_async_data_writer', 'pychron.experiment.use_async_data_writer')
+        bind_preference(self, 'data_writer_flush_interval', 'pychron.experiment.data_writer_flush_interval')
+        bind_preference(self, 'data_writer_queue_size', 'pychron.experiment.data_writer_queue_size')
 
     # def wait(self):
     #     st = time.time()
@@ -114,7 +122,12 @@ class DataCollector(Consoleable):
 
         self._alive = True
 
-        self._measure()
+        try:
+            self._measure()
+        finally:
+            ig = self.isotope_group
+            if ig is not None:
+                ig.end_acquisition()
 
         tt = time.time() - self.starttime
         self.debug('estimated time: {:0.3f} actual time: :{:0.3f}'.format(et, tt))
@@ -135,20 +148,22 @@ class DataCollector(Consoleable):
 
         self._evt = evt = Event()
 
-        # self._queue = q = Queue()
-        # def writefunc():
-        #     writer = self.data_writer
-        #     while not q.empty() or not evt.wait(10):
-        #         dets = self.detectors
-        #         while not q.empty():
-        #             x, keys, signals = q.get()
-        #             writer(dets, x, keys, signals)
-        #
-        # # only write to file every 10 seconds and not on main thread
-        # t = Thread(target=writefunc)
-        # # t.setDaemon(True)
-        # t.start()
+        if self.use_async_data_writer and getattr(self, 'data_writer', None):
+            self._writer = AsyncDataWriter(self.data_writer,
+                                           maxsize=max(1, self.data_writer_queue_size),
+                                           flush_interval=self.data_writer_flush_interval,
+                                           on_error=self._data_writer_error)
+            self._writer.start()
+
+        try:
+            self._measure_loop(evt)
+        finally:
+            evt.set()
+            self._stop_writer()
+
+        self.debug('measurement finished')
 
+    def _measure_loop(self, evt):
         self.debug('measurement period (ms) = {}'.format(self.period_ms))
         period = self.period_ms * 0.001
         i = 1
@@ -176,11 +191,16 @@ class DataCollector(Consoleable):
                     self.terminated = True
                 break
 
-        evt.set()
-        # self.debug('waiting for write to finish')
-        # t.join()
+    def _stop_writer(self):
+        writer = self._writer
+        if writer is not None:
+            self.debug('waiting for data writer. queue depth={}'.format(writer.depth))
+            writer.stop()
+            self.debug('data writer finished. {}'.format(writer.report_stats()))
+            self._writer = None
 
-        self.debug('measurement finished')
+    def _data_writer_error(self, e):
+        self.debug('failed writing data {}'.format(e))
 
     def _pre_trigger_hook(self):
         return True
@@ -253,8 +273,13 @@ class DataCollector(Consoleable):
             return data
 
     def _save_data(self, x, keys, signals):
-        # self._queue.put((x, keys, signals))
-        self.data_writer(self.detectors, x, keys, signals)
+        # resolve the isotope/detector pairing now. the peak hop collector repairs the detectors for the next hop
+        # before a queued row is written
+        pairs = [(d.isotope, d.name) for d in self.detectors]
+        if self._writer is not None:
+            self._writer.put(pairs, x, keys, signals)
+        else:
+            self.data_writer(pairs, x, keys, signals)
 
         # update arar_age
         if self.is_baseline and self.for_peak_hop:
@@ -0,0 +1,143 @@
+# ===============================================================================
+# Copyright 2026 ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+import time
+
+from numpy import empty
+
+
+# ============= local library imports  ==========================
+
+
+class H5DataWriter(object):
+    """
+        writes the signals of one measurement group, e.g. "signal", "baseline", to the tables built by
+        ``AutomatedRunPersister.build_tables``.
+
+        rows are keyed by the (isotope, detector) pairs resolved by the data collector when the signals were
+        measured, not by the detectors' current isotope. table handles are looked up once per pair and cached.
+        rows are buffered per table and appended as one record array when ``flush_interval`` seconds have elapsed
+        since the last flush, when a table has ``flush_rows`` buffered rows, or when ``flush`` is called. ``flush``
+        must be called before the file is closed.
+    """
+
+    def __init__(self, data_manager, grpname, flush_interval=1.0, flush_rows=500, logger=None):
+        self._dm = data_manager
+        self._grpname = grpname
+        self._flush_interval = flush_interval
+        self._flush_rows = max(1, flush_rows)
+        self._logger = logger
+
+        # (isotope, detector): table or None if the table does not exist
+        self._tables = {}
+        # (isotope, detector): [table, times, values]
+        self._buffers = {}
+        self._last_flush = time.time()
+
+        self.nrows = 0
+        self.nflushes = 0
+
+    def __call__(self, pairs, x, keys, signals):
+        """
+            pairs: list of (isotope, detector name) resolved when the signals were measured
+        """
+        full = False
+        for key in pairs:
+            k = key[1]
+            if k not in keys:
+                continue
+
+            try:
+                buf = self._buffers[key]
+            except KeyError:
+                t = self._get_table(key)
+                if t is None:
+                    continue
+                buf = self._buffers[key] = [t, [], []]
+
+            buf[1].append(x)
+            buf[2].append(signals[keys.index(k)])
+            self.nrows += 1
+            if len(buf[1]) >= self._flush_rows:
+                full = True
+
+        if full or time.time() - self._last_flush >= self._flush_interval:
+            self.flush()
+
+    def flush(self):
+        """
+            append the buffered rows to their tables
+        """
+        for key, (t, xs, ys) in self._buffers.items():
+            n = len(xs)
+            if not n:
+                continue
+
+            try:
+                rows = empty(n, dtype=t.dtype)
+                rows['time'] = xs
+                rows['value'] = ys
+                t.append(rows)
+                t.flush()
+            except BaseException as e:
+                self._debug('error: {} group:{} det:{} iso:{}'.format(e, self._grpname, key[1], key[0]))
+
+            del xs[:]
+            del ys[:]
+
+        self.nflushes += 1
+        self._last_flush = time.time()
+
+    def close(self):
+        """
+            flush and release the table handles. the handles are only valid while the file is open
+        """
+        self.flush()
+        self._buffers = {}
+        self._tables = {}
+
+    # private
+    def _get_table(self, key):
+        try:
+            return self._tables[key]
+        except KeyError:
+            pass
+
+        iso, k = key
+        if self._grpname == 'baseline':
+            grp = '/{}'.format(self._grpname)
+        else:
+            grp = '/{}/{}'.format(self._grpname, iso)
+
+        t = None
+        try:
+            t = self._dm.get_table(k, grp)
+        except AttributeError as e:
+            self._debug('error: {} group:{} det:{} iso:{}'.format(e, self._grpname, k, iso))
+
+        if t is None:
+            self._debug('no table. group:{} det:{} iso:{}'.format(self._grpname, k, iso))
+
+        self._tables[key] = t
+        return t
+
+    def _debug(self, msg):
+        if self._logger is not None:
+            self._logger.debug(msg)
+
+# ============= EOF =============================================
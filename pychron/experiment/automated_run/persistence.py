@@ -19,8 +19,9 @@ import binascii
 import math
 import os
 import time
+from contextlib import contextmanager
 
-from traits.api import Instance, Bool, Interface, provides, Long, Str, Float
+from traits.api import Instance, Bool, Interface, provides, Long, Str, Float, Int
 from xlwt import Workbook, struct
 
 from pychron.core.helpers.datetime_tools import get_datetime
@@ -28,6 +29,7 @@ from pychron.core.helpers.filetools import subdirize
 from pychron.core.helpers.strtools import to_bool
 from pychron.core.ui.preference_binding import set_preference
 from pychron.database.adapters.local_lab_adapter import LocalLabAdapter
+from pychron.experiment.automated_run.h5_writer import H5DataWriter
 from pychron.experiment.automated_run.hop_util import parse_hops
 from pychron.experiment.automated_run.mass_spec_persistence_spec import MassSpecPersistenceSpec
 from pychron.loggable import Loggable
@@ -221,15 +223,19 @@ class AutomatedRunPersister(BasePersister):
     use_analysis_grouping = Bool(False)
     grouping_threshold = Float
     grouping_suffix = Str
+    h5_flush_interval = Float(5.0)
+    h5_flush_rows = Int(500)
 
     _db_extraction_id = None
     _temp_analysis_buffer = None
     _current_data_frame = None
+    _data_writers = None
 
     def __init__(self, *args, **kw):
         super(AutomatedRunPersister, self).__init__(*args, **kw)
         # self.bind_preferences()
         self._temp_analysis_buffer = []
+        self._data_writers = []
 
     def set_preferences(self, preferences):
         """
@@ -243,7 +249,9 @@ class AutomatedRunPersister(BasePersister):
 
         for attr, cast in (('use_analysis_grouping', to_bool),
                            ('grouping_threshold', float),
-                           ('grouping_suffix', str)):
+                           ('grouping_suffix', str),
+                           ('h5_flush_interval', float),
+                           ('h5_flush_rows', int)):
             set_preference(preferences, self, attr, 'pychron.experiment.{}'.format(attr), cast)
 
         set_preference(preferences, self, 'use_massspec_database', 'pychron.massspec.database.enabled', to_bool)
@@ -277,45 +285,17 @@ class AutomatedRunPersister(BasePersister):
     def get_data_writer(self, grpname):
         """
         grpname should be a str such as "signal", "baseline",etc
-        return a closure for writing the data
+        return a callable for writing the data. rows are buffered and written when the ``writer_ctx`` exits
 
         :param grpname: str
-        :return: function
+        :return: ``H5DataWriter``
         """
-        tables = {}
-
-        def write_data(dets, x, keys, signals):
-            # todo: test whether saving data to h5 in real time is expansive
-
-            # disable H5 data writer
-            # self.unique_warning('NOT Writing data to H5 in real time')
-            # return
-
-            dm = self.data_manager
-            for det in dets:
-                k = det.name
-                try:
-                    if k in keys:
-                        if grpname == 'baseline':
-                            grp = '/{}'.format(grpname)
-                        else:
-                            grp = '/{}/{}'.format(grpname, det.isotope)
-
-                        tag = '{}/{}'.format(grp, k)
-                        if tag in tables:
-                            t = tables['tag']
-                        else:
-                            t = dm.get_table(k, grp)
-
-                        nrow = t.row
-                        nrow['time'] = x
-                        nrow['value'] = signals[keys.index(k)]
-                        nrow.append()
-                        t.flush()
-                except AttributeError as e:
-                    self.debug('error: {} group:{} det:{} iso:{}'.format(e, grpname, k, det.isotope))
-
-        return write_data
+        w = H5DataWriter(self.data_manager, grpname,
+                         flush_interval=self.h5_flush_interval,
+                         flush_rows=self.h5_flush_rows,
+                         logger=self)
+        self._data_writers.append(w)
+        return w
 
     def build_tables(self, grpname, detectors, n):
         """
@@ -363,8 +343,13 @@ class AutomatedRunPersister(BasePersister):
     def get_last_aliquot(self, identifier):
         return self.datahub.get_greatest_aliquot(identifier)
 
+    @contextmanager
     def writer_ctx(self):
-        return self.data_manager.open_file(self._current_data_frame)
+        with self.data_manager.open_file(self._current_data_frame) as f:
+            try:
+                yield f
+            finally:
+                self._close_data_writers()
 
     # def pre_extraction_save(self):
     #     """
@@ -578,6 +563,12 @@ class AutomatedRunPersister(BasePersister):
                     # mem_log('post mass spec save')
 
     # private
+    def _close_data_writers(self):
+        for w in self._data_writers:
+            w.close()
+            self.debug('{} rows written in {} flushes'.format(w.nrows, w.nflushes))
+        self._data_writers = []
+
     def _save_detector_ic_csv(self):
 
         from pychron.experiment.utilities.detector_ic import make_items, save_csv
@@ -18,6 +18,7 @@
 
 import os
 import pprint
+from logging import DEBUG
 
 from traits.api import Str, Either, Int, Callable, Bool, Float, Enum, List
 # ============= standard library imports ========================
@@ -28,7 +29,8 @@ from uncertainties import nominal_value, std_dev
 from pychron.core.yaml import yload
 from pychron.experiment.conditional.regexes import MAPPER_KEY_REGEX, \
     STD_REGEX, INTERPOLATE_REGEX, EXTRACTION_STR_ABS_REGEX, EXTRACTION_STR_PERCENT_REGEX
-from pychron.experiment.conditional.utilities import tokenize, get_teststr_attr_func, extract_attr
+from pychron.experiment.conditional.utilities import tokenize, get_teststr_attr_func, extract_attr, \
+    compile_expression, MAPPER_NODES
 from pychron.experiment.utilities.conditionals import RUN, QUEUE, SYSTEM
 from pychron.loggable import Loggable
 from pychron.paths import paths
@@ -165,6 +167,10 @@ class BaseConditional(Loggable):
                        analysis_types=analysis_types,
                        **kw)
         self._from_dict_hook(cd)
+        self._compile()
+
+    def _compile(self):
+        pass
 
     def _from_dict_hook(self, cd):
         pass
@@ -218,7 +224,12 @@ class AutomatedRunConditional(BaseConditional):
 
     _teststr = None
     _ctx = None
-    value_context = None
+
+    # compiled by ``_compile``
+    _tokens = None
+    _codes = None
+    _use_std = False
+    _mapper_code = None
 
     # def __init__(self, attr, teststr,
     # start_count=0,
@@ -241,6 +252,14 @@ class AutomatedRunConditional(BaseConditional):
         s = '{} {}'.format(self.teststr, self.message)
         return s
 
+    @property
+    def value_context(self):
+        """
+            the context of the last check. only formatted when needed, e.g. when the conditional trips
+        """
+        if self._ctx is not None:
+            return pprint.pformat(self._ctx, width=1)
+
     def to_dict(self):
         d = self._attr_dict()
         d['hash_id'] = self._hash_id(d)
@@ -290,21 +309,31 @@ class AutomatedRunConditional(BaseConditional):
         evaluate the teststr with the context
 
         """
+        if self._tokens is None:
+            self._compile()
+            if not self.active:
+                return
+
         teststr, ctx = self._make_context(run, data)
         self._teststr, self._ctx = teststr, ctx
 
-        self.value_context = vc = pprint.pformat(ctx, width=1)
+        debug = self.logger is not None and self.logger.isEnabledFor(DEBUG)
+        if debug:
+            self.debug('testing {}'.format(teststr))
+            if verbose:
+                self.debug('attribute context {}'.format(pprint.pformat(self._attr_dict(), width=1)))
+            self.debug('evaluate ot="{}" t="{}", ctx="{}"'.format(self.teststr, teststr, self.value_context))
 
-        self.debug('testing {}'.format(teststr))
-        if verbose:
-            self.debug('attribute context {}'.format(pprint.pformat(self._attr_dict(), width=1)))
-        msg = 'evaluate ot="{}" t="{}", ctx="{}"'.format(self.teststr, teststr, vc)
-        self.debug(msg)
         if teststr and ctx:
-            if eval(teststr, ctx):
+            code = self._get_code(teststr)
+            if code is None:
+                return
+
+            if eval(code, {'__builtins__': {}}, ctx):
                 self.trips += 1
-                self.debug('condition {} is true trips={}/{}'.format(teststr, self.trips,
-                                                                     self.ntrips))
+                if debug:
+                    self.debug('condition {} is true trips={}/{}'.format(teststr, self.trips,
+                                                                         self.ntrips))
                 if self.trips >= self.ntrips:
                     self.tripped = True
                     self.message = 'condition {} is True'.format(teststr)
@@ -313,23 +342,88 @@ class AutomatedRunConditional(BaseConditional):
             else:
                 self.trips = 0
 
-    def _make_context(self, obj, data):
+    def _compile(self):
+        """
+            tokenize the teststr and look up the accessor for each token once instead of on every check.
+
+            a token's teststr is only interpolated, e.g. "Ar40<$MIN_INTENSITY", if it contains a "$".
+            the evaluated teststrs are compiled to code objects and cached in ``_codes``
+        """
         teststr = self.teststr
-        ctx = {}
-        tt = []
+        tokens = []
         for ti, oper in tokenize(teststr):
             ts, attr, func = get_teststr_attr_func(ti)
 
             attr = attr.replace('(', '_').replace(')', '_')
             ts = ts.replace('(', '_').replace(')', '_')
+            tokens.append((attr, func, ts, oper, bool(INTERPOLATE_REGEX.search(ts))))
+
+        self._tokens = tokens
+        self._codes = {}
+        self._use_std = bool(STD_REGEX.match(teststr))
+
+        self._mapper_key = ''
+        self._mapper_code = None
+        if self.mapper:
+            m = MAPPER_KEY_REGEX.search(self.mapper)
+            if m:
+                self._mapper_key = m.group(0)
+                try:
+                    self._mapper_code = compile_expression(self.mapper, MAPPER_NODES)
+                except ValueError as e:
+                    self._deactivate(e)
+                    return
+
+        if not any(t[4] for t in tokens):
+            # the teststr when every value is available
+            ts = ' '.join(t for token in tokens for t in (token[2], token[3]) if t)
+            if ts:
+                try:
+                    self._codes[ts] = compile_expression(ts)
+                except ValueError as e:
+                    self._deactivate(e)
+
+    def _get_code(self, teststr):
+        try:
+            return self._codes[teststr]
+        except KeyError:
+            pass
+
+        try:
+            code = compile_expression(teststr)
+        except ValueError as e:
+            self.unique_warning('Skipping check. {}'.format(e))
+            return
+
+        self._codes[teststr] = code
+        return code
 
-            v = func(obj, data, self.window)
+    def _deactivate(self, e):
+        self.warning('Deactivating check "{}". {}'.format(self.teststr, e))
+        self.active = False
+
+    def _teststr_changed(self):
+        self._tokens = None
+
+    def _mapper_changed(self):
+        self._tokens = None
+
+    def _make_context(self, obj, data):
+        if self._tokens is None:
+            self._compile()
+
+        ctx = {}
+        tt = []
+        window = self.window
+        for attr, func, ts, oper, interpolate in self._tokens:
+            v = func(obj, data, window)
             if v is not None:
-                vv = std_dev(v) if STD_REGEX.match(teststr) else nominal_value(v)
+                vv = std_dev(v) if self._use_std else nominal_value(v)
                 vv = self._map_value(vv)
                 ctx[attr] = vv
 
-                ts = self._interpolate_teststr(ts, obj, data)
+                if interpolate:
+                    ts = self._interpolate_teststr(ts, obj, data)
                 tt.append(ts)
                 if oper:
                     tt.append(oper)
@@ -337,11 +431,8 @@ class AutomatedRunConditional(BaseConditional):
         return ' '.join(tt), ctx
 
     def _map_value(self, vv):
-        if self.mapper:
-            m = MAPPER_KEY_REGEX.search(self.mapper)
-            if m:
-                key = m.group(0)
-                vv = eval(self.mapper, {key: vv})
+        if self._mapper_code is not None:
+            vv = eval(self._mapper_code, {self._mapper_key: vv})
         return vv
 
     def _interpolate_teststr(self, ts, obj, data):
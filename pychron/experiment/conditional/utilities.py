@@ -18,6 +18,10 @@
 # ============= standard library imports ========================
 # ============= local library imports  ==========================
 from __future__ import absolute_import
+
+import ast
+import sys
+
 from uncertainties import ufloat
 
 from pychron.experiment.conditional.regexes import COMP_REGEX, ARGS_REGEX, DEFLECTION_REGEX, BASELINECOR_REGEX, \
@@ -25,38 +29,76 @@ from pychron.experiment.conditional.regexes import COMP_REGEX, ARGS_REGEX, DEFLE
     RATIO_REGEX, BETWEEN_REGEX, PRESSURE_REGEX, DEVICE_REGEX
 
 
+# python<3.8 parses literals to Num, Str and NameConstant instead of Constant
+if sys.version_info < (3, 8):
+    LITERAL_NODES = (ast.Constant, ast.Num, ast.Str, ast.NameConstant)
+else:
+    LITERAL_NODES = (ast.Constant,)
+
+# the nodes allowed in a teststr after it is converted by ``get_teststr_attr_func``, e.g. "not 0<=Ar40<=5 or age>10"
+TESTSTR_NODES = (ast.Expression, ast.BoolOp, ast.And, ast.Or, ast.UnaryOp, ast.Not, ast.USub, ast.UAdd,
+                 ast.BinOp, ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+                 ast.Compare, ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+                 ast.Name, ast.Load) + LITERAL_NODES
+
+# mappers may also call builtins, e.g. "abs(x)"
+MAPPER_NODES = TESTSTR_NODES + (ast.Call,)
+
+
+def compile_expression(s, nodes=TESTSTR_NODES):
+    """
+        parse ``s`` and return a code object for ``eval``.
+
+        raises ValueError if ``s`` is not valid python or uses anything other than ``nodes``,
+        e.g. attribute access, subscripts or lambdas
+    """
+    try:
+        tree = ast.parse(s, mode='eval')
+    except SyntaxError as e:
+        raise ValueError('invalid expression "{}". {}'.format(s, e))
+
+    for node in ast.walk(tree):
+        if not isinstance(node, nodes):
+            raise ValueError('invalid expression "{}". {} not allowed'.format(s, node.__class__.__name__))
+        if isinstance(node, ast.Call) and not isinstance(node.func, ast.Name):
+            raise ValueError('invalid expression "{}". only simple function calls allowed'.format(s))
+
+    return compile(tree, '<conditional>', 'eval')
+
+
 def interpolate_teststr():
     pass
 
 
 def get_teststr_attr_func(token):
     for args in (
-            (DEVICE_REGEX, 'obj.get_device_value(attr)', wrapper, device_teststr),
-            (PRESSURE_REGEX, 'obj.get_pressure(attr)', wrapper, pressure_teststr),
-            (DEFLECTION_REGEX, 'obj.get_deflection(attr, current=True)'),
-            (ACTIVE_REGEX, 'attr not in data[0] if data is not None else False'),
-            (CP_REGEX, 'aa.get_current_intensity(attr)'),
-            (BASELINECOR_REGEX, 'aa.get_baseline_corrected_value(attr, default=None)'),
-            (BASELINE_REGEX, 'aa.get_baseline_value(attr)'),
-            (SLOPE_REGEX, 'aa.get_slope(attr, window or -1)'),
-            (AVG_REGEX, 'aa.get_values(attr, window or -1).mean()'),
-            (MAX_REGEX, 'aa.get_values(attr, window or -1).max()'),
-            (MIN_REGEX, 'aa.get_values(attr, window or -1).min()'),
-            (RATIO_REGEX, 'aa.get_value(attr)', wrapper, ratio_teststr),
-            (BETWEEN_REGEX, 'aa.get_value(attr)', between_wrapper, between_teststr)):
+            (DEVICE_REGEX, lambda obj, aa, attr, data, window: obj.get_device_value(attr), wrapper, device_teststr),
+            (PRESSURE_REGEX, lambda obj, aa, attr, data, window: obj.get_pressure(attr), wrapper, pressure_teststr),
+            (DEFLECTION_REGEX, lambda obj, aa, attr, data, window: obj.get_deflection(attr, current=True)),
+            (ACTIVE_REGEX, lambda obj, aa, attr, data, window: attr not in data[0] if data is not None else False),
+            (CP_REGEX, lambda obj, aa, attr, data, window: aa.get_current_intensity(attr)),
+            (BASELINECOR_REGEX,
+             lambda obj, aa, attr, data, window: aa.get_baseline_corrected_value(attr, default=None)),
+            (BASELINE_REGEX, lambda obj, aa, attr, data, window: aa.get_baseline_value(attr)),
+            (SLOPE_REGEX, lambda obj, aa, attr, data, window: aa.get_slope(attr, window or -1)),
+            (AVG_REGEX, lambda obj, aa, attr, data, window: aa.get_values(attr, window or -1).mean()),
+            (MAX_REGEX, lambda obj, aa, attr, data, window: aa.get_values(attr, window or -1).max()),
+            (MIN_REGEX, lambda obj, aa, attr, data, window: aa.get_values(attr, window or -1).min()),
+            (RATIO_REGEX, get_value, wrapper, ratio_teststr),
+            (BETWEEN_REGEX, get_value, between_wrapper, between_teststr)):
 
         wfunc = wrapper
         if len(args) == 2:
-            reg, fstr = args
+            reg, accessor = args
             tfunc = teststr_func
         else:
-            reg, fstr, wfunc, tfunc = args
+            reg, accessor, wfunc, tfunc = args
 
         found = reg.match(token)
         # print token, fstr, found
         if found:
             attr, key, teststr = tfunc(token)
-            func = wfunc(fstr, token, attr)
+            func = wfunc(accessor, token, attr)
             break
     else:
         teststr = token
@@ -77,29 +119,35 @@ def get_teststr_attr_func(token):
     return teststr, key, func
 
 
+# accessors
+def get_value(obj, aa, attr, data, window):
+    return aa.get_value(attr)
+
+
 # wrappers
-def wrapper(fstr, token, ai):
+def wrapper(accessor, token, ai):
+    """
+        bind ``accessor`` to the attribute ``ai``. returns func(obj, data, window)
+    """
+
     def func(obj, data, window):
-        return eval(fstr, {'attr': ai,
-                           'aa': obj.isotope_group,
-                           'obj': obj,
-                           'data': data, 'window': window})
+        return accessor(obj, obj.isotope_group, ai, data, window)
 
     return func
 
 
-def between_wrapper(fstr, token, ai):
+def between_wrapper(accessor, token, ai):
     aa = ARGS_REGEX.search(token).group(0)[1:-1].split(',')
     kk = aa[0]
     if '.' in kk:
         kk = kk.split('.')[0].strip()
 
-    for aa in ((DEFLECTION_REGEX, 'obj.get_deflection(attr, current=True)'),
-               (BASELINECOR_REGEX, 'aa.get_baseline_corrected_value(attr)'),
-               (BASELINE_REGEX, 'aa.get_baseline_value(attr)'),
-               (MIN_REGEX, 'aa.get_values(attr, window or -1).min()', kfunc()),
-               (MAX_REGEX, 'aa.get_values(attr, window or -1).max()', kfunc()),
-               (CP_REGEX, 'aa.get_current_intensity(attr)')):
+    for aa in ((DEFLECTION_REGEX, lambda obj, aa, attr, data, window: obj.get_deflection(attr, current=True)),
+               (BASELINECOR_REGEX, lambda obj, aa, attr, data, window: aa.get_baseline_corrected_value(attr)),
+               (BASELINE_REGEX, lambda obj, aa, attr, data, window: aa.get_baseline_value(attr)),
+               (MIN_REGEX, lambda obj, aa, attr, data, window: aa.get_values(attr, window or -1).min(), kfunc()),
+               (MAX_REGEX, lambda obj, aa, attr, data, window: aa.get_values(attr, window or -1).max(), kfunc()),
+               (CP_REGEX, lambda obj, aa, attr, data, window: aa.get_current_intensity(attr))):
         if len(aa) == 2:
             r, ff = aa
             kf = lambda x: x
@@ -114,7 +162,7 @@ def between_wrapper(fstr, token, ai):
         #     self.unique_warning('invalid modifier teststr="{}"'.format(kk))
         #     return
         # else:
-        return wrapper(fstr, token, ai)
+        return wrapper(accessor, token, ai)
 
 
 # teststr
@@ -18,6 +18,7 @@
 
 import os
 import time
+import uuid
 from datetime import datetime
 from operator import itemgetter
 from threading import Thread, Lock, currentThread
@@ -50,6 +51,7 @@ from pychron.experiment.conflict_resolver import ConflictResolver
 from pychron.experiment.datahub import Datahub
 from pychron.experiment.experiment_scheduler import ExperimentScheduler
 from pychron.experiment.experiment_status import ExperimentStatus
+from pychron.experiment.run_prefetcher import RunPrefetcher
 from pychron.experiment.stats import StatsGroup
 from pychron.experiment.utilities.conditionals import test_queue_conditionals_name, SYSTEM, QUEUE, RUN, \
     CONDITIONAL_GROUP_TAGS
@@ -61,8 +63,8 @@ from pychron.extraction_line.ipyscript_runner import IPyScriptRunner
 from pychron.globals import globalv
 from pychron.paths import paths
 from pychron.pychron_constants import DEFAULT_INTEGRATION_TIME, AR_AR, DVC_PROTOCOL, DEFAULT_MONITOR_NAME, \
-    SCRIPT_NAMES, EM_SCRIPT_KEYS, NULL_STR, NULL_EXTRACT_DEVICES, IPIPETTE_PROTOCOL, ILASER_PROTOCOL, IFURNACE_PROTOCOL, \
-    CRYO_PROTOCOL
+    SCRIPT_NAMES, SCRIPT_KEYS, EM_SCRIPT_KEYS, NULL_STR, NULL_EXTRACT_DEVICES, IPIPETTE_PROTOCOL, ILASER_PROTOCOL, \
+    IFURNACE_PROTOCOL, CRYO_PROTOCOL
 
 
 def remove_backup(uuid_str):
@@ -134,6 +136,7 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
     dashboard_client = Instance('pychron.dashboard.client.DashboardClient')
 
     scheduler = Instance(ExperimentScheduler)
+    run_prefetcher = Instance(RunPrefetcher)
 
     events = List
     # ===========================================================================
@@ -171,6 +174,7 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
 
     ratio_change_detection_enabled = Bool(False)
     execute_open_queues = Bool(True)
+    use_run_prefetch = Bool(True)
 
     # dvc
     use_dvc_persistence = Bool(False)
@@ -253,7 +257,8 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
                  'experiment_type',
                  'laboratory',
                  'ratio_change_detection_enabled',
-                 'execute_open_queues')
+                 'execute_open_queues',
+                 'use_run_prefetch')
         self._preference_binder(prefid, attrs)
 
         # dvc
@@ -313,6 +318,7 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
             self.info('pre execute check failed')
 
     def set_queue_modified(self):
+        self.run_prefetcher.invalidate()
         self.queue_modified = True
 
     def is_alive(self):
@@ -553,6 +559,7 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
 
         last_runid = None
 
+        self.run_prefetcher.invalidate()
         rgen, nruns = exp.new_runs_generator()
 
         cnt = 0
@@ -800,6 +807,10 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
                 run.spec.state = 'failed'
                 break
 
+            if step == '_measurement':
+                # prepare the next run while this run is measuring
+                self._prefetch_next_run(run)
+
             if not getattr(self, step)(run):
                 self.warning('{} did not complete successfully'.format(step[1:]))
                 if step != '_post_measurement':  # save data even if post measurement fails
@@ -962,6 +973,13 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
         self.debug('End Runs. stats={}'.format(self.stats))
         # self._last_ran = None
         self.stats.stop_timer()
+        self.run_prefetcher.invalidate()
+
+        # push the analyses still waiting in the publish queue
+        if self.use_dvc_persistence:
+            dvcp = self.application.get_service('pychron.dvc.dvc_persister.DVCPersister')
+            if dvcp:
+                dvcp.flush_publish_queue()
 
         # self.db.close()
         self.set_extract_state(False)
@@ -1143,6 +1161,7 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
             return AutomatedRun
 
             generate an AutomatedRun for this ``spec``.
+            use the run prepared by ``run_prefetcher`` if there is one
 
         """
         exp = self.experiment_queue
@@ -1150,12 +1169,26 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
         if not self._set_run_aliquot(spec):
             return
 
-        run = None
+        pulled = False
+        arun = None
+        prepared = self.run_prefetcher.take(spec)
+        if prepared is not None:
+            if self._is_prefetch_stale(prepared):
+                self.debug('scripts changed since {} was prefetched'.format(spec.runid))
+            else:
+                self.debug('using prefetched run {}'.format(spec.runid))
+                arun, pulled = prepared.run, prepared.pulled
+
+        if arun is None:
+            arun = self._prepare_run(spec)
 
+        # the spec is only modified here, on the executor thread, never by the prefetch worker
         spec.load_name = exp.load_name
         spec.load_holder = exp.tray
+        arun.uuid = spec.uuid = str(uuid.uuid4())
 
-        arun = spec.make_run(run=run)
+        # the aliquot is set when the run is started
+        arun.runid = spec.runid
         arun.logger_name = 'AutomatedRun {}'.format(arun.runid)
 
         if spec.end_after:
@@ -1168,31 +1201,11 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
         '''
         self._add_backup(arun.uuid)
 
-        arun.integration_time = 1.04
-
-        arun.labspy_client = self.application.get_service('pychron.labspy.client.LabspyClient')
-
-        for k in ('signal_color', 'sniff_color', 'baseline_color',
-                  'ms_pumptime_start', 'datahub', 'console_display', 'experiment_queue',
-                  'spectrometer_manager', 'extraction_line_manager', 'ion_optics_manager',
-                  'use_db_persistence', 'use_dvc_persistence', 'use_xls_persistence'):
-            setattr(arun, k, getattr(self, k))
-
+        arun.ms_pumptime_start = self.ms_pumptime_start
         arun.previous_blanks = self._prev_blank_id, self._prev_blanks, self._prev_blank_runid
         arun.previous_baselines = self._prev_baselines
         arun.on_trait_change(self._handle_executor_event, 'executor_event')
 
-        arun.set_preferences(self.application.preferences)
-
-        arun.refresh_scripts()
-
-        for sname in SCRIPT_NAMES:
-            script = getattr(arun, sname)
-            if script:
-                script.application = self.application
-                script.manager = self
-                script.runner = self.pyscript_runner
-
         arun.extract_device = exp.extract_device
         arun.persister.datahub = self.datahub
         arun.persister.dbexperiment_identifier = exp.database_identifier
@@ -1209,7 +1222,8 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
                 repid = spec.repository_identifier
                 self.datahub.mainstore.add_repository(repid, self.default_principal_investigator, inform=False)
 
-                arun.dvc_persister.initialize(repid)
+                arun.dvc_persister.initialize(repid, pull=not pulled)
+                self.stats.publish_queue = dvcp.publish_queue
 
         mon = self.monitor
         if mon is not None:
@@ -1226,6 +1240,79 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
 
         return arun
 
+    def _prepare_run(self, spec):
+        """
+            spec: AutomatedRunSpec
+            return AutomatedRun
+
+            the parts of making a run that do not depend on the previous run, i.e. loading the scripts.
+            called by ``run_prefetcher`` on a worker thread while the previous run is measuring so ``spec``
+            must not be modified. the uuid is assigned by ``_make_run``
+        """
+        arun = spec.make_run(new_uuid=False)
+        arun.logger_name = 'AutomatedRun {}'.format(arun.runid)
+
+        arun.integration_time = 1.04
+
+        arun.labspy_client = self.application.get_service('pychron.labspy.client.LabspyClient')
+
+        for k in ('signal_color', 'sniff_color', 'baseline_color',
+                  'datahub', 'console_display', 'experiment_queue',
+                  'spectrometer_manager', 'extraction_line_manager', 'ion_optics_manager',
+                  'use_db_persistence', 'use_dvc_persistence', 'use_xls_persistence'):
+            setattr(arun, k, getattr(self, k))
+
+        arun.set_preferences(self.application.preferences)
+
+        arun.refresh_scripts()
+
+        for sname in SCRIPT_NAMES:
+            script = getattr(arun, sname)
+            if script:
+                script.application = self.application
+                script.manager = self
+                script.runner = self.pyscript_runner
+
+        return arun
+
+    def _prefetch_next_run(self, run):
+        """
+            run: AutomatedRun
+
+            start preparing the run after ``run``
+        """
+        if not self.use_run_prefetch or self.end_at_run_completion or run.is_last:
+            return
+
+        exp = self.experiment_queue
+        spec = next((s for s in exp.cleaned_automated_runs if s.executable and s is not run.spec), None)
+        if spec is not None:
+            self.run_prefetcher.prefetch(spec)
+
+    def _pull_prefetched_repository(self, spec):
+        if self.use_dvc_persistence:
+            dvcp = self.application.get_service('pychron.dvc.dvc_persister.DVCPersister')
+            if dvcp:
+                return dvcp.pull_repository(spec.repository_identifier)
+
+    def _is_prefetch_stale(self, prepared):
+        """
+            prepared: PreparedRun
+
+            return True if the spec's scripts were changed or a script file was modified after the run was prepared
+        """
+        arun = prepared.run
+        for si in SCRIPT_KEYS:
+            if getattr(arun.script_info, '{}_script_name'.format(si)) != getattr(prepared.spec, '{}_script'.format(si)):
+                return True
+
+        for sname in SCRIPT_NAMES:
+            script = getattr(arun, sname)
+            if script:
+                p = script.filename
+                if os.path.isfile(p) and os.path.getmtime(p) >= prepared.timestamp:
+                    return True
+
     def _set_run_aliquot(self, spec):
         """
             spec: AutomatedRunSpec
@@ -2067,7 +2154,7 @@ class ExperimentExecutor(Consoleable, PreferenceMixin):
 
                 # experimentor handles the queue modified
                 # resets the database and updates info
-                self.queue_modified = True
+                self.set_queue_modified()
 
             else:
                 self.info('executed N {} {}s'.format(action.count + 1,
@@ -2253,6 +2340,10 @@ Use Last "blank_{}"= {}
     def _scheduler_default(self):
         return ExperimentScheduler()
 
+    def _run_prefetcher_default(self):
+        return RunPrefetcher(prepare=self._prepare_run,
+                             pull=self._pull_prefetched_repository)
+
     def _datahub_default(self):
         dh = Datahub()
         return dh
@@ -0,0 +1,121 @@
+# ===============================================================================
+# Copyright 2026 ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+from traits.api import Callable, Int
+# ============= standard library imports ========================
+import time
+from threading import Thread, Lock, Event
+
+# ============= local library imports  ==========================
+from pychron.loggable import Loggable
+
+
+class PreparedRun(object):
+    """
+        a run prepared ahead of time for ``spec``
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.run = None
+        self.pulled = False
+        self.timestamp = time.time()
+        self.event = Event()
+
+
+class RunPrefetcher(Loggable):
+    """
+        prepare the next run on a worker thread while the current run is measuring.
+
+        ``prepare(spec)`` returns the AutomatedRun for ``spec``. ``pull(spec)`` optionally pulls the spec's
+        repository and returns True if it was pulled. only one run is prepared at a time. a prepared run is
+        discarded by ``invalidate``, e.g. when the queue is modified, or when another spec is prefetched.
+    """
+    prepare = Callable
+    pull = Callable
+
+    nprepared = Int
+    nhits = Int
+
+    def __init__(self, *args, **kw):
+        super(RunPrefetcher, self).__init__(*args, **kw)
+        self._lock = Lock()
+        self._prepared = None
+
+    def prefetch(self, spec):
+        """
+            start preparing ``spec``. does nothing if ``spec`` is already prepared or being prepared
+        """
+        with self._lock:
+            if self._prepared is not None and self._prepared.spec is spec:
+                return
+
+            self._prepared = p = PreparedRun(spec)
+
+        self.debug('prefetching {}'.format(spec.runid))
+        t = Thread(target=self._prepare, args=(p,), name='prefetch {}'.format(spec.runid))
+        t.daemon = True
+        t.start()
+
+    def take(self, spec, timeout=None):
+        """
+            return the PreparedRun for ``spec`` or None if ``spec`` was not prefetched or the prepared run was
+            invalidated. waits for a preparation in progress
+        """
+        with self._lock:
+            p = self._prepared
+            if p is None or p.spec is not spec:
+                return
+
+        if not p.event.wait(timeout):
+            self.debug('timed out waiting for prefetched run {}'.format(spec.runid))
+            return
+
+        with self._lock:
+            if self._prepared is not p:
+                return
+            self._prepared = None
+
+        if p.run is not None:
+            self.nhits += 1
+            return p
+
+    def invalidate(self):
+        with self._lock:
+            if self._prepared is not None:
+                self.debug('invalidating prefetched run {}'.format(self._prepared.spec.runid))
+            self._prepared = None
+
+    # private
+    def _prepare(self, p):
+        st = time.time()
+        try:
+            p.run = self.prepare(p.spec)
+            if p.run is not None and self.pull:
+                p.pulled = bool(self.pull(p.spec))
+        except BaseException:
+            self.warning('failed prefetching {}'.format(p.spec.runid))
+            self.debug_exception()
+            p.run = None
+        finally:
+            p.event.set()
+
+        if p.run is not None:
+            self.nprepared += 1
+            self.debug('prefetched {} in {:0.3f}s'.format(p.spec.runid, time.time() - st))
+
+# ============= EOF =============================================
@@ -105,6 +105,10 @@ class StatsGroup(Loggable):
     run_duration = String
     current_run_duration = String
 
+    # analyses saved but not yet pushed by the DVC publish queue
+    publish_queue = Any
+    unpublished = Int
+
     _timer = Any
 
     elapsed = Property(depends_on='_elapsed')
@@ -156,6 +160,8 @@ class StatsGroup(Loggable):
         def update_time():
             e = round(time.time() - st)
             d = {'_elapsed': e}
+            if self.publish_queue:
+                d['unpublished'] = self.publish_queue.depth
             if self._run_start:
                 re = round(time.time() - self._run_start)
                 d['_run_elapsed'] = re
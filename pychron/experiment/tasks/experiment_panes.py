@@ -340,6 +340,9 @@ class StatsPane(TraitsDockPane):
                                       UReadonly('elapsed')),
                                Readonly('remaining', label='Remaining'),
                                Readonly('etf', label='Est. finish'),
+                               Readonly('unpublished', label='Unpublished',
+                                        tooltip='Analyses saved but not yet pushed to the git host',
+                                        visible_when='publish_queue'),
                                label='General')
         cur_grp = BorderVGroup(Readonly('current_run_duration', ),
                                Readonly('run_elapsed'),
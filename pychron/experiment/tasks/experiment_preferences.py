@@ -97,7 +97,13 @@ class ExperimentPreferences(BasePreferencesHelper):
     failed_intensity_count_threshold = PositiveInteger(3)
     ratio_change_detection_enabled = Bool(False)
     plot_panel_update_period = PositiveInteger(1)
+    use_async_data_writer = Bool(True)
+    data_writer_flush_interval = PositiveFloat(1.0)
+    data_writer_queue_size = PositiveInteger(1000)
+    h5_flush_interval = PositiveFloat(5.0)
+    h5_flush_rows = PositiveInteger(500)
     execute_open_queues = Bool
+    use_run_prefetch = Bool(True)
 
     def _get_memory_threshold(self):
         return self._memory_threshold
@@ -161,6 +167,9 @@ class ExperimentPreferencesPane(PreferencesPane):
         general_grp = VGroup(Item('execute_open_queues', label='Execute Open Queues',
                                   tooltip='After the active queue finishes continue running any other open tabs '
                                           'in order from left to right'),
+                             Item('use_run_prefetch', label='Prepare Next Run',
+                                  tooltip='Load the scripts and pull the repository of the next analysis '
+                                          'while the current analysis is measuring'),
                              Item('experiment_type', label='Experiment Type'),
                              Item('send_config_before_run',
                                   tooltip='Set the spectrometer configuration before each analysis',
@@ -224,6 +233,11 @@ class ExperimentPreferencesPane(PreferencesPane):
         persist_grp = Group(Item('use_xls_persistence', label='Save analyses to Excel workbook'),
                             Item('use_db_persistence', label='Save analyses to Database'),
                             Item('use_uuid_path_name', label='Use UUID Path Names'),
+                            HGroup(Item('h5_flush_interval', label='HDF5 Flush Interval (s)',
+                                        tooltip='Write buffered signals to the HDF5 file every N seconds. '
+                                                'Always written at the end of each measurement'),
+                                   Item('h5_flush_rows', label='HDF5 Buffer Rows',
+                                        tooltip='Write a table\'s buffered signals once it has N rows')),
                             label='Persist', show_border=True)
 
         pc_grp = Group(Item('use_peak_center_threshold', label='Use Peak Center Threshold',
@@ -250,6 +264,13 @@ class ExperimentPreferencesPane(PreferencesPane):
                                                   'Configured via "setupfiles/ratio_change_detection.yaml"'),
                                      Item('plot_panel_update_period', label='Regression Update Period',
                                           tooltip='update the isotope regression graph every N counts'),
+                                     HGroup(Item('use_async_data_writer', label='Background Data Writer',
+                                                 tooltip='Write measured data on a background thread so slow '
+                                                         'disk writes do not delay the measurement'),
+                                            Item('data_writer_flush_interval', label='Flush Interval (s)',
+                                                 enabled_when='use_async_data_writer'),
+                                            Item('data_writer_queue_size', label='Queue Size',
+                                                 enabled_when='use_async_data_writer')),
                                      pc_grp,
                                      persist_grp,
                                      monitor_grp, overlap_grp),
@@ -0,0 +1,77 @@
+import threading
+import time
+import unittest
+
+from pychron.experiment.automated_run.async_writer import AsyncDataWriter
+
+
+class AsyncDataWriterTestCase(unittest.TestCase):
+    def test_write_order(self):
+        written = []
+        w = AsyncDataWriter(lambda *args: written.append(args), flush_interval=0.01)
+        w.start()
+        for i in range(100):
+            w.put(i, 'a')
+        w.stop()
+
+        self.assertEqual(written, [(i, 'a') for i in range(100)])
+        self.assertEqual(w.stats()['written'], 100)
+        self.assertEqual(w.depth, 0)
+        self.assertFalse(w.is_alive)
+
+    def test_not_on_calling_thread(self):
+        threads = set()
+        w = AsyncDataWriter(lambda *args: threads.add(threading.current_thread()), flush_interval=0.01)
+        w.start()
+        w.put(1)
+        time.sleep(0.1)
+        self.assertNotIn(threading.current_thread(), threads)
+        w.stop()
+
+    def test_flush_on_stop(self):
+        written = []
+        # long interval. nothing is written until stop
+        w = AsyncDataWriter(lambda *args: written.append(args), flush_interval=60)
+        w.start()
+        for i in range(5):
+            w.put(i)
+        self.assertEqual(written, [])
+        w.stop()
+        self.assertEqual(len(written), 5)
+
+    def test_bounded(self):
+        written = []
+
+        def slow(*args):
+            time.sleep(0.01)
+            written.append(args)
+
+        w = AsyncDataWriter(slow, maxsize=4, flush_interval=60)
+        w.start()
+        for i in range(20):
+            w.put(i)
+            self.assertLessEqual(w.depth, 4)
+        w.stop()
+
+        self.assertEqual(len(written), 20)
+        self.assertLessEqual(w.max_depth, 4)
+
+    def test_error(self):
+        errors = []
+
+        def writer(x):
+            if x == 1:
+                raise ValueError('bad')
+
+        w = AsyncDataWriter(writer, flush_interval=0.01, on_error=errors.append)
+        w.start()
+        for i in range(3):
+            w.put(i)
+        w.stop()
+        self.assertEqual(len(errors), 1)
+        self.assertEqual(w.nwritten, 3)
+        self.assertTrue(w.report_stats())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -37,6 +37,9 @@ class Arun(object):
     def get_device_value(self, dev_name):
         return 60
 
+    def get_interpolated_value(self, v):
+        return {'$MIN_INTENSITY': 100}.get(v)
+
 
 class ParseConditionalsTestCase(unittest.TestCase):
     def setUp(self):
@@ -299,6 +302,42 @@ class ConditionalsTestCase(unittest.TestCase):
         d = {'check': 'L2(CDD).deflection==2000', 'attr': 'CDD'}
         self._test(d)
 
+    @unittest.skipIf(DEBUGGING, 'Debugging')
+    def test_Interpolate(self):
+        d = {'check': 'Ar40<$MIN_INTENSITY', 'attr': 'Ar40'}
+        self.arun.isotope_group.isotopes['Ar40'].value = 1000
+        self._test(d, expected=None)
+
+        self.arun.isotope_group.isotopes['Ar40'].value = 10
+        c = self._test(d)
+        self.assertEqual(c.result_dict()['teststr'], 'Ar40<100')
+
+    def test_compiled_once(self):
+        c = conditional_from_dict({'check': 'age>0.1 and Ar40<100'}, 'TerminationConditional')
+        tokens = c._tokens
+        self.assertEqual(list(c._codes), ['age>0.1 and Ar40<100'])
+        for i in range(3):
+            self.assertTrue(c.check(self.arun, ([], []), 1000))
+        self.assertIs(c._tokens, tokens)
+
+        c.teststr = 'age<0.1'
+        self.assertIsNone(c.check(self.arun, ([], []), 1000))
+
+    def test_numeric_teststr(self):
+        c = conditional_from_dict({'check': 'Ar40>5'}, 'TerminationConditional')
+        self.assertTrue(c.active)
+        self.assertEqual(list(c._codes), ['Ar40>5'])
+
+    def test_invalid_teststr(self):
+        c = conditional_from_dict({'check': 'age>0.1 and open("x")'}, 'TerminationConditional')
+        self.assertFalse(c.active)
+        self.assertIsNone(c.check(self.arun, ([], []), 1000))
+
+    def test_invalid_mapper(self):
+        d = {'check': 'Ar40>900', 'mapper': 'x.__class__'}
+        c = conditional_from_dict(d, 'TerminationConditional')
+        self.assertFalse(c.active)
+
     def _test_between(self, l, h):
         self.arun.isotope_group.isotopes['Ar40'].value = 3.4
         d = {'check': 'between(Ar40,{},{})'.format(l, h), 'attr': 'Ar40'}
@@ -308,6 +347,7 @@ class ConditionalsTestCase(unittest.TestCase):
         c = conditional_from_dict(d, kind)
         ret = c.check(self.arun, ([], []), 1000)
         self.assertEqual(ret, expected)
+        return c
 
 
 if __name__ == '__main__':
@@ -0,0 +1,106 @@
+"""
+benchmark the cost of checking a conditional during a measurement.
+
+    python -m pychron.experiment.tests.conditionals_benchmark [ncycles]
+
+checks each of the example conditionals from the docs and the tests ``ncycles`` times. "compiled" is the normal
+path, the teststr is compiled once when the conditional is loaded. "per check" discards the compiled teststr
+before every check, i.e. tokenizes and compiles on every check as conditionals did before.
+each is run with debug logging enabled and disabled.
+
+the run returns constant values so only the cost of the conditionals is measured, not the isotope regressions.
+"""
+import logging
+import sys
+import time
+
+from numpy import linspace
+
+from pychron.experiment.conditional.conditional import conditional_from_dict
+
+EXAMPLES = ({'check': 'CDD.inactive'},
+            {'check': 'CDD.deflection==2000'},
+            {'check': 'bone.ig.pressure > 1e-8'},
+            {'check': 'device.pneumatics < 10'},
+            {'check': 'Ar40 < $MIN_INTENSITY'},
+            {'check': 'age>0.1 and age<100'},
+            {'check': 'age>0.1 and between(Ar40,0,100)'},
+            {'check': 'not age<0.1'},
+            {'check': 'Ar40/Ar39>1'},
+            {'check': 'between(Ar40.bs,0,1)'},
+            {'check': 'between(max(Ar40),200,205)'},
+            {'check': 'slope(Ar40)>0.1'},
+            {'check': 'average(Ar40)>182', 'window': 10},
+            {'check': 'Ar40.cur>1'},
+            {'check': 'Ar40.bs_corrected<10'},
+            {'check': 'Ar40>900', 'mapper': 'x+1000'})
+
+
+class Group(object):
+    def __init__(self):
+        self._values = linspace(0, 100)
+
+    def get_value(self, attr):
+        return 10.
+
+    def get_values(self, attr, window):
+        return self._values[-window:]
+
+    def get_slope(self, attr, window):
+        return 2.
+
+    def get_current_intensity(self, attr):
+        return 50.
+
+    def get_baseline_value(self, attr):
+        return 0.25
+
+    def get_baseline_corrected_value(self, attr, default=None):
+        return 9.75
+
+
+class Run(object):
+    def __init__(self):
+        self.isotope_group = Group()
+
+    def get_deflection(self, *args, **kw):
+        return 2000
+
+    def get_pressure(self, attr):
+        return 1e-9
+
+    def get_device_value(self, dev_name):
+        return 60
+
+    def get_interpolated_value(self, v):
+        return 100
+
+
+def measure(conds, arun, ncycles, recompile):
+    data = (['H1', 'AX'], [1, 1])
+    st = time.perf_counter()
+    for i in range(ncycles):
+        for c in conds:
+            if recompile:
+                c._tokens = None
+            c.check(arun, data, 1000)
+    return time.perf_counter() - st
+
+
+def run(ncycles=500):
+    arun = Run()
+    conds = [conditional_from_dict(d, 'TerminationConditional') for d in EXAMPLES]
+    n = ncycles * len(conds)
+
+    print('cycles={} conditionals={}'.format(ncycles, len(conds)))
+    for debug in (True, False):
+        logging.disable(logging.NOTSET if debug else logging.DEBUG)
+        for name, recompile in (('per check', True), ('compiled', False)):
+            et = measure(conds, arun, ncycles, recompile)
+            print('debug={:<5s} {:<10s} {:0.2f} us/check'.format(str(debug), name, et / n * 1e6))
+    logging.disable(logging.NOTSET)
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:2]]
+    run(*args)
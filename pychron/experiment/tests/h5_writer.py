@@ -0,0 +1,110 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from pychron.experiment.automated_run.async_writer import AsyncDataWriter
+from pychron.experiment.automated_run.h5_writer import H5DataWriter
+from pychron.managers.data_managers.h5_data_manager import H5DataManager
+
+
+class Detector(object):
+    def __init__(self, name, isotope):
+        self.name = name
+        self.isotope = isotope
+
+
+DETECTORS = [Detector('H1', 'Ar40'), Detector('AX', 'Ar39'), Detector('CDD', 'Ar36')]
+
+
+class H5DataWriterTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.path = os.path.join(self.root, 'run.hdf5')
+        self.dm = dm = H5DataManager()
+        with dm.open_file(self.path, 'w'):
+            dm.new_group('signal')
+            dm.new_group('baseline')
+            for d in DETECTORS:
+                grp = dm.new_group(d.isotope, parent='/signal')
+                dm.new_table(grp, d.name)
+                dm.new_table('/baseline', d.name)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def _write(self, grpname, ncycles, detectors=None, **kw):
+        dets = detectors or DETECTORS
+        keys = [d.name for d in dets]
+        pairs = [(d.isotope, d.name) for d in dets]
+        with self.dm.open_file(self.path):
+            w = H5DataWriter(self.dm, grpname, **kw)
+            for i in range(ncycles):
+                w(pairs, i * 0.5, keys, [i * (j + 1) for j in range(len(keys))])
+            w.close()
+        return w
+
+    def _read(self, group, name):
+        with self.dm.open_table(self.path, name, group) as t:
+            return [(r['time'], r['value']) for r in t.iterrows()]
+
+    def test_write(self):
+        w = self._write('signal', 10, flush_interval=60, flush_rows=1000)
+        self.assertEqual(w.nrows, 30)
+        self.assertEqual(w.nflushes, 1)
+
+        rows = self._read('/signal/Ar39', 'AX')
+        self.assertEqual(rows, [(i * 0.5, i * 2) for i in range(10)])
+
+    def test_flush_rows(self):
+        w = self._write('signal', 10, flush_interval=60, flush_rows=4)
+        self.assertEqual(w.nflushes, 3)
+        self.assertEqual(len(self._read('/signal/Ar40', 'H1')), 10)
+
+    def test_baseline(self):
+        self._write('baseline', 5)
+        self.assertEqual(len(self._read('/baseline', 'CDD')), 5)
+        self.assertEqual(self._read('/signal/Ar36', 'CDD'), [])
+
+    def test_peak_hop(self):
+        # the same detector measures a different isotope on each hop. there are no Ar39/H1 or Ar36/AX tables
+        with self.dm.open_file(self.path):
+            w = H5DataWriter(self.dm, 'signal', flush_interval=60)
+            for i in range(4):
+                isos = ('Ar40', 'Ar39') if i % 2 else ('Ar39', 'Ar36')
+                w(list(zip(isos, ('H1', 'AX'))), i, ['H1', 'AX'], [1, 2])
+            w.close()
+
+        self.assertEqual(w.nrows, 4)
+        self.assertEqual(self._read('/signal/Ar40', 'H1'), [(1, 1), (3, 1)])
+        self.assertEqual(self._read('/signal/Ar39', 'AX'), [(1, 2), (3, 2)])
+
+    def test_repaired_before_flush(self):
+        # rows are queued with the pairing at measurement time. the detectors are repaired for the next hop before
+        # the queued rows are written
+        h1, ax = Detector('H1', 'Ar40'), Detector('AX', 'Ar39')
+        with self.dm.open_file(self.path):
+            w = H5DataWriter(self.dm, 'signal', flush_interval=60)
+            q = AsyncDataWriter(w, flush_interval=60)
+            for i in range(4):
+                h1.isotope, ax.isotope = ('Ar40', 'Ar39') if i % 2 else ('Ar39', 'Ar36')
+                q.put([(d.isotope, d.name) for d in (h1, ax)], i, ['H1', 'AX'], [1, 2])
+
+            h1.isotope, ax.isotope = 'Ar36', 'Ar40'
+            q.stop()
+            w.close()
+
+        self.assertEqual(w.nrows, 4)
+        self.assertEqual(self._read('/signal/Ar40', 'H1'), [(1, 1), (3, 1)])
+        self.assertEqual(self._read('/signal/Ar39', 'AX'), [(1, 2), (3, 2)])
+        self.assertEqual(self._read('/signal/Ar36', 'CDD'), [])
+
+    def test_missing_table(self):
+        dets = DETECTORS + [Detector('L2', 'Ar38')]
+        w = self._write('signal', 3, detectors=dets)
+        self.assertEqual(w.nrows, 9)
+        self.assertEqual(len(self._read('/signal/Ar40', 'H1')), 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+benchmark the per-cycle cost of writing signals to the run's HDF5 file.
+
+    python -m pychron.experiment.tests.h5_writer_benchmark [ncycles] [ndetectors]
+
+compares the previous writer, which looked up the table and flushed it for every detector on every cycle, with
+``H5DataWriter`` for a multicollector run, all detectors every cycle, and a peak hop run, one hop per cycle.
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from pychron.experiment.automated_run.h5_writer import H5DataWriter
+from pychron.managers.data_managers.h5_data_manager import H5DataManager
+
+DETECTORS = ('H2', 'H1', 'AX', 'L1', 'L2', 'CDD', 'H3', 'L3')
+ISOTOPES = ('Ar40', 'Ar39', 'Ar38', 'Ar37', 'Ar36')
+
+
+class Detector(object):
+    def __init__(self, name, isotope):
+        self.name = name
+        self.isotope = isotope
+
+
+def make_per_sample_writer(dm, grpname):
+    """
+        the previous ``AutomatedRunPersister.get_data_writer``, taking the collector's (isotope, detector) pairs
+    """
+
+    def write_data(pairs, x, keys, signals):
+        for iso, k in pairs:
+            if k in keys:
+                t = dm.get_table(k, '/{}/{}'.format(grpname, iso))
+                nrow = t.row
+                nrow['time'] = x
+                nrow['value'] = signals[keys.index(k)]
+                nrow.append()
+                t.flush()
+
+    return write_data
+
+
+def make_multicollector(ndet):
+    dets = [Detector(d, ISOTOPES[i % len(ISOTOPES)]) for i, d in enumerate(DETECTORS[:ndet])]
+    keys = [d.name for d in dets]
+    return [(dets, keys)]
+
+
+def make_peak_hop(ndet):
+    # every detector measures every isotope. one hop per cycle
+    names = DETECTORS[:ndet]
+    hops = []
+    for i in range(len(ISOTOPES)):
+        dets = [Detector(d, ISOTOPES[(i + j) % len(ISOTOPES)]) for j, d in enumerate(names)]
+        hops.append((dets, list(names)))
+    return hops
+
+
+def build(dm, path, hops, ncycles):
+    with dm.open_file(path, 'w'):
+        dm.new_group('signal')
+        for dets, keys in hops:
+            for d in dets:
+                grp = dm.new_group(d.isotope, parent='/signal')
+                dm.new_table(grp, d.name, ncycles)
+
+
+def measure(dm, path, writer, hops, ncycles):
+    signals = [1.0] * len(hops[0][1])
+    nhops = len(hops)
+    pairs = [[(d.isotope, d.name) for d in dets] for dets, keys in hops]
+    with dm.open_file(path):
+        st = time.perf_counter()
+        for c in range(ncycles):
+            dets, keys = hops[c % nhops]
+            writer(pairs[c % nhops], c * 0.5, keys, signals)
+
+        if hasattr(writer, 'close'):
+            writer.close()
+        return time.perf_counter() - st
+
+
+def run(ncycles=5000, ndet=8):
+    root = tempfile.mkdtemp()
+    try:
+        print('cycles={} detectors={}'.format(ncycles, ndet))
+        for kind, hops in (('multicollector', make_multicollector(ndet)),
+                           ('peak hop', make_peak_hop(ndet))):
+            for name, factory in (('per sample', make_per_sample_writer),
+                                  ('buffered', H5DataWriter)):
+                dm = H5DataManager()
+                path = os.path.join(root, '{}-{}.hdf5'.format(kind, name).replace(' ', '_'))
+                build(dm, path, hops, ncycles)
+                et = measure(dm, path, factory(dm, 'signal'), hops, ncycles)
+                print('{:<15s} {:<11s} {:0.2f} us/cycle'.format(kind, name, et / ncycles * 1e6))
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
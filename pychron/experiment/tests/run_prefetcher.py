@@ -0,0 +1,94 @@
+import unittest
+from threading import Event
+
+from pychron.experiment.run_prefetcher import RunPrefetcher
+
+
+class Spec(object):
+    def __init__(self, runid):
+        self.runid = runid
+
+
+class Run(object):
+    def __init__(self, spec):
+        self.spec = spec
+
+
+class RunPrefetcherTestCase(unittest.TestCase):
+    def setUp(self):
+        self.prepared = []
+        self.pulled = []
+        self.release = Event()
+        self.release.set()
+        self.prefetcher = RunPrefetcher(prepare=self._prepare, pull=self._pull)
+
+    def _prepare(self, spec):
+        self.release.wait(5)
+        if spec.runid == 'fail':
+            raise ValueError('invalid script')
+
+        self.prepared.append(spec.runid)
+        return Run(spec)
+
+    def _pull(self, spec):
+        self.pulled.append(spec.runid)
+        return True
+
+    def test_take(self):
+        spec = Spec('1000-01')
+        self.prefetcher.prefetch(spec)
+
+        p = self.prefetcher.take(spec, timeout=5)
+        self.assertIs(p.run.spec, spec)
+        self.assertTrue(p.pulled)
+        self.assertEqual(self.pulled, ['1000-01'])
+        self.assertEqual(self.prefetcher.nhits, 1)
+
+        # a prepared run is only used once
+        self.assertIsNone(self.prefetcher.take(spec, timeout=5))
+
+    def test_take_other_spec(self):
+        self.prefetcher.prefetch(Spec('1000-01'))
+        self.assertIsNone(self.prefetcher.take(Spec('1000-02'), timeout=5))
+
+    def test_waits_for_preparation(self):
+        self.release.clear()
+        spec = Spec('1000-01')
+        self.prefetcher.prefetch(spec)
+        self.assertIsNone(self.prefetcher.take(spec, timeout=0.01))
+
+        self.release.set()
+        self.assertIsNotNone(self.prefetcher.take(spec, timeout=5))
+
+    def test_invalidate(self):
+        self.release.clear()
+        spec = Spec('1000-01')
+        self.prefetcher.prefetch(spec)
+        self.prefetcher.invalidate()
+        self.release.set()
+
+        self.assertIsNone(self.prefetcher.take(spec, timeout=5))
+
+    def test_prefetch_replaces(self):
+        a, b = Spec('1000-01'), Spec('1000-02')
+        self.prefetcher.prefetch(a)
+        self.prefetcher.prefetch(b)
+        self.assertIsNone(self.prefetcher.take(a, timeout=5))
+        self.assertIsNotNone(self.prefetcher.take(b, timeout=5))
+
+    def test_prefetch_same_spec(self):
+        spec = Spec('1000-01')
+        self.prefetcher.prefetch(spec)
+        self.prefetcher.prefetch(spec)
+        self.assertIsNotNone(self.prefetcher.take(spec, timeout=5))
+        self.assertEqual(self.prepared, ['1000-01'])
+
+    def test_failed(self):
+        spec = Spec('fail')
+        self.prefetcher.prefetch(spec)
+        self.assertIsNone(self.prefetcher.take(spec, timeout=5))
+        self.assertEqual(self.pulled, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
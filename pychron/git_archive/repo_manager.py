@@ -688,11 +688,13 @@ class GitRepoManager(Loggable):
         commit_view = CommitView(model=h)
         return commit_view
 
-    def pull(self, branch='master', remote='origin', handled=True, use_progress=True, use_auto_pull=False):
+    def pull(self, branch='master', remote='origin', handled=True, use_progress=True, use_auto_pull=False,
+             fetch=True):
         """
             fetch and merge
 
             if use_auto_pull is False ask user if they want to accept the available updates
+            if fetch is False only merge. use when the remote was already fetched
         """
         self.debug('pulling {} from {}'.format(branch, remote))
 
@@ -710,22 +712,23 @@ class GitRepoManager(Loggable):
                                      show_percent=False,
                                      title='Pull Repository {}'.format(self.name), close_at_end=False)
                 prog.change_message('Fetching branch:"{}" from "{}"'.format(branch, remote))
-            try:
-                self.fetch(remote)
-            except GitCommandError as e:
-                self.debug(e)
-                if not handled:
-                    raise e
-            self.debug('fetch complete')
+            if fetch:
+                try:
+                    self.fetch(remote)
+                except GitCommandError as e:
+                    self.debug(e)
+                    if not handled:
+                        raise e
+                self.debug('fetch complete')
 
             def merge():
                 try:
                     repo.git.merge('FETCH_HEAD')
                 except GitCommandError:
-                    self.smart_pull(branch=branch, remote=remote)
+                    self.smart_pull(branch=branch, remote=remote, fetch=fetch)
 
             if not use_auto_pull:
-                ahead, behind = self.ahead_behind(remote)
+                ahead, behind = self.ahead_behind(remote, fetch=fetch)
                 if behind:
                     if self.confirmation_dialog('Repository "{}" is behind the official version by {} changes.\n'
                                                 'Would you like to pull the available changes?'.format(self.name,
@@ -746,14 +749,20 @@ class GitRepoManager(Loggable):
     def has_remote(self, remote='origin'):
         return bool(self._get_remote(remote))
 
-    def push(self, branch='master', remote=None, inform=False):
+    def push(self, branch='master', remote=None, inform=False, handled=True):
+        """
+            if handled is False a failed push raises GitCommandError
+        """
         if remote is None:
             remote = 'origin'
 
         repo = self._repo
         rr = self._get_remote(remote)
         if rr:
-            self._git_command(lambda: repo.git.push(remote, branch), tag='GitRepoManager.push')
+            if handled:
+                self._git_command(lambda: repo.git.push(remote, branch), tag='GitRepoManager.push')
+            else:
+                repo.git.push(remote, branch)
             if inform:
                 self.information_dialog('{} push complete'.format(self.name))
         else:
@@ -777,9 +786,12 @@ class GitRepoManager(Loggable):
 
     def smart_pull(self, branch='master', remote='origin',
                    quiet=True,
-                   accept_our=False, accept_their=False):
+                   accept_our=False, accept_their=False, fetch=True):
+        """
+            if fetch is False only merge. use when the remote was already fetched
+        """
         try:
-            ahead, behind = self.ahead_behind(remote)
+            ahead, behind = self.ahead_behind(remote, fetch=fetch)
         except GitCommandError as e:
             self.debug('Smart pull error: {}'.format(e))
             return
@@ -855,16 +867,18 @@ You like to delete them and try again?'''.format(clean)):
 
         return True
 
-    def fetch(self, remote='origin'):
+    def fetch(self, remote='origin', handled=True):
         if self._repo:
+            if not handled:
+                return self._repo.git.fetch(remote)
             return self._git_command(lambda: self._repo.git.fetch(remote), 'GitRepoManager.fetch')
             # return self._repo.git.fetch(remote)
 
-    def ahead_behind(self, remote='origin'):
+    def ahead_behind(self, remote='origin', fetch=True):
         self.debug('ahead behind')
 
         repo = self._repo
-        ahead, behind = ahead_behind(repo, remote)
+        ahead, behind = ahead_behind(repo, fetch=fetch, remote=remote)
 
         return ahead, behind
 
@@ -20,7 +20,7 @@ from traitsui.api import Item, HGroup, VGroup, Readonly, EnumEditor
 
 from pychron.core.pychron_traits import BorderVGroup
 from pychron.options.options import SubOptions, AppearanceSubOptions
-from pychron.pychron_constants import MAIN, APPEARANCE, LEAST_SQUARES_1D, WEIGHTED_MEAN_1D, BRACKETING, NN, MATCHING
+from pychron.pychron_constants import MAIN, APPEARANCE, LEAST_SQUARES_1D, WEIGHTED_MEAN_1D, NN
 
 
 class FluxSubOptions(SubOptions):
@@ -52,7 +52,6 @@ class FluxSubOptions(SubOptions):
                                               'irradiation hole. '
                                               'This is to test "monte carloing" the irradiation geometry'),
                                  show_border=True,
-                                 visible_when='model_kind not in ("{}", "{}", "{}")'.format(MATCHING, BRACKETING, NN),
                                  label='Monte Carlo'),
                           show_border=True,
                           label='Calculations')
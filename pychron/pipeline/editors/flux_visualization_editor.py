@@ -15,7 +15,7 @@
 # ===============================================================================
 from operator import itemgetter
 
-from numpy import linspace, meshgrid, arctan2, sin, cos, vstack, array, zeros, diff, argwhere
+from numpy import linspace, meshgrid, arctan2, sin, cos, vstack, column_stack, array, zeros, diff, argwhere
 from traits.api import Instance, Int, Str, Float, Property, List, on_trait_change
 from traitsui.api import View, UItem, VGroup, HGroup, TableEditor, Tabbed
 from traitsui.table_column import ObjectColumn
@@ -174,7 +174,7 @@ class BaseFluxVisualizationEditor(BaseTraitsEditor):
         else:
             pts = array([[p.x, p.y] for p in ipositions])
 
-        if options.use_monte_carlo and options.model_kind not in (MATCHING, BRACKETING, NN):
+        if options.use_monte_carlo:
             fe = FluxEstimator(options.monte_carlo_ntrials, reg)
 
             split = len(self.unknown_positions)
@@ -268,13 +268,10 @@ class BaseFluxVisualizationEditor(BaseTraitsEditor):
         n = reg.n * 10
         gx, gy = make_grid(r, n)
 
-        nz = zeros((n, n))
+        # predict the whole grid at once
+        pts = column_stack((gx.ravel(), gy.ravel()))
+        nz = reg.predict(pts).reshape(n, n)
         ne = zeros((n, n))
-        for i in range(n):
-            pts = vstack((gx[i], gy[i])).T
-
-            nominals = reg.predict(pts)
-            nz[i] = nominals
 
         self.max_j = nz.max()
         self.min_j = nz.min()
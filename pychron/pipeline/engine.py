@@ -249,6 +249,7 @@ class PipelineEngine(Loggable):
 
     pipeline_template_root = Instance(PipelineTemplateRoot)
     use_arar_calculations = Bool
+    use_node_cache = Bool(True)
 
     def __init__(self, *args, **kw):
         super(PipelineEngine, self).__init__(*args, **kw)
@@ -649,6 +650,7 @@ class PipelineEngine(Loggable):
         state.unknowns = unks
 
         state.canceled = False
+        state.node_timings = []
 
         ost = time.time()
         for idx, node in enumerate(self.pipeline.iternodes(None)):
@@ -659,16 +661,14 @@ class PipelineEngine(Loggable):
                         self.debug('Pre run failed {}'.format(node))
                         return True
 
-                    st = time.time()
                     try:
-                        node.run(state)
+                        self._run_node(idx, node, state)
                         node.visited = True
                         self.selected = node
                     except NoAnalysesError:
                         self.information_dialog('No Analyses in Pipeline!')
                         self.pipeline.reset()
                         return True
-                    self.debug('{:02n}: {} Runtime: {:0.4f}'.format(idx, node, time.time() - st))
 
                     if state.veto:
                         self.debug('pipeline vetoed by {}'.format(node))
@@ -683,6 +683,7 @@ class PipelineEngine(Loggable):
         else:
             self.debug('pipeline run finished')
             self.debug('pipeline runtime {}'.format(time.time() - ost))
+            self._report_node_timings(state)
             if post_run:
                 self.post_run(state)
             return True
@@ -713,6 +714,7 @@ class PipelineEngine(Loggable):
             self.debug('starting at node {} {}'.format(start_node, run_from))
         state.veto = None
         state.canceled = False
+        state.node_timings = []
 
         for idx, node in enumerate(pipeline.iternodes(start_node)):
             node.visited = False
@@ -731,9 +733,8 @@ class PipelineEngine(Loggable):
                         self.debug('Pre run failed {}'.format(node))
                         return True
 
-                    st = time.time()
                     try:
-                        node.run(state)
+                        self._run_node(idx, node, state)
                         node.visited = True
                         self.selected = node
                         # self.update_detectors()
@@ -741,7 +742,6 @@ class PipelineEngine(Loggable):
                         self.information_dialog('No Analyses in Pipeline!')
                         pipeline.reset()
                         return True
-                    self.debug('{:02n}: {} Runtime: {:0.4f}'.format(idx, node, time.time() - st))
 
                     if state.veto:
                         if state.veto_message:
@@ -759,6 +759,7 @@ class PipelineEngine(Loggable):
         else:
             self.debug('pipeline run finished')
             self.debug('pipeline runtime {}'.format(time.time() - ost))
+            self._report_node_timings(state)
             if post_run:
                 self.post_run(state)
 
@@ -992,6 +993,40 @@ class PipelineEngine(Loggable):
                 if not r.update():
                     self.warning('Failed to update repo="{}"'.format(r.name))
 
+    def _run_node(self, idx, node, state):
+        """
+            run ``node`` or, if its inputs and configuration are unchanged since its last run, restore its outputs
+        """
+        st = time.time()
+        key = node.cache_key(state) if self.use_node_cache else None
+        node.cached = cached = node.is_cached(key)
+        if cached:
+            node.restore_cache(state)
+        else:
+            self._prefetch(node, state)
+            node.run(state)
+            if self.use_node_cache and not (state.veto or state.canceled):
+                node.store_cache(state, key)
+            else:
+                node.clear_cache()
+
+        node.run_time = rt = time.time() - st
+        state.node_timings.append((idx, node.name, rt, cached))
+        self.debug('{:02n}: {} Runtime: {:0.4f}{}'.format(idx, node, rt, ' (cached)' if cached else ''))
+
+    def _prefetch(self, node, state):
+        ms = node.prefetch_modifiers
+        if ms and self.dvc:
+            ans, keys = node.prefetch_hint(state)
+            self.dvc.prefetch(ans, ms, keys)
+
+    def _report_node_timings(self, state):
+        ts = state.node_timings
+        if ts:
+            n = len([t for t in ts if t[3]])
+            self.debug('nodes run={} cached={} total node runtime={:0.4f}'.format(len(ts) - n, n,
+                                                                                    sum((t[2] for t in ts))))
+
     def _set_grouping(self, items, gid, attr='group_id'):
         for si in items:
             setattr(si, attr, gid)
@@ -0,0 +1,374 @@
+# ===============================================================================
+# Copyright 2026 ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+"""
+run a saved pipeline template without the Pipeline task, e.g. to regenerate tables and figures on a server.
+
+    python -m pychron.pipeline.headless <template.yaml> --query <query.yaml> --connection <connection.yaml> --workers 4
+
+the query spec is a yaml file with any of the keys of ``QuerySpec``::
+
+    projects: [Foo, Bar]
+    low_post: 2019-01-01
+    mass_spectrometers: [jan]
+
+each project is run in its own worker process with its own database connection.
+interactive nodes are not supported. figures are rendered with the Qt offscreen platform
+"""
+# ============= enthought library imports =======================
+from traits.api import Instance, Str
+# ============= standard library imports ========================
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# ============= local library imports  ==========================
+from pychron.core.yaml import yload
+from pychron.loggable import Loggable
+
+QUERY_KEYS = ('projects', 'samples', 'identifiers', 'uuids', 'repositories', 'mass_spectrometers',
+              'low_post', 'high_post', 'exclude_uuids', 'include_invalid')
+
+CONNECTION_KEYS = ('host', 'username', 'password', 'name', 'kind', 'path', 'timeout')
+
+_app = None
+
+
+class QuerySpec(object):
+    """
+        selects the unknowns for a headless pipeline run
+    """
+
+    def __init__(self, projects=None, samples=None, identifiers=None, uuids=None, repositories=None,
+                 mass_spectrometers=None, low_post=None, high_post=None, exclude_uuids=None,
+                 include_invalid=False):
+        self.projects = _listify(projects)
+        self.samples = _listify(samples)
+        self.identifiers = _listify(identifiers)
+        self.uuids = _listify(uuids)
+        self.repositories = _listify(repositories)
+        self.mass_spectrometers = _listify(mass_spectrometers)
+        self.exclude_uuids = _listify(exclude_uuids)
+        self.low_post = low_post
+        self.high_post = high_post
+        self.include_invalid = include_invalid
+
+    @classmethod
+    def from_dict(cls, d):
+        bad = [k for k in d if k not in QUERY_KEYS]
+        if bad:
+            raise ValueError('Invalid query keys {}. Valid keys {}'.format(bad, QUERY_KEYS))
+
+        return cls(**d)
+
+    @classmethod
+    def load(cls, path):
+        return cls.from_dict(yload(path) or {})
+
+    def to_dict(self):
+        return {k: getattr(self, k) for k in QUERY_KEYS}
+
+    def split(self):
+        """
+            one spec per project. the spec itself if it does not select by project
+        """
+        if len(self.projects) < 2:
+            return [self]
+
+        specs = []
+        for p in self.projects:
+            d = self.to_dict()
+            d['projects'] = [p]
+            specs.append(QuerySpec(**d))
+        return specs
+
+    @property
+    def label(self):
+        return ','.join(self.projects or self.samples or self.identifiers or self.repositories) or 'query'
+
+    def resolve(self, dvc):
+        """
+            return the analyses selected by this spec
+        """
+        db = dvc.db
+        with db.session_ctx():
+            if self.uuids:
+                records = db.get_analyses_uuid(self.uuids)
+            else:
+                identifiers = list(self.identifiers)
+                if self.projects or self.samples:
+                    lns = db.get_labnumbers(projects=self.projects or None,
+                                            samples=self.samples or None,
+                                            mass_spectrometers=self.mass_spectrometers or None,
+                                            low_post=self.low_post,
+                                            high_post=self.high_post,
+                                            filter_non_run=True)
+                    identifiers.extend([li.identifier for li in lns])
+
+                if not identifiers:
+                    return []
+
+                records, _ = db.get_labnumber_analyses(identifiers,
+                                                       low_post=self.low_post,
+                                                       high_post=self.high_post,
+                                                       exclude_uuids=self.exclude_uuids or None,
+                                                       include_invalid=self.include_invalid,
+                                                       mass_spectrometers=self.mass_spectrometers or None,
+                                                       repositories=self.repositories or None,
+                                                       verbose_query=False,
+                                                       record_views=True)
+
+        return dvc.make_analyses(records, use_progress=False)
+
+
+def _listify(v):
+    if v is None:
+        return []
+    if isinstance(v, str):
+        return [v]
+    return list(v)
+
+
+def setup_headless():
+    """
+        must be called before any of the pipeline modules are imported
+    """
+    os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    from pychron.core.ui import set_qt
+    set_qt()
+
+    from pychron.globals import globalv
+    globalv.skip_configure = True
+    globalv.show_warnings = False
+    globalv.show_infos = False
+
+    # the figure editors need a QApplication
+    global _app
+    from pyface.qt import QtGui
+    if QtGui.QApplication.instance() is None:
+        _app = QtGui.QApplication([])
+
+
+def make_dvc(connection):
+    """
+        connection: dict. the DVCDatabase attributes in ``CONNECTION_KEYS`` plus organization and meta_repo_name
+    """
+    connection = dict(connection)
+    if not connection.get('meta_repo_name'):
+        raise ValueError('meta_repo_name required')
+
+    from pychron.dvc.dvc import DVC
+    from pychron.paths import paths
+
+    dvc = DVC(bind=False,
+              organization=connection.pop('organization', ''),
+              meta_repo_name=connection.pop('meta_repo_name', ''))
+    paths.meta_root = os.path.join(paths.dvc_dir, dvc.meta_repo_name)
+    dvc.db.trait_set(**{k: v for k, v in connection.items() if k in CONNECTION_KEYS})
+    if not dvc.initialize():
+        raise RuntimeError('Failed to initialize DVC. connection={}'.format(connection.get('host')))
+
+    return dvc
+
+
+class HeadlessPipelineRunner(Loggable):
+    """
+        loads a pipeline template and runs it without the Pipeline task or any dialogs.
+
+        the node loop is the same as ``PipelineEngine.run_pipeline`` with configuration disabled
+    """
+
+    dvc = Instance('pychron.dvc.dvc.DVC')
+    template_path = Str
+
+    def load_pipeline(self):
+        from pychron.pipeline.engine import Pipeline
+        from pychron.pipeline.template import PipelineTemplate
+
+        name = os.path.splitext(os.path.basename(self.template_path))[0]
+        template = PipelineTemplate(name, self.template_path, {}, {})
+
+        pipeline = Pipeline(name=name)
+        template.render(None, pipeline, None, None, self.dvc)
+
+        for node in pipeline.iternodes():
+            # disable the nodes' interactive options
+            for attr in ('use_graphical_filter', 'use_browser'):
+                if hasattr(node, attr):
+                    setattr(node, attr, False)
+        return pipeline
+
+    def run(self, analyses, pipeline=None):
+        """
+            run the pipeline with ``analyses`` as the unknowns. returns the EngineState
+        """
+        from pychron.pipeline.nodes.data import UnknownNode
+        from pychron.pipeline.state import EngineState
+
+        if pipeline is None:
+            pipeline = self.load_pipeline()
+
+        state = EngineState()
+        nodes = pipeline.iternodes()
+        for idx, node in enumerate(nodes):
+            node.index = idx
+            node.visited = False
+            if idx == 0 and isinstance(node, UnknownNode):
+                node.unknowns = list(analyses)
+
+        if not nodes or not isinstance(nodes[0], UnknownNode):
+            state.unknowns = list(analyses)
+
+        for idx, node in enumerate(nodes):
+            if not node.enabled:
+                self.debug('Skip node {:02n}: {}'.format(idx, node))
+                continue
+
+            if not node.pre_run(state, configure=False):
+                raise RuntimeError('Pre run failed {}'.format(node))
+
+            st = time.time()
+            if node.prefetch_modifiers:
+                ans, keys = node.prefetch_hint(state)
+                self.dvc.prefetch(ans, node.prefetch_modifiers, keys)
+
+            node.run(state)
+            node.visited = True
+            rt = time.time() - st
+            state.node_timings.append((idx, node.name, rt, False))
+            self.debug('{:02n}: {} Runtime: {:0.4f}'.format(idx, node, rt))
+
+            if state.veto or state.canceled:
+                raise RuntimeError('pipeline {} by {}'.format('vetoed' if state.veto else 'canceled', node))
+
+        for node in pipeline.nodes:
+            if node.enabled:
+                node.post_run(self, state)
+
+        return state
+
+
+def run_job(job):
+    """
+        run one query spec in the current process. returns a summary dict. used by the worker processes
+    """
+    template_path, spec, connection, root = job
+
+    st = time.time()
+    result = {'label': spec.label, 'nanalyses': 0, 'status': 'ok', 'error': '', 'node_timings': []}
+    try:
+        setup_headless()
+        from pychron.paths import paths
+        paths.build(root)
+
+        from pychron.core.helpers.logger_setup import logging_setup
+        logging_setup('headless_pipeline_{}'.format(os.getpid()), use_archiver=False)
+
+        dvc = make_dvc(connection)
+        ans = spec.resolve(dvc)
+        result['nanalyses'] = len(ans)
+        if ans:
+            state = HeadlessPipelineRunner(dvc=dvc, template_path=template_path).run(ans)
+            result['node_timings'] = state.node_timings
+        else:
+            result['status'] = 'empty'
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = str(e)
+
+    result['runtime'] = time.time() - st
+    return result
+
+
+def run_batch(template_path, spec, connection, root='~/Pychron', workers=1):
+    """
+        run the template for each project of ``spec``, in ``workers`` processes
+    """
+    jobs = [(template_path, s, connection, root) for s in spec.split()]
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(run_job, jobs))
+    else:
+        return [run_job(j) for j in jobs]
+
+
+def get_parser():
+    parser = argparse.ArgumentParser(description='Run a pipeline template without the GUI')
+    parser.add_argument('template', help='path to a pipeline template')
+    parser.add_argument('--query', help='path to a yaml query spec')
+    parser.add_argument('--project', action='append', dest='projects', help='project name. can be repeated')
+    parser.add_argument('--identifier', action='append', dest='identifiers', help='identifier. can be repeated')
+    parser.add_argument('--low-post', help='only analyses run after this date')
+    parser.add_argument('--high-post', help='only analyses run before this date')
+    parser.add_argument('--connection', help='path to a yaml file with the database connection, organization '
+                                             'and meta_repo_name')
+    parser.add_argument('--root', default='~/Pychron', help='pychron root directory')
+    parser.add_argument('--workers', type=int, default=1, help='number of worker processes')
+    return parser
+
+
+def make_query_spec(args):
+    d = yload(args.query) if args.query else {}
+    d = dict(d or {})
+    for k in ('projects', 'identifiers'):
+        v = getattr(args, k)
+        if v:
+            d[k] = v
+    if args.low_post:
+        d['low_post'] = args.low_post
+    if args.high_post:
+        d['high_post'] = args.high_post
+
+    return QuerySpec.from_dict(d)
+
+
+def get_connection(path=None):
+    if path:
+        return yload(path)
+
+    return dict(host=os.environ.get('PYCHRON_DB_HOST', 'localhost'),
+                username=os.environ.get('PYCHRON_DB_USER'),
+                password=os.environ.get('PYCHRON_DB_PWD'),
+                name=os.environ.get('PYCHRON_DB_NAME', 'pychrondvc'),
+                kind=os.environ.get('PYCHRON_DB_KIND', 'mysql'),
+                organization=os.environ.get('PYCHRON_ORGANIZATION', ''),
+                meta_repo_name=os.environ.get('PYCHRON_META_REPO', ''))
+
+
+def main(argv=None):
+    args = get_parser().parse_args(argv)
+    spec = make_query_spec(args)
+
+    st = time.time()
+    results = run_batch(os.path.abspath(args.template), spec, get_connection(args.connection),
+                        root=args.root, workers=args.workers)
+
+    failed = 0
+    for r in results:
+        print('{label:<30s} {status:<8s} n={nanalyses:<5d} {runtime:0.2f}s {error}'.format(**r))
+        if r['status'] == 'failed':
+            failed += 1
+
+    print('{} jobs, {} failed, total {:0.2f}s'.format(len(results), failed, time.time() - st))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    import sys
+
+    sys.exit(main())
+# ============= EOF =============================================
@@ -20,11 +20,20 @@ from __future__ import absolute_import
 from traits.api import Bool, Any, List, Str
 
 # ============= standard library imports ========================
+import hashlib
+import json
 # ============= local library imports  ==========================
 from pychron.column_sorter_mixin import ColumnSorterMixin
 from pychron.core.helpers.traitsui_shortcuts import okcancel_view
 
 
+def analyses_signature(ans):
+    """
+        uuid and modification sha of each analysis
+    """
+    return [(getattr(a, 'uuid', None), getattr(a, 'modification_sha', None) or id(a)) for a in ans]
+
+
 class BaseNode(ColumnSorterMixin):
     name = 'Base'
     enabled = Bool(True)
@@ -49,6 +58,28 @@ class BaseNode(ColumnSorterMixin):
     use_state_unknowns = True
     use_state_references = True
 
+    # memoization.
+    # a node that declares the state attributes it reads, ``cache_inputs``, and writes, ``cache_outputs``, is not
+    # run again by the engine if its configuration and its inputs are unchanged since its last run. the outputs of
+    # the last run are copied to the state instead. only suitable for nodes that are deterministic and idempotent
+    # and have no side effects other than the outputs and the analyses in the inputs
+    cache_inputs = None
+    cache_outputs = None
+    # attributes the node sets on the analyses in the outputs, e.g. ``group_id``. saved with the outputs and set
+    # on the analyses again when the outputs are restored
+    cache_analysis_attrs = None
+    cached = Bool(False)
+    run_time = 0
+
+    _cache_keys = None
+    _cached_outputs = None
+    _cached_analysis_values = None
+
+    # prefetch hint.
+    # files the node reads from every analysis, e.g. ``'peakcenter'``, or ``'.data'`` for the raw data. the engine
+    # loads them for the analyses returned by ``prefetch_hint`` in one batch before the node is run
+    prefetch_modifiers = None
+
     def __init__(self, *args, **kw):
         super(BaseNode, self).__init__(*args, **kw)
         self.bind_preferences()
@@ -68,6 +99,95 @@ class BaseNode(ColumnSorterMixin):
         self._manual_configured = False
         self.active = False
 
+    def cache_key(self, state):
+        """
+            hash of the node configuration and the uuids and modification shas of the analyses in the
+            ``cache_inputs``. None if the node cannot be cached
+        """
+        if self.cache_inputs is None or not self._is_cacheable():
+            return
+
+        config = self._cache_config()
+        if config is None:
+            return
+
+        h = hashlib.sha1(json.dumps(config, sort_keys=True, default=str).encode('utf-8'))
+        for attr in self.cache_inputs:
+            v = getattr(state, attr)
+            if isinstance(v, (list, tuple)):
+                v = analyses_signature(v)
+            h.update(json.dumps([attr, v], default=str).encode('utf-8'))
+
+        for attr in self.cache_inputs:
+            v = self._cache_analysis_values(getattr(state, attr))
+            if v is not None:
+                h.update(json.dumps([attr, v], default=str).encode('utf-8'))
+        return h.hexdigest()
+
+    def is_cached(self, key):
+        """
+            True if ``key`` matches the inputs before or after the last run
+        """
+        return key is not None and self._cache_keys is not None and key in self._cache_keys
+
+    def store_cache(self, state, key):
+        if key is None:
+            self.clear_cache()
+            return
+
+        self._cached_outputs = outputs = {attr: self._copy_output(getattr(state, attr))
+                                          for attr in self.cache_outputs or ()}
+
+        values = None
+        attrs = self.cache_analysis_attrs
+        if attrs:
+            values = [(a, [getattr(a, k) for k in attrs])
+                      for v in outputs.values() if isinstance(v, list) for a in v]
+        self._cached_analysis_values = values
+        self._cache_keys = (key, self.cache_key(state))
+
+    def restore_cache(self, state):
+        for attr, v in self._cached_outputs.items():
+            setattr(state, attr, self._copy_output(v))
+
+        if self._cached_analysis_values:
+            attrs = self.cache_analysis_attrs
+            for a, vs in self._cached_analysis_values:
+                for k, v in zip(attrs, vs):
+                    setattr(a, k, v)
+
+    def clear_cache(self):
+        self._cache_keys = None
+        self._cached_outputs = None
+        self._cached_analysis_values = None
+
+    def prefetch_hint(self, state):
+        """
+            return (analyses, keys). the analyses to prefetch ``prefetch_modifiers`` for and the isotope keys of the
+            raw data to load, None for all
+        """
+        return state.unknowns, None
+
+    def _copy_output(self, v):
+        if isinstance(v, list):
+            v = list(v)
+        elif isinstance(v, dict):
+            v = dict(v)
+        return v
+
+    def _is_cacheable(self):
+        return True
+
+    def _cache_analysis_values(self, v):
+        """
+            values of the analyses in an input that the node depends on and that can change without changing the
+            analyses' modification sha, e.g. the age after a new J. None if the node only depends on the shas
+        """
+        return
+
+    def _cache_config(self):
+        return self.to_template()
+
     def pre_load(self, nodedict):
         for k, v in nodedict.items():
             if hasattr(self, k):
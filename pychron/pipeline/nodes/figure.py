@@ -24,6 +24,7 @@ from pychron.core.helpers.isotope_utils import sort_detectors
 from pychron.core.helpers.iterfuncs import groupby_key
 from pychron.core.helpers.strtools import ratio
 from pychron.core.progress import progress_iterator
+from pychron.dvc import PEAKCENTER
 from pychron.options.options_manager import IdeogramOptionsManager, OptionsController, SeriesOptionsManager, \
     SpectrumOptionsManager, InverseIsochronOptionsManager, VerticalFluxOptionsManager, XYScatterOptionsManager, \
     RadialOptionsManager, RegressionSeriesOptionsManager, FluxVisualizationOptionsManager, CompositeOptionsManager, \
@@ -259,6 +260,13 @@ class SeriesNode(FigureNode):
     name = 'Series'
     editor_klass = 'pychron.pipeline.plot.editors.series_editor,SeriesEditor'
     plotter_options_manager_klass = SeriesOptionsManager
+    prefetch_modifiers = (PEAKCENTER,)
+
+    def prefetch_hint(self, state):
+        # the peak centers are only read if plotted
+        if any(p.name == PEAK_CENTER for p in self.plotter_options.get_plotable_aux_plots()):
+            return state.unknowns, None
+        return [], None
 
     def _configure_hook(self):
         pom = self.plotter_options_manager
@@ -301,11 +309,13 @@ class RegressionSeriesNode(SeriesNode):
     name = 'Regression Series'
     editor_klass = 'pychron.pipeline.plot.editors.regression_series_editor,RegressionSeriesEditor'
     plotter_options_manager_klass = RegressionSeriesOptionsManager
+    prefetch_modifiers = ('.data',)
 
-    def run(self, state):
-        po = self.plotter_options
+    def prefetch_hint(self, state):
+        return state.unknowns, self._raw_data_keys()
 
-        keys = [fi.name for fi in list(reversed([pi for pi in po.get_plotable_aux_plots()]))]
+    def run(self, state):
+        keys = self._raw_data_keys()
 
         def load_raw(x, prog, i, n):
             x.load_raw_data(keys)
@@ -313,6 +323,10 @@ class RegressionSeriesNode(SeriesNode):
         progress_iterator(state.unknowns, load_raw, threshold=1)
         super(RegressionSeriesNode, self).run(state)
 
+    def _raw_data_keys(self):
+        po = self.plotter_options
+        return [fi.name for fi in list(reversed([pi for pi in po.get_plotable_aux_plots()]))]
+
     def _configure_hook(self):
         pom = self.plotter_options_manager
         if self.unknowns:
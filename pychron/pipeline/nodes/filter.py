@@ -258,6 +258,22 @@ class FilterNode(BaseNode):
         vs = [fi.to_string() for fi in self.filters] * 3
         d['filters'] = vs
 
+    @property
+    def cache_inputs(self):
+        return (self.analysis_kind,)
+
+    cache_outputs = cache_inputs
+
+    def _cache_config(self):
+        return {'filters': [(fi.to_string(), fi.chain_operator) for fi in self.filters],
+                'remove': self.remove}
+
+    def _cache_analysis_values(self, ans):
+        # in memory changes, e.g. a new J or blank, change the filtered values but not the modification sha
+        if isinstance(ans, list):
+            fs = [fi for fi in self.filters if fi.attribute]
+            return [[fi._get_value(a, fi.attribute) for fi in fs] for a in ans]
+
 
 class MSWDFilterNode(BaseNode):
     name = 'MSWD Filter'
@@ -240,6 +240,11 @@ class FitIsotopeEvolutionNode(FitNode):
     name = 'Fit IsoEvo'
     use_plotting = False
     _refit_message = 'The selected Isotope Evolutions have already been fit. Would you like to skip refitting?'
+    prefetch_modifiers = ('.data',)
+
+    def prefetch_hint(self, state):
+        keys = [pi.name for pi in self.plotter_options.get_saveable_aux_plots()]
+        return self._get_valid_unknowns(state.unknowns), keys
 
     def _check_refit(self, analysis):
         for k in self._keys:
@@ -411,6 +416,10 @@ class DefineEquilibrationNode(FitNode):
     plotter_options_manager_klass = DefineEquilibrationOptionsManager
     use_plotting = False
     _refit_message = 'The selected Equilibrations have already been fit. Would you like to skip refitting?'
+    prefetch_modifiers = ('.data',)
+
+    def prefetch_hint(self, state):
+        return state.unknowns, [pi.name for pi in self.plotter_options.get_saveable_aux_plots()]
 
     def _configure_hook(self):
         pom = self.plotter_options_manager
@@ -76,6 +76,21 @@ class GroupingNode(BaseNode):
     def _generate_key_hook(self, key):
         return key
 
+    @property
+    def cache_inputs(self):
+        return (self.analysis_kind,)
+
+    cache_outputs = cache_inputs
+
+    @property
+    def cache_analysis_attrs(self):
+        return (self._attr,)
+
+    def _cache_config(self):
+        d = self.to_template()
+        d['attribute'] = self.attribute
+        return d
+
     def run(self, state):
         self._run(state)
 
@@ -142,6 +157,10 @@ class SubGroupingNode(GroupingNode, Preferred):
     _sorting_enabled = False
     _parent_group = 'group_id'
 
+    def _is_cacheable(self):
+        # regrouped by pre_run
+        return False
+
     def load(self, nodedict):
         self.by_key = nodedict.get('key', 'Aliquot')
 
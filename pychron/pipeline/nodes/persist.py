@@ -32,6 +32,7 @@ from pychron.pipeline.nodes.base import BaseNode
 from pychron.pipeline.nodes.data import BaseDVCNode
 from pychron.pipeline.tables.table_options_manager import TableOptionsManager
 from pychron.pipeline.tables.xlsx_table_writer import XLSXAnalysisTableWriter
+from pychron.processing.arar_age import recalculate_ages
 
 
 class PersistNode(BaseDVCNode):
@@ -262,11 +263,12 @@ class FluxPersistNode(DVCPersistNode):
         #                 add=False)
 
         j = ufloat(irp.j, irp.jerr, tag='j')
-        for i in state.unknowns:
-            if i.identifier == irp.identifier:
-                i.j = j
-                i.arar_constants.lambda_k = lk
-                i.recalculate_age()
+        ans = [i for i in state.unknowns if i.identifier == irp.identifier]
+        for i in ans:
+            i.j = j
+            i.arar_constants.lambda_k = lk
+
+        recalculate_ages(ans)
 
 
 class XLSXAnalysisTablePersistNode(BaseDVCNode):
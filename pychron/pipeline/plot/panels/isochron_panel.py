@@ -19,6 +19,7 @@
 from __future__ import absolute_import
 from pychron.pipeline.plot.panels.figure_panel import FigurePanel
 from pychron.pipeline.plot.plotter.isochron import Isochron, InverseIsochron
+from pychron.processing.analyses.analysis_group import calculate_group_isochrons
 
 
 # ============= local library imports  ==========================
@@ -33,4 +34,10 @@ class InverseIsochronPanel(FigurePanel):
     _figure_klass = InverseIsochron
     track_value = False
 
+    def make_graph(self):
+        # solve the isochrons of all the subgroups in one batch. the figures reuse the cached results
+        ags = [fig.setup_analysis_group() for fig in self.figures]
+        calculate_group_isochrons(ags, exclude_non_plateau=self.plot_options.exclude_non_plateau)
+        return super(InverseIsochronPanel, self).make_graph()
+
 # ============= EOF =============================================
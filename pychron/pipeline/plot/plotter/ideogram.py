@@ -552,7 +552,7 @@ class Ideogram(BaseArArFigure):
             plot.overlays.append(o)
 
             def cfunc(x1, x2):
-                return cumulative_probability(self.xs, self.xes, x1, x2, n=N)
+                return cumulative_probability(self.xs, self.xes, x1, x2, n=N, adaptive=True)
 
             xs, ys, xmi, xma = self._calculate_asymptotic_limits(cfunc,
                                                                  tol=self.options.asymptotic_height_percent)
@@ -867,7 +867,7 @@ class Ideogram(BaseArArFigure):
         else:
             if opt.use_asymptotic_limits and calculate_limits:
                 def cfunc(x1, x2):
-                    return cumulative_probability(ages, errors, x1, x2, n=N)
+                    return cumulative_probability(ages, errors, x1, x2, n=N, adaptive=True)
 
                 bins, probs, x1, x2 = self._calculate_asymptotic_limits(cfunc,
                                                                         tol=(opt.asymptotic_height_percent or 10))
@@ -875,7 +875,7 @@ class Ideogram(BaseArArFigure):
 
                 return bins, probs
             else:
-                return cumulative_probability(ages, errors, xmi, xma, n=N)
+                return cumulative_probability(ages, errors, xmi, xma, n=N, adaptive=True)
 
     def _calculate_nominal_xlimits(self):
         return self.min_x(self.options.index_attr), self.max_x(self.options.index_attr)
@@ -197,8 +197,7 @@ class InverseIsochron(Isochron):
         """
         graph = self.graph
 
-        if self.options.omit_non_plateau:
-            self.analysis_group.do_omit_non_plateau()
+        self.setup_analysis_group()
 
         for pid, (plotobj, po) in enumerate(zip(graph.plots, plots)):
             plot_name = po.plot_name
@@ -206,6 +205,18 @@ class InverseIsochron(Isochron):
                 continue
             getattr(self, '_plot_{}'.format(plot_name))(po, plotobj, pid)
 
+    def setup_analysis_group(self):
+        """
+            apply the isochron options to the analysis group
+        """
+        opt = self.options
+        ag = self.analysis_group
+        ag.isochron_age_error_kind = opt.error_calc_method
+        ag.isochron_method = opt.regressor_kind
+        if opt.omit_non_plateau:
+            ag.do_omit_non_plateau()
+        return ag
+
     # ===============================================================================
     # plotters
     # ===============================================================================
@@ -218,8 +229,6 @@ class InverseIsochron(Isochron):
 
     def _plot_inverse_isochron(self, po, plot, pid):
         opt = self.options
-        self.analysis_group.isochron_age_error_kind = opt.error_calc_method
-        self.analysis_group.isochron_method = opt.regressor_kind
         _, _, reg = self.analysis_group.get_isochron_data(exclude_non_plateau=opt.exclude_non_plateau)
         graph = self.graph
 
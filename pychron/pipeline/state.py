@@ -71,4 +71,7 @@ class EngineState(HasTraits):
     arar_calculation_options = None
 
     correlation_ellipses = None
+
+    # (index, node name, runtime, cached) of each node run
+    node_timings = List
 # ============= EOF =============================================
@@ -0,0 +1,118 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import yaml
+
+from pychron.paths import paths
+from pychron.pipeline.headless import QuerySpec, get_parser, make_query_spec, HeadlessPipelineRunner, run_job
+
+try:
+    from pychron.pipeline.nodes.grouping import GroupingNode
+except ImportError:
+    # pychron.pipeline.nodes imports the figure nodes, which need chaco
+    GroupingNode = None
+
+
+class HeadlessAnalysis(object):
+    group_id = 0
+    graph_id = 0
+
+    def __init__(self, identifier, aliquot):
+        self.identifier = identifier
+        self.aliquot = aliquot
+        self.project = 'Foo'
+
+
+class HeadlessQuerySpecTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_from_dict(self):
+        spec = QuerySpec.from_dict({'projects': 'Foo', 'low_post': '2019-01-01'})
+        self.assertEqual(spec.projects, ['Foo'])
+        self.assertEqual(spec.low_post, '2019-01-01')
+        self.assertEqual(spec.identifiers, [])
+
+    def test_invalid_key(self):
+        self.assertRaises(ValueError, QuerySpec.from_dict, {'project': 'Foo'})
+
+    def test_split(self):
+        spec = QuerySpec(projects=['Foo', 'Bar'], mass_spectrometers='jan')
+        specs = spec.split()
+        self.assertEqual([s.projects for s in specs], [['Foo'], ['Bar']])
+        self.assertEqual([s.mass_spectrometers for s in specs], [['jan'], ['jan']])
+        self.assertEqual(specs[1].label, 'Bar')
+
+        spec = QuerySpec(identifiers=['1000', '1001'])
+        self.assertEqual(spec.split(), [spec])
+
+    def test_parse_args(self):
+        p = os.path.join(self.root, 'query.yaml')
+        with open(p, 'w') as wfile:
+            yaml.dump({'projects': ['Foo'], 'high_post': '2020-01-01'}, wfile)
+
+        args = get_parser().parse_args(['ideogram.yaml', '--query', p, '--project', 'Bar', '--project', 'Baz',
+                                        '--workers', '2'])
+        spec = make_query_spec(args)
+        self.assertEqual(spec.projects, ['Bar', 'Baz'])
+        self.assertEqual(spec.high_post, '2020-01-01')
+        self.assertEqual(args.workers, 2)
+
+
+@unittest.skipIf(GroupingNode is None, 'pipeline nodes not importable')
+class HeadlessPipelineRunnerTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.template = os.path.join(self.root, 'grouping.yaml')
+        with open(self.template, 'w') as wfile:
+            yaml.dump({'nodes': [{'klass': 'UnknownNode'},
+                                 {'klass': 'GroupingNode', 'key': 'Identifier'}]}, wfile)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_load_pipeline(self):
+        pipeline = HeadlessPipelineRunner(template_path=self.template).load_pipeline()
+        self.assertEqual(pipeline.name, 'grouping')
+        self.assertEqual([n.__class__.__name__ for n in pipeline.iternodes()], ['UnknownNode', 'GroupingNode'])
+
+    def test_run(self):
+        ans = [HeadlessAnalysis('{}'.format(i // 3), i) for i in range(9)]
+        state = HeadlessPipelineRunner(template_path=self.template).run(ans)
+
+        self.assertEqual(len(state.unknowns), 9)
+        self.assertEqual(len({a.group_id for a in state.unknowns}), 3)
+        self.assertEqual(state.projects, {'Foo'})
+
+        self.assertEqual([(idx, name) for idx, name, _, _ in state.node_timings], [(0, 'Unknowns'),
+                                                                                   (1, 'Grouping')])
+        self.assertTrue(all(rt >= 0 for _, _, rt, _ in state.node_timings))
+
+
+class HeadlessRunJobTestCase(unittest.TestCase):
+    def setUp(self):
+        self.root = tempfile.mkdtemp()
+        self.root_dir = paths.root_dir
+
+    def tearDown(self):
+        # run_job builds paths in self.root
+        if self.root_dir and os.path.isdir(self.root_dir):
+            paths.build(self.root_dir)
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_failed(self):
+        spec = QuerySpec(projects='Foo')
+        result = run_job((os.path.join(self.root, 'grouping.yaml'), spec, {'host': 'localhost'}, self.root))
+        self.assertEqual(result['status'], 'failed')
+        self.assertEqual(result['error'], 'meta_repo_name required')
+        self.assertEqual(result['label'], 'Foo')
+        self.assertEqual(result['nanalyses'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
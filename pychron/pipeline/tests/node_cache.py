@@ -0,0 +1,154 @@
+import hashlib
+import unittest
+
+from uncertainties import ufloat
+
+try:
+    from pychron.pipeline.nodes.base import BaseNode
+    from pychron.pipeline.nodes.filter import FilterNode
+    from pychron.pipeline.nodes.grouping import GroupingNode, SubGroupingNode
+    from pychron.pipeline.state import EngineState
+except ImportError:
+    # pychron.pipeline.nodes imports the figure nodes, which need chaco
+    BaseNode = None
+
+
+class CacheAnalysis(object):
+    group_id = 0
+    graph_id = 0
+    temp_status = 'ok'
+    modification_id = 0
+
+    def __init__(self, uuid, identifier, aliquot):
+        self.uuid = uuid
+        self.identifier = identifier
+        self.aliquot = aliquot
+        self.sample = 'sample-{}'.format(int(identifier) % 2)
+        self.uage = ufloat(aliquot, 0.1)
+
+    @property
+    def modification_sha(self):
+        ctx = (self.uuid, self.modification_id, self.temp_status, self.group_id, self.graph_id)
+        return hashlib.sha1(repr(ctx).encode('utf-8')).hexdigest()
+
+
+def run_node(node, state):
+    """
+        same as PipelineEngine._run_node
+    """
+    key = node.cache_key(state)
+    node.cached = node.is_cached(key)
+    if node.cached:
+        node.restore_cache(state)
+    else:
+        node.run(state)
+        node.store_cache(state, key)
+
+
+@unittest.skipIf(BaseNode is None, 'pipeline nodes not importable')
+class NodeCacheTestCase(unittest.TestCase):
+    def setUp(self):
+        self.analyses = [CacheAnalysis('uuid-{}'.format(i), '{}'.format(i // 3), i) for i in range(12)]
+        self.state = EngineState(unknowns=list(self.analyses))
+
+    def test_rerun_cached(self):
+        node = GroupingNode(by_key='Identifier')
+        run_node(node, self.state)
+        self.assertFalse(node.cached)
+        gids = [a.group_id for a in self.state.unknowns]
+        self.assertEqual(len(set(gids)), 4)
+
+        self.state.unknowns = list(self.analyses)
+        run_node(node, self.state)
+        self.assertTrue(node.cached)
+        self.assertEqual([a.group_id for a in self.state.unknowns], gids)
+
+    def test_modified_analysis(self):
+        node = GroupingNode(by_key='Identifier')
+        run_node(node, self.state)
+
+        self.analyses[0].modification_id += 1
+        run_node(node, self.state)
+        self.assertFalse(node.cached)
+
+        run_node(node, self.state)
+        self.assertTrue(node.cached)
+
+    def test_changed_analyses(self):
+        node = GroupingNode(by_key='Identifier')
+        run_node(node, self.state)
+
+        self.state.unknowns = self.analyses[:6]
+        run_node(node, self.state)
+        self.assertFalse(node.cached)
+
+    def test_changed_config(self):
+        node = GroupingNode(by_key='Identifier')
+        run_node(node, self.state)
+
+        node.by_key = 'Sample'
+        run_node(node, self.state)
+        self.assertFalse(node.cached)
+        self.assertEqual(len({a.group_id for a in self.state.unknowns}), 2)
+
+    def test_filter(self):
+        node = FilterNode(remove=True)
+        node.add_filter('aliquot', '!=', '3')
+        node.filters.pop(0)
+
+        run_node(node, self.state)
+        self.assertEqual(len(self.state.unknowns), 11)
+
+        self.state.unknowns = list(self.analyses)
+        run_node(node, self.state)
+        self.assertTrue(node.cached)
+        self.assertEqual(len(self.state.unknowns), 11)
+
+        node.remove = False
+        self.state.unknowns = list(self.analyses)
+        run_node(node, self.state)
+        self.assertFalse(node.cached)
+
+    def test_restore_grouping(self):
+        node = GroupingNode(by_key='Identifier')
+        run_node(node, self.state)
+        gids = [a.group_id for a in self.state.unknowns]
+
+        # clear all grouping. the inputs match the inputs before the last run
+        for a in self.analyses:
+            a.group_id = 0
+
+        self.state.unknowns = list(self.analyses)
+        run_node(node, self.state)
+        self.assertTrue(node.cached)
+        self.assertEqual([a.group_id for a in self.state.unknowns], gids)
+
+    def test_filter_value_changed(self):
+        node = FilterNode(remove=True)
+        node.add_filter('age', '<', '6')
+        node.filters.pop(0)
+
+        run_node(node, self.state)
+        self.assertEqual(len(self.state.unknowns), 6)
+
+        # e.g. a new J. the modification sha does not change
+        for a in self.analyses:
+            a.uage = ufloat(a.aliquot / 2., 0.1)
+
+        self.state.unknowns = list(self.analyses)
+        run_node(node, self.state)
+        self.assertFalse(node.cached)
+        self.assertEqual(len(self.state.unknowns), 12)
+
+    def test_not_cacheable(self):
+        node = BaseNode()
+        self.assertIsNone(node.cache_key(self.state))
+        self.assertFalse(node.is_cached(None))
+
+    def test_subgrouping_not_cacheable(self):
+        node = SubGroupingNode()
+        self.assertIsNone(node.cache_key(self.state))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -15,6 +15,7 @@
 # ===============================================================================
 
 # ============= enthought library imports =======================
+import hashlib
 from collections import namedtuple
 from math import ceil
 from operator import attrgetter
@@ -241,12 +242,29 @@ class IdeogramPlotable(HasTraits):
     step = ''
     timestamp = 0
     uuid = None
+    modification_id = 0
 
     def __init__(self, make_arar_constants=True, *args, **kw):
         super(IdeogramPlotable, self).__init__(*args, **kw)
         if make_arar_constants:
             self.arar_constants = ArArConstants()
 
+    def set_modified(self):
+        """
+            mark the analysis' data as changed
+        """
+        self.modification_id += 1
+
+    @property
+    def modification_sha(self):
+        """
+            hash of the analysis identity, modification count, status and grouping.
+            changes whenever anything the pipeline nodes depend on changes
+        """
+        ctx = (self.uuid, self.modification_id, self.temp_status,
+               self.group_id, self.graph_id, self.aux_id, self.tab_id, getattr(self, 'subgroup', None))
+        return hashlib.sha1(repr(ctx).encode('utf-8')).hexdigest()
+
     def baseline_corrected_intercepts_to_dict(self):
         pass
 
@@ -302,6 +320,7 @@ class IdeogramPlotable(HasTraits):
             self.tag = tag
 
         self.temp_status = self.tag
+        self.set_modified()
 
     def value_string(self, t):
         a, e = self._value_string(t)
@@ -23,13 +23,15 @@ from traits.api import List, Property, cached_property, Str, Bool, Int, Event, F
 from uncertainties import ufloat, nominal_value, std_dev
 
 from pychron.core.stats import calculate_mswd_probability
+from pychron.core.helpers.iterfuncs import groupby_key
 from pychron.core.stats.core import calculate_mswd, calculate_weighted_mean, validate_mswd
 from pychron.core.utils import alphas
 from pychron.experiment.utilities.runid import make_aliquot
 from pychron.processing.analyses.analysis import IdeogramPlotable
 from pychron.processing.analyses.preferred import Preferred
-from pychron.processing.arar_age import ArArAge
-from pychron.processing.argon_calculations import calculate_plateau_age, age_equation, calculate_isochron
+from pychron.processing.arar_age import ArArAge, recalculate_ages
+from pychron.processing.argon_calculations import calculate_plateau_age, age_equation, calculate_isochron, \
+    calculate_isochrons
 from pychron.pychron_constants import MSEM, SD, SUBGROUPING_ATTRS, ERROR_TYPES, WEIGHTED_MEAN, \
     DEFAULT_INTEGRATED, SUBGROUPINGS, ARITHMETIC_MEAN, PLATEAU_ELSE_WEIGHTED_MEAN, WEIGHTINGS, FLECK, NULL_STR, \
     ISOCHRON, MSE, SE
@@ -43,6 +45,26 @@ def AGProperty(*depends):
     return Property(depends_on=d)
 
 
+def calculate_group_isochrons(groups, exclude_non_plateau=False):
+    """
+        calculate the isochrons of many analysis groups. the York regressions of all the groups that share an
+        error kind and regression method are solved in one batch.
+
+        the results are cached on each group and returned by ``get_isochron_data``
+    """
+    items = []
+    for ag in groups:
+        args = ag.get_isochron_args(exclude_non_plateau)
+        if args:
+            items.append((ag, args))
+
+    for (kind, method), gitems in groupby_key(items, lambda x: x[1][0][:2]):
+        gitems = list(gitems)
+        rs = calculate_isochrons([(ans, exclude) for _, (_, ans, exclude) in gitems], kind, reg=method)
+        for (ag, (key, _, _)), r in zip(gitems, rs):
+            ag._isochron_data = key, r
+
+
 def MetaDataProperty(*depends):
     d = 'metadata_refresh_needed'
     if depends:
@@ -124,6 +146,7 @@ class AnalysisGroup(IdeogramPlotable):
 
     isochron_3640 = None
     isochron_regressor = None
+    _isochron_data = None
 
     exclude_non_plateau = Bool(False)
     omit_by_tag = Bool(True)
@@ -204,6 +227,14 @@ class AnalysisGroup(IdeogramPlotable):
         if dirty:
             self.dirty = True
 
+    def recalculate_ages(self, force=False):
+        """
+            recalculate the ages of all analyses in one batch. use after changing J, lambda_k or
+            the trapped 40/36 of the analyses
+        """
+        recalculate_ages([a for a in self.analyses if isinstance(a, ArArAge)], force=force)
+        self.dirty = True
+
     def get_arithmetic_mean(self, *args, **kw):
         return self._calculate_arithmetic_mean(*args, **kw)
 
@@ -229,7 +260,11 @@ class AnalysisGroup(IdeogramPlotable):
             if not self.get_is_plateau_step(a):
                 a.temp_status = 'omit'
 
-    def get_isochron_data(self, exclude_non_plateau=False):
+    def get_isochron_args(self, exclude_non_plateau=False):
+        """
+            return (key, analyses, exclude) for the isochron of this group or None if there are no analyses.
+            ``key`` identifies the isochron settings and the excluded analyses
+        """
         ans = [a for a in self.analyses if isinstance(a, ArArAge)]
 
         if (exclude_non_plateau or self.exclude_non_plateau) and hasattr(self, 'get_is_plateau_step'):
@@ -243,7 +278,24 @@ class AnalysisGroup(IdeogramPlotable):
 
         exclude = [i for i, x in enumerate(ans) if test(x)]
         if ans:
-            return calculate_isochron(ans, self.isochron_age_error_kind, reg=self.isochron_method, exclude=exclude)
+            key = (self.isochron_age_error_kind, self.isochron_method, tuple(exclude))
+            return key, ans, exclude
+
+    def get_isochron_data(self, exclude_non_plateau=False):
+        args = self.get_isochron_args(exclude_non_plateau)
+        if args:
+            key, ans, exclude = args
+            data = self._isochron_data
+            if data and data[0] == key:
+                return data[1]
+
+            r = calculate_isochron(ans, self.isochron_age_error_kind, reg=self.isochron_method, exclude=exclude)
+            self._isochron_data = key, r
+            return r
+
+    @on_trait_change('dirty,analyses[],analyses:[temp_status]')
+    def _clear_isochron_data(self):
+        self._isochron_data = None
 
     def calculate_isochron_age(self, exclude_non_plateau=False):
         try:
@@ -660,7 +712,8 @@ class StepHeatAnalysisGroup(AnalysisGroup):
 
         for a in self.analyses:
             a.arar_constants.trapped_atm4036 = v
-            a.recalculate_age(force=True)
+
+        self.recalculate_ages(force=True)
 
     @property
     def integrated_enabled(self):
@@ -31,6 +31,7 @@ from pychron.core.helpers.iterfuncs import groupby_key
 from pychron.processing.arar_constants import ArArConstants
 from pychron.processing.argon_calculations import calculate_f, abundance_sensitivity_correction, age_equation, \
     calculate_flux, calculate_arar_decay_factors
+from pychron.processing.batch_argon_calculations import BatchArArAge, age_equation_batch
 from pychron.processing.isotope import Blank
 from pychron.processing.isotope_group import IsotopeGroup
 from pychron.pychron_constants import ARGON_KEYS, ARAR_MAPPING
@@ -41,6 +42,71 @@ def value_error(uv):
             'error': float(std_dev(uv))}
 
 
+def _constants_key(a):
+    arc = a.arar_constants
+    fk = arc.fixed_k3739
+    t = arc.atm4036
+    return (arc.k3739_mode.lower(), arc.allow_negative_ca_correction, arc.age_units,
+            nominal_value(arc.lambda_Cl36), nominal_value(arc.atm3836),
+            nominal_value(t), std_dev(t),
+            nominal_value(fk), std_dev(fk))
+
+
+def recalculate_ages(analyses, force=False, include_decay_error=False):
+    """
+        batch equivalent of calling ``recalculate_age(force)`` on each analysis.
+
+        F (if forced or missing) and ages are calculated for all analyses that share the same constants at once.
+        use after changing J, lambda_k or the trapped 40/36 of a group of analyses.
+        analyses using the cosmogenic correction are recalculated one at a time
+    """
+    ans = []
+    for a in analyses:
+        if a.arar_constants.use_cosmogenic_correction:
+            a.recalculate_age(force=force)
+        else:
+            ans.append(a)
+
+    for _, gs in groupby_key(ans, _constants_key):
+        gs = list(gs)
+        arc = gs[0].arar_constants
+
+        fs, isos = [], []
+        for a in gs:
+            if force or not a.uF:
+                iso = a._assemble_isotope_intensities()
+                if iso:
+                    fs.append(a)
+                    isos.append(iso)
+
+        if fs:
+            batch = BatchArArAge.from_ufloats(isos,
+                                              [a.interference_corrections for a in fs],
+                                              [a.decay_days for a in fs],
+                                              arar_constants=arc,
+                                              fixed_k3739=[a.fixed_k3739 for a in fs])
+            batch.calculate_f()
+            for i, a in enumerate(fs):
+                a.uF = batch.make_uF(i)
+                a.F = float(batch.F[i])
+                a.F_err = float(batch.F_err[i])
+                a.F_err_wo_irrad = float(batch.F_err_wo_irrad[i])
+
+        gs = [a for a in gs if a.uF is not None and a.j is not None]
+        if gs:
+            lks = [a.arar_constants.lambda_k for a in gs]
+            if not include_decay_error:
+                lks = [nominal_value(lk) for lk in lks]
+
+            ages, djs, dfs, dls = age_equation_batch([nominal_value(a.j) for a in gs],
+                                                     [nominal_value(a.uF) for a in gs],
+                                                     [nominal_value(lk) for lk in lks],
+                                                     arc)
+            for a, lk, age, dj, df, dl in zip(gs, lks, ages, djs, dfs, dls):
+                a.set_age_values(age, dj, df, dl, lk)
+
+
+
 class ArArAge(IsotopeGroup):
     """
     High level representation of the ArAr attributes of an analysis.
@@ -528,6 +594,36 @@ class ArArAge(IsotopeGroup):
 
         self._set_age_values(f, include_decay_error)
 
+    def set_age_values(self, age, dj, df, dlambda_k, lambda_k):
+        """
+            set the age attributes from an age and its partial derivatives with respect to J, F and lambda_k.
+            equivalent to _set_age_values. used by recalculate_ages
+        """
+        j = self.j
+        jv = nominal_value(j)
+        base = float(age) + df * (self.uF - nominal_value(self.uF))
+        if dlambda_k and std_dev(lambda_k):
+            base = base + dlambda_k * (lambda_k - nominal_value(lambda_k))
+
+        if 1 + jv * nominal_value(self.uF) <= 0:
+            # age_equation returns ufloat(0, 0) where the age is undefined
+            base = ufloat(0, 0)
+            dj = 0
+
+        pj = copy(j)
+        pj.tag = 'Position'
+        pj.std_dev = self.position_jerr or 0
+
+        self.uage_w_position_err = base + dj * (pj - jv)
+        self.uage_w_j_err = base + dj * (j - jv)
+        self.uage = base
+        self.age = nominal_value(base)
+        self.age_err = std_dev(base)
+        self.age_err_wo_j = std_dev(base)
+
+        for iso in self.itervalues():
+            iso.age_error_component = self.get_error_component(iso.name)
+
     def _set_age_values(self, f, include_decay_error=False):
         arc = self.arar_constants
 
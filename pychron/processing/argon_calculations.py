@@ -50,6 +50,27 @@ def unpack_value_error(xx):
 
 
 def calculate_isochron(analyses, error_calc_kind, exclude=None, reg='NewYork', include_j_err=True):
+    return calculate_isochrons([(analyses, exclude)], error_calc_kind, reg=reg, include_j_err=include_j_err)[0]
+
+
+def calculate_isochrons(groups, error_calc_kind, reg='NewYork', include_j_err=True):
+    """
+        calculate the inverse isochron of each group of analyses.
+
+        groups: list of (analyses, exclude) tuples
+
+        the York regressions of all the groups are solved together, see ``solve_york_regressors``.
+        returns a list with an (age, yint, reg) tuple, or None, for each group
+    """
+    from pychron.core.regression.new_york_regressor import solve_york_regressors
+
+    items = [_make_isochron_regressors(ans, error_calc_kind, exclude, reg) for ans, exclude in groups]
+    solve_york_regressors([r for item in items if item for r in item[1:]])
+
+    return [_isochron_age(*item, include_j_err=include_j_err) if item else None for item in items]
+
+
+def _make_isochron_regressors(analyses, error_calc_kind, exclude, reg):
     if exclude is None:
         exclude = []
 
@@ -68,17 +89,20 @@ def calculate_isochron(analyses, error_calc_kind, exclude=None, reg='NewYork', i
 
     regx = isochron_regressor(ys, yerrs, xs, xerrs,
                               xds, xdes, yns, ynes, xns, xnes,
-                              reg)
+                              reg, calculate=False)
     regx.user_excluded = exclude
 
     reg = isochron_regressor(xs, xerrs, ys, yerrs,
                              xds, xdes, xns, xnes, yns, ynes,
-                             reg)
+                             reg, calculate=False)
     reg.user_excluded = exclude
 
     regx.error_calc_type = error_calc_kind
     reg.error_calc_type = error_calc_kind
+    return ref, reg, regx
+
 
+def _isochron_age(ref, reg, regx, include_j_err=True):
     yint = ufloat(reg.get_intercept(), reg.get_intercept_error())
     try:
         r = 1 / ufloat(regx.get_intercept(), regx.get_intercept_error())
@@ -96,7 +120,7 @@ def calculate_isochron(analyses, error_calc_kind, exclude=None, reg='NewYork', i
     return age, yint, reg
 
 
-def isochron_regressor(xs, xes, ys, yes, xds, xdes, xns, xnes, yns, ynes, reg='NewYork'):
+def isochron_regressor(xs, xes, ys, yes, xds, xdes, xns, xnes, yns, ynes, reg='NewYork', calculate=True):
     reg = reg.lower()
     if reg in ('newyork', 'new_york'):
         from pychron.core.regression.new_york_regressor import NewYorkRegressor as klass
@@ -110,7 +134,8 @@ def isochron_regressor(xs, xes, ys, yes, xds, xdes, xns, xnes, yns, ynes, reg='N
                 xds=xds, xdes=xdes,
                 xns=xns, xnes=xnes,
                 yns=yns, ynes=ynes)
-    reg.calculate()
+    if calculate:
+        reg.calculate()
     return reg
 
 
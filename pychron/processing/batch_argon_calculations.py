@@ -0,0 +1,418 @@
+# ===============================================================================
+# Copyright 2026 ross
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+# ===============================================================================
+
+# ============= enthought library imports =======================
+# ============= standard library imports ========================
+from numpy import asarray, zeros, eye, where, log, sqrt, einsum, errstate, array, outer, ones
+from uncertainties import nominal_value, std_dev, covariance_matrix, ufloat
+
+# ============= local library imports  ==========================
+from pychron.processing.arar_constants import ArArConstants
+from pychron.processing.argon_calculations import calculate_atmospheric
+from pychron.pychron_constants import INTERFERENCE_KEYS
+
+# Structure of arrays versions of calculate_f and age_equation.
+#
+# Values are carried as LinearArrays, an array of values plus the jacobian of each value with respect to a fixed
+# set of input variables. This is the same first order propagation uncertainties does with ufloats, but for N
+# analyses at once. Errors, including the covariance between inputs of the same analysis, are calculated from the
+# jacobian and the input covariance matrix at the end.
+
+# input variable indices
+ISOTOPE_VARIABLES = (0, 1, 2, 3, 4)
+INTERFERENCE_VARIABLES = dict(zip(INTERFERENCE_KEYS, range(5, 5 + len(INTERFERENCE_KEYS))))
+TRAPPED_VARIABLE = 5 + len(INTERFERENCE_KEYS)
+FIXED_K3739_VARIABLE = TRAPPED_VARIABLE + 1
+NVARIABLES = FIXED_K3739_VARIABLE + 1
+
+
+def _col(v):
+    return asarray(v)[..., None]
+
+
+class LinearArray(object):
+    """
+        array of values with first order derivatives (jac) with respect to K input variables.
+
+        value: (N,)
+        jac: (N, K)
+    """
+    __slots__ = ('value', 'jac')
+
+    # make numpy defer to our reflected operators, e.g. ndarray * LinearArray
+    __array_ufunc__ = None
+
+    def __init__(self, value, jac):
+        self.value = value
+        self.jac = jac
+
+    @classmethod
+    def variables(cls, values):
+        """
+            values: (N, K). return a LinearArray for each of the K variables
+        """
+        values = asarray(values, dtype=float)
+        n, k = values.shape
+        ident = eye(k)
+        return [cls(values[:, i], zeros((n, k)) + ident[i]) for i in range(k)]
+
+    @classmethod
+    def where(cls, mask, a, b):
+        a, b = _coerce(a), _coerce(b)
+        av, aj = a
+        bv, bj = b
+        value = where(mask, av, bv)
+        if aj is None and bj is None:
+            return value
+
+        if aj is None:
+            aj = zeros(bj.shape)
+        if bj is None:
+            bj = zeros(aj.shape)
+
+        return cls(value, where(_col(mask), aj, bj))
+
+    def std_dev(self, covariance):
+        """
+            covariance: (N, K, K) covariance of the input variables
+        """
+        return sqrt(einsum('ni,nij,nj->n', self.jac, covariance, self.jac))
+
+    def __neg__(self):
+        return LinearArray(-self.value, -self.jac)
+
+    def __pos__(self):
+        return self
+
+    def __add__(self, other):
+        ov, oj = _coerce(other)
+        return LinearArray(self.value + ov, self.jac if oj is None else self.jac + oj)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        ov, oj = _coerce(other)
+        return LinearArray(self.value - ov, self.jac if oj is None else self.jac - oj)
+
+    def __rsub__(self, other):
+        return -self + other
+
+    def __mul__(self, other):
+        ov, oj = _coerce(other)
+        jac = self.jac * _col(ov)
+        if oj is not None:
+            jac = jac + oj * _col(self.value)
+        return LinearArray(self.value * ov, jac)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        ov, oj = _coerce(other)
+        with errstate(divide='ignore', invalid='ignore'):
+            value = self.value / ov
+            jac = self.jac / _col(ov)
+            if oj is not None:
+                jac = jac - oj * _col(value / ov)
+        return LinearArray(value, jac)
+
+    def __rtruediv__(self, other):
+        ov, _ = _coerce(other)
+        with errstate(divide='ignore', invalid='ignore'):
+            value = ov / self.value
+            jac = self.jac * _col(-value / self.value)
+        return LinearArray(value, jac)
+
+
+def _coerce(v):
+    if isinstance(v, LinearArray):
+        return v.value, v.jac
+    return asarray(v, dtype=float), None
+
+
+def interference_corrections_batch(a39, a37, production_ratios, arar_constants, use_fixed, fixed_k3739):
+    """
+        batch version of argon_calculations.interference_corrections
+
+        use_fixed: (N,) bool. True where the fixed K37/K39 mode applies
+        fixed_k3739: LinearArray of the fixed K37/K39 values
+    """
+    pr = production_ratios
+    ca3937 = pr.get('Ca3937', 0)
+    k3739 = pr.get('K3739', 0)
+
+    # normal
+    k39 = (a39 - ca3937 * a37) / (1 - k3739 * ca3937)
+    k37 = k3739 * k39
+    ca37 = a37 - k37
+
+    # fixed. see argon_calculations.apply_fixed_k3739
+    if use_fixed.any():
+        x = fixed_k3739
+        zero = _coerce(ca3937)[0] == 0
+        y = LinearArray.where(zero, 1, 1 / LinearArray.where(zero, 1, ca3937))
+
+        fca37 = (a39 * x * y) / (x + y)
+        fk39 = a39 - ca3937 * fca37
+        fk37 = x * fk39
+
+        ca37 = LinearArray.where(use_fixed, fca37, ca37)
+        k39 = LinearArray.where(use_fixed, fk39, k39)
+        k37 = LinearArray.where(use_fixed, fk37, k37)
+
+    ca39 = ca3937 * ca37
+    k38 = pr.get('K3839', 0) * k39
+
+    if not arar_constants.allow_negative_ca_correction:
+        ca37 = LinearArray.where(_coerce(ca37)[0] > 0, ca37, 0)
+
+    ca36 = pr.get('Ca3637', 0) * ca37
+    ca38 = pr.get('Ca3837', 0) * ca37
+
+    return k37, k38, k39, ca36, ca37, ca38, ca39
+
+
+def calculate_f_batch(values, decay_time, arar_constants, use_fixed=None):
+    """
+        batch version of argon_calculations.calculate_f
+
+        values: (N, NVARIABLES) input values. see the *_VARIABLE indices
+        decay_time: (N,) days since irradiation
+        use_fixed: (N,) bool. True where the fixed K37/K39 mode applies
+
+        return F as a LinearArray
+    """
+    values = asarray(values, dtype=float)
+    if use_fixed is None:
+        use_fixed = zeros(values.shape[0], dtype=bool)
+
+    xs = LinearArray.variables(values)
+    a40, a39, a38, a37, a36 = (xs[i] for i in ISOTOPE_VARIABLES)
+    pr = {k: xs[i] for k, i in INTERFERENCE_VARIABLES.items()}
+    trapped_4036 = xs[TRAPPED_VARIABLE]
+    fixed_k3739 = xs[FIXED_K3739_VARIABLE]
+
+    k37, k38, k39, ca36, ca37, ca38, ca39 = interference_corrections_batch(a39, a37, pr, arar_constants,
+                                                                           use_fixed, fixed_k3739)
+
+    atm36, atm38, cl36, cl38 = calculate_atmospheric(a38, a36, k38, ca38, ca36,
+                                                     asarray(decay_time, dtype=float),
+                                                     pr, arar_constants)
+    atm40 = atm36 * trapped_4036
+    k40 = k39 * pr['K4039']
+    rad40 = a40 - atm40 - k40
+
+    zero = k39.value == 0
+    return LinearArray.where(zero, 1, rad40 / LinearArray.where(zero, 1, k39))
+
+
+def age_equation_batch(j, f, lambda_k, arar_constants=None):
+    """
+        batch version of argon_calculations.age_equation
+
+        j, f, lambda_k: (N,) nominal values
+
+        return age and the partial derivatives of age with respect to j, f and lambda_k. where the age is undefined
+        the age and its derivatives are 0
+    """
+    if arar_constants is None:
+        arar_constants = ArArConstants()
+
+    j, f, lambda_k = (asarray(v, dtype=float) for v in (j, f, lambda_k))
+    s = arar_constants.scale_age(1, current='a')
+
+    jf = 1 + j * f
+    valid = jf > 0
+    with errstate(divide='ignore', invalid='ignore'):
+        age = where(valid, log(jf) / lambda_k * s, 0)
+        c = where(valid, s / (jf * lambda_k), 0)
+        dlambda = where(valid, -age / lambda_k, 0)
+
+    return age, c * f, c * j, dlambda
+
+
+class BatchArArAge(object):
+    """
+        structure of arrays F and age calculation for N analyses that share ``arar_constants``.
+
+        values: (N, NVARIABLES) nominal values of the input variables
+        covariance: (N, NVARIABLES, NVARIABLES) covariance of the input variables of each analysis
+        decay_time: (N,) days since irradiation
+        use_fixed: (N,) bool. True where the fixed K37/K39 mode applies
+    """
+
+    def __init__(self, values, covariance, decay_time, arar_constants=None, use_fixed=None, production_keys=None):
+        if arar_constants is None:
+            arar_constants = ArArConstants()
+
+        self.values = asarray(values, dtype=float)
+        self.covariance = asarray(covariance, dtype=float)
+        self.decay_time = asarray(decay_time, dtype=float)
+        self.arar_constants = arar_constants
+        self.use_fixed = use_fixed
+        self.production_keys = production_keys
+        self.inputs = None
+
+        self.uF = None
+        self.F = None
+        self.F_err = None
+        self.F_err_wo_irrad = None
+
+    @classmethod
+    def from_ufloats(cls, isotopes, interferences, decay_time, arar_constants=None, fixed_k3739=None,
+                     **kw):
+        """
+            isotopes: list of N (a40, a39, a38, a37, a36) ufloats
+            interferences: list of N dicts of production ratio ufloats
+            fixed_k3739: list of N fixed K37/K39 values or None. an analysis uses the fixed mode if its value is
+            truthy or arar_constants.k3739_mode is "Fixed"
+        """
+        if arar_constants is None:
+            arar_constants = ArArConstants()
+
+        n = len(isotopes)
+        if fixed_k3739 is None:
+            fixed_k3739 = [None] * n
+
+        mode_fixed = arar_constants.k3739_mode.lower() != 'normal'
+
+        values = zeros((n, NVARIABLES))
+        covariance = zeros((n, NVARIABLES, NVARIABLES))
+        use_fixed = zeros(n, dtype=bool)
+        inputs = []
+
+        for i, (isos, prs, fk) in enumerate(zip(isotopes, interferences, fixed_k3739)):
+            use_fixed[i] = bool(fk) or mode_fixed
+            if use_fixed[i] and not fk:
+                fk = arar_constants.fixed_k3739
+
+            xs = list(isos) + [prs.get(k, 0) for k in INTERFERENCE_KEYS] + [make_trapped_4036(arar_constants),
+                                                                            fk or 0]
+            values[i] = [nominal_value(x) for x in xs]
+            covariance[i, :5, :5] = covariance_matrix(isos)
+            for idx in range(5, NVARIABLES):
+                covariance[i, idx, idx] = std_dev(xs[idx]) ** 2
+            inputs.append(xs)
+
+        obj = cls(values, covariance, decay_time, arar_constants=arar_constants, use_fixed=use_fixed, **kw)
+        obj.inputs = inputs
+        return obj
+
+    def calculate_f(self):
+        uF = calculate_f_batch(self.values, self.decay_time, self.arar_constants, self.use_fixed)
+
+        cov = self.covariance
+        wo_irrad = cov.copy()
+        for idx in INTERFERENCE_VARIABLES.values():
+            wo_irrad[:, idx, :] = 0
+            wo_irrad[:, :, idx] = 0
+
+        self.uF = uF
+        self.F = uF.value
+        self.F_err = uF.std_dev(cov)
+        self.F_err_wo_irrad = uF.std_dev(wo_irrad)
+        return self.F, self.F_err, self.F_err_wo_irrad
+
+    def f_covariance(self, shared=False):
+        """
+            return the (N, N) covariance matrix of F.
+
+            the ufloat path creates independent production ratio and trapped 40/36 variables for every analysis
+            so analyses are uncorrelated. if ``shared`` is True analyses with the same production key share their
+            production ratio variables and all analyses share the trapped 40/36 variable.
+        """
+        jac = self.uF.jac
+        n = jac.shape[0]
+        cov = zeros((n, n))
+        cov[range(n), range(n)] = self.F_err ** 2
+        if not shared:
+            return cov
+
+        keys = self.production_keys
+        if keys is None:
+            keys = [None] * n
+        same = array([[ki == kj for kj in keys] for ki in keys])
+        same[range(n), range(n)] = False
+
+        for idx in INTERFERENCE_VARIABLES.values():
+            var = self.covariance[:, idx, idx]
+            g = jac[:, idx] * sqrt(var)
+            cov += where(same, outer(g, g), 0)
+
+        var = self.covariance[:, TRAPPED_VARIABLE, TRAPPED_VARIABLE]
+        g = jac[:, TRAPPED_VARIABLE] * sqrt(var)
+        t = outer(g, g)
+        t[range(n), range(n)] = 0
+        cov += t
+        return cov
+
+    def calculate_age(self, j, j_err=0, position_jerr=0, lambda_k=None, lambda_k_err=0):
+        """
+            return age, age error without J error, age error with J error and age error with position J error.
+
+            j, j_err, position_jerr, lambda_k, lambda_k_err: scalar or (N,).
+            lambda_k_err is only included if it is non zero. i.e. include_decay_error
+        """
+        if self.F is None:
+            self.calculate_f()
+
+        n = self.F.shape[0]
+        if lambda_k is None:
+            lambda_k = nominal_value(self.arar_constants.lambda_k)
+
+        j, j_err, position_jerr, lambda_k, lambda_k_err = (asarray(v, dtype=float) * ones(n)
+                                                           for v in (j, j_err, position_jerr,
+                                                                     lambda_k, lambda_k_err))
+
+        age, dj, df, dl = age_equation_batch(j, self.F, lambda_k, self.arar_constants)
+
+        ss = (df * self.F_err) ** 2 + (dl * lambda_k_err) ** 2
+        age_err = sqrt(ss)
+        age_err_w_j = sqrt(ss + (dj * j_err) ** 2)
+        age_err_w_position = sqrt(ss + (dj * position_jerr) ** 2)
+        return age, age_err, age_err_w_j, age_err_w_position
+
+    def make_uF(self, i, inputs=None):
+        """
+            build the ufloat equivalent of the ith F.
+
+            inputs: the NVARIABLES ufloats (or floats) used as inputs for the ith analysis. defaults to the inputs
+            passed to from_ufloats. the result is correlated with the inputs exactly as if it had been calculated by
+            calculate_f, so error components are preserved
+        """
+        if inputs is None:
+            inputs = self.inputs[i]
+
+        value = self.F[i]
+        u = value
+        for g, x in zip(self.uF.jac[i], inputs):
+            if g and std_dev(x):
+                u = u + g * (x - nominal_value(x))
+
+        if u is value:
+            u = ufloat(value, 0)
+        return u
+
+
+def make_trapped_4036(arar_constants):
+    """
+        the trapped 40/36 ufloat as created by argon_calculations.calculate_f
+    """
+    t = arar_constants.atm4036
+    trapped_4036 = ufloat(nominal_value(t), std_dev(t))
+    trapped_4036.tag = 'trapped_4036'
+    return trapped_4036
+
+# ============= EOF =============================================
@@ -28,8 +28,10 @@ from numpy import array, Inf, polyfit, gradient, array_split, mean
 from uncertainties import ufloat, nominal_value, std_dev
 
 from pychron.core.geometry.geometry import curvature_at
-from pychron.core.helpers.binpack import unpack
+from pychron.core.helpers.binpack import unpack_arrays, pack_arrays
 from pychron.core.helpers.fits import natural_name_fit, fit_to_degree
+from pychron.core.helpers.signal_buffer import SignalBuffer
+from pychron.core.regression.incremental_regressor import IncrementalPolynomialRegressor
 from pychron.core.regression.least_squares_regressor import ExponentialRegressor, FitError, LeastSquaresRegressor
 from pychron.core.regression.mean_regressor import MeanRegressor
 from pychron.core.regression.ols_regressor import PolynomialRegressor
@@ -54,6 +56,7 @@ class BaseMeasurement(object):
     detector_serial_id = None
     group_data = 0
     _regressor = None
+    _buffer = None
 
     @property
     def n(self):
@@ -77,6 +80,26 @@ class BaseMeasurement(object):
         self.mass = 0
         self.time_zero_offset = 0
 
+    def append_data(self, x, y):
+        """
+            append a single point. used during acquisition.
+
+            points are accumulated in a ``SignalBuffer`` so the cost per point is constant.
+            if ``xs``/``ys`` were replaced since the last append the buffer is reseeded from them
+        """
+        buf = self._buffer
+        if buf is None or not buf.owns(self.xs, self.ys):
+            buf = self._buffer = SignalBuffer(self.xs, self.ys)
+
+        buf.append(x, y)
+        self.xs, self.ys = buf.xs, buf.ys
+
+    def end_acquisition(self):
+        """
+            release the acquisition buffer. later fits are calculated from scratch instead of incrementally
+        """
+        self._buffer = None
+
     def set_grouping(self, n):
         self.group_data = n
         self._regressor = None
@@ -98,7 +121,7 @@ class BaseMeasurement(object):
             endianness = self.endianness
 
         fmt = '{}ff'.format(endianness)
-        txt = b''.join((struct.pack(fmt, x, y) for x, y in zip(self.xs, self.ys)))
+        txt = pack_arrays(fmt, self.xs, self.ys)
         if as_hex:
             txt = hexlify(txt)
         return txt
@@ -113,21 +136,21 @@ class BaseMeasurement(object):
             self.unpack_error = e
             return
 
+        self.set_data(xs, ys, n_only)
+
+    def set_data(self, xs, ys, n_only=False):
         if n_only:
             self.n = len(xs)
         else:
-            self.xs = array(xs)
-            self.ys = array(ys)
-
-            # print self.name, self.xs.shape, self.ys.shape
-            # print self.name, self.ys
+            self.xs = array(xs, dtype=float)
+            self.ys = array(ys, dtype=float)
 
     def _unpack_blob(self, blob, endianness=None):
         if endianness is None:
             endianness = self.endianness
 
         try:
-            x, y = unpack(blob, fmt='{}ff'.format(endianness))
+            x, y = unpack_arrays(blob, fmt='{}ff'.format(endianness))
             # x, y = zip(*[struct.unpack('{}ff'.format(endianness), blob[i:i + 8]) for i in range(0, len(blob), 8)])
             if self.reverse_unpack:
                 return y, x
@@ -452,9 +475,12 @@ class IsotopicMeasurement(BaseMeasurement):
             if not isinstance(reg, LeastSquaresRegressor):
                 reg = LeastSquaresRegressor()
                 reg.construct_fitfunc(lfit)
-        elif not isinstance(reg, PolynomialRegressor):
-            reg = PolynomialRegressor()
-            reg.set_degree(fit_to_degree(fit), refresh=False)
+        else:
+            # live data only grows so update the fit incrementally instead of refitting every point
+            klass = IncrementalPolynomialRegressor if self._buffer is not None else PolynomialRegressor
+            if type(reg) is not klass:
+                reg = klass()
+                reg.set_degree(fit_to_degree(fit), refresh=False)
 
         xs, ys = self.get_data()
         reg.trait_set(xs=xs, ys=ys,
@@ -18,7 +18,6 @@
 import logging
 import os
 
-from numpy import append as npappend
 from traits.api import Property, Dict, Str
 from traits.has_traits import HasTraits
 from uncertainties import ufloat
@@ -228,6 +227,13 @@ class IsotopeGroup(HasTraits):
         r = ufloat(*ic)
         return r
 
+    def end_acquisition(self):
+        for iso in self.itervalues():
+            iso.end_acquisition()
+            iso.baseline.end_acquisition()
+            iso.sniff.end_acquisition()
+            iso.whiff.end_acquisition()
+
     def append_data(self, iso, det, x, signal, kind):
         """
             if kind is baseline then key used to match isotope is `detector` not an `isotope_name`
@@ -244,10 +250,7 @@ class IsotopeGroup(HasTraits):
             if kind == 'sniff':
                 isotope._value = signal
 
-            xs = npappend(isotope.xs, x)
-            ys = npappend(isotope.ys, signal)
-            isotope.xs = xs
-            isotope.ys = ys
+            isotope.append_data(x, signal)
             # isotope.dirty = True
 
         isotopes = self.isotopes
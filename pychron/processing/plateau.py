@@ -17,7 +17,9 @@
 # ============= enthought library imports =======================
 from __future__ import absolute_import
 
-from numpy import argmax, array
+from numpy import argmax, zeros, arange, cumsum, where, errstate, isfinite, minimum, newaxis, \
+    nan, full
+from scipy.stats import chi2
 from six.moves import range
 from traits.api import HasTraits, List, Array
 
@@ -45,6 +47,167 @@ class Log():
 log = Log()
 
 
+def find_plateaus(ages, errors, signals, excludes=None, **kw):
+    """
+        find the plateau of a single spectrum. see ``find_plateaus_batch``
+
+        return (start, end) or [] if no plateau
+    """
+    return find_plateaus_batch([(ages, errors, signals, excludes)], **kw)[0]
+
+
+def find_plateaus_batch(spectra, method='', nsteps=3, overlap_sigma=2, gas_fraction=50, chunksize=256):
+    """
+        find the plateaus of many spectra.
+
+        spectra: list of (ages, errors, signals) or (ages, errors, signals, excludes) tuples. spectra can
+        have different numbers of steps
+
+        the criteria are evaluated for every start/end pair of a chunk of spectra at once using prefix sums
+        of the signals, the inverse variance weighted ages and squared ages, so no span is summed twice.
+
+        returns a list with the (start, end) of the longest plateau, or [], for each spectrum.
+        same result as ``Plateau.find_plateaus``
+    """
+    use_mswd = method.lower() == MAHON.lower()
+    results = []
+    spectra = list(spectra)
+    for i in range(0, len(spectra), chunksize):
+        chunk = spectra[i:i + chunksize]
+        results.extend(_find_plateaus_chunk(chunk, use_mswd, nsteps, overlap_sigma, gas_fraction))
+    return results
+
+
+def _pad_spectra(spectra):
+    """
+        stack the spectra into (nspectra, nsteps) arrays padded with zeros.
+
+        valid is False for the padding, mask is False for the padding and excluded steps
+    """
+    ns = [len(sp[0]) for sp in spectra]
+    k, n = len(spectra), max(ns) if ns else 0
+
+    ages = zeros((k, n))
+    errors = zeros((k, n))
+    signals = zeros((k, n))
+    valid = zeros((k, n), dtype=bool)
+    mask = zeros((k, n), dtype=bool)
+    for i, (sp, ni) in enumerate(zip(spectra, ns)):
+        ages[i, :ni] = sp[0]
+        errors[i, :ni] = sp[1]
+        signals[i, :ni] = sp[2]
+        valid[i, :ni] = True
+        mask[i, :ni] = True
+        if len(sp) > 3 and sp[3]:
+            ex = [e for e in sp[3] if 0 <= e < ni]
+            mask[i, ex] = False
+
+    return ages, errors, signals, valid, mask
+
+
+def _span_sums(v):
+    """
+        sums of v over every span. s[..., i, j] is the sum of v[..., i:j+1]
+    """
+    c = cumsum(v, axis=-1)
+    return c[..., newaxis, :] - (c - v)[..., :, newaxis]
+
+
+def _find_plateaus_chunk(spectra, use_mswd, nsteps, overlap_sigma, gas_fraction):
+    ages, errors, signals, valid, mask = _pad_spectra(spectra)
+    k, n = ages.shape
+    if not n:
+        return [[] for _ in range(k)]
+
+    steps = arange(n)
+    starts = steps[:, newaxis]
+    ends = steps[newaxis, :]
+
+    # span [start, end] is a candidate if end is not excluded, start is not excluded and is long enough
+    ok = (ends >= starts) & ((ends - starts) + 1 >= nsteps)
+    ok = ok[newaxis] & mask[:, newaxis, :] & mask[:, :, newaxis]
+
+    # percent released
+    ss = signals * mask
+    css = _span_sums(ss)
+    total = css[:, 0, -1]
+    with errstate(divide='ignore', invalid='ignore'):
+        ok &= css / total[:, newaxis, newaxis] >= gas_fraction / 100.
+
+    if use_mswd:
+        ok &= _valid_mswds(ages, errors, mask)
+    else:
+        ok &= ends <= _overlap_ends(ages, errors, valid, overlap_sigma)[:, :, newaxis]
+
+    pe = where(ok, ends, -1).max(axis=2)
+
+    results = []
+    for pei in pe:
+        # an end of 0 is not a plateau, as in Plateau._find_plateaus
+        found = where(pei > 0)[0]
+        if found.shape[0]:
+            s = found[argmax(pei[found] - found)]
+            results.append((int(s), int(pei[s])))
+        else:
+            results.append([])
+    return results
+
+
+def _overlap_ends(ages, errors, valid, overlap_sigma):
+    """
+        last end of the span starting at each step where every pair of steps overlap at ``overlap_sigma``.
+        excluded steps are included in the overlap test
+    """
+    n = ages.shape[1]
+    e = errors * overlap_sigma
+    lo = ages - e
+    hi = ages + e
+
+    ov = (lo[:, :, newaxis] < hi[:, newaxis, :]) & (hi[:, :, newaxis] > lo[:, newaxis, :])
+
+    steps = arange(n)
+    fail = ~ov & (steps[newaxis, :] > steps[:, newaxis]) & valid[:, newaxis, :]
+    # first step j > i that does not overlap step i
+    first = where(fail.any(axis=2), fail.argmax(axis=2), n)
+
+    # the span [i, j] overlaps if i overlaps every step in [i, j] and [i+1, j] overlaps
+    return minimum.accumulate((first - 1)[:, ::-1], axis=1)[:, ::-1]
+
+
+def _valid_mswds(ages, errors, mask):
+    """
+        mahon 1996 acceptable mswd of the weighted mean of the not excluded steps of every span
+    """
+    n = ages.shape[1]
+    with errstate(divide='ignore', invalid='ignore'):
+        w = where(mask, errors ** -2., 0)
+
+        # spans with a zero error step are not valid
+        bad = mask & ~isfinite(w)
+        w[bad] = 0
+        nbad = _span_sums(bad.astype(float))
+
+        # center on the mean age to reduce cancellation in the sum of squares
+        c = where(mask, ages, 0).sum(axis=1) / mask.sum(axis=1)
+        x = where(mask, ages - c[:, newaxis], 0)
+
+        s0 = _span_sums(w)
+        s1 = _span_sums(w * x)
+        s2 = _span_sums(w * x ** 2)
+        cnt = _span_sums(mask.astype(float)).astype(int)
+
+        chi = s2 - s1 ** 2 / s0
+        mswd = chi / (cnt - 1)
+
+    dof = arange(1, n + 1)
+    low, high = full(n + 1, nan), full(n + 1, nan)
+    low[2:], high[2:] = chi2.interval(0.95, dof[:-1], scale=1. / dof[:-1])
+
+    low, high = low[cnt], high[cnt]
+    with errstate(invalid='ignore'):
+        return (cnt > 1) & (nbad == 0) & (low <= mswd) & (mswd <= high)
+
+
 class Plateau(HasTraits):
     ages = Array
     errors = Array
@@ -63,64 +226,22 @@ class Plateau(HasTraits):
         """
             method: str either fleck 1977 or mahon 1996
         """
-        if method.lower() == MAHON:
+        if method.lower() == MAHON.lower():
             self.use_mswd = True
             self.use_overlap = False
         else:
             self.use_mswd = False
             self.use_overlap = True
 
-        n = len(self.ages)
         excludes = self.excludes
         ss = [s for i, s in enumerate(self.signals) if i not in excludes]
-
         self.total_signal = float(sum(ss))
-        # log.info(self.total_signal)
-
-        idxs = []
-        spans = []
-
-        overlap_func = memoize(self._overlap)
-        for i in range(n):
-            if i in excludes:
-                continue
-            idx = self._find_plateaus(n, i, excludes, overlap_func)
-            if idx:
-                # log.debug('found {} {}'.format(*idx))
-                idxs.append(idx)
-                spans.append(idx[1] - idx[0])
-
-        if spans:
-            return idxs[argmax(array(spans))]
-
-        return idxs
 
-    def _find_plateaus(self, n, start, excludes, overlap_func):
-        potential_end = None
-        for i in range(start, n, 1):
-            if i in excludes:
-                continue
-
-            if not self.check_nsteps(start, i):
-                log.debug('{} {} nsteps failed'.format(start, i))
-                continue
-
-            if self.use_overlap and not self.check_overlap(start, i, overlap_func):
-                log.debug('{} {} overlap failed'.format(start, i))
-                # potential_end=None
-                break
-
-            if self.use_mswd and not self.check_mswd(start, i):
-                continue
-
-            if not self.check_percent_released(start, i):
-                log.debug('{} {} percent failed'.format(start, i))
-                continue
-
-            potential_end = i
-
-        if potential_end:
-            return start, potential_end
+        return find_plateaus(self.ages, self.errors, self.signals, excludes,
+                             method=method,
+                             nsteps=self.nsteps,
+                             overlap_sigma=self.overlap_sigma,
+                             gas_fraction=self.gas_fraction)
 
     def check_percent_released(self, start, end):
         ss = sum([(s if not i in self.excludes else 0)
@@ -134,12 +255,16 @@ class Plateau(HasTraits):
         """
             return False if not valid
         """
-        ages = self.ages[start, end + 1]
-        errors = self.errors[start, end + 1]
+        idx = [i for i in range(start, end + 1) if i not in self.excludes]
+        ages = self.ages[idx]
+        errors = self.errors[idx]
         mswd = calculate_mswd(ages, errors)
         return validate_mswd(mswd, len(ages))
 
-    def check_overlap(self, start, end, overlap_func):
+    def check_overlap(self, start, end, overlap_func=None):
+        if overlap_func is None:
+            overlap_func = self._overlap
+
         overlap_sigma = self.overlap_sigma
         for c, i in enumerate(range(start, end, 1)):
             for j in range(start + c, end + 1, 1):
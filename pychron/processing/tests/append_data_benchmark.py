@@ -0,0 +1,46 @@
+"""
+benchmark the per-sample cost of ``IsotopeGroup.append_data`` during a multicollector run.
+
+    python -m pychron.processing.tests.append_data_benchmark [ncycles] [ndetectors]
+
+prints the mean cost per sample for consecutive blocks of cycles. with the growable
+``SignalBuffer`` storage the cost should stay flat as the run gets longer.
+"""
+import sys
+import time
+
+from pychron.processing.isotope import Isotope
+from pychron.processing.isotope_group import IsotopeGroup
+
+DETECTORS = ('H2', 'H1', 'AX', 'L1', 'L2', 'CDD', 'H3', 'L3')
+
+
+def make_group(ndet):
+    ig = IsotopeGroup()
+    for i, det in enumerate(DETECTORS[:ndet]):
+        name = 'Ar{}'.format(36 + i)
+        ig.isotopes[name] = Isotope(name, det)
+    return ig
+
+
+def run(ncycles=10000, ndet=8, block=1000):
+    ig = make_group(ndet)
+    keys = [(iso.name, iso.detector) for iso in ig.itervalues()]
+
+    print('cycles={} detectors={}'.format(ncycles, ndet))
+    st = time.perf_counter()
+    for c in range(ncycles):
+        x = c * 0.5
+        for name, det in keys:
+            ig.append_data(name, det, x, 1.0, 'signal')
+
+        if c and not (c + 1) % block:
+            et = time.perf_counter() - st
+            print('cycles {:>6d}-{:<6d} {:0.2f} us/sample'.format(c + 1 - block, c + 1,
+                                                                  et / (block * ndet) * 1e6))
+            st = time.perf_counter()
+
+
+if __name__ == '__main__':
+    args = [int(a) for a in sys.argv[1:3]]
+    run(*args)
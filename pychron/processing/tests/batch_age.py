@@ -0,0 +1,167 @@
+import unittest
+
+from numpy import random
+from uncertainties import ufloat, nominal_value, std_dev
+
+from pychron.processing.arar_age import ArArAge, recalculate_ages
+from pychron.processing.arar_constants import ArArConstants
+from pychron.processing.argon_calculations import calculate_f, age_equation
+from pychron.processing.batch_argon_calculations import BatchArArAge, age_equation_batch
+from pychron.processing.isotope import Isotope
+
+INTERFERENCES = {'K4039': (0.0012, 0.0001), 'K3839': (0.012, 0.0002), 'K3739': (0.00023, 0.00001),
+                 'Ca3937': (0.00068, 0.00002), 'Ca3837': (0.00003, 0.000001), 'Ca3637': (0.00028, 0.000005),
+                 'Cl3638': (250, 10)}
+
+SIGNALS = {'Ar40': 1000., 'Ar39': 100., 'Ar38': 1.5, 'Ar37': 20., 'Ar36': 0.5}
+
+
+def make_interferences():
+    return {k: ufloat(v, e, tag=k) for k, (v, e) in INTERFERENCES.items()}
+
+
+def make_analysis(rng, klass=ArArAge):
+    a = klass()
+    a.arar_constants = ArArConstants()
+    ic = ufloat(1.02, 0.003, tag='ic')
+    for k, v in SIGNALS.items():
+        iso = Isotope(k, 'H1' if k == 'Ar40' else 'CDD')
+        v *= rng.uniform(0.8, 1.2)
+        iso.set_uvalue((v, v * 0.001))
+        iso.set_baseline(0.01, 0.001)
+        iso.set_blank(v * 0.01, v * 0.0005)
+        if k in ('Ar40', 'Ar36'):
+            iso.ic_factor = ic
+        a.isotopes[k] = iso
+
+    a.interference_corrections = make_interferences()
+    a.timestamp = 1e9
+    a.irradiation_time = 1e9 - rng.uniform(10, 100) * 60 * 60 * 24
+    a.set_j(rng.uniform(0.001, 0.002), 1e-6)
+    a.position_jerr = 5e-7
+    a.calculate_decay_factors()
+    return a
+
+
+class BatchAgeTestCase(unittest.TestCase):
+    def _make_pair(self, n=10, seed=1):
+        return ([make_analysis(random.RandomState(seed + i)) for i in range(n)],
+                [make_analysis(random.RandomState(seed + i)) for i in range(n)])
+
+    def _assert_close(self, a, b, rtol=1e-9):
+        self.assertAlmostEqual(a, b, delta=abs(b) * rtol + 1e-15)
+
+    def test_recalculate_ages(self):
+        scalar, batch = self._make_pair()
+        for a in scalar:
+            a.recalculate_age(force=True)
+
+        recalculate_ages(batch, force=True)
+
+        for s, b in zip(scalar, batch):
+            self._assert_close(b.F, s.F)
+            self._assert_close(b.F_err, s.F_err)
+            self._assert_close(b.F_err_wo_irrad, s.F_err_wo_irrad)
+            self._assert_close(b.age, s.age)
+            self._assert_close(b.age_err, s.age_err)
+            self._assert_close(std_dev(b.uage_w_j_err), std_dev(s.uage_w_j_err))
+            self._assert_close(std_dev(b.uage_w_position_err), std_dev(s.uage_w_position_err))
+            for k in SIGNALS:
+                self._assert_close(b.isotopes[k].age_error_component, s.isotopes[k].age_error_component)
+
+    def test_recalculate_ages_new_j(self):
+        scalar, batch = self._make_pair()
+        for ans in (scalar, batch):
+            for a in ans:
+                a.recalculate_age(force=True)
+                a.set_j(0.0015, 2e-6)
+
+        for a in scalar:
+            a.recalculate_age()
+        recalculate_ages(batch)
+
+        for s, b in zip(scalar, batch):
+            self._assert_close(b.age, s.age)
+            self._assert_close(std_dev(b.uage_w_j_err), std_dev(s.uage_w_j_err))
+
+    def test_recalculate_ages_mixed_fixed_k3739(self):
+        scalar, batch = self._make_pair(n=4)
+        for ans in (scalar, batch):
+            for i, a in enumerate(ans):
+                a.arar_constants.k3739_mode = 'Fixed'
+                a.arar_constants.k3739_v = 0.01 if i % 2 else 0.02
+                a.arar_constants.k3739_e = 0.0001 if i % 2 else 0.0005
+
+        for a in scalar:
+            a.recalculate_age(force=True)
+        recalculate_ages(batch, force=True)
+
+        for s, b in zip(scalar, batch):
+            self._assert_close(b.F, s.F)
+            self._assert_close(b.F_err, s.F_err)
+            self._assert_close(b.age, s.age)
+
+    def test_recalculate_ages_mixed_trapped_4036_error(self):
+        scalar, batch = self._make_pair(n=2)
+        for ans in (scalar, batch):
+            ans[1].arar_constants.atm4036_e = 5
+
+        for a in scalar:
+            a.recalculate_age(force=True)
+        recalculate_ages(batch, force=True)
+
+        for s, b in zip(scalar, batch):
+            self._assert_close(b.F_err, s.F_err)
+            self._assert_close(b.age_err, s.age_err)
+        self.assertNotAlmostEqual(batch[0].F_err / batch[0].F, batch[1].F_err / batch[1].F)
+
+    def test_fixed_k3739_negative_ca(self):
+        arc = ArArConstants()
+        arc.k3739_mode = 'Fixed'
+        arc.allow_negative_ca_correction = False
+
+        rng = random.RandomState(2)
+        isos, prs = [], []
+        for i in range(5):
+            isos.append([ufloat(v * rng.uniform(0.9, 1.1), v * 0.01) for v in SIGNALS.values()])
+            prs.append(make_interferences())
+        # negative ca37
+        isos[0][3] = ufloat(-0.1, 0.01)
+
+        batch = BatchArArAge.from_ufloats(isos, prs, [30] * 5, arar_constants=arc)
+        batch.calculate_f()
+        for i, (iso, pr) in enumerate(zip(isos, prs)):
+            f, f_wo_irrad, _, _, _ = calculate_f(iso, 30, pr, arar_constants=arc)
+            self._assert_close(batch.F[i], nominal_value(f))
+            self._assert_close(batch.F_err[i], std_dev(f))
+            self._assert_close(batch.F_err_wo_irrad[i], std_dev(f_wo_irrad))
+            self._assert_close(std_dev(batch.make_uF(i)), std_dev(f))
+
+    def test_f_covariance(self):
+        isos = [[ufloat(v, v * 0.01) for v in SIGNALS.values()] for i in range(3)]
+        prs = [make_interferences() for i in range(3)]
+        batch = BatchArArAge.from_ufloats(isos, prs, [30] * 3, production_keys=['a', 'a', 'b'])
+        batch.calculate_f()
+
+        cov = batch.f_covariance()
+        self.assertEqual(cov[0, 1], 0)
+
+        cov = batch.f_covariance(shared=True)
+        self._assert_close(cov[0, 0], batch.F_err[0] ** 2)
+        self.assertNotEqual(cov[0, 1], 0)
+        self.assertAlmostEqual(cov[0, 1], cov[1, 0])
+        self.assertLess(abs(cov[0, 2]), abs(cov[0, 1]))
+
+    def test_age_equation(self):
+        arc = ArArConstants()
+        lk = nominal_value(arc.lambda_k)
+        js = [0.001, 0.002, 0.001]
+        fs = [10, 5, -2000]
+        ages, _, _, _ = age_equation_batch(js, fs, [lk] * 3, arc)
+        for j, f, age in zip(js, fs, ages):
+            self._assert_close(age, nominal_value(age_equation((j, 0), (f, 0), arar_constants=arc)))
+        self.assertEqual(ages[2], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
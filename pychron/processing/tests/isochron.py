@@ -0,0 +1,53 @@
+import unittest
+
+from numpy import random
+from uncertainties import nominal_value, std_dev
+
+from pychron.processing.analyses.analysis import Analysis
+from pychron.processing.analyses.analysis_group import AnalysisGroup, calculate_group_isochrons
+from pychron.processing.tests.batch_age import make_analysis
+
+
+class GroupIsochronTestCase(unittest.TestCase):
+    def _make_groups(self, seed):
+        groups = []
+        for i in range(3):
+            ans = [make_analysis(random.RandomState(seed + 10 * i + j), Analysis) for j in range(5)]
+            for a in ans:
+                a.calculate_age(force=True)
+            groups.append(AnalysisGroup(analyses=ans))
+        return groups
+
+    def _assert_close(self, a, b, rtol=1e-9):
+        self.assertAlmostEqual(a, b, delta=abs(b) * rtol + 1e-15)
+
+    def test_group_isochrons(self):
+        scalar = self._make_groups(1)
+        batch = self._make_groups(1)
+
+        calculate_group_isochrons(batch)
+        for s, b in zip(scalar, batch):
+            sage, syint, sreg = s.get_isochron_data()
+            bage, byint, breg = b.get_isochron_data()
+            self._assert_close(nominal_value(bage), nominal_value(sage))
+            self._assert_close(std_dev(bage), std_dev(sage))
+            self._assert_close(nominal_value(byint), nominal_value(syint))
+            self._assert_close(breg.mswd, sreg.mswd)
+
+    def test_cached_isochron(self):
+        ag = self._make_groups(1)[0]
+        calculate_group_isochrons([ag])
+        reg = ag.get_isochron_data()[2]
+        self.assertIs(ag.get_isochron_data()[2], reg)
+
+        ag.analyses[0].temp_status = 'omit'
+        reg2 = ag.get_isochron_data()[2]
+        self.assertIsNot(reg2, reg)
+        self.assertEqual(reg2.user_excluded, [0])
+
+        ag.dirty = True
+        self.assertIsNot(ag.get_isochron_data()[2], reg2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -2,7 +2,42 @@ from __future__ import absolute_import
 __author__ = 'ross'
 import unittest
 
-from pychron.processing.plateau import Plateau
+from numpy import random
+
+from pychron.processing.plateau import Plateau, find_plateaus_batch
+from pychron.pychron_constants import MAHON
+
+
+def brute_force_plateau(p, method=''):
+    """
+        reference plateau search. tests every start/end pair with the Plateau criteria
+    """
+    use_mswd = method == MAHON
+    p.total_signal = float(sum([s for i, s in enumerate(p.signals) if i not in p.excludes]))
+
+    n = len(p.ages)
+    idxs = []
+    for start in range(n):
+        if start in p.excludes:
+            continue
+
+        potential_end = None
+        for end in range(start, n):
+            if end in p.excludes or not p.check_nsteps(start, end):
+                continue
+            if not use_mswd and not p.check_overlap(start, end):
+                break
+            if use_mswd and not p.check_mswd(start, end):
+                continue
+            if p.check_percent_released(start, end):
+                potential_end = end
+
+        if potential_end:
+            idxs.append((start, potential_end))
+
+    if idxs:
+        return max(idxs, key=lambda x: (x[1] - x[0], -x[0]))
+    return []
 
 
 class PlateauTestCase(unittest.TestCase):
@@ -116,6 +151,36 @@ class PlateauTestCase(unittest.TestCase):
         idx = (1, 4)
         return ages, errors, signals, exclude, idx
 
+    def _random_spectra(self, k, seed=2):
+        rs = random.RandomState(seed)
+        spectra = []
+        for i in range(k):
+            n = rs.randint(3, 15)
+            ages = 10 + rs.normal(0, 0.5, n)
+            # add a few outliers
+            ages[rs.rand(n) < 0.2] += rs.normal(0, 3)
+            errors = rs.uniform(0.05, 0.5, n)
+            signals = rs.uniform(0, 1, n)
+            excludes = [j for j in range(n) if rs.rand() < 0.1]
+            spectra.append((ages, errors, signals, excludes))
+        return spectra
+
+    def test_matches_brute_force(self):
+        for method in ('', MAHON):
+            for ages, errors, signals, excludes in self._random_spectra(150):
+                p = Plateau(ages=ages, errors=errors, signals=signals, excludes=excludes)
+                self.assertEqual(p.find_plateaus(method), brute_force_plateau(p, method))
+
+    def test_batch(self):
+        spectra = self._random_spectra(100, seed=3)
+        for method in ('', MAHON):
+            pidxs = find_plateaus_batch(spectra, method=method, chunksize=16)
+            self.assertEqual(len(pidxs), len(spectra))
+            self.assertTrue(any(pidxs))
+            for (ages, errors, signals, excludes), pidx in zip(spectra, pidxs):
+                p = Plateau(ages=ages, errors=errors, signals=signals, excludes=excludes)
+                self.assertEqual(pidx, p.find_plateaus(method))
+
 
 if __name__ == '__main__':
     unittest.main()
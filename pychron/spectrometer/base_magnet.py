@@ -100,6 +100,26 @@ class BaseMagnet(SpectrometerDevice, FieldMixin):
         """
         return self.field_table.map_dac_to_mass(dac, detname)
 
+    def map_dacs_to_masses(self, dacs, detname):
+        """
+        convert an array of DAC values to masses for a given detector, e.g. to label a scan's mass axis
+
+        :param dacs: array of voltages
+        :param detname: str, name of a detector, e.g H1
+        :return: ndarray, masses. nan for a DAC that does not map to a mass
+        """
+        return self.field_table.map_dacs_to_masses(dacs, detname)
+
+    def map_masses_to_dacs(self, masses, detname):
+        """
+        convert an array of masses to DAC values for a given detector
+
+        :param masses: array of masses, amu
+        :param detname: str, name of a detector, e.g H1
+        :return: ndarray, dac voltages. nan for a mass that does not map to a DAC
+        """
+        return self.field_table.map_masses_to_dacs(masses, detname)
+
     def map_mass_to_dac(self, mass, detname):
         """
         convert a mass value from amu to dac for a given detector
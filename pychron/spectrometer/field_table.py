@@ -16,13 +16,13 @@
 
 # ============= enthought library imports =======================
 import csv
-import hashlib
 import os
 import shutil
 
 import six
-from numpy import asarray, array, nonzero, polyval
-from scipy.optimize import leastsq, brentq
+from numpy import asarray, array, nonzero, polyval, polyder, linspace, diff, sign, interp, median, searchsorted, \
+    isnan, nan, full
+from scipy.optimize import leastsq
 from traits.api import HasTraits, List, Str, Dict, Bool, Property, CFloat
 
 from pychron.core.helpers.filetools import add_extension, backup
@@ -52,6 +52,52 @@ def format_dac(dac):
     return '{:0.5f}'.format(dac) if dac != NULL_STR else ''
 
 
+def make_inverse_table(coeffs, masses, low=0, high=200, n=2001):
+    """
+        tabulate dac=polyval(coeffs, mass) between ``low`` and ``high`` amu and return the monotonic branch that
+        contains the median of ``masses``, the calibrated masses, as (dacs, masses) with dacs increasing.
+
+        returns None if the polynomial is flat at the calibrated masses
+    """
+    ms = linspace(low, high, n)
+    dacs = polyval(coeffs, ms)
+    slope = sign(diff(dacs))
+
+    i = min(max(searchsorted(ms, median(masses)) - 1, 0), n - 2)
+    s = slope[i]
+    if not s:
+        return
+
+    idx = nonzero(slope[:i] != s)[0]
+    start = idx[-1] + 1 if len(idx) else 0
+    idx = nonzero(slope[i:] != s)[0]
+    end = i + idx[0] if len(idx) else n - 1
+
+    ms, dacs = ms[start:end + 1], dacs[start:end + 1]
+    if s < 0:
+        ms, dacs = ms[::-1], dacs[::-1]
+    return dacs, ms
+
+
+def invert_polynomial(coeffs, table, dacs, niterations=2):
+    """
+        return the masses for an array of ``dacs``. nan if a dac is outside of ``table``
+
+        interpolates ``table``, from ``make_inverse_table``, then refines with ``niterations`` newton steps
+    """
+    dacs = asarray(dacs, dtype=float)
+    if table is None:
+        return full(dacs.shape, nan)
+
+    tdacs, tmasses = table
+    ms = interp(dacs, tdacs, tmasses, left=nan, right=nan)
+
+    dcoeffs = polyder(coeffs)
+    for i in range(niterations):
+        ms = ms - (polyval(coeffs, ms) - dacs) / polyval(dcoeffs, ms)
+    return ms
+
+
 class FieldItem(HasTraits):
     isotope = Str
 
@@ -80,6 +126,10 @@ class FieldTable(Loggable):
 
         # self.db = None
         self._mftable = None
+        self._mftable_path = None
+        self._mftable_stat = None
+        # detector: (coefficients, inverse table)
+        self._inverse_tables = {}
         self._detectors = None
         self._test_path = None
 
@@ -109,42 +159,61 @@ class FieldTable(Loggable):
     def map_dac_to_mass(self, dac, detname):
         detname = get_detector_name(detname)
 
-        d = self._get_mftable()
+        mass = self.map_dacs_to_masses((dac,), detname)[0]
+        if isnan(mass):
+            self.debug('DAC does not map to an isotope. DAC={}, Detector={}'.format(dac, detname))
+        else:
+            return float(mass)
+
+    def map_dacs_to_masses(self, dacs, detname):
+        """
+            map an array of dacs to masses for one detector. nan for a dac that does not map to a mass
 
+            :param dacs: array of dac voltages
+            :param detname: str, name of a detector, e.g H1
+            :return: ndarray
+        """
+        detname = get_detector_name(detname)
+
+        d = self._get_mftable()
         _, xs, ys, p = d[detname]
         if self.polynominal_mass_func:
-            def func(x, *args):
-                c = list(p)
-                c[-1] -= dac
-                return polyval(c, x)
+            return invert_polynomial(p, self._get_inverse_table(detname, xs, ys, p), dacs)
+        else:
+            lookup = {y: x for x, y in zip(xs, ys) if y != NULL_STR}
+            return array([lookup.get(di, nan) for di in dacs], dtype=float)
 
-            try:
-                mass = brentq(func, 0, 200)
-                return mass
-            except ValueError as e:
-                self.debug('DAC does not map to an isotope. DAC={}, Detector={}'.format(dac, detname))
+    def map_masses_to_dacs(self, masses, detname):
+        """
+            map an array of masses to dacs for one detector. nan for a mass that does not map to a dac
+
+            :param masses: array of masses, amu
+            :param detname: str, name of a detector, e.g H1
+            :return: ndarray
+        """
+        detname = get_detector_name(detname)
+
+        d = self._get_mftable()
+        _, xs, ys, p = d[detname]
+        if self.polynominal_mass_func:
+            return polyval(p, asarray(masses, dtype=float))
         else:
-            try:
-                idx = ys.index(dac)
-                return xs[idx]
-            except IndexError:
-                self.debug('DAC does not map to an isotope. DAC={}, Detector={}'.format(dac, detname))
+            dacs = (self.get_dac(detname, m) for m in masses)
+            return array([nan if di is None or di == NULL_STR else di for di in dacs], dtype=float)
 
     def map_mass_to_dac(self, mass, detname):
 
         if isinstance(mass, str):
             mass = self.molweights[mass]
 
-        self.debug('Mapping mass to dac mass func: "{}"'.format(self.mass_cal_func))
         detname = get_detector_name(detname)
         d = self._get_mftable()
         _, xs, ys, p = d[detname]
 
+        # the mass func and coefficients are logged by load_table
         if self.polynominal_mass_func:
-            self.debug('{} map mass coeffs = {}'.format(detname, p))
             dac = polyval(p, mass)
         else:
-            self.debug('using discrete mass mapping')
             dac = self.get_dac(detname, mass)
 
         return dac
@@ -241,7 +310,6 @@ class FieldTable(Loggable):
             for fi in self.items:
                 writer.writerow(fi.to_csv(detectors, fmt))
 
-        self._set_mftable_hash(p)
         self._add_to_archive(p, message='manual modification')
 
     def dump(self, isos, d, message):
@@ -263,7 +331,7 @@ class FieldTable(Loggable):
 
                 writer.writerow(a)
 
-        self._set_mftable_hash(p)
+        self._set_mftable_stat(p)
         self._add_to_archive(p, message)
 
     @property
@@ -314,10 +382,10 @@ class FieldTable(Loggable):
 
         mws = self.molweights
 
-        self._set_mftable_hash(path)
+        self._set_mftable_stat(path)
         items = []
 
-        with open(path, 'U') as f:
+        with open(path, 'r') as f:
             reader = csv.reader(f)
             table = []
 
@@ -383,9 +451,11 @@ class FieldTable(Loggable):
                 else:
                     c = None
 
+                self.debug('{} mass func: "{}" coeffs = {}'.format(k, mass_func, c))
                 d[k] = (isos, mws, ys, c)
 
             self._mftable = d
+            self._inverse_tables = {}
             # self._mftable={k: (isos, mws, table[2 + i], )
             # for i, k in enumerate(detectors)}
             self._detectors = detectors
@@ -421,27 +491,45 @@ class FieldTable(Loggable):
         self.debug('================================')
 
     def _get_mftable(self):
-        if not self._mftable or not self._check_mftable_hash():
+        if not self._mftable:
             self.debug('using mftable at {}'.format(self.path))
             self.load_table()
+        elif self._check_mftable_stat():
+            self.debug('mftable modified. reloading {}'.format(self._mftable_path))
+            self.load_table(self._mftable_path)
 
         return self._mftable
 
-    def _check_mftable_hash(self):
+    def _get_inverse_table(self, detname, xs, ys, p):
+        try:
+            coeffs, table = self._inverse_tables[detname]
+            if coeffs is p:
+                return table
+        except KeyError:
+            pass
+
+        mws, _ = self._clean_dacs(xs, ys)
+        table = make_inverse_table(p, mws)
+        self._inverse_tables[detname] = (p, table)
+        return table
+
+    def _check_mftable_stat(self):
         """
             return True if mftable externally modified
         """
-        # p = paths.mftable
-        current_hash = self._make_hash(self.path)
-        return self._mftable_hash != current_hash
+        return self._mftable_stat != self._make_stat(self._mftable_path)
+
+    def _make_stat(self, p):
+        try:
+            st = os.stat(p)
+        except (OSError, TypeError):
+            return
 
-    def _make_hash(self, p):
-        if p and os.path.isfile(p):
-            with open(p, 'rb') as rfile:
-                return hashlib.md5(rfile.read())
+        return st.st_mtime_ns, st.st_size
 
-    def _set_mftable_hash(self, p):
-        self._mftable_hash = self._make_hash(p)
+    def _set_mftable_stat(self, p):
+        self._mftable_path = p
+        self._mftable_stat = self._make_stat(p)
 
     def _add_to_archive(self, p, message):
         # if self.use_db_archive:
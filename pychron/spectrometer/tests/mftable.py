@@ -1,7 +1,11 @@
 from __future__ import absolute_import
 import os
+import shutil
+import tempfile
 import unittest
 
+from numpy import linspace, isnan
+
 from pychron.spectrometer.field_table import FieldTable
 
 
@@ -51,6 +55,15 @@ class DiscreteMFTableTestCase(unittest.TestCase):
         dac = self.mftable.map_mass_to_dac('Ar40', 'H2')
         self.assertEqual(dac, 5.8955)
 
+    def test_discrete_arrays(self):
+        dacs = self.mftable.map_masses_to_dacs([40, 39, 1], 'H2')
+        self.assertEqual(list(dacs[:2]), [5.8955, 5.7882])
+        self.assertTrue(isnan(dacs[2]))
+
+        masses = self.mftable.map_dacs_to_masses([5.8955, 1], 'H2')
+        self.assertEqual(masses[0], 40)
+        self.assertTrue(isnan(masses[1]))
+
 
 class MFTableTestCase(unittest.TestCase):
     def setUp(self):
@@ -75,6 +88,59 @@ class MFTableTestCase(unittest.TestCase):
         dac = self.mftable.map_mass_to_dac('Ar40', 'H2')
         self.assertNotEqual(dac, 5.8955)
 
+    def test_map_dac_to_mass(self):
+        for det in ('H2', 'AX', 'CDD'):
+            dac = self.mftable.map_mass_to_dac(39.5, det)
+            self.assertAlmostEqual(self.mftable.map_dac_to_mass(dac, det), 39.5, 8)
+
+    def test_map_dac_to_mass_invalid(self):
+        self.assertIsNone(self.mftable.map_dac_to_mass(100, 'AX'))
+
+    def test_map_arrays(self):
+        masses = linspace(35, 41, 100)
+        dacs = self.mftable.map_masses_to_dacs(masses, 'H1')
+        self.assertEqual(len(dacs), 100)
+        for a, b in zip(self.mftable.map_dacs_to_masses(dacs, 'H1'), masses):
+            self.assertAlmostEqual(a, b, 8)
+
+    def test_update_invalidates_inverse(self):
+        dac = self.mftable.map_mass_to_dac('Ar40', 'H1')
+        self.mftable.update_field_table('H1', 'Ar40', dac + 0.1, save=False, update_others=False)
+        self.assertAlmostEqual(self.mftable.map_dac_to_mass(dac + 0.1, 'H1'), 40, 1)
+
+
+class MFTableReloadTestCase(unittest.TestCase):
+    def setUp(self):
+        src = './spectrometer/tests/data/mftable.csv'
+        if not os.path.isfile(src):
+            src = 'pychron/spectrometer/tests/data/mftable.csv'
+
+        self.root = tempfile.mkdtemp()
+        self.path = p = os.path.join(self.root, 'mftable.csv')
+        shutil.copyfile(src, p)
+
+        self.mftable = FieldTable(bind=False)
+        self.mftable.molweights = {'Ar40': 40, 'Ar39': 39, 'Ar36': 36, 'Foo': 1}
+        self.mftable._test_path = p
+        self.mftable.load_table(path=p)
+
+    def tearDown(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+    def test_not_reloaded(self):
+        table = self.mftable.get_table()
+        self.assertIs(self.mftable.get_table(), table)
+
+    def test_reload_modified(self):
+        table = self.mftable.get_table()
+        with open(self.path, 'r') as rfile:
+            txt = rfile.read()
+        with open(self.path, 'w') as wfile:
+            wfile.write(txt.replace('Ar40,5.8955', 'Ar40,5.9955'))
+
+        self.assertIsNot(self.mftable.get_table(), table)
+        self.assertEqual(self.mftable.get_table()['H2'][2][0], 5.9955)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -26,11 +26,17 @@ def suite():
     from pychron.core.tests.spell_correct import SpellCorrectTestCase
     from pychron.core.tests.filtering_tests import FilteringTestCase
     from pychron.core.stats.tests.peak_detection_test import MultiPeakDetectionTestCase
+    from pychron.core.stats.tests.monte_carlo_tests import MonteCarloTestCase, FluxMonteCarloTestCase, \
+        NearestNeighborFluxTestCase
+    from pychron.core.stats.tests.probability_curves_tests import CumulativeProbabilityTestCase
     from pychron.core.helpers.tests.floatfmt import FloatfmtTestCase
     from pychron.core.helpers.tests.strtools import CamelCaseTestCase
+    from pychron.core.helpers.tests.signal_buffer import SignalBufferTestCase, MeasurementAppendTestCase
+    from pychron.core.helpers.tests.binpack import BinpackTestCase
     from pychron.core.xml.tests.xml_parser import XMLParserTestCase
     from pychron.core.regression.tests.regression import OLSRegressionTest, MeanRegressionTest, \
-        FilterOLSRegressionTest, OLSRegressionTest2, TruncateRegressionTest
+        FilterOLSRegressionTest, OLSRegressionTest2, TruncateRegressionTest, IncrementalOLSRegressionTest, \
+        IncrementalFilterOLSRegressionTest, IncrementalRegressionTest, NewYorkRegressionTest, YorkBatchTest
     from pychron.core.tests.alpha_tests import AlphaTestCase
 
     # DataMapper
@@ -38,6 +44,17 @@ def suite():
         USGSVSCIrradiationSourceUnittest
     from pychron.data_mapper.tests.nmgrl_legacy_source import NMGRLLegacySourceUnittest
 
+    # Database
+    from pychron.database.tests.session import ScopedSessionTestCase
+
+    # DVC
+    from pychron.dvc.tests.data_sidecar import DataSidecarTestCase
+    from pychron.dvc.tests.cache import DVCCacheTestCase
+    from pychron.dvc.tests.dvc_analysis import LazyDVCAnalysisTestCase
+    from pychron.dvc.tests.meta_repo import MetaRepoIndexTestCase
+    from pychron.dvc.tests.analysis_records import AnalysisRecordsTestCase
+    from pychron.dvc.tests.publish_queue import PublishQueueTestCase
+
     # Experiment
     from pychron.experiment.tests.repository_identifier import ExperimentIdentifierTestCase
     from pychron.experiment.tests.peak_hop_parse import PeakHopYamlCase1
@@ -45,6 +62,9 @@ def suite():
     from pychron.experiment.tests.backup import BackupTestCase
     from pychron.experiment.tests.peak_hop_parse import PeakHopTxtCase
     from pychron.experiment.tests.duration_tracker import DurationTrackerTestCase
+    from pychron.experiment.tests.async_writer import AsyncDataWriterTestCase
+    from pychron.experiment.tests.h5_writer import H5DataWriterTestCase
+    from pychron.experiment.tests.run_prefetcher import RunPrefetcherTestCase
     from pychron.experiment.tests.frequency_test import FrequencyTestCase, FrequencyTemplateTestCase
     from pychron.experiment.tests.position_regex_test import XYTestCase
     from pychron.experiment.tests.renumber_aliquot_test import RenumberAliquotTestCase
@@ -55,17 +75,24 @@ def suite():
     # ExternalPipette
     from pychron.external_pipette.tests.external_pipette import ExternalPipetteTestCase
 
+    # Pipeline
+    from pychron.pipeline.tests.headless import HeadlessQuerySpecTestCase, HeadlessPipelineRunnerTestCase, \
+        HeadlessRunJobTestCase
+    from pychron.pipeline.tests.node_cache import NodeCacheTestCase
+
     # Processing
     from pychron.processing.tests.plateau import PlateauTestCase
     from pychron.processing.tests.ratio import RatioTestCase
     from pychron.processing.tests.age_converter import AgeConverterTestCase
+    from pychron.processing.tests.batch_age import BatchAgeTestCase
+    from pychron.processing.tests.isochron import GroupIsochronTestCase
 
     # Pyscripts
     # from pychron.pyscripts.tests.extraction_script import WaitForTestCase
     from pychron.pyscripts.tests.measurement_pyscript import InterpolationTestCase, DocstrContextTestCase
 
     # Spectrometer
-    from pychron.spectrometer.tests.mftable import MFTableTestCase, DiscreteMFTableTestCase
+    from pychron.spectrometer.tests.mftable import MFTableTestCase, DiscreteMFTableTestCase, MFTableReloadTestCase
     from pychron.spectrometer.tests.integration_time import IntegrationTimeTestCase
 
     from pychron.stage.tests.stage_map import StageMapTestCase, TransformTestCase
@@ -82,9 +109,16 @@ def suite():
         SpellCorrectTestCase,
         FilteringTestCase,
         MultiPeakDetectionTestCase,
+        MonteCarloTestCase,
+        FluxMonteCarloTestCase,
+        NearestNeighborFluxTestCase,
+        CumulativeProbabilityTestCase,
         FloatfmtTestCase,
         SigFigStdFmtTestCase,
         CamelCaseTestCase,
+        SignalBufferTestCase,
+        MeasurementAppendTestCase,
+        BinpackTestCase,
         RatioTestCase,
         XMLParserTestCase,
         OLSRegressionTest,
@@ -94,6 +128,11 @@ def suite():
         FilterOLSRegressionTest,
         OLSRegressionTest2,
         TruncateRegressionTest,
+        IncrementalOLSRegressionTest,
+        IncrementalFilterOLSRegressionTest,
+        IncrementalRegressionTest,
+        NewYorkRegressionTest,
+        YorkBatchTest,
         MSWDTestCase,
 
         # DataMapper
@@ -102,6 +141,17 @@ def suite():
         # NuFileSourceUnittest,
         NMGRLLegacySourceUnittest,
 
+        # Database
+        ScopedSessionTestCase,
+
+        # DVC
+        DataSidecarTestCase,
+        DVCCacheTestCase,
+        LazyDVCAnalysisTestCase,
+        MetaRepoIndexTestCase,
+        AnalysisRecordsTestCase,
+        PublishQueueTestCase,
+
         # Experiment
         ExperimentIdentifierTestCase,
         PeakHopYamlCase1,
@@ -109,6 +159,9 @@ def suite():
         BackupTestCase,
         PeakHopTxtCase,
         DurationTrackerTestCase,
+        AsyncDataWriterTestCase,
+        H5DataWriterTestCase,
+        RunPrefetcherTestCase,
         FrequencyTestCase,
         FrequencyTemplateTestCase,
         XYTestCase,
@@ -121,10 +174,18 @@ def suite():
         # ExternalPipette
         ExternalPipetteTestCase,
 
+        # Pipeline
+        HeadlessQuerySpecTestCase,
+        HeadlessPipelineRunnerTestCase,
+        HeadlessRunJobTestCase,
+        NodeCacheTestCase,
+
         # Processing
         PlateauTestCase,
         RatioTestCase,
         AgeConverterTestCase,
+        BatchAgeTestCase,
+        GroupIsochronTestCase,
 
         # Pyscripts
         WaitForTestCase,
@@ -134,6 +195,7 @@ def suite():
         # Spectrometer
         MFTableTestCase,
         DiscreteMFTableTestCase,
+        MFTableReloadTestCase,
         IntegrationTimeTestCase,
 
         # Stage